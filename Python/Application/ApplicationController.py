@@ -3,12 +3,16 @@ import platform
 import subprocess
 import time
 from typing import Optional, Dict, Any
+from System.AppRegistry import get_app_registry
+from System.WindowRegistry import get_window_registry
+from Application.InputBackend import get_input_backend
 
 class ApplicationController:
     def __init__(self):
         self.os_name = platform.system()
+        self.input = get_input_backend()
         pyautogui.FAILSAFE = True
-        pyautogui.PAUSE = 0.5
+        pyautogui.PAUSE = self.input.action_delay
         
         self.common_commands = {
             'type': self._type_text,
@@ -24,29 +28,23 @@ class ApplicationController:
             'screenshot': self._screenshot,
         }
         
-        self.app_specific_commands = {
+        self.registry = get_app_registry()
+        self.windows = get_window_registry()
+        self.family_handlers = {
             'vscode': self._vscode_commands,
-            'visual studio code': self._vscode_commands,
-            'code': self._vscode_commands,
-            'chrome': self._browser_commands,
-            'firefox': self._browser_commands,
-            'brave': self._browser_commands,
-            'edge': self._browser_commands,
             'browser': self._browser_commands,
-            'spotify': self._media_commands,
-            'vlc': self._media_commands,
+            'media': self._media_commands,
             'terminal': self._terminal_commands,
-            'cmd': self._terminal_commands,
-            'command prompt': self._terminal_commands,
-            'powershell': self._terminal_commands,
-            'notepad': self._editor_commands,
-            'gedit': self._editor_commands,
-            'textedit': self._editor_commands,
+            'editor': self._editor_commands,
             'word': self._word_commands,
             'excel': self._excel_commands,
             'powerpoint': self._powerpoint_commands,
             'libreoffice': self._libreoffice_commands,
         }
+        self.app_specific_commands = {
+            keyword: self.family_handlers[family]
+            for keyword, family in self.registry.family_keywords
+        }
 
     def execute_command(self, app_name: str, command: str, params: Dict[str, Any] = None) -> bool:
         try:
@@ -57,9 +55,9 @@ class ApplicationController:
             if command_lower in self.common_commands:
                 return self.common_commands[command_lower](params)
             
-            for app_key, handler in self.app_specific_commands.items():
-                if app_key in app_lower:
-                    return handler(command_lower, params)
+            family = self.registry.family_for(app_lower)
+            if family in self.family_handlers:
+                return self.family_handlers[family](command_lower, params)
             
             return self._generic_command(command_lower, params)
             
@@ -70,21 +68,21 @@ class ApplicationController:
     def _type_text(self, params: Dict[str, Any]) -> bool:
         text = params.get('text', '')
         if text:
-            pyautogui.write(text, interval=0.05)
+            self.input.write(text)
             return True
         return False
 
     def _press_key(self, params: Dict[str, Any]) -> bool:
         key = params.get('key', '')
         if key:
-            pyautogui.press(key)
+            self.input.press(key)
             return True
         return False
 
     def _press_hotkey(self, params: Dict[str, Any]) -> bool:
         keys = params.get('keys', [])
         if keys:
-            pyautogui.hotkey(*keys)
+            self.input.hotkey(*keys)
             return True
         return False
 
@@ -154,24 +152,24 @@ class ApplicationController:
         ctrl_or_cmd = 'command' if self.os_name == 'Darwin' else 'ctrl'
         
         commands = {
-            'save': lambda: pyautogui.hotkey(ctrl_or_cmd, 's'),
-            'save all': lambda: pyautogui.hotkey(ctrl_or_cmd, 'k', 's'),
-            'open file': lambda: pyautogui.hotkey(ctrl_or_cmd, 'o'),
-            'new file': lambda: pyautogui.hotkey(ctrl_or_cmd, 'n'),
-            'close': lambda: pyautogui.hotkey(ctrl_or_cmd, 'w'),
-            'close all': lambda: pyautogui.hotkey(ctrl_or_cmd, 'k', 'w'),
-            'find': lambda: pyautogui.hotkey(ctrl_or_cmd, 'f'),
-            'replace': lambda: pyautogui.hotkey(ctrl_or_cmd, 'h'),
-            'comment': lambda: pyautogui.hotkey(ctrl_or_cmd, '/'),
-            'terminal': lambda: pyautogui.hotkey(ctrl_or_cmd, '`'),
-            'command palette': lambda: pyautogui.hotkey(ctrl_or_cmd, 'shift', 'p'),
-            'go to line': lambda: pyautogui.hotkey(ctrl_or_cmd, 'g'),
-            'duplicate line': lambda: pyautogui.hotkey(ctrl_or_cmd, 'shift', 'd'),
-            'delete line': lambda: pyautogui.hotkey(ctrl_or_cmd, 'shift', 'k'),
-            'format document': lambda: pyautogui.hotkey(ctrl_or_cmd, 'shift', 'i'),
-            'next tab': lambda: pyautogui.hotkey(ctrl_or_cmd, 'pagedown'),
-            'previous tab': lambda: pyautogui.hotkey(ctrl_or_cmd, 'pageup'),
-            'split editor': lambda: pyautogui.hotkey(ctrl_or_cmd, '\\'),
+            'save': lambda: self.input.hotkey(ctrl_or_cmd, 's'),
+            'save all': lambda: self.input.hotkey(ctrl_or_cmd, 'k', 's'),
+            'open file': lambda: self.input.hotkey(ctrl_or_cmd, 'o'),
+            'new file': lambda: self.input.hotkey(ctrl_or_cmd, 'n'),
+            'close': lambda: self.input.hotkey(ctrl_or_cmd, 'w'),
+            'close all': lambda: self.input.hotkey(ctrl_or_cmd, 'k', 'w'),
+            'find': lambda: self.input.hotkey(ctrl_or_cmd, 'f'),
+            'replace': lambda: self.input.hotkey(ctrl_or_cmd, 'h'),
+            'comment': lambda: self.input.hotkey(ctrl_or_cmd, '/'),
+            'terminal': lambda: self.input.hotkey(ctrl_or_cmd, '`'),
+            'command palette': lambda: self.input.hotkey(ctrl_or_cmd, 'shift', 'p'),
+            'go to line': lambda: self.input.hotkey(ctrl_or_cmd, 'g'),
+            'duplicate line': lambda: self.input.hotkey(ctrl_or_cmd, 'shift', 'd'),
+            'delete line': lambda: self.input.hotkey(ctrl_or_cmd, 'shift', 'k'),
+            'format document': lambda: self.input.hotkey(ctrl_or_cmd, 'shift', 'i'),
+            'next tab': lambda: self.input.hotkey(ctrl_or_cmd, 'pagedown'),
+            'previous tab': lambda: self.input.hotkey(ctrl_or_cmd, 'pageup'),
+            'split editor': lambda: self.input.hotkey(ctrl_or_cmd, '\\'),
         }
         
         if command in commands:
@@ -183,26 +181,26 @@ class ApplicationController:
         ctrl_or_cmd = 'command' if self.os_name == 'Darwin' else 'ctrl'
         
         commands = {
-            'new tab': lambda: pyautogui.hotkey(ctrl_or_cmd, 't'),
-            'close tab': lambda: pyautogui.hotkey(ctrl_or_cmd, 'w'),
-            'reopen tab': lambda: pyautogui.hotkey(ctrl_or_cmd, 'shift', 't'),
-            'next tab': lambda: pyautogui.hotkey(ctrl_or_cmd, 'tab'),
-            'previous tab': lambda: pyautogui.hotkey(ctrl_or_cmd, 'shift', 'tab'),
-            'refresh': lambda: pyautogui.hotkey(ctrl_or_cmd, 'r'),
-            'hard refresh': lambda: pyautogui.hotkey(ctrl_or_cmd, 'shift', 'r'),
-            'back': lambda: pyautogui.hotkey('alt', 'left'),
-            'forward': lambda: pyautogui.hotkey('alt', 'right'),
-            'home': lambda: pyautogui.hotkey('alt', 'home'),
-            'address bar': lambda: pyautogui.hotkey(ctrl_or_cmd, 'l'),
-            'bookmark': lambda: pyautogui.hotkey(ctrl_or_cmd, 'd'),
-            'history': lambda: pyautogui.hotkey(ctrl_or_cmd, 'h'),
-            'downloads': lambda: pyautogui.hotkey(ctrl_or_cmd, 'j'),
-            'incognito': lambda: pyautogui.hotkey(ctrl_or_cmd, 'shift', 'n'),
-            'developer tools': lambda: pyautogui.hotkey('f12'),
-            'zoom in': lambda: pyautogui.hotkey(ctrl_or_cmd, '+'),
-            'zoom out': lambda: pyautogui.hotkey(ctrl_or_cmd, '-'),
-            'reset zoom': lambda: pyautogui.hotkey(ctrl_or_cmd, '0'),
-            'fullscreen': lambda: pyautogui.press('f11'),
+            'new tab': lambda: self.input.hotkey(ctrl_or_cmd, 't'),
+            'close tab': lambda: self.input.hotkey(ctrl_or_cmd, 'w'),
+            'reopen tab': lambda: self.input.hotkey(ctrl_or_cmd, 'shift', 't'),
+            'next tab': lambda: self.input.hotkey(ctrl_or_cmd, 'tab'),
+            'previous tab': lambda: self.input.hotkey(ctrl_or_cmd, 'shift', 'tab'),
+            'refresh': lambda: self.input.hotkey(ctrl_or_cmd, 'r'),
+            'hard refresh': lambda: self.input.hotkey(ctrl_or_cmd, 'shift', 'r'),
+            'back': lambda: self.input.hotkey('alt', 'left'),
+            'forward': lambda: self.input.hotkey('alt', 'right'),
+            'home': lambda: self.input.hotkey('alt', 'home'),
+            'address bar': lambda: self.input.hotkey(ctrl_or_cmd, 'l'),
+            'bookmark': lambda: self.input.hotkey(ctrl_or_cmd, 'd'),
+            'history': lambda: self.input.hotkey(ctrl_or_cmd, 'h'),
+            'downloads': lambda: self.input.hotkey(ctrl_or_cmd, 'j'),
+            'incognito': lambda: self.input.hotkey(ctrl_or_cmd, 'shift', 'n'),
+            'developer tools': lambda: self.input.hotkey('f12'),
+            'zoom in': lambda: self.input.hotkey(ctrl_or_cmd, '+'),
+            'zoom out': lambda: self.input.hotkey(ctrl_or_cmd, '-'),
+            'reset zoom': lambda: self.input.hotkey(ctrl_or_cmd, '0'),
+            'fullscreen': lambda: self.input.press('f11'),
         }
         
         if command in commands:
@@ -212,16 +210,16 @@ class ApplicationController:
 
     def _media_commands(self, command: str, params: Dict[str, Any]) -> bool:
         commands = {
-            'play': lambda: pyautogui.press('space'),
-            'pause': lambda: pyautogui.press('space'),
-            'next': lambda: pyautogui.press('n'),
-            'previous': lambda: pyautogui.press('p'),
-            'volume up': lambda: pyautogui.press('volumeup'),
-            'volume down': lambda: pyautogui.press('volumedown'),
-            'mute': lambda: pyautogui.press('volumemute'),
-            'fullscreen': lambda: pyautogui.press('f'),
-            'seek forward': lambda: pyautogui.press('right'),
-            'seek backward': lambda: pyautogui.press('left'),
+            'play': lambda: self.input.press('space'),
+            'pause': lambda: self.input.press('space'),
+            'next': lambda: self.input.press('n'),
+            'previous': lambda: self.input.press('p'),
+            'volume up': lambda: self.input.press('volumeup'),
+            'volume down': lambda: self.input.press('volumedown'),
+            'mute': lambda: self.input.press('volumemute'),
+            'fullscreen': lambda: self.input.press('f'),
+            'seek forward': lambda: self.input.press('right'),
+            'seek backward': lambda: self.input.press('left'),
         }
         
         if command in commands:
@@ -233,14 +231,14 @@ class ApplicationController:
         ctrl_or_cmd = 'command' if self.os_name == 'Darwin' else 'ctrl'
         
         commands = {
-            'clear': lambda: (pyautogui.write('clear') and pyautogui.press('enter')),
-            'new tab': lambda: pyautogui.hotkey(ctrl_or_cmd, 'shift', 't'),
-            'close tab': lambda: pyautogui.hotkey(ctrl_or_cmd, 'shift', 'w'),
-            'copy': lambda: pyautogui.hotkey(ctrl_or_cmd, 'shift', 'c'),
-            'paste': lambda: pyautogui.hotkey(ctrl_or_cmd, 'shift', 'v'),
-            'interrupt': lambda: pyautogui.hotkey(ctrl_or_cmd, 'c'),
-            'zoom in': lambda: pyautogui.hotkey(ctrl_or_cmd, '+'),
-            'zoom out': lambda: pyautogui.hotkey(ctrl_or_cmd, '-'),
+            'clear': lambda: self.input.sequence([('write', 'clear'), ('press', 'enter')]),
+            'new tab': lambda: self.input.hotkey(ctrl_or_cmd, 'shift', 't'),
+            'close tab': lambda: self.input.hotkey(ctrl_or_cmd, 'shift', 'w'),
+            'copy': lambda: self.input.hotkey(ctrl_or_cmd, 'shift', 'c'),
+            'paste': lambda: self.input.hotkey(ctrl_or_cmd, 'shift', 'v'),
+            'interrupt': lambda: self.input.hotkey(ctrl_or_cmd, 'c'),
+            'zoom in': lambda: self.input.hotkey(ctrl_or_cmd, '+'),
+            'zoom out': lambda: self.input.hotkey(ctrl_or_cmd, '-'),
         }
         
         if command in commands:
@@ -252,18 +250,18 @@ class ApplicationController:
         ctrl_or_cmd = 'command' if self.os_name == 'Darwin' else 'ctrl'
         
         commands = {
-            'save': lambda: pyautogui.hotkey(ctrl_or_cmd, 's'),
-            'save as': lambda: pyautogui.hotkey(ctrl_or_cmd, 'shift', 's'),
-            'open': lambda: pyautogui.hotkey(ctrl_or_cmd, 'o'),
-            'new': lambda: pyautogui.hotkey(ctrl_or_cmd, 'n'),
-            'find': lambda: pyautogui.hotkey(ctrl_or_cmd, 'f'),
-            'replace': lambda: pyautogui.hotkey(ctrl_or_cmd, 'h'),
-            'select all': lambda: pyautogui.hotkey(ctrl_or_cmd, 'a'),
-            'copy': lambda: pyautogui.hotkey(ctrl_or_cmd, 'c'),
-            'cut': lambda: pyautogui.hotkey(ctrl_or_cmd, 'x'),
-            'paste': lambda: pyautogui.hotkey(ctrl_or_cmd, 'v'),
-            'undo': lambda: pyautogui.hotkey(ctrl_or_cmd, 'z'),
-            'redo': lambda: pyautogui.hotkey(ctrl_or_cmd, 'y'),
+            'save': lambda: self.input.hotkey(ctrl_or_cmd, 's'),
+            'save as': lambda: self.input.hotkey(ctrl_or_cmd, 'shift', 's'),
+            'open': lambda: self.input.hotkey(ctrl_or_cmd, 'o'),
+            'new': lambda: self.input.hotkey(ctrl_or_cmd, 'n'),
+            'find': lambda: self.input.hotkey(ctrl_or_cmd, 'f'),
+            'replace': lambda: self.input.hotkey(ctrl_or_cmd, 'h'),
+            'select all': lambda: self.input.hotkey(ctrl_or_cmd, 'a'),
+            'copy': lambda: self.input.hotkey(ctrl_or_cmd, 'c'),
+            'cut': lambda: self.input.hotkey(ctrl_or_cmd, 'x'),
+            'paste': lambda: self.input.hotkey(ctrl_or_cmd, 'v'),
+            'undo': lambda: self.input.hotkey(ctrl_or_cmd, 'z'),
+            'redo': lambda: self.input.hotkey(ctrl_or_cmd, 'y'),
         }
         
         if command in commands:
@@ -275,15 +273,15 @@ class ApplicationController:
         ctrl_or_cmd = 'command' if self.os_name == 'Darwin' else 'ctrl'
         
         commands = {
-            'bold': lambda: pyautogui.hotkey(ctrl_or_cmd, 'b'),
-            'italic': lambda: pyautogui.hotkey(ctrl_or_cmd, 'i'),
-            'underline': lambda: pyautogui.hotkey(ctrl_or_cmd, 'u'),
-            'align left': lambda: pyautogui.hotkey(ctrl_or_cmd, 'l'),
-            'align center': lambda: pyautogui.hotkey(ctrl_or_cmd, 'e'),
-            'align right': lambda: pyautogui.hotkey(ctrl_or_cmd, 'r'),
-            'justify': lambda: pyautogui.hotkey(ctrl_or_cmd, 'j'),
-            'increase font': lambda: pyautogui.hotkey(ctrl_or_cmd, ']'),
-            'decrease font': lambda: pyautogui.hotkey(ctrl_or_cmd, '['),
+            'bold': lambda: self.input.hotkey(ctrl_or_cmd, 'b'),
+            'italic': lambda: self.input.hotkey(ctrl_or_cmd, 'i'),
+            'underline': lambda: self.input.hotkey(ctrl_or_cmd, 'u'),
+            'align left': lambda: self.input.hotkey(ctrl_or_cmd, 'l'),
+            'align center': lambda: self.input.hotkey(ctrl_or_cmd, 'e'),
+            'align right': lambda: self.input.hotkey(ctrl_or_cmd, 'r'),
+            'justify': lambda: self.input.hotkey(ctrl_or_cmd, 'j'),
+            'increase font': lambda: self.input.hotkey(ctrl_or_cmd, ']'),
+            'decrease font': lambda: self.input.hotkey(ctrl_or_cmd, '['),
         }
         
         if command in commands:
@@ -295,11 +293,11 @@ class ApplicationController:
         ctrl_or_cmd = 'command' if self.os_name == 'Darwin' else 'ctrl'
         
         commands = {
-            'new sheet': lambda: pyautogui.hotkey('shift', 'f11'),
-            'insert row': lambda: pyautogui.hotkey(ctrl_or_cmd, 'shift', '+'),
-            'delete row': lambda: pyautogui.hotkey(ctrl_or_cmd, '-'),
-            'autosum': lambda: pyautogui.hotkey('alt', '='),
-            'format cells': lambda: pyautogui.hotkey(ctrl_or_cmd, '1'),
+            'new sheet': lambda: self.input.hotkey('shift', 'f11'),
+            'insert row': lambda: self.input.hotkey(ctrl_or_cmd, 'shift', '+'),
+            'delete row': lambda: self.input.hotkey(ctrl_or_cmd, '-'),
+            'autosum': lambda: self.input.hotkey('alt', '='),
+            'format cells': lambda: self.input.hotkey(ctrl_or_cmd, '1'),
         }
         
         if command in commands:
@@ -311,11 +309,11 @@ class ApplicationController:
         ctrl_or_cmd = 'command' if self.os_name == 'Darwin' else 'ctrl'
         
         commands = {
-            'new slide': lambda: pyautogui.hotkey(ctrl_or_cmd, 'm'),
-            'start presentation': lambda: pyautogui.press('f5'),
-            'next slide': lambda: pyautogui.press('right'),
-            'previous slide': lambda: pyautogui.press('left'),
-            'end presentation': lambda: pyautogui.press('esc'),
+            'new slide': lambda: self.input.hotkey(ctrl_or_cmd, 'm'),
+            'start presentation': lambda: self.input.press('f5'),
+            'next slide': lambda: self.input.press('right'),
+            'previous slide': lambda: self.input.press('left'),
+            'end presentation': lambda: self.input.press('esc'),
         }
         
         if command in commands:
@@ -331,68 +329,68 @@ class ApplicationController:
         
         if 'type' in command or 'write' in command:
             if text:
-                pyautogui.write(text, interval=0.05)
+                self.input.write(text)
                 return True
         
         elif 'enter' in command or 'return' in command:
-            pyautogui.press('enter')
+            self.input.press('enter')
             return True
         
         elif 'delete' in command or 'backspace' in command:
-            pyautogui.press('backspace')
+            self.input.press('backspace')
             return True
         
         elif 'tab' in command:
-            pyautogui.press('tab')
+            self.input.press('tab')
             return True
         
         elif 'escape' in command or 'esc' in command:
-            pyautogui.press('esc')
+            self.input.press('esc')
             return True
         
         elif 'copy' in command:
             ctrl_or_cmd = 'command' if self.os_name == 'Darwin' else 'ctrl'
-            pyautogui.hotkey(ctrl_or_cmd, 'c')
+            self.input.hotkey(ctrl_or_cmd, 'c')
             return True
         
         elif 'paste' in command:
             ctrl_or_cmd = 'command' if self.os_name == 'Darwin' else 'ctrl'
-            pyautogui.hotkey(ctrl_or_cmd, 'v')
+            self.input.hotkey(ctrl_or_cmd, 'v')
             return True
         
         elif 'cut' in command:
             ctrl_or_cmd = 'command' if self.os_name == 'Darwin' else 'ctrl'
-            pyautogui.hotkey(ctrl_or_cmd, 'x')
+            self.input.hotkey(ctrl_or_cmd, 'x')
             return True
         
         elif 'select all' in command:
             ctrl_or_cmd = 'command' if self.os_name == 'Darwin' else 'ctrl'
-            pyautogui.hotkey(ctrl_or_cmd, 'a')
+            self.input.hotkey(ctrl_or_cmd, 'a')
             return True
         
         elif 'save' in command:
             ctrl_or_cmd = 'command' if self.os_name == 'Darwin' else 'ctrl'
-            pyautogui.hotkey(ctrl_or_cmd, 's')
+            self.input.hotkey(ctrl_or_cmd, 's')
             return True
         
         elif 'undo' in command:
             ctrl_or_cmd = 'command' if self.os_name == 'Darwin' else 'ctrl'
-            pyautogui.hotkey(ctrl_or_cmd, 'z')
+            self.input.hotkey(ctrl_or_cmd, 'z')
             return True
         
         elif 'redo' in command:
             ctrl_or_cmd = 'command' if self.os_name == 'Darwin' else 'ctrl'
-            pyautogui.hotkey(ctrl_or_cmd, 'y')
+            self.input.hotkey(ctrl_or_cmd, 'y')
             return True
         
         elif 'find' in command or 'search' in command:
             ctrl_or_cmd = 'command' if self.os_name == 'Darwin' else 'ctrl'
-            pyautogui.hotkey(ctrl_or_cmd, 'f')
+            self.input.hotkey(ctrl_or_cmd, 'f')
             return True
         
         elif 'close' in command or 'quit' in command:
             ctrl_or_cmd = 'command' if self.os_name == 'Darwin' else 'ctrl'
-            pyautogui.hotkey('alt' if self.os_name != 'Darwin' else ctrl_or_cmd, 'f4' if self.os_name != 'Darwin' else 'q')
+            self.input.hotkey('alt' if self.os_name != 'Darwin' else ctrl_or_cmd, 'f4' if self.os_name != 'Darwin' else 'q')
             return True
         
         return False
@@ -401,6 +399,9 @@ class ApplicationController:
         try:
             app_lower = app_name.lower()
             
+            if self.windows.focus(app_name):
+                return True
+            
             if self.os_name == 'Darwin':
                 try:
                     script = f'tell application "{app_name}" to activate'
@@ -1,94 +1,214 @@
 from typing import Optional, Dict, Any
+from collections import OrderedDict, deque
+from pathlib import Path
+import atexit
+import json
+import os
+import threading
 import time
 
+HISTORY_SIZE = 50
+MAX_APP_STATES = 32
+SNAPSHOT_DELAY = 2.0
+
+try:
+    from config import CONTEXT_MAX_AGE
+except ImportError:
+    CONTEXT_MAX_AGE = 30 * 60
+
+def default_context_path() -> Path:
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA')
+    base = Path(cache_home) if cache_home else Path.home() / '.cache'
+    return base / 'either_assistant' / 'context.json'
+
+def _app_has_window(app_name: str) -> Optional[bool]:
+    """Whether the app has an open window; None when windows can't be listed."""
+    try:
+        from System.WindowRegistry import get_window_registry
+        from System.WindowList import list_windows
+    except ImportError:
+        return None
+    if get_window_registry().lookup(app_name) is not None:
+        return True
+    return False if list_windows() is not None else None
+
 class ContextManager:
-    def __init__(self):
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, state_path: Optional[Path] = None):
         self.current_app: Optional[str] = None
         self.previous_app: Optional[str] = None
-        self.app_history: list = []
+        self.app_history: deque = deque(maxlen=HISTORY_SIZE)
         self.context_start_time: Optional[float] = None
-        self.app_states: Dict[str, Dict[str, Any]] = {}
-        
+        self.app_states: OrderedDict = OrderedDict()
+        self.recent: OrderedDict = OrderedDict()
+        self.state_path = Path(state_path) if state_path else None
+        self._lock = threading.Lock()
+        self._snapshot_timer: Optional[threading.Timer] = None
+        if self.state_path:
+            self.load()
+            atexit.register(self.flush)
+
+    @classmethod
+    def shared(cls) -> 'ContextManager':
+        """Process-wide context persisted to disk, so it survives per-command rebuilds and restarts."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(default_context_path())
+            return cls._shared
+
+    def load(self) -> None:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.current_app = data.get('current_app')
+        self.previous_app = data.get('previous_app')
+        self.context_start_time = data.get('context_start_time')
+        self.app_history.extend(data.get('app_history', []))
+        for entry in self.app_history:
+            self._touch_recent(entry['app'])
+        for app, state in data.get('app_states', []):
+            self.app_states[app] = state
+        if self.current_app and not self._restored_context_is_live():
+            print(f"🎯 Dropped stale context: {self.current_app}")
+            self.current_app = None
+            self.context_start_time = None
+
+    def _restored_context_is_live(self) -> bool:
+        # A context from an earlier session may point at an app that has since closed;
+        # app commands would then send keystrokes to whatever window has focus.
+        started = self.context_start_time
+        if not isinstance(started, (int, float)) or time.time() - started > CONTEXT_MAX_AGE:
+            return False
+        return _app_has_window(self.current_app) is not False
+
+    def _snapshot_data(self) -> Dict[str, Any]:
+        return {
+            'current_app': self.current_app,
+            'previous_app': self.previous_app,
+            'context_start_time': self.context_start_time,
+            'app_history': list(self.app_history),
+            'app_states': list(self.app_states.items()),
+        }
+
+    def flush(self) -> None:
+        if not self.state_path:
+            return
+        with self._lock:
+            if self._snapshot_timer is not None:
+                self._snapshot_timer.cancel()
+                self._snapshot_timer = None
+            data = self._snapshot_data()
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'), default=str)
+            os.replace(tmp_path, self.state_path)
+        except OSError:
+            pass
+
+    def _changed(self) -> None:
+        # Coalesce bursts of updates into one small write
+        if not self.state_path:
+            return
+        with self._lock:
+            if self._snapshot_timer is None:
+                self._snapshot_timer = threading.Timer(SNAPSHOT_DELAY, self.flush)
+                self._snapshot_timer.daemon = True
+                self._snapshot_timer.start()
+
+    def _touch_recent(self, app: str) -> None:
+        self.recent[app] = True
+        self.recent.move_to_end(app)
+        if len(self.recent) > HISTORY_SIZE:
+            self.recent.popitem(last=False)
+
+    def _state_for(self, app: str) -> Dict[str, Any]:
+        state = self.app_states.get(app)
+        if state is None:
+            state = self.app_states[app] = {}
+            if len(self.app_states) > MAX_APP_STATES:
+                self.app_states.popitem(last=False)
+        else:
+            self.app_states.move_to_end(app)
+        return state
+
     def set_context(self, app_name: str) -> bool:
         if app_name and app_name.strip():
             if self.current_app:
                 self.previous_app = self.current_app
-                
+
             self.current_app = app_name.strip().lower()
             self.context_start_time = time.time()
-            
+
             self.app_history.append({
                 'app': self.current_app,
                 'timestamp': self.context_start_time
             })
-            
-            if len(self.app_history) > 50:
-                self.app_history.pop(0)
-            
-            if self.current_app not in self.app_states:
-                self.app_states[self.current_app] = {}
-            
+            self._touch_recent(self.current_app)
+            self._state_for(self.current_app)
+            self._changed()
+
             print(f"🎯 Context switched to: {self.current_app}")
             return True
         return False
-    
+
     def get_current_context(self) -> Optional[str]:
         return self.current_app
-    
+
     def get_previous_context(self) -> Optional[str]:
         return self.previous_app
-    
+
     def clear_context(self) -> None:
         self.previous_app = self.current_app
         self.current_app = None
         self.context_start_time = None
+        self._changed()
         print("🎯 Context cleared")
-    
+
     def switch_to_previous(self) -> Optional[str]:
         if self.previous_app:
             temp = self.current_app
             self.current_app = self.previous_app
             self.previous_app = temp
             self.context_start_time = time.time()
+            self._changed()
             print(f"🎯 Switched back to: {self.current_app}")
             return self.current_app
         return None
-    
+
     def is_in_app_context(self) -> bool:
         return self.current_app is not None
-    
+
     def get_context_duration(self) -> Optional[float]:
         if self.context_start_time:
             return time.time() - self.context_start_time
         return None
-    
+
     def get_app_state(self, key: str) -> Any:
         if self.current_app and self.current_app in self.app_states:
-            return self.app_states[self.current_app].get(key)
+            return self._state_for(self.current_app).get(key)
         return None
-    
+
     def set_app_state(self, key: str, value: Any) -> bool:
         if self.current_app:
-            if self.current_app not in self.app_states:
-                self.app_states[self.current_app] = {}
-            self.app_states[self.current_app][key] = value
+            self._state_for(self.current_app)[key] = value
+            self._changed()
             return True
         return False
-    
+
     def get_recent_apps(self, count: int = 5) -> list:
         recent = []
-        seen = set()
-        
-        for entry in reversed(self.app_history):
-            app = entry['app']
-            if app not in seen:
-                recent.append(app)
-                seen.add(app)
+        for app in reversed(self.recent):
+            recent.append(app)
             if len(recent) >= count:
                 break
-        
         return recent
-    
+
     def get_context_info(self) -> Dict[str, Any]:
         return {
             'current_app': self.current_app,
@@ -97,4 +217,3 @@ class ContextManager:
             'in_context': self.is_in_app_context(),
             'recent_apps': self.get_recent_apps(5)
         }
-
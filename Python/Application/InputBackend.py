@@ -0,0 +1,393 @@
+import os
+import platform
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import pyautogui
+    PYAUTOGUI_AVAILABLE = True
+except Exception:
+    PYAUTOGUI_AVAILABLE = False
+
+try:
+    from Xlib import X, XK, display as xdisplay
+    from Xlib.ext import xtest
+    XK.load_keysym_group('xf86')
+    XTEST_AVAILABLE = True
+except ImportError:
+    XTEST_AVAILABLE = False
+
+try:
+    import pyperclip
+    PYPERCLIP_AVAILABLE = True
+except ImportError:
+    PYPERCLIP_AVAILABLE = False
+
+try:
+    from config import INPUT_BACKEND, INPUT_ACTION_DELAY, INPUT_TYPING_INTERVAL, CLIPBOARD_PASTE_THRESHOLD
+except ImportError:
+    INPUT_BACKEND = "auto"
+    INPUT_ACTION_DELAY = 0.05
+    INPUT_TYPING_INTERVAL = 0.0
+    CLIPBOARD_PASTE_THRESHOLD = 64
+
+from System.WindowList import active_window
+
+Action = Tuple[Any, ...]
+
+TERMINAL_HINTS = ('terminal', 'konsole', 'kitty', 'alacritty', 'xterm', 'tilix', 'wezterm', 'terminator')
+
+def _clipboard_commands() -> Optional[Tuple[List[str], List[str]]]:
+    system = platform.system()
+    if system == "Darwin":
+        return ['pbcopy'], ['pbpaste']
+    if system == "Linux":
+        if os.environ.get('WAYLAND_DISPLAY') and shutil.which('wl-copy'):
+            return ['wl-copy'], ['wl-paste', '--no-newline']
+        if shutil.which('xclip'):
+            return ['xclip', '-selection', 'clipboard'], ['xclip', '-selection', 'clipboard', '-o']
+        if shutil.which('xsel'):
+            return ['xsel', '--clipboard', '--input'], ['xsel', '--clipboard', '--output']
+    return None
+
+def clipboard_available() -> bool:
+    return PYPERCLIP_AVAILABLE or _clipboard_commands() is not None
+
+def get_clipboard() -> Optional[str]:
+    if PYPERCLIP_AVAILABLE:
+        try:
+            return pyperclip.paste()
+        except Exception:
+            return None
+    commands = _clipboard_commands()
+    if commands is None:
+        return None
+    try:
+        result = subprocess.run(commands[1], capture_output=True, text=True, timeout=1)
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+def set_clipboard(text: str) -> bool:
+    if PYPERCLIP_AVAILABLE:
+        try:
+            pyperclip.copy(text)
+            return True
+        except Exception:
+            return False
+    commands = _clipboard_commands()
+    if commands is None:
+        return False
+    try:
+        # xclip/wl-copy fork to keep serving the selection, so don't capture their output
+        result = subprocess.run(commands[0], input=text, text=True, timeout=2,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return False
+    return result.returncode == 0
+
+# Set while a paste is waiting to put the user's clipboard back. A second paste
+# inside that window keeps this value rather than saving the text just pasted.
+_restore_lock = threading.Lock()
+_restore_timer: Optional[threading.Timer] = None
+_restore_generation = 0
+_saved_clipboard: Optional[str] = None
+
+def _cancel_restore() -> Optional[str]:
+    """Drop the pending restore (call with ``_restore_lock`` held); returns the clipboard it was keeping."""
+    global _restore_timer, _saved_clipboard
+    previous = _saved_clipboard
+    if _restore_timer is not None:
+        _restore_timer.cancel()
+    _restore_timer, _saved_clipboard = None, None
+    return previous
+
+def _schedule_restore(previous: str, delay: float) -> None:
+    global _restore_timer, _restore_generation, _saved_clipboard
+    _restore_generation += 1
+    _saved_clipboard = previous
+    _restore_timer = threading.Timer(delay, _restore_clipboard, args=(_restore_generation,))
+    _restore_timer.daemon = True
+    _restore_timer.start()
+
+def _restore_clipboard(generation: int) -> None:
+    with _restore_lock:
+        if generation != _restore_generation:
+            return
+        previous = _cancel_restore()
+        if previous is not None:
+            set_clipboard(previous)
+
+class InputBackend:
+    """Keyboard injection with a configurable settle delay.
+
+    ``action_delay`` is slept once after each public call (or once after a
+    whole ``sequence``), replacing pyautogui's global ``PAUSE``. Text at or
+    above ``paste_threshold`` characters goes through the clipboard and a
+    single paste shortcut instead of being typed key by key.
+    """
+    name = 'base'
+    def __init__(self, action_delay: float = INPUT_ACTION_DELAY, typing_interval: float = INPUT_TYPING_INTERVAL,
+                 paste_threshold: int = CLIPBOARD_PASTE_THRESHOLD):
+        self.action_delay = action_delay
+        self.typing_interval = typing_interval
+        self.paste_threshold = paste_threshold
+        self.modifier = 'command' if platform.system() == 'Darwin' else 'ctrl'
+        self._captured: Optional[List[Action]] = None
+
+    @contextmanager
+    def capture(self):
+        """Collect the actions sent while the block runs (used for macro recording)."""
+        previous, self._captured = self._captured, []
+        try:
+            yield self._captured
+        finally:
+            if previous is not None:
+                previous.extend(self._captured)
+            self._captured = previous
+
+    def _record(self, action: Action) -> None:
+        if self._captured is not None:
+            self._captured.append(action)
+
+    def _press(self, key: str) -> None:
+        raise NotImplementedError
+
+    def _hotkey(self, keys: Sequence[str]) -> None:
+        raise NotImplementedError
+
+    def _write(self, text: str, interval: float) -> None:
+        raise NotImplementedError
+
+    def _can_type(self, text: str) -> bool:
+        return True
+
+    def _flush(self) -> None:
+        pass
+
+    def _settle(self) -> None:
+        if self.action_delay > 0:
+            time.sleep(self.action_delay)
+
+    def press(self, key: str, presses: int = 1) -> None:
+        for _ in range(presses):
+            self._press(key)
+            self._record(('press', key))
+        self._flush()
+        self._settle()
+
+    def hotkey(self, *keys: str) -> None:
+        self._hotkey(keys)
+        self._record(('hotkey',) + tuple(keys))
+        self._flush()
+        self._settle()
+
+    def write(self, text: str, interval: Optional[float] = None) -> None:
+        if not text:
+            return
+        self._type(text, self.typing_interval if interval is None else interval)
+        self._record(('write', text))
+        self._flush()
+        self._settle()
+
+    def _type(self, text: str, interval: float) -> None:
+        use_paste = not self._can_type(text) or (self.paste_threshold and len(text) >= self.paste_threshold)
+        if use_paste and self.paste(text):
+            return
+        self._write(text, interval)
+
+    def _paste_keys(self) -> Tuple[str, ...]:
+        window = active_window() if platform.system() == "Linux" else None
+        if window and any(hint in f"{window.get('wm_class', '')} {window.get('title', '')}".lower()
+                          for hint in TERMINAL_HINTS):
+            return ('ctrl', 'shift', 'v')
+        return (self.modifier, 'v')
+
+    def paste(self, text: str, restore: bool = True) -> bool:
+        """Paste ``text`` through the clipboard; False if no clipboard is reachable."""
+        if not clipboard_available():
+            return False
+        with _restore_lock:
+            previous = _cancel_restore()
+            if previous is None and restore:
+                previous = get_clipboard()
+            if not set_clipboard(text):
+                if previous is not None:
+                    set_clipboard(previous)
+                return False
+            self._hotkey(self._paste_keys())
+            self._flush()
+            if restore and previous is not None and previous != text:
+                # The target reads the clipboard asynchronously; restore once it has had time to read it
+                _schedule_restore(previous, 0.5)
+        return True
+
+    def sequence(self, actions: Iterable[Action]) -> None:
+        """Run a batch such as ``[('write', 'clear'), ('press', 'enter')]`` with one settle at the end."""
+        for action in actions:
+            kind, args = action[0], action[1:]
+            if kind == 'press':
+                self._press(args[0])
+            elif kind == 'hotkey':
+                self._hotkey(args)
+            elif kind == 'write':
+                self._flush()
+                self._type(args[0], self.typing_interval)
+            elif kind == 'sleep':
+                self._flush()
+                time.sleep(args[0])
+            else:
+                raise ValueError(f"Unknown input action: {kind}")
+            self._record(tuple(action))
+        self._flush()
+        self._settle()
+
+class PyAutoGUIBackend(InputBackend):
+    name = 'pyautogui'
+
+    def _press(self, key: str) -> None:
+        pyautogui.press(key, _pause=False)
+
+    def _hotkey(self, keys: Sequence[str]) -> None:
+        pyautogui.hotkey(*keys, _pause=False)
+
+    def _can_type(self, text: str) -> bool:
+        return text.isascii()
+
+    def _write(self, text: str, interval: float) -> None:
+        pyautogui.write(text, interval=interval, _pause=False)
+
+class XTestBackend(InputBackend):
+    """Synthesises key events with the XTEST extension on one X connection.
+
+    Events are queued and flushed once per call, so a paragraph becomes a
+    single round trip to the server. Characters with no keycode in the
+    current layout are pasted instead.
+    """
+    name = 'xtest'
+    KEY_NAMES = {
+        'ctrl': 'Control_L', 'ctrlleft': 'Control_L', 'ctrlright': 'Control_R',
+        'shift': 'Shift_L', 'shiftleft': 'Shift_L', 'shiftright': 'Shift_R',
+        'alt': 'Alt_L', 'altleft': 'Alt_L', 'altright': 'Alt_R',
+        'win': 'Super_L', 'winleft': 'Super_L', 'command': 'Super_L', 'super': 'Super_L',
+        'enter': 'Return', 'return': 'Return', 'tab': 'Tab', 'space': 'space',
+        'backspace': 'BackSpace', 'delete': 'Delete', 'del': 'Delete', 'insert': 'Insert',
+        'esc': 'Escape', 'escape': 'Escape',
+        'up': 'Up', 'down': 'Down', 'left': 'Left', 'right': 'Right',
+        'home': 'Home', 'end': 'End', 'pageup': 'Prior', 'pagedown': 'Next', 'pgup': 'Prior', 'pgdn': 'Next',
+        'capslock': 'Caps_Lock', 'printscreen': 'Print', 'prtsc': 'Print',
+        'volumeup': 'XF86_AudioRaiseVolume', 'volumedown': 'XF86_AudioLowerVolume', 'volumemute': 'XF86_AudioMute',
+        'playpause': 'XF86_AudioPlay', 'nexttrack': 'XF86_AudioNext', 'prevtrack': 'XF86_AudioPrev',
+        'stop': 'XF86_AudioStop',
+    }
+    CONTROL_CHARS = {'\n': 'Return', '\r': 'Return', '\t': 'Tab'}
+
+    def __init__(self, display=None, **kwargs):
+        super().__init__(**kwargs)
+        self.display = display or xdisplay.Display()
+        if not self.display.has_extension('XTEST'):
+            raise RuntimeError("X server has no XTEST extension")
+        self._keys = {}
+        self._shift = self.display.keysym_to_keycode(XK.string_to_keysym('Shift_L'))
+
+    def _char_keysym(self, char: str) -> int:
+        if char in self.CONTROL_CHARS:
+            return XK.string_to_keysym(self.CONTROL_CHARS[char])
+        code = ord(char)
+        if 0x20 <= code <= 0x7e or 0xa0 <= code <= 0xff:
+            return code
+        return 0x01000000 | code
+
+    def _key_keysym(self, key: str) -> int:
+        if len(key) == 1:
+            return self._char_keysym(key)
+        name = self.KEY_NAMES.get(key.lower())
+        if name is None and key.lower().startswith('f') and key[1:].isdigit():
+            name = key.upper()
+        return XK.string_to_keysym(name or key)
+
+    def _lookup(self, keysym: int) -> Optional[Tuple[int, bool]]:
+        if keysym not in self._keys:
+            found = None
+            for keycode, index in self.display.keysym_to_keycodes(keysym):
+                if index in (0, 1):
+                    found = (keycode, index == 1)
+                    break
+            self._keys[keysym] = found
+        return self._keys[keysym]
+
+    def _key(self, key: str) -> Tuple[int, bool]:
+        found = self._lookup(self._key_keysym(key))
+        if found is None:
+            raise ValueError(f"No keycode for key: {key}")
+        return found
+
+    def _tap(self, keycode: int, shift: bool) -> None:
+        if shift:
+            xtest.fake_input(self.display, X.KeyPress, self._shift)
+        xtest.fake_input(self.display, X.KeyPress, keycode)
+        xtest.fake_input(self.display, X.KeyRelease, keycode)
+        if shift:
+            xtest.fake_input(self.display, X.KeyRelease, self._shift)
+
+    def _press(self, key: str) -> None:
+        self._tap(*self._key(key))
+
+    def _hotkey(self, keys: Sequence[str]) -> None:
+        resolved = [self._key(key) for key in keys]
+        pressed = []
+        for keycode, shift in resolved:
+            if shift and self._shift not in pressed:
+                xtest.fake_input(self.display, X.KeyPress, self._shift)
+                pressed.append(self._shift)
+            xtest.fake_input(self.display, X.KeyPress, keycode)
+            pressed.append(keycode)
+        for keycode in reversed(pressed):
+            xtest.fake_input(self.display, X.KeyRelease, keycode)
+
+    def _can_type(self, text: str) -> bool:
+        return all(self._lookup(self._char_keysym(char)) is not None for char in text)
+
+    def _write(self, text: str, interval: float) -> None:
+        for char in text:
+            found = self._lookup(self._char_keysym(char))
+            if found is None:
+                continue
+            self._tap(*found)
+            if interval > 0:
+                self._flush()
+                time.sleep(interval)
+
+    def _flush(self) -> None:
+        self.display.sync()
+
+def create_input_backend(name: str = INPUT_BACKEND, **kwargs) -> InputBackend:
+    """Build a backend by name: 'xtest', 'pyautogui' or 'auto' (XTEST where possible)."""
+    name = (name or 'auto').lower()
+    if name in ('auto', 'xtest') and XTEST_AVAILABLE and platform.system() == "Linux" and os.environ.get('DISPLAY'):
+        try:
+            return XTestBackend(**kwargs)
+        except Exception as e:
+            if name == 'xtest':
+                raise
+            print(f"⚠️ XTEST input unavailable ({e}), using pyautogui")
+    elif name == 'xtest':
+        raise RuntimeError("XTEST input needs python-xlib and an X display")
+    if not PYAUTOGUI_AVAILABLE:
+        raise RuntimeError("No input backend available (install pyautogui or python-xlib)")
+    return PyAutoGUIBackend(**kwargs)
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def get_input_backend() -> InputBackend:
+    """Process-wide backend, so the X connection is opened once."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_input_backend()
+        return _backend
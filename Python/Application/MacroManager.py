@@ -0,0 +1,147 @@
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+def default_macro_path() -> Path:
+    config_home = os.environ.get('XDG_CONFIG_HOME') or os.environ.get('APPDATA')
+    base = Path(config_home) if config_home else Path.home() / '.config'
+    return base / 'either_assistant' / 'macros.json'
+
+CONTROL_PATTERNS = [
+    ('start', re.compile(r'^(?:start\s+)?record(?:ing)?\s+(?:a\s+)?macro\s+(?:called\s+|named\s+)?(.+)$')),
+    ('stop', re.compile(r'^(?:stop|end|finish)\s+(?:the\s+)?(?:recording|macro)(?:\s+.*)?$|^save\s+(?:the\s+)?macro$')),
+    ('cancel', re.compile(r'^(?:cancel|discard)\s+(?:the\s+)?(?:recording|macro)$')),
+    ('run', re.compile(r'^(?:run|play|replay|execute)\s+(?:the\s+)?macro\s+(.+)$')),
+    ('delete', re.compile(r'^(?:delete|remove|forget)\s+(?:the\s+)?macro\s+(.+)$')),
+    ('list', re.compile(r'^(?:list|show)\s+(?:all\s+|my\s+)?macros$')),
+]
+
+# Actions that only produce a reply or list; replaying them adds nothing
+UNRECORDED_ACTIONS = {'conversation', 'list_apps', 'unknown', 'clear_context'}
+
+def normalize_macro_name(name: str) -> str:
+    return ' '.join(name.lower().strip().rstrip('.,!?;:').split())
+
+class MacroManager:
+    """Named, persisted sequences of resolved command JSON.
+
+    While recording, every command the assistant executes successfully is
+    stored as the action JSON Gemini resolved it to. ``app_command`` steps
+    also keep the key events they sent, so a replay can go straight to the
+    input backend without parsing or command lookup.
+    """
+    def __init__(self, macro_path: Optional[Path] = None):
+        self.macro_path = Path(macro_path) if macro_path else default_macro_path()
+        self.macros: Dict[str, Dict[str, Any]] = {}
+        self.recording_name: Optional[str] = None
+        self.recording_steps: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with open(self.macro_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.macros = data.get('macros', {})
+        except (OSError, ValueError):
+            self.macros = {}
+
+    def save(self) -> None:
+        with self._lock:
+            data = {'macros': self.macros}
+        try:
+            self.macro_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.macro_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.macro_path)
+        except OSError as e:
+            print(f"⚠️ Could not save macros: {e}")
+
+    def parse_control(self, text: str) -> Optional[Tuple[str, Optional[str]]]:
+        """Recognise macro voice commands; returns ``(operation, name)`` or None."""
+        text = normalize_macro_name(text)
+        for operation, pattern in CONTROL_PATTERNS:
+            match = pattern.match(text)
+            if match:
+                name = match.group(1) if match.groups() else None
+                return operation, normalize_macro_name(name) if name else None
+        if text in self.macros:
+            return 'run', text
+        return None
+
+    @property
+    def is_recording(self) -> bool:
+        return self.recording_name is not None
+
+    def start_recording(self, name: str) -> bool:
+        name = normalize_macro_name(name)
+        if not name:
+            return False
+        with self._lock:
+            self.recording_name = name
+            self.recording_steps = []
+        print(f"⏺️ Recording macro: {name}")
+        return True
+
+    def record_step(self, command_json: Dict[str, Any], app: Optional[str] = None,
+                    keys: Optional[List[Tuple[Any, ...]]] = None) -> bool:
+        if not self.is_recording or command_json.get('action', 'unknown') in UNRECORDED_ACTIONS:
+            return False
+        step = dict(command_json)
+        if app:
+            step['app'] = app
+        if keys:
+            step['keys'] = [list(action) for action in keys]
+        with self._lock:
+            self.recording_steps.append(step)
+        print(f"⏺️ Recorded step {len(self.recording_steps)}: {step.get('action')}")
+        return True
+
+    def stop_recording(self) -> Optional[str]:
+        with self._lock:
+            name, steps = self.recording_name, self.recording_steps
+            self.recording_name = None
+            self.recording_steps = []
+            if not name or not steps:
+                return None
+            self.macros[name] = {'steps': steps, 'created': time.time()}
+        self.save()
+        print(f"💾 Saved macro '{name}' ({len(steps)} steps)")
+        return name
+
+    def cancel_recording(self) -> bool:
+        with self._lock:
+            was_recording = self.recording_name is not None
+            self.recording_name = None
+            self.recording_steps = []
+        return was_recording
+
+    def get(self, name: str) -> Optional[List[Dict[str, Any]]]:
+        macro = self.macros.get(normalize_macro_name(name))
+        return macro['steps'] if macro else None
+
+    def delete(self, name: str) -> bool:
+        with self._lock:
+            removed = self.macros.pop(normalize_macro_name(name), None) is not None
+        if removed:
+            self.save()
+        return removed
+
+    def list_macros(self) -> List[str]:
+        return sorted(self.macros)
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_macro_manager() -> MacroManager:
+    """Process-wide manager; recording has to survive across commands."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = MacroManager()
+        return _manager
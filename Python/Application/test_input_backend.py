@@ -0,0 +1,152 @@
+
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import Application.InputBackend as input_backend
+from Application.InputBackend import XTEST_AVAILABLE, InputBackend
+
+PARAGRAPH = ("The quick brown fox jumps over the lazy dog; meanwhile, 42 developers "
+             "rewrite the parser (again) and ship it before lunch! ") * 4
+
+def _start_xvfb():
+    """Start a private Xvfb and return (process, display name), or None if it didn't come up."""
+    display_name = ':97'
+    process = subprocess.Popen(['Xvfb', display_name, '-screen', '0', '1024x768x24', '-nolisten', 'tcp'],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    from Xlib import display as xdisplay
+    for _ in range(50):
+        try:
+            xdisplay.Display(display_name).close()
+            return process, display_name
+        except Exception:
+            time.sleep(0.1)
+    process.terminate()
+    return None
+
+def _focused_window(display):
+    from Xlib import X
+    root = display.screen().root
+    window = root.create_window(0, 0, 200, 100, 0, display.screen().root_depth,
+                                event_mask=X.KeyPressMask | X.KeyReleaseMask)
+    window.map()
+    display.sync()
+    window.set_input_focus(X.RevertToParent, X.CurrentTime)
+    display.sync()
+    return window
+
+def _count_key_presses(display, timeout=2.0):
+    from Xlib import X
+    presses = 0
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        while display.pending_events():
+            if display.next_event().type == X.KeyPress:
+                presses += 1
+        time.sleep(0.02)
+        if not display.pending_events():
+            break
+    return presses
+
+def _with_xvfb(test):
+    def run():
+        pytest.importorskip("Xlib")
+        if not XTEST_AVAILABLE:
+            pytest.skip("needs the XTEST extension from python-xlib")
+        if not shutil.which('Xvfb'):
+            pytest.skip("needs Xvfb")
+        started = _start_xvfb()
+        if started is None:
+            pytest.skip("Xvfb did not start")
+        process, display_name = started
+        old_display = os.environ.get('DISPLAY')
+        os.environ['DISPLAY'] = display_name
+        try:
+            test(display_name)
+        finally:
+            if old_display is None:
+                os.environ.pop('DISPLAY', None)
+            else:
+                os.environ['DISPLAY'] = old_display
+            process.terminate()
+            process.wait()
+    run.__name__ = test.__name__
+    return run
+
+@_with_xvfb
+def test_xtest_types_paragraph_quickly(display_name):
+    from Xlib import display as xdisplay
+    from Application.InputBackend import XTestBackend
+    reader = xdisplay.Display(display_name)
+    _focused_window(reader)
+    backend = XTestBackend(display=xdisplay.Display(display_name), action_delay=0.0, paste_threshold=0)
+    start = time.perf_counter()
+    backend.write(PARAGRAPH)
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.25, f"typing {len(PARAGRAPH)} chars took {elapsed:.3f}s"
+    assert _count_key_presses(reader) >= len(PARAGRAPH)
+    print(f"✓ XTEST typed {len(PARAGRAPH)} chars in {elapsed * 1000:.1f} ms")
+
+@_with_xvfb
+def test_sequence_settles_once(display_name):
+    from Xlib import display as xdisplay
+    from Application.InputBackend import XTestBackend
+    reader = xdisplay.Display(display_name)
+    _focused_window(reader)
+    backend = XTestBackend(display=xdisplay.Display(display_name), action_delay=0.2, paste_threshold=0)
+    actions = [('hotkey', 'ctrl', 'a')] + [('press', 'right')] * 20 + [('write', 'clear'), ('press', 'enter')]
+    start = time.perf_counter()
+    backend.sequence(actions)
+    elapsed = time.perf_counter() - start
+    assert 0.2 <= elapsed < 0.35, f"sequence took {elapsed:.3f}s"
+    assert _count_key_presses(reader) == 2 + 20 + len('clear') + 1
+    print(f"✓ {len(actions)} batched actions in {elapsed * 1000:.1f} ms")
+
+@_with_xvfb
+def test_action_delay_is_configurable(display_name):
+    from Xlib import display as xdisplay
+    from Application.InputBackend import XTestBackend
+    backend = XTestBackend(display=xdisplay.Display(display_name), action_delay=0.0)
+    start = time.perf_counter()
+    for _ in range(10):
+        backend.hotkey('ctrl', 's')
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.1, f"10 hotkeys took {elapsed:.3f}s"
+    print(f"✓ 10 hotkeys with no settle delay in {elapsed * 1000:.1f} ms")
+
+class KeylessBackend(InputBackend):
+    def __init__(self):
+        super().__init__(action_delay=0.0)
+        self.pastes = 0
+    def _hotkey(self, keys):
+        self.pastes += 1
+
+def test_back_to_back_pastes_restore_the_original_clipboard(monkeypatch):
+    clipboard = ["user's text"]
+    monkeypatch.setattr(input_backend, 'clipboard_available', lambda: True)
+    monkeypatch.setattr(input_backend, 'get_clipboard', lambda: clipboard[0])
+    monkeypatch.setattr(input_backend, 'set_clipboard', lambda text: clipboard.__setitem__(0, text) or True)
+    backend = KeylessBackend()
+    monkeypatch.setattr(backend, '_paste_keys', lambda: ('ctrl', 'v'))
+    assert backend.paste("first dictation")
+    assert backend.paste("second dictation")
+    assert clipboard[0] == "second dictation" and backend.pastes == 2
+    time.sleep(0.7)
+    assert clipboard[0] == "user's text"
+
+if __name__ == "__main__":
+    for test in (test_xtest_types_paragraph_quickly, test_sequence_settles_once, test_action_delay_is_configurable):
+        try:
+            test()
+        except pytest.skip.Exception as e:
+            print(f"⚠️ Skipping {test.__name__}: {e}")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_back_to_back_pastes_restore_the_original_clipboard(monkeypatch)
+    print("✅ InputBackend tests passed")
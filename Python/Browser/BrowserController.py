@@ -7,11 +7,20 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 import time
 import re
+from Browser.DomIndex import get_dom_index
+from Browser.Prefetcher import get_prefetcher
+from Browser.TabRegistry import get_tab_registry
+from Browser.PageActions import get_page_actions
 
 class BrowserController:
-    def __init__(self, driver):
+    INDEXED_KINDS = {'link', 'video', 'button'}
+    def __init__(self, driver, dom_index=None):
         self.driver = driver
         self.wait = WebDriverWait(driver, 10)
+        self.dom_index = dom_index or get_dom_index(driver)
+        self.prefetcher = get_prefetcher(driver)
+        self.tabs = get_tab_registry(driver)
+        self.actions = get_page_actions(driver)
     
     def _ensure_valid_window(self):
         """Ensure we're on a valid window, switch if current is closed"""
@@ -25,6 +34,7 @@ class BrowserController:
                 handles = self.driver.window_handles
                 if handles:
                     self.driver.switch_to.window(handles[0])
+                    self.tabs.sync()
                     print("⚠️  Previous window was closed. Switched to available window.")
                     return True
                 else:
@@ -33,9 +43,23 @@ class BrowserController:
             except Exception as e:
                 print(f"❌ Cannot recover from closed window: {e}")
                 return False
+    def _click_prefetched(self, kind, n):
+        targets = self.prefetcher.targets(kind)
+        if not targets or len(targets) < n:
+            return False
+        try:
+            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", targets[n - 1])
+            targets[n - 1].click()
+            return True
+        except Exception:
+            self.prefetcher.invalidate()
+            return False
     def click_first_link(self):
         try:
             print("🖱️  Clicking first link...")
+            if self._click_prefetched('link', 1):
+                print("✓ Clicked first result!")
+                return True
             selectors = [
                 "a[href]",
                 "div[role='link']",
@@ -43,7 +67,11 @@ class BrowserController:
             ]
             for selector in selectors:
                 try:
-                    links = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                    if selector == "a[href]":
+                        first = self.dom_index.nth('link', 1)
+                        links = [first] if first else []
+                    else:
+                        links = self.driver.find_elements(By.CSS_SELECTOR, selector)
                     if links:
                         first_link = links[0]
                         self.driver.execute_script("arguments[0].scrollIntoView();", first_link)
@@ -68,8 +96,19 @@ class BrowserController:
                 'image': "img",
                 'result': "div.g, div.result, div[data-testid='result']",
             }
-            selector = selectors.get(element_type.lower(), "a[href]")
-            elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+            kind = element_type.lower() if element_type.lower() in selectors else 'link'
+            if kind in self.prefetcher.KINDS and self._click_prefetched(kind, n):
+                print(f"✓ Clicked {n}th {element_type}!")
+                return True
+            elements = None
+            if kind in self.INDEXED_KINDS:
+                try:
+                    items = self.dom_index.snapshot(kind, limit=n, visible=False, with_text=False)
+                    elements = [item['element'] for item in items]
+                except Exception:
+                    elements = None
+            if elements is None:
+                elements = self.driver.find_elements(By.CSS_SELECTOR, selectors[kind])
             if len(elements) >= n:
                 target = elements[n - 1]
                 self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", target)
@@ -86,18 +125,7 @@ class BrowserController:
     def scroll_down(self, amount="medium"):
         try:
             print("📜 Scrolling down...")
-            scroll_amounts = {
-                'small': 300,
-                'medium': 600,
-                'large': 1000,
-                'page': 'window.innerHeight',
-            }
-            pixels = scroll_amounts.get(amount, 600)
-            if isinstance(pixels, str):
-                self.driver.execute_script(f"window.scrollBy(0, {pixels});")
-            else:
-                self.driver.execute_script(f"window.scrollBy(0, {pixels});")
-            time.sleep(0.5)
+            self.actions.scroll(amount, 1)
             print("✓ Scrolled down!")
             return True
         except Exception as e:
@@ -106,18 +134,7 @@ class BrowserController:
     def scroll_up(self, amount="medium"):
         try:
             print("📜 Scrolling up...")
-            scroll_amounts = {
-                'small': 300,
-                'medium': 600,
-                'large': 1000,
-                'page': 'window.innerHeight',
-            }
-            pixels = scroll_amounts.get(amount, 600)
-            if isinstance(pixels, str):
-                self.driver.execute_script(f"window.scrollBy(0, -{pixels});")
-            else:
-                self.driver.execute_script(f"window.scrollBy(0, -{pixels});")
-            time.sleep(0.5)
+            self.actions.scroll(amount, -1)
             print("✓ Scrolled up!")
             return True
         except Exception as e:
@@ -143,27 +160,12 @@ class BrowserController:
     def close_popup(self):
         try:
             print("❌ Closing popup...")
-            close_selectors = [
-                "button[aria-label*='close' i]",
-                "button[title*='close' i]",
-                "[class*='close' i]",
-                "button.close",
-                "div[role='button'][aria-label*='close' i]",
-                "svg[aria-label='Close']",
-            ]
-            for selector in close_selectors:
-                try:
-                    close_btn = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    close_btn.click()
-                    time.sleep(0.5)
-                    print("✓ Popup closed!")
-                    return True
-                except:
-                    continue
+            if self.actions.close_popup():
+                print("✓ Popup closed!")
+                return True
             try:
                 actions = ActionChains(self.driver)
                 actions.send_keys(Keys.ESCAPE).perform()
-                time.sleep(0.5)
                 print("✓ Pressed Escape key!")
                 return True
             except:
@@ -176,10 +178,9 @@ class BrowserController:
     def volume_up(self):
         try:
             print("🔊 Increasing volume...")
-            video = self.driver.find_element(By.TAG_NAME, "video")
-            current_volume = self.driver.execute_script("return arguments[0].volume;", video)
-            new_volume = min(current_volume + 0.1, 1.0)
-            self.driver.execute_script(f"arguments[0].volume = {new_volume};", video)
+            new_volume = self.actions.volume(0.1)
+            if new_volume is None:
+                raise NoSuchElementException("no video on this page")
             print(f"✓ Volume increased to {int(new_volume * 100)}%")
             return True
         except Exception as e:
@@ -194,10 +195,9 @@ class BrowserController:
     def volume_down(self):
         try:
             print("🔉 Decreasing volume...")
-            video = self.driver.find_element(By.TAG_NAME, "video")
-            current_volume = self.driver.execute_script("return arguments[0].volume;", video)
-            new_volume = max(current_volume - 0.1, 0.0)
-            self.driver.execute_script(f"arguments[0].volume = {new_volume};", video)
+            new_volume = self.actions.volume(-0.1)
+            if new_volume is None:
+                raise NoSuchElementException("no video on this page")
             print(f"✓ Volume decreased to {int(new_volume * 100)}%")
             return True
         except Exception as e:
@@ -236,16 +236,15 @@ class BrowserController:
             try:
                 words = text_clean.split()
                 if len(words) > 1:
-                    links = self.driver.find_elements(By.CSS_SELECTOR, "a[href]")
+                    links = self.dom_index.snapshot('link', visible=True, with_text=True)
                     for link in links:
                         try:
-                            if link.is_displayed():
-                                link_text = link.text.lower()
-                                matches = sum(1 for word in words if word in link_text)
-                                if matches >= min(2, len(words)):
-                                    self.driver.execute_script("arguments[0].click();", link)
-                                    print(f"✓ Clicked (partial match): {link.text.strip()}")
-                                    return True
+                            link_text = link['text'].lower()
+                            matches = sum(1 for word in words if word in link_text)
+                            if matches >= min(2, len(words)):
+                                self.driver.execute_script("arguments[0].click();", link['element'])
+                                print(f"✓ Clicked (partial match): {link['text']}")
+                                return True
                         except:
                             continue
             except:
@@ -266,41 +265,7 @@ class BrowserController:
             return False
     def highlight_element(self, element):
         try:
-            css = """
-            @keyframes pulse-circle {
-                0% {
-                    box-shadow: 0 0 0 0 rgba(255, 0, 0, 0.7),
-                                0 0 0 0 rgba(255, 0, 0, 0.7);
-                }
-                50% {
-                    box-shadow: 0 0 0 15px rgba(255, 0, 0, 0),
-                                0 0 0 30px rgba(255, 0, 0, 0);
-                }
-                100% {
-                    box-shadow: 0 0 0 0 rgba(255, 0, 0, 0),
-                                0 0 0 0 rgba(255, 0, 0, 0);
-                }
-            }
-            .ai-highlight {
-                animation: pulse-circle 2s infinite !important;
-                border: 3px solid red !important;
-                border-radius: 8px !important;
-                padding: 5px !important;
-                transition: all 0.3s ease !important;
-            }
-            """
-            self.driver.execute_script(f"""
-                if (!document.getElementById('ai-highlight-style')) {{
-                    var style = document.createElement('style');
-                    style.id = 'ai-highlight-style';
-                    style.textContent = `{css}`;
-                    document.head.appendChild(style);
-                }}
-            """)
-            self.driver.execute_script("""
-                arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});
-                arguments[0].classList.add('ai-highlight');
-            """, element)
+            self.actions.highlight(element)
             print("✨ Element highlighted with animation!")
             return True
         except Exception as e:
@@ -308,16 +273,7 @@ class BrowserController:
             return False
     def remove_highlight(self, element=None):
         try:
-            if element:
-                self.driver.execute_script("""
-                    arguments[0].classList.remove('ai-highlight');
-                """, element)
-            else:
-                self.driver.execute_script("""
-                    document.querySelectorAll('.ai-highlight').forEach(el => {
-                        el.classList.remove('ai-highlight');
-                    });
-                """)
+            self.actions.unhighlight(element)
             return True
         except:
             return False
@@ -374,6 +330,7 @@ class BrowserController:
             # Switch to new tab
             new_handles = self.driver.window_handles
             new_tab = [h for h in new_handles if h not in original_handles][0]
+            self.tabs.opened(new_tab, url)
             self.driver.switch_to.window(new_tab)
             
             if url:
@@ -400,9 +357,9 @@ class BrowserController:
     def switch_to_tab(self, tab_index):
         """Switch to a specific tab by index (1-based)"""
         try:
-            handles = self.driver.window_handles
+            handles = self.tabs.handles()
             if 0 < tab_index <= len(handles):
-                self.driver.switch_to.window(handles[tab_index - 1])
+                self.tabs.activate(handles[tab_index - 1])
                 print(f"✓ Switched to tab {tab_index}")
                 return True
             else:
@@ -416,9 +373,9 @@ class BrowserController:
         """Switch to the first tab"""
         try:
             print("📑 Switching to first tab...")
-            handles = self.driver.window_handles
+            handles = self.tabs.handles()
             if handles:
-                self.driver.switch_to.window(handles[0])
+                self.tabs.activate(handles[0])
                 print("✓ Switched to first tab!")
                 return True
             return False
@@ -430,9 +387,9 @@ class BrowserController:
         """Switch to the last tab"""
         try:
             print("📑 Switching to last tab...")
-            handles = self.driver.window_handles
+            handles = self.tabs.handles()
             if handles:
-                self.driver.switch_to.window(handles[-1])
+                self.tabs.activate(handles[-1])
                 print("✓ Switched to last tab!")
                 return True
             return False
@@ -444,12 +401,11 @@ class BrowserController:
         """Switch to the next tab (wraps around)"""
         try:
             print("📑 Switching to next tab...")
-            handles = self.driver.window_handles
-            current_handle = self.driver.current_window_handle
-            current_index = handles.index(current_handle)
-            next_index = (current_index + 1) % len(handles)
-            self.driver.switch_to.window(handles[next_index])
-            print(f"✓ Switched to next tab (tab {next_index + 1})")
+            handle = self.tabs.relative(1)
+            if handle is None:
+                return False
+            self.tabs.activate(handle)
+            print(f"✓ Switched to next tab (tab {self.tabs.handles().index(handle) + 1})")
             return True
         except Exception as e:
             print(f"✗ Switch to next tab failed: {e}")
@@ -459,12 +415,11 @@ class BrowserController:
         """Switch to the previous tab (wraps around)"""
         try:
             print("📑 Switching to previous tab...")
-            handles = self.driver.window_handles
-            current_handle = self.driver.current_window_handle
-            current_index = handles.index(current_handle)
-            prev_index = (current_index - 1) % len(handles)
-            self.driver.switch_to.window(handles[prev_index])
-            print(f"✓ Switched to previous tab (tab {prev_index + 1})")
+            handle = self.tabs.relative(-1)
+            if handle is None:
+                return False
+            self.tabs.activate(handle)
+            print(f"✓ Switched to previous tab (tab {self.tabs.handles().index(handle) + 1})")
             return True
         except Exception as e:
             print(f"✗ Switch to previous tab failed: {e}")
@@ -474,12 +429,11 @@ class BrowserController:
         """Close the current tab and switch to the next one"""
         try:
             print("❌ Closing current tab...")
-            handles = self.driver.window_handles
+            handles = self.tabs.handles()
             if len(handles) > 1:
-                self.driver.close()
+                self.tabs.close(self.tabs.current_handle())
                 # Switch to the first available tab
-                remaining_handles = self.driver.window_handles
-                self.driver.switch_to.window(remaining_handles[0])
+                self.tabs.activate(self.tabs.handles()[0])
                 print("✓ Tab closed!")
                 return True
             else:
@@ -493,15 +447,13 @@ class BrowserController:
         """Close all tabs except the current one"""
         try:
             print("❌ Closing all other tabs...")
-            current_handle = self.driver.current_window_handle
-            all_handles = self.driver.window_handles
+            current_handle = self.tabs.current_handle()
             
-            for handle in all_handles:
+            for handle in self.tabs.handles():
                 if handle != current_handle:
-                    self.driver.switch_to.window(handle)
-                    self.driver.close()
+                    self.tabs.close(handle)
             
-            self.driver.switch_to.window(current_handle)
+            self.tabs.activate(current_handle)
             print("✓ All other tabs closed!")
             return True
         except Exception as e:
@@ -513,18 +465,16 @@ class BrowserController:
         try:
             print("\n📑 Open Tabs:")
             print("=" * 70)
-            handles = self.driver.window_handles
-            current_handle = self.driver.current_window_handle
+            tabs = self.tabs.list()
+            current_handle = self.tabs.current_handle()
             
-            for i, handle in enumerate(handles, 1):
-                self.driver.switch_to.window(handle)
-                title = self.driver.title or "(No title)"
+            for i, (handle, title, url) in enumerate(tabs, 1):
+                title = title or url or "(No title)"
                 current_marker = " ← Current" if handle == current_handle else ""
                 print(f"  {i}. {title}{current_marker}")
             
-            self.driver.switch_to.window(current_handle)
             print("=" * 70)
-            print(f"Total tabs: {len(handles)}\n")
+            print(f"Total tabs: {len(tabs)}\n")
             return True
         except Exception as e:
             print(f"✗ List tabs failed: {e}")
@@ -551,6 +501,7 @@ class BrowserController:
             # Switch to new window
             new_handles = self.driver.window_handles
             new_window = [h for h in new_handles if h not in original_handles][0]
+            self.tabs.opened(new_window, url)
             self.driver.switch_to.window(new_window)
             
             if url:
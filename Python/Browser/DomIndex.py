@@ -0,0 +1,198 @@
+import time
+import weakref
+from Browser.PageScript import PageScript
+from Metrics import record_cache
+
+DOM_INDEX_JS = r"""
+(function () {
+    if (window.__eitherDomIndex) { return; }
+    var KINDS = {
+        link: 'a[href]',
+        button: 'button',
+        input: 'input:not([type="hidden"]), textarea, select',
+        video: 'video, ytd-video-renderer, ytd-grid-video-renderer',
+        heading: 'h1, h2, h3'
+    };
+    var sets = {};
+    var ordered = {};
+    var index = {
+        id: Math.random().toString(36).slice(2),
+        version: 0
+    };
+    for (var k in KINDS) { sets[k] = new Set(); ordered[k] = null; }
+
+    function addTree(node) {
+        if (!node || node.nodeType !== 1) { return false; }
+        var changed = false;
+        for (var kind in KINDS) {
+            var selector = KINDS[kind];
+            var kindChanged = false;
+            if (node.matches(selector)) { sets[kind].add(node); kindChanged = true; }
+            if (node.firstElementChild) {
+                var found = node.querySelectorAll(selector);
+                for (var i = 0; i < found.length; i++) { sets[kind].add(found[i]); }
+                if (found.length) { kindChanged = true; }
+            }
+            if (kindChanged) { ordered[kind] = null; changed = true; }
+        }
+        return changed;
+    }
+    function invalidate() {
+        for (var kind in KINDS) { ordered[kind] = null; }
+    }
+    function orderedList(kind) {
+        var list = ordered[kind];
+        if (list) { return list; }
+        list = [];
+        sets[kind].forEach(function (el) {
+            if (el.isConnected) { list.push(el); } else { sets[kind].delete(el); }
+        });
+        list.sort(function (a, b) {
+            return (a.compareDocumentPosition(b) & Node.DOCUMENT_POSITION_FOLLOWING) ? -1 : 1;
+        });
+        ordered[kind] = list;
+        return list;
+    }
+    function isVisible(el) {
+        if (!el.getClientRects().length) { return false; }
+        var style = window.getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.display !== 'none';
+    }
+    function describe(el) {
+        return {
+            element: el,
+            text: (el.innerText || el.textContent || '').trim(),
+            href: el.href || null,
+            title: el.getAttribute('title'),
+            tag: el.tagName.toLowerCase()
+        };
+    }
+
+    index.state = function () {
+        return {id: index.id, version: index.version, url: location.href};
+    };
+    index.snapshot = function (kind, opts) {
+        opts = opts || {};
+        var list = orderedList(kind);
+        if (opts.scan) { list = list.slice(0, opts.scan); }
+        var items = [];
+        for (var i = 0; i < list.length; i++) {
+            var el = list[i];
+            if (opts.visible && !isVisible(el)) { continue; }
+            var item = describe(el);
+            if (opts.withText && !item.text) { continue; }
+            items.push(item);
+            if (opts.limit && items.length >= opts.limit) { break; }
+        }
+        var state = index.state();
+        state.items = items;
+        return state;
+    };
+    index.find = function (text, kinds) {
+        var needle = (text || '').toLowerCase();
+        for (var k = 0; k < kinds.length; k++) {
+            var list = orderedList(kinds[k]);
+            for (var i = 0; i < list.length; i++) {
+                var el = list[i];
+                var elText = (el.innerText || '').toLowerCase();
+                if (elText.indexOf(needle) !== -1 && isVisible(el)) { return describe(el); }
+            }
+        }
+        return null;
+    };
+
+    var observer = new MutationObserver(function (records) {
+        var changed = false;
+        for (var i = 0; i < records.length; i++) {
+            var record = records[i];
+            if (record.type === 'childList') {
+                for (var a = 0; a < record.addedNodes.length; a++) {
+                    if (addTree(record.addedNodes[a])) { changed = true; }
+                }
+                if (record.removedNodes.length) { invalidate(); changed = true; }
+            } else if (record.type === 'attributes') {
+                addTree(record.target);
+                invalidate();
+                changed = true;
+            } else {
+                changed = true;
+            }
+        }
+        if (changed) { index.version++; }
+    });
+    observer.observe(document, {
+        childList: true,
+        subtree: true,
+        characterData: true,
+        attributes: true,
+        attributeFilter: ['href', 'hidden', 'aria-hidden', 'type', 'disabled']
+    });
+    if (document.documentElement) { addTree(document.documentElement); }
+    window.__eitherDomIndex = index;
+})();
+"""
+
+_indexes = weakref.WeakKeyDictionary()
+
+class DomIndex:
+    MAX_SNAPSHOT_AGE = 5.0
+    def __init__(self, driver):
+        self.driver = driver
+        self.script = PageScript(driver, '__eitherDomIndex', DOM_INDEX_JS)
+        self._cache = {}
+    def get_state(self):
+        try:
+            state = self.script.peek("o.state()")
+        except Exception:
+            return None
+        if not state:
+            return None
+        return (state.get('id'), state.get('version'), state.get('url'))
+    def snapshot(self, kind, scan=None, limit=None, visible=True, with_text=True):
+        key = (kind, scan, limit, visible, with_text)
+        start = time.perf_counter()
+        cached = self._cache.get(key)
+        if cached and time.time() - cached['time'] < self.MAX_SNAPSHOT_AGE:
+            if self.get_state() == cached['state']:
+                record_cache('dom_index', True, time.perf_counter() - start)
+                return cached['items']
+        record_cache('dom_index', False)
+        result = self.script.call('snapshot', kind, {
+            'scan': scan,
+            'limit': limit,
+            'visible': visible,
+            'withText': with_text,
+        })
+        if not result:
+            return []
+        items = result.get('items') or []
+        self._cache[key] = {
+            'state': (result.get('id'), result.get('version'), result.get('url')),
+            'items': items,
+            'time': time.time(),
+        }
+        return items
+    def nth(self, kind, n, visible=False):
+        items = self.snapshot(kind, scan=None, limit=n, visible=visible, with_text=False)
+        if len(items) >= n:
+            return items[n - 1]['element']
+        return None
+    def count(self, kind, visible=False):
+        return len(self.snapshot(kind, visible=visible, with_text=False))
+    def find_text(self, text, kinds=('link', 'button')):
+        try:
+            return self.script.call('find', text, list(kinds))
+        except Exception:
+            return None
+    def invalidate(self):
+        self._cache.clear()
+
+def get_dom_index(driver):
+    try:
+        index = _indexes.get(driver)
+        if index is None:
+            index = DomIndex(driver)
+            _indexes[driver] = index
+        return index
+    except TypeError:
+        return DomIndex(driver)
@@ -1,6 +1,5 @@
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
@@ -15,6 +14,9 @@ from Browser.MediaPlayer import MediaPlayer
 from Browser.ResearchDownloader import ResearchDownloader
 from Browser.BrowserController import BrowserController
 from Browser.PageReader import PageReader
+from Browser.DomIndex import get_dom_index
+from Browser.Prefetcher import get_prefetcher
+from Browser.PlatformRegistry import get_platform_registry
 
 class EnhancedIntelligentBrowser:
     def __init__(self, driver, system_controller):
@@ -24,8 +26,11 @@ class EnhancedIntelligentBrowser:
         self.platform_name = platform.system()
         self.media_player = MediaPlayer(driver)
         self.research_downloader = ResearchDownloader(driver)
-        self.browser_controller = BrowserController(driver)
-        self.page_reader = PageReader(driver)
+        self.dom_index = get_dom_index(driver)
+        self.browser_controller = BrowserController(driver, self.dom_index)
+        self.page_reader = PageReader(driver, self.dom_index)
+        self.prefetcher = get_prefetcher(driver)
+        self.platforms = get_platform_registry()
         self.whatsapp_open = False
     
     def _ensure_valid_window(self):
@@ -298,78 +303,34 @@ class EnhancedIntelligentBrowser:
             self.search_on_platform(query, platform)
             return False, str(e)
     def search_on_platform(self, query, platform):
-        platform_lower = platform.lower().strip()
-        platform_urls = {
-            'youtube': f'https://www.youtube.com/results?search_query={query.replace(" ", "+")}',
-            'google': f'https://www.google.com/search?q={query.replace(" ", "+")}',
-            'facebook': f'https://www.facebook.com/search/top?q={query.replace(" ", "%20")}',
-            'instagram': f'https://www.instagram.com/explore/search/keyword/?q={query.replace(" ", "%20")}',
-            'twitter': f'https://twitter.com/search?q={query.replace(" ", "%20")}',
-            'linkedin': f'https://www.linkedin.com/search/results/all/?keywords={query.replace(" ", "%20")}',
-            'reddit': f'https://www.reddit.com/search?q={query.replace(" ", "+")}',
-            'wikipedia': f'https://en.wikipedia.org/w/index.php?search={query.replace(" ", "+")}',
-            'spotify': f'https://open.spotify.com/search/{query.replace(" ", "%20")}',
-            'amazon': f'https://www.amazon.com/s?k={query.replace(" ", "+")}',
-            'github': f'https://github.com/search?q={query.replace(" ", "+")}',
-            'stackoverflow': f'https://stackoverflow.com/search?q={query.replace(" ", "+")}',
-            'pinterest': f'https://www.pinterest.com/search/pins/?q={query.replace(" ", "%20")}',
-            'quora': f'https://www.quora.com/search?q={query.replace(" ", "+")}',
-            'medium': f'https://medium.com/search?q={query.replace(" ", "+")}',
-            'netflix': f'https://www.netflix.com/search?q={query.replace(" ", "%20")}',
-            'ebay': f'https://www.ebay.com/sch/i.html?_nkw={query.replace(" ", "+")}',
-            'imdb': f'https://www.imdb.com/find?q={query.replace(" ", "+")}',
-            'yelp': f'https://www.yelp.com/search?find_desc={query.replace(" ", "+")}',
-            'tiktok': f'https://www.tiktok.com/search?q={query.replace(" ", "%20")}',
-            'twitch': f'https://www.twitch.tv/search?term={query.replace(" ", "%20")}',
-            'flipkart': f'https://www.flipkart.com/search?q={query.replace(" ", "%20")}',
-            'snapdeal': f'https://www.snapdeal.com/search?keyword={query.replace(" ", "%20")}',
-            'meesho': f'https://www.meesho.com/search?q={query.replace(" ", "%20")}',
-        }
-        if 'chatgpt' in platform_lower or 'chat gpt' in platform_lower or 'gpt' in platform_lower:
-            print(f"🤖 Opening ChatGPT (query: {query})")
-            return self.open_website(f'https://chat.openai.com/?q={query.replace(" ", "+")}')
-        if 'whatsapp' in platform_lower:
-            print(f"💬 Opening WhatsApp Web")
-            return self.open_website('https://web.whatsapp.com')
-        if 'gmail' in platform_lower or 'mail' in platform_lower:
-            print(f"📧 Searching Gmail for: {query}")
-            return self.open_website(f'https://mail.google.com/mail/u/0/#search/{query.replace(" ", "+")}')
-        if platform_lower in platform_urls:
-            url = platform_urls[platform_lower]
-            print(f"🔍 Searching '{query}' on {platform.title()}")
-            return self.open_website(url)
+        entry = self.platforms.resolve(platform)
+        if entry is not None:
+            url = self.platforms.search_url(platform, query)
+            if entry.get('label'):
+                print(f"{entry['label']} (query: {query})")
+            else:
+                print(f"🔍 Searching '{query}' on {platform.title()}")
+            opened = self.open_website(url)
+            if opened and entry.get('results'):
+                self.prefetcher.start()
+            return opened
         print(f"🌐 Attempting generic search on {platform}...")
-        generic_patterns = [
-            f'https://www.{platform_lower}.com/search?q={query.replace(" ", "+")}',
-            f'https://{platform_lower}.com/search?q={query.replace(" ", "+")}',
-        ]
-        try:
-            url = generic_patterns[0]
-            print(f"   Trying: {url}")
-            return self.open_website(url)
-        except:
-            print(f"   ⚠ Search URL unknown, opening homepage")
-            homepage = f'https://www.{platform_lower}.com'
-            return self.open_website(homepage)
+        url = self.platforms.generic_search_url(platform, query)
+        print(f"   Trying: {url}")
+        return self.open_website(url)
     def search_google(self, query):
         # Ensure we have a valid window first
         if not self._ensure_valid_window():
             print("Browser window closed, cannot search")
             return False
         
+        url = self.platforms.search_url('google', query)
         max_retries = 3
         for attempt in range(max_retries):
             try:
                 print(f"Searching for: {query} (attempt {attempt + 1}/{max_retries})")
-                self.driver.get("https://www.google.com")
-                time.sleep(1)
-                search_box = self.wait.until(
-                    EC.presence_of_element_located((By.NAME, "q"))
-                )
-                search_box.clear()
-                search_box.send_keys(query)
-                search_box.send_keys(Keys.RETURN)
-                time.sleep(2)
+                self.driver.get(url)
+                self.prefetcher.start()
                 print(f"Search results for: {query}")
                 return True
             except TimeoutException:
@@ -541,7 +502,6 @@ class EnhancedIntelligentBrowser:
             try:
                 print(f"Opening: {url} (attempt {attempt + 1}/{max_retries})")
                 self.driver.get(url)
-                time.sleep(2)
                 try:
                     title = self.driver.title
                     print(f"Loaded: {title}")
@@ -4,17 +4,33 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import time
+from Browser.Prefetcher import get_prefetcher, page_key
+from Browser.PlatformRegistry import get_platform_registry
 
 class MediaPlayer:
     def __init__(self, driver):
         self.driver = driver
         self.wait = WebDriverWait(driver, 15)
+        self.prefetcher = get_prefetcher(driver)
     def play_first_youtube_result(self, query):
         try:
-            search_url = f"https://www.youtube.com/results?search_query={query.replace(' ', '+')}"
+            search_url = get_platform_registry().search_url('youtube', query)
             print(f"🔍 Searching YouTube: {search_url}")
-            self.driver.get(search_url)
-            time.sleep(2)
+            on_results = page_key(self.driver.current_url) == page_key(search_url)
+            videos = self.prefetcher.targets('video') if on_results else None
+            if not videos:
+                self.driver.get(search_url)
+                videos = self.prefetcher.collect(timeout=10)
+                videos = [result['element'] for result in videos]
+            if videos:
+                try:
+                    first_video = videos[0]
+                    video_title = first_video.get_attribute('title') or first_video.text
+                    print(f"▶️  Playing: {video_title}")
+                    first_video.click()
+                    return True, f"Playing: {video_title}"
+                except Exception:
+                    self.prefetcher.invalidate()
             try:
                 first_video = self.wait.until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, "a#video-title"))
@@ -33,10 +49,9 @@ class MediaPlayer:
             return False, str(e)
     def play_first_spotify_result(self, query):
         try:
-            search_url = f"https://open.spotify.com/search/{query.replace(' ', '%20')}"
+            search_url = get_platform_registry().search_url('spotify', query)
             print(f"🔍 Searching Spotify: {search_url}")
             self.driver.get(search_url)
-            time.sleep(3)
             return True, f"Opened Spotify search for: {query}"
         except Exception as e:
             print(f"❌ Error with Spotify: {e}")
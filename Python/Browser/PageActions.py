@@ -0,0 +1,114 @@
+import weakref
+from Browser.PageScript import PageScript
+
+PAGE_ACTIONS_JS = r"""
+(function () {
+    if (window.__eitherActions) { return; }
+    var HIGHLIGHT_CSS =
+        '@keyframes pulse-circle {' +
+        ' 0% { box-shadow: 0 0 0 0 rgba(255,0,0,.7), 0 0 0 0 rgba(255,0,0,.7); }' +
+        ' 50% { box-shadow: 0 0 0 15px rgba(255,0,0,0), 0 0 0 30px rgba(255,0,0,0); }' +
+        ' 100% { box-shadow: 0 0 0 0 rgba(255,0,0,0), 0 0 0 0 rgba(255,0,0,0); } }' +
+        '.ai-highlight { animation: pulse-circle 2s infinite !important; border: 3px solid red !important;' +
+        ' border-radius: 8px !important; padding: 5px !important; transition: all .3s ease !important; }';
+    var CLOSE_SELECTORS = [
+        "button[aria-label*='close' i]",
+        "button[title*='close' i]",
+        "[class*='close' i]",
+        "button.close",
+        "div[role='button'][aria-label*='close' i]",
+        "svg[aria-label='Close']"
+    ];
+    function visible(el) {
+        if (!el.getClientRects().length) { return false; }
+        var style = window.getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.display !== 'none';
+    }
+    function video() {
+        var videos = document.querySelectorAll('video');
+        for (var i = 0; i < videos.length; i++) {
+            if (!videos[i].paused) { return videos[i]; }
+        }
+        return videos[0] || null;
+    }
+    var actions = {
+        scroll: function (pages, pixels) {
+            window.scrollBy(0, pages ? pages * window.innerHeight : pixels);
+            return window.scrollY;
+        },
+        volume: function (delta) {
+            var v = video();
+            if (!v) { return null; }
+            v.volume = Math.min(1, Math.max(0, Math.round((v.volume + delta) * 100) / 100));
+            return v.volume;
+        },
+        closePopup: function () {
+            for (var s = 0; s < CLOSE_SELECTORS.length; s++) {
+                var nodes = document.querySelectorAll(CLOSE_SELECTORS[s]);
+                for (var i = 0; i < nodes.length; i++) {
+                    var target = nodes[i].closest('button, [role="button"], a') || nodes[i];
+                    if (!visible(target)) { continue; }
+                    target.dispatchEvent(new MouseEvent('click', {bubbles: true, cancelable: true, view: window}));
+                    return CLOSE_SELECTORS[s];
+                }
+            }
+            return null;
+        },
+        highlight: function (el) {
+            if (!document.getElementById('ai-highlight-style')) {
+                var style = document.createElement('style');
+                style.id = 'ai-highlight-style';
+                style.textContent = HIGHLIGHT_CSS;
+                (document.head || document.documentElement).appendChild(style);
+            }
+            el.scrollIntoView({behavior: 'smooth', block: 'center'});
+            el.classList.add('ai-highlight');
+            return true;
+        },
+        unhighlight: function (el) {
+            var nodes = el ? [el] : document.querySelectorAll('.ai-highlight');
+            for (var i = 0; i < nodes.length; i++) { nodes[i].classList.remove('ai-highlight'); }
+            return nodes.length;
+        }
+    };
+    window.__eitherActions = actions;
+})();
+"""
+
+_actions = weakref.WeakKeyDictionary()
+
+class PageActions:
+    """Compact page-side helpers for the everyday browser controls.
+
+    Installed once per document (and pre-registered for new documents on
+    Chromium), so scrolling, volume, popup closing and highlighting are each
+    a single small script call instead of several round trips.
+    """
+    SCROLL_AMOUNTS = {'small': 300, 'medium': 600, 'large': 1000}
+    def __init__(self, driver):
+        self.driver = driver
+        self.script = PageScript(driver, '__eitherActions', PAGE_ACTIONS_JS)
+    def scroll(self, amount='medium', direction=1):
+        if amount == 'page':
+            return self.script.call('scroll', direction, 0)
+        return self.script.call('scroll', 0, direction * self.SCROLL_AMOUNTS.get(amount, 600))
+    def volume(self, delta):
+        """New volume (0-1) of the page's video, or None when there is none."""
+        return self.script.call('volume', delta)
+    def close_popup(self):
+        """Selector of the close control that was clicked, or None."""
+        return self.script.call('closePopup')
+    def highlight(self, element):
+        return self.script.call('highlight', element)
+    def unhighlight(self, element=None):
+        return self.script.call('unhighlight', element)
+
+def get_page_actions(driver):
+    try:
+        actions = _actions.get(driver)
+        if actions is None:
+            actions = PageActions(driver)
+            _actions[driver] = actions
+        return actions
+    except TypeError:
+        return PageActions(driver)
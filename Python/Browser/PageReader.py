@@ -4,11 +4,34 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import re
 from difflib import SequenceMatcher
+from Browser.DomIndex import get_dom_index
 
 class PageReader:
-    def __init__(self, driver):
+    def __init__(self, driver, dom_index=None):
         self.driver = driver
         self.wait = WebDriverWait(driver, 5)
+        self.dom_index = dom_index or get_dom_index(driver)
+    def _collect(self, kind, selector, scan=None):
+        try:
+            return self.dom_index.snapshot(kind, scan=scan, visible=True, with_text=True)
+        except Exception:
+            pass
+        collected = []
+        elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+        if scan:
+            elements = elements[:scan]
+        for elem in elements:
+            try:
+                if elem.is_displayed() and elem.text.strip():
+                    collected.append({
+                        'element': elem,
+                        'text': elem.text.strip(),
+                        'href': elem.get_attribute('href') if kind == 'link' else None,
+                        'tag': elem.tag_name.lower()
+                    })
+            except:
+                continue
+        return collected
     def get_page_summary(self):
         try:
             print("\n📄 Analyzing current page...")
@@ -32,16 +55,7 @@ class PageReader:
             return None
     def _get_visible_links(self):
         try:
-            links = self.driver.find_elements(By.CSS_SELECTOR, "a[href]")
-            visible_links = []
-            for link in links[:50]:
-                try:
-                    if link.is_displayed() and link.text.strip():
-                        text = link.text.strip()
-                        href = link.get_attribute('href')
-                        visible_links.append({'text': text, 'href': href})
-                except:
-                    continue
+            visible_links = [{'text': item['text'], 'href': item['href']} for item in self._collect('link', "a[href]", 50)]
             if visible_links:
                 print("🔗 Visible Links:")
                 for i, link in enumerate(visible_links[:20], 1):
@@ -53,15 +67,7 @@ class PageReader:
             return []
     def _get_visible_buttons(self):
         try:
-            buttons = self.driver.find_elements(By.CSS_SELECTOR, "button")
-            visible_buttons = []
-            for button in buttons[:30]:
-                try:
-                    if button.is_displayed() and button.text.strip():
-                        text = button.text.strip()
-                        visible_buttons.append(text)
-                except:
-                    continue
+            visible_buttons = [item['text'] for item in self._collect('button', "button", 30)]
             if visible_buttons:
                 print("\n🔘 Visible Buttons:")
                 for i, btn in enumerate(visible_buttons[:15], 1):
@@ -74,14 +80,11 @@ class PageReader:
     def _get_visible_headings(self):
         try:
             headings = []
+            found = self._collect('heading', "h1, h2, h3")
             for tag in ['h1', 'h2', 'h3']:
-                elements = self.driver.find_elements(By.TAG_NAME, tag)
-                for elem in elements:
-                    try:
-                        if elem.is_displayed() and elem.text.strip():
-                            headings.append({'level': tag, 'text': elem.text.strip()})
-                    except:
-                        continue
+                for item in found:
+                    if item.get('tag') == tag:
+                        headings.append({'level': tag, 'text': item['text']})
             if headings:
                 print("\n📌 Visible Headings:")
                 for i, heading in enumerate(headings[:15], 1):
@@ -96,22 +99,11 @@ class PageReader:
             text_lower = text.lower()
             text_lower = re.sub(r'\b(called|titled|named|file|page|link|button)\b', '', text_lower).strip()
             print(f"🔍 Searching for elements containing: '{text_lower}'")
-            links = self.driver.find_elements(By.CSS_SELECTOR, "a[href]")
-            for link in links:
-                try:
-                    if link.is_displayed() and text_lower in link.text.lower():
-                        print(f"   ✓ Found link: {link.text.strip()}")
-                        return link
-                except:
-                    continue
-            buttons = self.driver.find_elements(By.TAG_NAME, "button")
-            for button in buttons:
-                try:
-                    if button.is_displayed() and text_lower in button.text.lower():
-                        print(f"   ✓ Found button: {button.text.strip()}")
-                        return button
-                except:
-                    continue
+            match = self.dom_index.find_text(text_lower, ('link', 'button'))
+            if match:
+                kind = 'link' if match.get('tag') == 'a' else 'button'
+                print(f"   ✓ Found {kind}: {match['text']}")
+                return match['element']
             all_elements = self.driver.find_elements(By.XPATH, "//*")
             for elem in all_elements:
                 try:
@@ -127,21 +119,8 @@ class PageReader:
             return None
     def get_all_clickable_elements(self):
         try:
-            clickable = []
-            links = self.driver.find_elements(By.CSS_SELECTOR, "a[href]")
-            for link in links[:50]:
-                try:
-                    if link.is_displayed() and link.text.strip():
-                        clickable.append(('link', link.text.strip()))
-                except:
-                    continue
-            buttons = self.driver.find_elements(By.TAG_NAME, "button")
-            for button in buttons[:30]:
-                try:
-                    if button.is_displayed() and button.text.strip():
-                        clickable.append(('button', button.text.strip()))
-                except:
-                    continue
+            clickable = [('link', item['text']) for item in self._collect('link', "a[href]", 50)]
+            clickable += [('button', item['text']) for item in self._collect('button', "button", 30)]
             return clickable
         except Exception as e:
             return []
@@ -149,21 +128,8 @@ class PageReader:
         try:
             search_text_lower = search_text.lower().strip()
             print(f"\n🔍 Searching for closest match to: '{search_text}'")
-            candidates = []
-            links = self.driver.find_elements(By.CSS_SELECTOR, "a[href]")
-            for link in links[:100]:
-                try:
-                    if link.is_displayed() and link.text.strip():
-                        candidates.append((link, link.text.strip(), 'link'))
-                except:
-                    continue
-            buttons = self.driver.find_elements(By.TAG_NAME, "button")
-            for button in buttons[:50]:
-                try:
-                    if button.is_displayed() and button.text.strip():
-                        candidates.append((button, button.text.strip(), 'button'))
-                except:
-                    continue
+            candidates = [(item['element'], item['text'], 'link') for item in self._collect('link', "a[href]", 100)]
+            candidates += [(item['element'], item['text'], 'button') for item in self._collect('button', "button", 50)]
             matches = []
             for elem, text, elem_type in candidates:
                 text_lower = text.lower()
@@ -0,0 +1,45 @@
+import weakref
+
+_registered_scripts = weakref.WeakKeyDictionary()
+
+class PageScript:
+    """Page-side helper object that survives navigation.
+
+    The source is registered with CDP (Page.addScriptToEvaluateOnNewDocument)
+    so Chromium re-injects it into every new document; on other browsers it is
+    re-installed lazily the first time a call finds it missing.
+    """
+    def __init__(self, driver, global_name, source):
+        self.driver = driver
+        self.global_name = global_name
+        self.source = source
+    def _registered(self):
+        try:
+            return _registered_scripts.setdefault(self.driver, set())
+        except TypeError:
+            return set()
+    def install(self):
+        self.driver.execute_script(self.source)
+        registered = self._registered()
+        if self.global_name in registered or not hasattr(self.driver, 'execute_cdp_cmd'):
+            return
+        try:
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': self.source})
+        except Exception:
+            pass
+        registered.add(self.global_name)
+    def call(self, method, *args):
+        script = (
+            f"var o = window.{self.global_name};"
+            f" if (!o) {{ return {{'__missing__': true}}; }}"
+            f" return o.{method}.apply(o, arguments);"
+        )
+        result = self.driver.execute_script(script, *args)
+        if isinstance(result, dict) and result.get('__missing__'):
+            self.install()
+            result = self.driver.execute_script(script, *args)
+        return result
+    def peek(self, expression):
+        return self.driver.execute_script(
+            f"var o = window.{self.global_name}; return o ? {expression} : null;"
+        )
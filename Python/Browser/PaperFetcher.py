@@ -0,0 +1,289 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import xml.etree.ElementTree as ET
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTPX_AVAILABLE = False
+
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+SEMANTIC_SCHOLAR_API_URL = "https://api.semanticscholar.org/graph/v1/paper/search"
+ATOM_NS = {'atom': 'http://www.w3.org/2005/Atom'}
+CHECKSUM_FILE = ".paper_checksums.json"
+CHUNK_SIZE = 64 * 1024
+
+def _normalize_title(title):
+    return re.sub(r'[^a-z0-9]+', ' ', (title or '').lower()).strip()
+
+def _arxiv_id(value):
+    match = re.search(r'(\d{4}\.\d{4,5})', value or '')
+    return match.group(1) if match else None
+
+def _safe_filename(paper):
+    # The title is cut to 80 characters, so the arXiv id (or a hash of the PDF URL)
+    # keeps papers with a shared prefix from writing to and resuming each other's files.
+    name = re.sub(r'[^\w\- ]+', '', paper.get('title') or '').strip()
+    name = re.sub(r'\s+', '_', name)[:80]
+    key = paper.get('arxiv_id') or hashlib.sha256(paper['pdf_url'].encode()).hexdigest()[:12]
+    return f"{name}_{key}.pdf" if name else f"{key}.pdf"
+
+class PaperFetcher:
+    """Resolves and downloads papers over HTTP without touching the browser.
+
+    arXiv (Atom) and Semantic Scholar (JSON) are queried concurrently, PDFs
+    are fetched through one pooled async client with at most
+    ``max_concurrency`` transfers in flight. Partial downloads are kept as
+    ``.part`` files and resumed with Range requests, and finished files are
+    deduplicated by SHA-256 across sources and previous runs.
+    """
+    def __init__(self, downloads_dir, max_concurrency=4, timeout=30.0,
+                 arxiv_url=ARXIV_API_URL, semantic_scholar_url=SEMANTIC_SCHOLAR_API_URL,
+                 on_progress=None):
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx is required for PaperFetcher (pip install httpx)")
+        self.downloads_dir = downloads_dir
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.arxiv_url = arxiv_url
+        self.semantic_scholar_url = semantic_scholar_url
+        self.on_progress = on_progress
+        self._checksums = None
+        self._checksum_lock = threading.Lock()
+    def _emit(self, event, **data):
+        data['event'] = event
+        if self.on_progress:
+            try:
+                self.on_progress(data)
+            except Exception:
+                pass
+    def _make_client(self):
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.max_concurrency + 2,
+                                max_keepalive_connections=self.max_concurrency),
+            headers={'User-Agent': 'EitherAssistant/1.0 (research downloader)'},
+        )
+    async def search_arxiv(self, client, topic, limit):
+        params = {'search_query': f'all:{topic}', 'start': 0, 'max_results': limit}
+        response = await client.get(self.arxiv_url, params=params)
+        response.raise_for_status()
+        root = ET.fromstring(response.content)
+        papers = []
+        for entry in root.findall('atom:entry', ATOM_NS):
+            title = ' '.join((entry.findtext('atom:title', '', ATOM_NS) or '').split())
+            entry_id = entry.findtext('atom:id', '', ATOM_NS)
+            pdf_url = None
+            for link in entry.findall('atom:link', ATOM_NS):
+                if link.get('title') == 'pdf' or link.get('type') == 'application/pdf':
+                    pdf_url = link.get('href')
+                    break
+            if not pdf_url:
+                continue
+            papers.append({
+                'title': title,
+                'pdf_url': pdf_url,
+                'source': 'arxiv',
+                'arxiv_id': _arxiv_id(entry_id),
+            })
+        return papers
+    async def search_semantic_scholar(self, client, topic, limit):
+        params = {'query': topic, 'limit': limit, 'fields': 'title,openAccessPdf,externalIds'}
+        response = await client.get(self.semantic_scholar_url, params=params)
+        response.raise_for_status()
+        papers = []
+        for item in response.json().get('data') or []:
+            pdf = item.get('openAccessPdf') or {}
+            if not pdf.get('url'):
+                continue
+            external = item.get('externalIds') or {}
+            papers.append({
+                'title': item.get('title') or '',
+                'pdf_url': pdf['url'],
+                'source': 'semantic_scholar',
+                'arxiv_id': _arxiv_id(external.get('ArXiv')),
+            })
+        return papers
+    async def search(self, client, topic, limit):
+        sources = [('arXiv', self.search_arxiv), ('Semantic Scholar', self.search_semantic_scholar)]
+        results = await asyncio.gather(*(search(client, topic, limit) for _, search in sources),
+                                       return_exceptions=True)
+        lists = []
+        for (name, _), result in zip(sources, results):
+            if isinstance(result, Exception):
+                print(f"  ✗ {name} error: {result}")
+                self._emit('source_failed', source=name, error=str(result))
+                continue
+            print(f"  ✓ {name}: {len(result)} papers with PDFs")
+            lists.append(result)
+        candidates = []
+        seen = set()
+        for i in range(max((len(papers) for papers in lists), default=0)):
+            for papers in lists:
+                if i >= len(papers):
+                    continue
+                paper = papers[i]
+                keys = {('title', _normalize_title(paper['title'])), ('url', paper['pdf_url'])}
+                if paper.get('arxiv_id'):
+                    keys.add(('arxiv', paper['arxiv_id']))
+                if keys & seen:
+                    continue
+                seen |= keys
+                candidates.append(paper)
+                self._emit('found', title=paper['title'], source=paper['source'], url=paper['pdf_url'])
+        return candidates
+    def _checksum_path(self):
+        return os.path.join(self.downloads_dir, CHECKSUM_FILE)
+    def _load_checksums(self):
+        if self._checksums is None:
+            try:
+                with open(self._checksum_path(), 'r') as f:
+                    self._checksums = json.load(f)
+            except (OSError, ValueError):
+                self._checksums = {}
+            self._checksums = {digest: name for digest, name in self._checksums.items()
+                               if os.path.exists(os.path.join(self.downloads_dir, name))}
+        return self._checksums
+    def _save_checksums(self):
+        try:
+            with open(self._checksum_path(), 'w') as f:
+                json.dump(self._checksums, f, indent=2)
+        except OSError:
+            pass
+    def _claim_checksum(self, digest, filename):
+        with self._checksum_lock:
+            checksums = self._load_checksums()
+            if digest in checksums:
+                return checksums[digest]
+            checksums[digest] = filename
+            self._save_checksums()
+            return None
+    async def download(self, client, paper):
+        os.makedirs(self.downloads_dir, exist_ok=True)
+        filename = _safe_filename(paper)
+        path = os.path.join(self.downloads_dir, filename)
+        part_path = path + ".part"
+        digest = hashlib.sha256()
+        offset = 0
+        if os.path.exists(part_path):
+            with open(part_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    offset += len(chunk)
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+        self._emit('start', title=paper['title'], source=paper['source'], resume_from=offset)
+        async with client.stream('GET', paper['pdf_url'], headers=headers) as response:
+            if response.status_code == 416 and offset:
+                pass
+            else:
+                response.raise_for_status()
+                if offset and response.status_code != 206:
+                    digest = hashlib.sha256()
+                    offset = 0
+                mode = 'ab' if offset else 'wb'
+                total = response.headers.get('Content-Length')
+                total = int(total) + offset if total and total.isdigit() else None
+                received = offset
+                with open(part_path, mode) as f:
+                    async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                        if received == 0 and not chunk.lstrip().startswith(b'%PDF'):
+                            f.close()
+                            os.remove(part_path)
+                            raise ValueError("response is not a PDF")
+                        f.write(chunk)
+                        digest.update(chunk)
+                        received += len(chunk)
+                        self._emit('progress', title=paper['title'], bytes=received, total=total)
+        checksum = digest.hexdigest()
+        existing = self._claim_checksum(checksum, filename)
+        if existing:
+            os.remove(part_path)
+            self._emit('duplicate', title=paper['title'], source=paper['source'], existing=existing)
+            return None
+        os.replace(part_path, path)
+        self._emit('done', title=paper['title'], source=paper['source'], path=path, sha256=checksum)
+        return path
+    async def fetch(self, topic, max_papers=5):
+        """Search all sources and download up to ``max_papers`` unique PDFs."""
+        async with self._make_client() as client:
+            candidates = await self.search(client, topic, max_papers * 2)
+            downloaded = []
+            state = {'next': 0, 'in_flight': 0}
+            condition = asyncio.Condition()
+            async def worker():
+                while True:
+                    async with condition:
+                        await condition.wait_for(
+                            lambda: len(downloaded) + state['in_flight'] < max_papers
+                            or state['in_flight'] == 0
+                        )
+                        if len(downloaded) >= max_papers or state['next'] >= len(candidates):
+                            return
+                        position = state['next'] + 1
+                        paper = candidates[state['next']]
+                        state['next'] += 1
+                        state['in_flight'] += 1
+                    path = None
+                    try:
+                        print(f"  [{position}] {paper['title'][:60]}...")
+                        path = await self.download(client, paper)
+                        if path:
+                            print("      ✓ Downloaded!")
+                        else:
+                            print("      ↺ Duplicate, skipped")
+                    except Exception as e:
+                        print(f"      ✗ Failed: {e}")
+                        self._emit('failed', title=paper['title'], source=paper['source'], error=str(e))
+                    async with condition:
+                        state['in_flight'] -= 1
+                        if path:
+                            downloaded.append(path)
+                        condition.notify_all()
+            await asyncio.gather(*(worker() for _ in range(self.max_concurrency)))
+        self._emit('finished', downloaded=len(downloaded))
+        return downloaded
+    async def stream(self, topic, max_papers=5):
+        """Async generator yielding progress events while ``fetch`` runs."""
+        queue = asyncio.Queue()
+        previous = self.on_progress
+        def on_progress(event):
+            queue.put_nowait(event)
+            if previous:
+                previous(event)
+        self.on_progress = on_progress
+        task = asyncio.ensure_future(self.fetch(topic, max_papers))
+        try:
+            while True:
+                event = await queue.get()
+                yield event
+                if event['event'] == 'finished':
+                    break
+            await task
+        finally:
+            self.on_progress = previous
+            if not task.done():
+                task.cancel()
+    def fetch_sync(self, topic, max_papers=5):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.fetch(topic, max_papers))
+        result = {}
+        def runner():
+            try:
+                result['value'] = asyncio.run(self.fetch(topic, max_papers))
+            except Exception as e:
+                result['error'] = e
+        thread = threading.Thread(target=runner, daemon=True)
+        thread.start()
+        thread.join()
+        if 'error' in result:
+            raise result['error']
+        return result['value']
@@ -0,0 +1,122 @@
+from urllib.parse import quote, quote_plus, urlsplit
+
+# One entry per supported site. 'search' is a URL template filled with the
+# query encoded as 'plus' (spaces -> +) or 'path' (spaces -> %20); 'results'
+# is the selector profile for result anchors on its search page, with the
+# click targets ('link', 'video', 'result') it answers for. 'indicator'
+# marks the sites GeminiAPI treats as web platforms when parsing offline.
+PLATFORMS = [
+    {'id': 'youtube', 'host': 'youtube.com', 'indicator': True,
+     'search': 'https://www.youtube.com/results?search_query={query}', 'encoding': 'plus',
+     'results': {'selector': 'ytd-video-renderer a#video-title, ytd-grid-video-renderer a#video-title, a#video-title',
+                 'kinds': ('link', 'video', 'result')}},
+    {'id': 'google', 'host': 'google.', 'indicator': True,
+     'search': 'https://www.google.com/search?q={query}', 'encoding': 'plus',
+     'results': {'selector': '#search a h3, #rso a h3', 'kinds': ('link', 'result')}},
+    {'id': 'instagram', 'host': 'instagram.com', 'indicator': True,
+     'search': 'https://www.instagram.com/explore/search/keyword/?q={query}', 'encoding': 'path'},
+    {'id': 'facebook', 'host': 'facebook.com', 'indicator': True,
+     'search': 'https://www.facebook.com/search/top?q={query}', 'encoding': 'path'},
+    {'id': 'twitter', 'host': 'twitter.com', 'indicator': True,
+     'search': 'https://twitter.com/search?q={query}', 'encoding': 'path'},
+    {'id': 'amazon', 'host': 'amazon.', 'indicator': True,
+     'search': 'https://www.amazon.com/s?k={query}', 'encoding': 'plus',
+     'results': {'selector': 'div[data-component-type="s-search-result"] h2', 'kinds': ('link', 'result')}},
+    {'id': 'reddit', 'host': 'reddit.com', 'indicator': True,
+     'search': 'https://www.reddit.com/search?q={query}', 'encoding': 'plus'},
+    {'id': 'wikipedia', 'host': 'wikipedia.org', 'indicator': True,
+     'search': 'https://en.wikipedia.org/w/index.php?search={query}', 'encoding': 'plus',
+     'results': {'selector': '.mw-search-result-heading a', 'kinds': ('link', 'result')}},
+    {'id': 'spotify', 'host': 'spotify.com', 'indicator': True,
+     'search': 'https://open.spotify.com/search/{query}', 'encoding': 'path'},
+    {'id': 'linkedin', 'host': 'linkedin.com', 'indicator': True,
+     'search': 'https://www.linkedin.com/search/results/all/?keywords={query}', 'encoding': 'path'},
+    {'id': 'github', 'host': 'github.com', 'indicator': True,
+     'search': 'https://github.com/search?q={query}', 'encoding': 'plus'},
+    {'id': 'chatgpt', 'host': 'chat.openai.com', 'indicator': True, 'contains': ('chatgpt', 'chat gpt', 'gpt'),
+     'search': 'https://chat.openai.com/?q={query}', 'encoding': 'plus', 'label': '🤖 Opening ChatGPT'},
+    {'id': 'netflix', 'host': 'netflix.com', 'indicator': True,
+     'search': 'https://www.netflix.com/search?q={query}', 'encoding': 'path'},
+    {'id': 'pinterest', 'host': 'pinterest.', 'indicator': True,
+     'search': 'https://www.pinterest.com/search/pins/?q={query}', 'encoding': 'path'},
+    {'id': 'tiktok', 'host': 'tiktok.com', 'indicator': True,
+     'search': 'https://www.tiktok.com/search?q={query}', 'encoding': 'path'},
+    {'id': 'snapchat', 'host': 'snapchat.com', 'indicator': True, 'home': 'https://www.snapchat.com'},
+    {'id': 'whatsapp', 'host': 'web.whatsapp.com', 'indicator': True, 'contains': ('whatsapp',),
+     'home': 'https://web.whatsapp.com', 'label': '💬 Opening WhatsApp Web'},
+    {'id': 'telegram', 'host': 'web.telegram.org', 'indicator': True, 'home': 'https://web.telegram.org'},
+    {'id': 'stackoverflow', 'host': 'stackoverflow.com', 'indicator': True,
+     'search': 'https://stackoverflow.com/search?q={query}', 'encoding': 'plus',
+     'results': {'selector': '.s-post-summary--content-title a', 'kinds': ('link', 'result')}},
+    {'id': 'medium', 'host': 'medium.com', 'indicator': True,
+     'search': 'https://medium.com/search?q={query}', 'encoding': 'plus'},
+    {'id': 'quora', 'host': 'quora.com', 'indicator': True,
+     'search': 'https://www.quora.com/search?q={query}', 'encoding': 'plus'},
+    {'id': 'ebay', 'host': 'ebay.', 'indicator': True,
+     'search': 'https://www.ebay.com/sch/i.html?_nkw={query}', 'encoding': 'plus'},
+    {'id': 'imdb', 'host': 'imdb.com', 'indicator': True,
+     'search': 'https://www.imdb.com/find?q={query}', 'encoding': 'plus'},
+    {'id': 'yelp', 'host': 'yelp.', 'indicator': True,
+     'search': 'https://www.yelp.com/search?find_desc={query}', 'encoding': 'plus'},
+    {'id': 'twitch', 'host': 'twitch.tv', 'indicator': True,
+     'search': 'https://www.twitch.tv/search?term={query}', 'encoding': 'path'},
+    {'id': 'gmail', 'host': 'mail.google.com', 'contains': ('gmail', 'mail'),
+     'search': 'https://mail.google.com/mail/u/0/#search/{query}', 'encoding': 'plus', 'label': '📧 Searching Gmail'},
+    {'id': 'flipkart', 'host': 'flipkart.com',
+     'search': 'https://www.flipkart.com/search?q={query}', 'encoding': 'path'},
+    {'id': 'snapdeal', 'host': 'snapdeal.com',
+     'search': 'https://www.snapdeal.com/search?keyword={query}', 'encoding': 'path'},
+    {'id': 'meesho', 'host': 'meesho.com',
+     'search': 'https://www.meesho.com/search?q={query}', 'encoding': 'path'},
+    {'id': 'bing', 'host': 'bing.com',
+     'search': 'https://www.bing.com/search?q={query}', 'encoding': 'plus',
+     'results': {'selector': '#b_results h2 a', 'kinds': ('link', 'result')}},
+    {'id': 'duckduckgo', 'host': 'duckduckgo.com',
+     'search': 'https://duckduckgo.com/?q={query}', 'encoding': 'plus',
+     'results': {'selector': 'a[data-testid="result-title-a"], a.result__a', 'kinds': ('link', 'result')}},
+]
+
+def encode_query(query, encoding='plus'):
+    query = (query or '').strip()
+    if encoding == 'path':
+        return quote(query, safe='')
+    return quote_plus(query)
+
+class PlatformRegistry:
+    def __init__(self, platforms=None):
+        self.platforms = platforms or PLATFORMS
+        self.by_id = {platform['id']: platform for platform in self.platforms}
+        # Substring matches ("chat gpt", "my gmail") win over exact ids, as before
+        self.contains = [(needle, platform) for platform in self.platforms for needle in platform.get('contains', ())]
+        self.web_indicators = [platform['id'] for platform in self.platforms if platform.get('indicator')]
+        self.result_hosts = [(platform['host'], platform) for platform in self.platforms if platform.get('results')]
+    def resolve(self, name):
+        name_lower = (name or '').lower().strip()
+        for needle, platform in self.contains:
+            if needle in name_lower:
+                return platform
+        return self.by_id.get(name_lower)
+    def search_url(self, name, query):
+        """Results URL for ``query`` on platform ``name`` (None if it isn't known)."""
+        platform = self.resolve(name)
+        if platform is None:
+            return None
+        if not platform.get('search'):
+            return platform.get('home')
+        return platform['search'].format(query=encode_query(query, platform.get('encoding', 'plus')))
+    def generic_search_url(self, name, query):
+        return f'https://www.{name.lower().strip()}.com/search?q={encode_query(query)}'
+    def results_profile(self, url):
+        host = urlsplit(url or '').netloc.lower()
+        for needle, platform in self.result_hosts:
+            if needle in host:
+                return platform['results']
+        return None
+
+_registry = None
+
+def get_platform_registry():
+    global _registry
+    if _registry is None:
+        _registry = PlatformRegistry()
+    return _registry
@@ -0,0 +1,208 @@
+import threading
+import time
+import weakref
+from urllib.parse import urlsplit
+from Browser.PlatformRegistry import get_platform_registry
+from Metrics import record_cache
+
+# Installs the in-page collector and returns at once; the results land in
+# window.__eitherPrefetch when they render (or after ``timeout`` ms).
+START_JS = r"""
+var selector = arguments[0], limit = arguments[1], timeout = arguments[2], prerender = arguments[3];
+function collect() {
+    var results = [], seen = new Set();
+    var nodes = document.querySelectorAll(selector);
+    for (var i = 0; i < nodes.length && results.length < limit; i++) {
+        var anchor = nodes[i].closest('a[href]') || nodes[i].querySelector('a[href]');
+        if (!anchor || !anchor.href || seen.has(anchor)) { continue; }
+        var rect = anchor.getBoundingClientRect();
+        if (!rect.width && !rect.height && !anchor.offsetParent) { continue; }
+        seen.add(anchor);
+        results.push({
+            element: anchor,
+            href: anchor.href,
+            text: (nodes[i].getAttribute('title') || nodes[i].textContent || '').trim().slice(0, 200)
+        });
+    }
+    return results;
+}
+function hint(urls) {
+    if (!prerender || !urls.length) { return; }
+    var head = document.head || document.documentElement;
+    var origins = new Set();
+    urls.slice(0, 3).forEach(function (url) {
+        try { origins.add(new URL(url).origin); } catch (e) {}
+    });
+    origins.forEach(function (origin) {
+        if (origin === location.origin) { return; }
+        var link = document.createElement('link');
+        link.rel = 'preconnect';
+        link.href = origin;
+        head.appendChild(link);
+    });
+    if (window.HTMLScriptElement && HTMLScriptElement.supports && HTMLScriptElement.supports('speculationrules')) {
+        var rules = document.createElement('script');
+        rules.type = 'speculationrules';
+        rules.textContent = JSON.stringify({
+            prerender: [{source: 'list', urls: urls.slice(0, 1)}],
+            prefetch: [{source: 'list', urls: urls.slice(1, 3)}]
+        });
+        head.appendChild(rules);
+    } else {
+        var link = document.createElement('link');
+        link.rel = 'prerender';
+        link.href = urls[0];
+        head.appendChild(link);
+    }
+}
+var state = window.__eitherPrefetch = {url: location.href, results: [], done: false};
+function finish(results) {
+    hint(results.map(function (r) { return r.href; }));
+    state.results = results;
+    state.done = true;
+}
+var found = collect();
+if (found.length) { finish(found); return; }
+var observer = new MutationObserver(function () {
+    var results = collect();
+    if (results.length) { observer.disconnect(); clearTimeout(timer); finish(results); }
+});
+observer.observe(document.documentElement, {childList: true, subtree: true});
+var timer = setTimeout(function () { observer.disconnect(); finish(collect()); }, timeout);
+"""
+
+AWAIT_JS = r"""
+var wait = arguments[0], done = arguments[arguments.length - 1], started = Date.now();
+(function poll() {
+    var state = window.__eitherPrefetch;
+    if (!state) { done(null); return; }
+    if (state.done || Date.now() - started >= wait) {
+        done({url: state.url, results: state.results, done: state.done});
+        return;
+    }
+    setTimeout(poll, 50);
+})();
+"""
+# Selenium's default, used when the session's current value can't be read back.
+DEFAULT_SCRIPT_TIMEOUT = 30
+
+_prefetchers = weakref.WeakKeyDictionary()
+
+def page_key(url):
+    parts = urlsplit(url or '')
+    return (parts.netloc, parts.path, parts.query)
+
+class SearchPrefetcher:
+    """Caches the top result anchors of the search page that was just opened.
+
+    ``start`` installs an in-page collector right after a search and returns
+    at once; the page gathers the anchors as they render and hints the
+    browser to preconnect and prerender the first result. The next "click
+    first link" / "play first video" picks them up (``targets``) and clicks a
+    cached element instead of scanning the DOM again. Every WebDriver call
+    happens on the caller's thread, since a session can't be shared between
+    threads.
+    """
+    LIMIT = 10
+    TIMEOUT = 5.0
+    KINDS = ('link', 'video', 'result')
+    def __init__(self, driver, prerender=True):
+        self.driver = driver
+        self.prerender = prerender
+        self.url = None
+        self.kinds = ()
+        self.results = []
+        self._pending = False
+        self._started = 0.0
+        self._timeout = self.TIMEOUT
+        self._lock = threading.Lock()
+    def profile_for(self, url):
+        return get_platform_registry().results_profile(url)
+    def start(self, url=None, timeout=None):
+        """Begin collecting result anchors on the current page; never waits for them."""
+        with self._lock:
+            self.url, self.kinds, self.results, self._pending = None, (), [], False
+            try:
+                url = url or self.driver.current_url
+            except Exception:
+                return False
+            profile = self.profile_for(url)
+            if profile is None:
+                return False
+            self._timeout = self.TIMEOUT if timeout is None else timeout
+            try:
+                self.driver.execute_script(
+                    START_JS, profile['selector'], self.LIMIT, int(self._timeout * 1000), self.prerender)
+            except Exception as e:
+                print(f"⚠️ Prefetch failed: {str(e)[:100]}")
+                return False
+            self.url, self.kinds = url, profile['kinds']
+            self._pending = True
+            self._started = time.monotonic()
+            return True
+    def _finish(self, wait):
+        """Pick up what the page collected, waiting up to ``wait`` seconds for it."""
+        with self._lock:
+            if not self._pending:
+                return
+            wait = max(0.0, min(wait, self._timeout - (time.monotonic() - self._started)))
+            try:
+                data = self._run_async(AWAIT_JS, wait + 2, int(wait * 1000))
+            except Exception as e:
+                print(f"⚠️ Prefetch failed: {str(e)[:100]}")
+                data = None
+            if not data or (not data.get('done') and not data.get('results')):
+                self.url, self.kinds, self.results, self._pending = None, (), [], False
+                return
+            self._pending = False
+            self.url = data.get('url') or self.url
+            self.results = data.get('results') or []
+            if self.results:
+                print(f"⚡ Prefetched {len(self.results)} results")
+    def _run_async(self, script, timeout, *args):
+        """execute_async_script with its own script timeout; the session's previous one is put back."""
+        try:
+            previous = self.driver.timeouts.script
+        except Exception:
+            previous = DEFAULT_SCRIPT_TIMEOUT
+        self.driver.set_script_timeout(timeout)
+        try:
+            return self.driver.execute_async_script(script, *args)
+        finally:
+            try:
+                self.driver.set_script_timeout(previous)
+            except Exception:
+                pass
+    def collect(self, url=None, timeout=None):
+        """Gather result anchors for the current page now; returns them (possibly empty)."""
+        if not self.start(url, timeout):
+            return []
+        self._finish(self._timeout)
+        return self.results
+    def targets(self, kind='link', wait=None):
+        """Cached result elements for ``kind`` if they belong to the current page, else None."""
+        self._finish(self.TIMEOUT if wait is None else wait)
+        if not self.results or kind not in self.kinds:
+            record_cache('prefetch', False)
+            return None
+        try:
+            if page_key(self.driver.current_url) != page_key(self.url):
+                record_cache('prefetch', False)
+                return None
+        except Exception:
+            return None
+        record_cache('prefetch', True)
+        return [result['element'] for result in self.results]
+    def invalidate(self):
+        with self._lock:
+            self.url, self.kinds, self.results, self._pending = None, (), [], False
+
+def get_prefetcher(driver):
+    try:
+        prefetcher = _prefetchers.get(driver)
+        if prefetcher is None:
+            prefetcher = SearchPrefetcher(driver)
+            _prefetchers[driver] = prefetcher
+        return prefetcher
+    except TypeError:
+        return SearchPrefetcher(driver)
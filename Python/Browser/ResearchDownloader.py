@@ -5,16 +5,24 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import time
 import os
+from Browser.PaperFetcher import PaperFetcher, HTTPX_AVAILABLE
 
 class ResearchDownloader:
-    def __init__(self, driver):
+    def __init__(self, driver, on_progress=None):
         self.driver = driver
         self.wait = WebDriverWait(driver, 15)
         self.downloads_dir = os.path.expanduser("~/Downloads")
+        self.on_progress = on_progress
     def download_research_papers(self, topic, max_papers=5):
         print(f"📚 Searching for research papers on: {topic}")
         print(f"📥 Will download up to {max_papers} papers")
         print()
+        if HTTPX_AVAILABLE:
+            downloaded = self._download_over_http(topic, max_papers)
+            if downloaded:
+                print(f"\n✅ Downloaded {downloaded} research papers to: {self.downloads_dir}")
+                return True
+            print("\n⚠️  Direct download found nothing, falling back to browser search...")
         downloaded = 0
         print("🔍 Searching arXiv...")
         downloaded += self._download_from_arxiv(topic, max_papers - downloaded)
@@ -30,6 +38,14 @@ class ResearchDownloader:
         downloaded += self._download_from_semantic_scholar(topic, max_papers - downloaded)
         print(f"\n✅ Downloaded {downloaded} research papers to: {self.downloads_dir}")
         return downloaded > 0
+    def _download_over_http(self, topic, max_papers):
+        try:
+            print("🔍 Searching arXiv and Semantic Scholar...")
+            fetcher = PaperFetcher(self.downloads_dir, on_progress=self.on_progress)
+            return len(fetcher.fetch_sync(topic, max_papers))
+        except Exception as e:
+            print(f"  ✗ Direct download error: {e}")
+            return 0
     def _download_from_arxiv(self, topic, max_papers):
         try:
             search_url = f"https://arxiv.org/search/?query={topic.replace(' ', '+')}&searchtype=all&source=header"
@@ -0,0 +1,189 @@
+import json
+import threading
+import weakref
+from collections import OrderedDict
+from urllib.request import urlopen
+
+try:
+    from websockets.sync.client import connect as ws_connect
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+_registries = weakref.WeakKeyDictionary()
+
+def _target_id(handle):
+    # Old chromedriver builds prefix window handles with "CDwindow-"
+    return handle[len('CDwindow-'):] if handle and handle.startswith('CDwindow-') else handle
+
+class TabRegistry:
+    """In-memory view of the browser's tabs (handle, title, URL, order).
+
+    Seeded with one Target.getTargets call and then kept current from CDP
+    target events (targetCreated / targetInfoChanged / targetDestroyed) on a
+    browser-level DevTools connection, so listing tabs or moving to the
+    next/previous one never switches into each window to read its title.
+    Without the event stream (no websockets, Firefox) the registry re-syncs
+    from a single getTargets call per query instead.
+    """
+    def __init__(self, driver):
+        self.driver = driver
+        self.tabs = OrderedDict()
+        self.current = None
+        self.live = False
+        self._lock = threading.Lock()
+        self._socket = None
+        self._thread = None
+        self.sync()
+        self.start()
+    def _cdp(self, method, params=None):
+        if not hasattr(self.driver, 'execute_cdp_cmd'):
+            return None
+        try:
+            return self.driver.execute_cdp_cmd(method, params or {})
+        except Exception:
+            return None
+    def _page_targets(self):
+        data = self._cdp('Target.getTargets')
+        if data is None:
+            return None
+        return {
+            info['targetId']: info for info in data.get('targetInfos', [])
+            if info.get('type') == 'page'
+        }
+    def sync(self):
+        """Rebuild from the driver: one window_handles call plus one getTargets."""
+        try:
+            handles = self.driver.window_handles
+            current = self.driver.current_window_handle
+        except Exception:
+            handles, current = [], None
+        targets = self._page_targets() or {}
+        with self._lock:
+            previous = self.tabs
+            self.tabs = OrderedDict()
+            for handle in handles:
+                info = targets.get(_target_id(handle)) or previous.get(handle) or {}
+                self.tabs[handle] = {'title': info.get('title', ''), 'url': info.get('url', '')}
+            self.current = current
+    # ---- event stream ----
+    def _browser_socket_url(self):
+        try:
+            address = self.driver.capabilities['goog:chromeOptions']['debuggerAddress']
+            with urlopen(f"http://{address}/json/version", timeout=2) as response:
+                return json.loads(response.read().decode())['webSocketDebuggerUrl']
+        except Exception:
+            return None
+    def start(self):
+        if not WEBSOCKETS_AVAILABLE or self._thread is not None:
+            return False
+        url = self._browser_socket_url()
+        if url is None:
+            return False
+        try:
+            self._socket = ws_connect(url, max_size=None, open_timeout=3)
+            self._socket.send(json.dumps({'id': 1, 'method': 'Target.setDiscoverTargets', 'params': {'discover': True}}))
+        except Exception as e:
+            print(f"⚠️ Tab events unavailable: {str(e)[:100]}")
+            self._socket = None
+            return False
+        self.live = True
+        self._thread = threading.Thread(target=self._listen, daemon=True, name="TabRegistry")
+        self._thread.start()
+        return True
+    def _listen(self):
+        try:
+            for message in self._socket:
+                self.apply_event(json.loads(message))
+        except Exception:
+            pass
+        finally:
+            self.live = False
+            self._thread = None
+    def apply_event(self, event):
+        method = event.get('method')
+        params = event.get('params') or {}
+        with self._lock:
+            if method in ('Target.targetCreated', 'Target.targetInfoChanged'):
+                info = params.get('targetInfo') or {}
+                if info.get('type') != 'page':
+                    return
+                handle = self._handle_for(info['targetId'])
+                tab = self.tabs.setdefault(handle, {'title': '', 'url': ''})
+                tab['title'] = info.get('title', tab['title'])
+                tab['url'] = info.get('url', tab['url'])
+            elif method == 'Target.targetDestroyed':
+                handle = self._handle_for(params.get('targetId'))
+                self.tabs.pop(handle, None)
+                if self.current == handle:
+                    self.current = None
+    def _handle_for(self, target_id):
+        for handle in self.tabs:
+            if _target_id(handle) == target_id:
+                return handle
+        return target_id
+    def stop(self):
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except Exception:
+                pass
+        self.live = False
+    # ---- queries ----
+    def list(self):
+        """[(handle, title, url)] in tab order."""
+        if not self.live:
+            self.sync()
+        with self._lock:
+            return [(handle, tab['title'], tab['url']) for handle, tab in self.tabs.items()]
+    def handles(self):
+        return [handle for handle, _, _ in self.list()]
+    def current_handle(self):
+        with self._lock:
+            if self.current in self.tabs:
+                return self.current
+        try:
+            self.current = self.driver.current_window_handle
+        except Exception:
+            self.current = None
+        return self.current
+    def relative(self, offset):
+        """Handle ``offset`` tabs away from the current one (wraps around)."""
+        handles = self.handles()
+        current = self.current_handle()
+        if not handles or current not in handles:
+            return None
+        return handles[(handles.index(current) + offset) % len(handles)]
+    # ---- changes made through the driver ----
+    def activate(self, handle):
+        self.driver.switch_to.window(handle)
+        with self._lock:
+            self.current = handle
+    def opened(self, handle, url=''):
+        with self._lock:
+            self.tabs.setdefault(handle, {'title': '', 'url': url or ''})
+    def close(self, handle):
+        """Close ``handle`` without switching into it when CDP is available."""
+        if handle != self.current_handle() and self._cdp('Target.closeTarget', {'targetId': _target_id(handle)}) is not None:
+            with self._lock:
+                self.tabs.pop(handle, None)
+            return
+        current = self.current_handle()
+        if handle != current:
+            self.driver.switch_to.window(handle)
+        self.driver.close()
+        with self._lock:
+            self.tabs.pop(handle, None)
+            self.current = None
+        if handle != current and current:
+            self.activate(current)
+
+def get_tab_registry(driver):
+    try:
+        registry = _registries.get(driver)
+        if registry is None:
+            registry = TabRegistry(driver)
+            _registries[driver] = registry
+        return registry
+    except TypeError:
+        return TabRegistry(driver)
@@ -0,0 +1,222 @@
+import threading
+import time
+from html.parser import HTMLParser as _StdlibHTMLParser
+from urllib.parse import parse_qs, urljoin, urlsplit
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTPX_AVAILABLE = False
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+SEARCH_URL = "https://html.duckduckgo.com/html/"
+try:
+    from config import FETCH_RESULTS_WINDOW
+except ImportError:
+    FETCH_RESULTS_WINDOW = 120.0
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+def _clean_text(text):
+    return ' '.join((text or '').split())
+
+def _resolve_link(href, base):
+    """DuckDuckGo wraps results in /l/?uddg=<target>; unwrap to the real URL."""
+    url = urljoin(base, href or '')
+    parts = urlsplit(url)
+    if parts.path.startswith('/l/'):
+        target = parse_qs(parts.query).get('uddg')
+        if target:
+            return target[0]
+    return url
+
+def _classes(value):
+    return set((value or '').split())
+
+def _parse_selectolax(html):
+    tree = SelectolaxParser(html)
+    for br in tree.css('br'):
+        br.replace_with(' ')
+    results = []
+    for node in tree.css('div.result'):
+        if 'result--ad' in _classes(node.attributes.get('class')):
+            continue
+        link = node.css_first('a.result__a')
+        if link is None:
+            continue
+        snippet = node.css_first('.result__snippet')
+        results.append({
+            'title': _clean_text(link.text()),
+            'href': link.attributes.get('href'),
+            'snippet': _clean_text(snippet.text()) if snippet else '',
+        })
+    return results
+
+def _parse_lxml(html):
+    tree = lxml.html.fromstring(html)
+    for br in tree.iter('br'):
+        br.tail = ' ' + (br.tail or '')
+    has_class = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+    results = []
+    for node in tree.xpath(f"//div[{has_class.format('result')}]"):
+        if 'result--ad' in _classes(node.get('class')):
+            continue
+        links = node.xpath(f".//a[{has_class.format('result__a')}]")
+        if not links:
+            continue
+        snippets = node.xpath(f".//*[{has_class.format('result__snippet')}]")
+        results.append({
+            'title': _clean_text(links[0].text_content()),
+            'href': links[0].get('href'),
+            'snippet': _clean_text(snippets[0].text_content()) if snippets else '',
+        })
+    return results
+
+VOID_TAGS = {'br', 'img', 'wbr', 'hr', 'input', 'meta', 'link', 'source'}
+
+class _ResultParser(_StdlibHTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.results = []
+        self.current = None
+        self.field = None
+        self.depth = 0
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = _classes(attrs.get('class'))
+        if tag == 'div' and 'result' in classes and 'result--ad' not in classes:
+            self.current = {'title': '', 'href': None, 'snippet': ''}
+            self.results.append(self.current)
+        if self.current is None:
+            return
+        if self.field:
+            if tag not in VOID_TAGS:
+                self.depth += 1
+            elif tag == 'br':
+                self.current[self.field] += ' '
+        elif tag == 'a' and 'result__a' in classes:
+            self.field, self.depth = 'title', 1
+            self.current['href'] = attrs.get('href')
+        elif 'result__snippet' in classes:
+            self.field, self.depth = 'snippet', 1
+    def handle_endtag(self, tag):
+        if self.field:
+            self.depth -= 1
+            if self.depth <= 0:
+                self.field = None
+    def handle_data(self, data):
+        if self.field and self.current is not None:
+            self.current[self.field] += data
+
+def _parse_stdlib(html):
+    parser = _ResultParser()
+    parser.feed(html)
+    return [
+        {'title': _clean_text(r['title']), 'href': r['href'], 'snippet': _clean_text(r['snippet'])}
+        for r in parser.results if r['href']
+    ]
+
+def parse_results(html, base=SEARCH_URL):
+    """Structured results (title, url, snippet) from a DuckDuckGo HTML results page."""
+    if SELECTOLAX_AVAILABLE:
+        raw = _parse_selectolax(html)
+    elif LXML_AVAILABLE:
+        raw = _parse_lxml(html)
+    else:
+        raw = _parse_stdlib(html)
+    results = []
+    seen = set()
+    for item in raw:
+        url = _resolve_link(item['href'], base)
+        if not item['title'] or url in seen:
+            continue
+        seen.add(url)
+        results.append({'title': item['title'], 'url': url, 'snippet': item['snippet']})
+    return results
+
+class WebFetcher:
+    """Answers informational web queries with one HTTP request, no browser.
+
+    Results pages are fetched through a pooled keep-alive client and parsed
+    with selectolax or lxml when installed (html.parser otherwise). The last
+    results are kept so "open result 2" can hand a URL to the WebDriver, and
+    listeners (the API server) get them to show in the UI. Spoken "open result"
+    commands only refer to them for ``results_window`` seconds, or until the
+    assistant runs another command (``expire_results``).
+    """
+    def __init__(self, search_url=SEARCH_URL, timeout=8.0, results_window=FETCH_RESULTS_WINDOW):
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx is required for WebFetcher (pip install httpx)")
+        self.search_url = search_url
+        self.client = httpx.Client(
+            timeout=timeout,
+            follow_redirects=True,
+            headers={'User-Agent': USER_AGENT, 'Accept-Language': 'en-US,en;q=0.9'},
+            limits=httpx.Limits(max_keepalive_connections=4, max_connections=8),
+        )
+        self.last_query = None
+        self.last_results = []
+        self.results_window = results_window
+        self._results_until = 0.0
+        self.listeners = []
+        self._lock = threading.Lock()
+    def add_listener(self, callback):
+        if callback not in self.listeners:
+            self.listeners.append(callback)
+    def search(self, query, limit=8):
+        """Return up to ``limit`` results, or None if the request failed."""
+        try:
+            response = self.client.post(self.search_url, data={'q': query})
+            response.raise_for_status()
+        except Exception as e:
+            print(f"⚠️ Web fetch failed: {str(e)[:100]}")
+            return None
+        results = parse_results(response.text, str(response.url))[:limit]
+        with self._lock:
+            self.last_query = query
+            self.last_results = results
+            self._results_until = time.monotonic() + self.results_window
+        for callback in list(self.listeners):
+            try:
+                callback(query, results)
+            except Exception:
+                pass
+        return results
+    def result_url(self, position):
+        with self._lock:
+            if 1 <= position <= len(self.last_results):
+                return self.last_results[position - 1]['url']
+        return None
+    def has_recent_results(self):
+        with self._lock:
+            return bool(self.last_results) and time.monotonic() < self._results_until
+    def expire_results(self):
+        """Stop spoken "open result N" from meaning these results; the UI can still open them."""
+        with self._lock:
+            self._results_until = 0.0
+    def close(self):
+        self.client.close()
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+def get_web_fetcher():
+    """Shared fetcher (one connection pool per process); None without httpx."""
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None and HTTPX_AVAILABLE:
+            _fetcher = WebFetcher()
+        return _fetcher
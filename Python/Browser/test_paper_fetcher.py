@@ -0,0 +1,137 @@
+
+import sys
+import json
+import hashlib
+import os
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from Browser.PaperFetcher import PaperFetcher, _safe_filename
+
+PDFS = {
+    '/pdf/2401.00001': b'%PDF-1.4 first paper ' + b'a' * 200000,
+    '/pdf/2401.00002': b'%PDF-1.4 second paper ' + b'b' * 150000,
+    '/pdf/2401.00003': b'%PDF-1.4 third paper ' + b'c' * 1000,
+    '/oa/mirror.pdf': b'%PDF-1.4 first paper ' + b'a' * 200000,
+    '/oa/landing.pdf': b'<html>not a pdf</html>',
+}
+
+def _atom(base):
+    entries = []
+    for n in ('00001', '00002', '00003'):
+        entries.append(f"""
+  <entry>
+    <id>http://arxiv.org/abs/2401.{n}v1</id>
+    <title>Fixture Paper {n}</title>
+    <link href="{base}/abs/2401.{n}" rel="alternate" type="text/html"/>
+    <link title="pdf" href="{base}/pdf/2401.{n}" rel="related" type="application/pdf"/>
+  </entry>""")
+    return f'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom">{"".join(entries)}</feed>'
+
+def _semantic(base):
+    return json.dumps({'data': [
+        {'title': 'Fixture paper 00002', 'openAccessPdf': {'url': f'{base}/pdf/2401.00002'},
+         'externalIds': {'ArXiv': '2401.00002'}},
+        {'title': 'Mirrored Copy', 'openAccessPdf': {'url': f'{base}/oa/mirror.pdf'}, 'externalIds': {}},
+        {'title': 'Landing Page Only', 'openAccessPdf': {'url': f'{base}/oa/landing.pdf'}, 'externalIds': {}},
+        {'title': 'No Open Access', 'openAccessPdf': None, 'externalIds': {}},
+    ]})
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    ranges = []
+    def log_message(self, *args):
+        pass
+    def do_GET(self):
+        base = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+        path = self.path.split('?')[0]
+        if path == '/arxiv':
+            return self._send(200, _atom(base).encode(), 'application/atom+xml')
+        if path == '/s2':
+            return self._send(200, _semantic(base).encode(), 'application/json')
+        body = PDFS.get(path)
+        if body is None:
+            return self._send(404, b'', 'text/plain')
+        range_header = self.headers.get('Range')
+        if range_header:
+            FixtureHandler.ranges.append((path, range_header))
+            start = int(range_header.split('=')[1].split('-')[0])
+            return self._send(206, body[start:], 'application/pdf')
+        self._send(200, body, 'application/pdf')
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def _start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    return server, base
+
+def _fetcher(base, downloads_dir, events=None, max_concurrency=3):
+    return PaperFetcher(downloads_dir, max_concurrency=max_concurrency,
+                        arxiv_url=f"{base}/arxiv", semantic_scholar_url=f"{base}/s2",
+                        on_progress=events.append if events is not None else None)
+
+def test_fetch_dedupes_across_sources():
+    server, base = _start_server()
+    try:
+        with tempfile.TemporaryDirectory() as downloads_dir:
+            events = []
+            paths = _fetcher(base, downloads_dir, events, max_concurrency=1).fetch_sync("fixture", max_papers=5)
+            names = sorted(os.path.basename(p).lower() for p in paths)
+            assert names == ['fixture_paper_00001_2401.00001.pdf', 'fixture_paper_00002_2401.00002.pdf',
+                             'fixture_paper_00003_2401.00003.pdf']
+            kinds = [e['event'] for e in events]
+            assert kinds.count('duplicate') == 1
+            assert kinds.count('failed') == 1
+            assert kinds[-1] == 'finished'
+            assert not [f for f in os.listdir(downloads_dir) if f.endswith('.part')]
+    finally:
+        server.shutdown()
+
+def test_fetch_respects_max_papers():
+    server, base = _start_server()
+    try:
+        with tempfile.TemporaryDirectory() as downloads_dir:
+            paths = _fetcher(base, downloads_dir).fetch_sync("fixture", max_papers=2)
+            assert len(paths) == 2
+            assert len([f for f in os.listdir(downloads_dir) if f.endswith('.pdf')]) == 2
+    finally:
+        server.shutdown()
+
+def test_resume_partial_download():
+    server, base = _start_server()
+    try:
+        with tempfile.TemporaryDirectory() as downloads_dir:
+            body = PDFS['/pdf/2401.00001']
+            with open(os.path.join(downloads_dir, 'Fixture_Paper_00001_2401.00001.pdf.part'), 'wb') as f:
+                f.write(body[:50000])
+            FixtureHandler.ranges.clear()
+            _fetcher(base, downloads_dir).fetch_sync("fixture", max_papers=1)
+            assert ('/pdf/2401.00001', 'bytes=50000-') in FixtureHandler.ranges
+            with open(os.path.join(downloads_dir, 'Fixture_Paper_00001_2401.00001.pdf'), 'rb') as f:
+                assert hashlib.sha256(f.read()).hexdigest() == hashlib.sha256(body).hexdigest()
+    finally:
+        server.shutdown()
+
+def test_long_shared_titles_get_distinct_filenames():
+    prefix = "A Survey of Methods for " + "Very " * 15
+    first = {'title': prefix + "Part One", 'pdf_url': 'https://example.org/one.pdf'}
+    second = {'title': prefix + "Part Two", 'pdf_url': 'https://example.org/two.pdf'}
+    assert _safe_filename(first) != _safe_filename(second)
+    assert _safe_filename(dict(first, arxiv_id='2401.00001')) == prefix.strip().replace(' ', '_')[:80] + '_2401.00001.pdf'
+    assert _safe_filename({'title': '???', 'pdf_url': 'https://example.org/one.pdf'}).endswith('.pdf')
+
+if __name__ == "__main__":
+    test_fetch_dedupes_across_sources()
+    test_fetch_respects_max_papers()
+    test_resume_partial_download()
+    test_long_shared_titles_get_distinct_filenames()
+    print("✅ PaperFetcher tests passed")
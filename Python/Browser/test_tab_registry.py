@@ -0,0 +1,74 @@
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from Browser.TabRegistry import TabRegistry
+
+class FakeSwitch:
+    def __init__(self, driver):
+        self.driver = driver
+    def window(self, handle):
+        self.driver.calls.append(('switch', handle))
+        self.driver.current_window_handle = handle
+
+class FakeDriver:
+    """Chromium-like driver: handles are CDP target ids."""
+    def __init__(self):
+        self.targets = {
+            'A': {'targetId': 'A', 'type': 'page', 'title': 'Inbox', 'url': 'https://mail.example/'},
+            'B': {'targetId': 'B', 'type': 'page', 'title': 'Docs', 'url': 'https://docs.example/'},
+            'W': {'targetId': 'W', 'type': 'service_worker', 'title': '', 'url': 'https://docs.example/sw.js'},
+        }
+        self.current_window_handle = 'A'
+        self.calls = []
+        self.switch_to = FakeSwitch(self)
+        self.capabilities = {}
+    @property
+    def window_handles(self):
+        self.calls.append(('window_handles',))
+        return [t for t, info in self.targets.items() if info['type'] == 'page']
+    def execute_cdp_cmd(self, method, params):
+        self.calls.append(('cdp', method))
+        if method == 'Target.getTargets':
+            return {'targetInfos': list(self.targets.values())}
+        if method == 'Target.closeTarget':
+            self.targets.pop(params['targetId'])
+            return {'success': True}
+        raise ValueError(method)
+
+def test_list_and_navigate_from_memory():
+    driver = FakeDriver()
+    registry = TabRegistry(driver)
+    registry.live = True  # as if the CDP event stream were connected
+    registry.apply_event({'method': 'Target.targetCreated', 'params': {'targetInfo':
+        {'targetId': 'C', 'type': 'page', 'title': 'New Tab', 'url': 'about:blank'}}})
+    registry.apply_event({'method': 'Target.targetInfoChanged', 'params': {'targetInfo':
+        {'targetId': 'C', 'type': 'page', 'title': 'News', 'url': 'https://news.example/'}}})
+    driver.calls.clear()
+    assert registry.list() == [
+        ('A', 'Inbox', 'https://mail.example/'),
+        ('B', 'Docs', 'https://docs.example/'),
+        ('C', 'News', 'https://news.example/'),
+    ]
+    assert registry.relative(1) == 'B'
+    assert registry.relative(-1) == 'C'
+    assert driver.calls == [], driver.calls
+    registry.activate(registry.relative(-1))
+    assert driver.calls == [('switch', 'C')]
+    registry.apply_event({'method': 'Target.targetDestroyed', 'params': {'targetId': 'B'}})
+    assert registry.handles() == ['A', 'C']
+
+def test_close_other_tab_without_switching():
+    driver = FakeDriver()
+    registry = TabRegistry(driver)
+    driver.calls.clear()
+    registry.close('B')
+    assert ('switch', 'B') not in driver.calls
+    assert [h for h, _, _ in registry.list()] == ['A']
+
+if __name__ == "__main__":
+    test_list_and_navigate_from_memory()
+    test_close_other_tab_without_switching()
+    print("✅ TabRegistry tests passed")
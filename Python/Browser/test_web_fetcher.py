@@ -0,0 +1,113 @@
+
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from urllib.parse import parse_qs
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import Browser.WebFetcher as web_fetcher
+from Browser.WebFetcher import WebFetcher, parse_results
+
+RESULTS_PAGE = """<!DOCTYPE html>
+<html><body>
+<div class="result results_links result--ad">
+  <a class="result__a" href="https://ads.example/">Sponsored thing</a>
+</div>
+<div class="result results_links results_links_deep web-result">
+  <div class="links_main links_deep result__body">
+    <h2 class="result__title">
+      <a rel="nofollow" class="result__a" href="//duckduckgo.com/l/?uddg=https%3A%2F%2Fdocs.python.org%2F3%2F&amp;rut=abc">Python <b>3</b> documentation</a>
+    </h2>
+    <a class="result__snippet" href="//duckduckgo.com/l/?uddg=https%3A%2F%2Fdocs.python.org%2F3%2F">Welcome! This is the <b>official</b> documentation<br>for Python.</a>
+  </div>
+</div>
+<div class="result results_links web-result">
+  <div class="links_main result__body">
+    <h2 class="result__title"><a class="result__a" href="https://www.python.org/">Welcome to Python.org</a></h2>
+    <div class="result__snippet">The official home of the Python Programming Language</div>
+  </div>
+</div>
+<div class="result results_links web-result">
+  <h2 class="result__title"><a class="result__a" href="https://www.python.org/">Duplicate of python.org</a></h2>
+</div>
+</body></html>"""
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    queries = []
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.queries.append(parse_qs(self.rfile.read(length).decode()).get('q', [''])[0])
+        body = RESULTS_PAGE.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    def log_message(self, format, *args):
+        pass
+
+EXPECTED = [
+    {'title': 'Python 3 documentation', 'url': 'https://docs.python.org/3/',
+     'snippet': 'Welcome! This is the official documentation for Python.'},
+    {'title': 'Welcome to Python.org', 'url': 'https://www.python.org/',
+     'snippet': 'The official home of the Python Programming Language'},
+]
+
+def test_parse_results_with_each_parser():
+    parsers = ['stdlib']
+    if web_fetcher.SELECTOLAX_AVAILABLE:
+        parsers.append('selectolax')
+    if web_fetcher.LXML_AVAILABLE:
+        parsers.append('lxml')
+    for name in parsers:
+        original = (web_fetcher.SELECTOLAX_AVAILABLE, web_fetcher.LXML_AVAILABLE)
+        web_fetcher.SELECTOLAX_AVAILABLE = name == 'selectolax'
+        web_fetcher.LXML_AVAILABLE = name == 'lxml'
+        try:
+            results = parse_results(RESULTS_PAGE, "https://html.duckduckgo.com/html/")
+        finally:
+            web_fetcher.SELECTOLAX_AVAILABLE, web_fetcher.LXML_AVAILABLE = original
+        assert results == EXPECTED, f"{name}: {results}"
+
+def test_search_over_http_keeps_last_results():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        fetcher = WebFetcher(search_url=f"http://127.0.0.1:{server.server_address[1]}/html/")
+        seen = []
+        fetcher.add_listener(lambda query, results: seen.append((query, len(results))))
+        results = fetcher.search("python docs")
+        assert FixtureHandler.queries[-1] == "python docs"
+        assert [r['url'] for r in results] == [r['url'] for r in EXPECTED]
+        assert fetcher.result_url(2) == 'https://www.python.org/'
+        assert fetcher.result_url(3) is None
+        assert seen == [("python docs", 2)]
+        assert fetcher.has_recent_results()
+        fetcher.expire_results()
+        assert not fetcher.has_recent_results()
+        assert fetcher.result_url(2) == 'https://www.python.org/'
+        fetcher.close()
+    finally:
+        server.shutdown()
+
+def test_results_go_stale_after_the_window():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        fetcher = WebFetcher(search_url=f"http://127.0.0.1:{server.server_address[1]}/html/", results_window=0.05)
+        fetcher.search("python docs")
+        assert fetcher.has_recent_results()
+        time.sleep(0.1)
+        assert not fetcher.has_recent_results()
+        fetcher.close()
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_parse_results_with_each_parser()
+    test_search_over_http_keeps_last_results()
+    test_results_go_stale_after_the_window()
+    print("✅ WebFetcher tests passed")
@@ -1,6 +1,7 @@
 
 import re
 from enum import Enum
+from System.AppRegistry import get_app_registry
 
 class CommandType(Enum):
     SYSTEM = "system"
@@ -9,6 +10,7 @@ class CommandType(Enum):
 
 class CommandClassifier:
     def __init__(self):
+        self.app_keywords = get_app_registry().classifier_keywords
         self.system_patterns = [
             r'\b(open|launch|start|run|execute)\s+\w+',
             r'\b(close|quit|exit|kill|stop)\s+\w+',
@@ -126,11 +128,7 @@ class CommandClassifier:
             return -10
         if text.strip().lower().startswith(('open ', 'launch ', 'start ', 'run ', 'execute ', 'close ', 'quit ')):
             score += 3
-        apps = ['chrome', 'firefox', 'brave', 'edge', 'safari', 'notepad', 
-                'calculator', 'terminal', 'cmd', 'settings', 'explorer',
-                'finder', 'spotify', 'discord', 'steam', 'vlc', 'code', 'vscode',
-                'visual', 'studio', 'tool', 'app', 'application']
-        for app in apps:
+        for app in self.app_keywords:
             if app in text:
                 score += 2
         system_keywords = ['file', 'folder', 'directory', 'volume', 'brightness',
@@ -0,0 +1,514 @@
+import re
+from Browser.PlatformRegistry import get_platform_registry
+
+BROWSERS = ('chrome', 'firefox', 'edge', 'safari', 'brave', 'opera')
+BROWSER_WORDS = BROWSERS + ('browser',)
+SEARCH_VERBS = ('search', 'searc', 'serch', 'find', 'lookup')
+LAUNCH_WORDS = ('open', 'launch', 'start')
+CREATE_WORDS = ('create', 'make')
+FILE_NAME_STOPWORDS = ('called', 'named', 'titled', 'a', 'the')
+OPENED_FILE_STOPWORDS = FILE_NAME_STOPWORDS + ('it',)
+SWITCH_APP_KEYWORDS = ('chrome', 'firefox', 'vscode', 'code', 'terminal', 'calculator',
+                       'notepad', 'word', 'excel', 'browser', 'spotify', 'discord',
+                       'steam', 'vlc', 'gimp', 'photoshop')
+FILE_APP_KEYWORDS = (
+    ('vscode', ('vscode', 'vs code', 'visual studio code', 'code editor')),
+    ('chrome', ('chrome', 'browser', 'google chrome')),
+    ('firefox', ('firefox',)),
+    ('notepad', ('notepad',)),
+)
+EDITOR_ALIASES = ('vs', 'vscode', 'visual studio', 'visual studio code', 'code')
+APP_COMMANDS = ('save file', 'save', 'copy', 'paste', 'cut', 'undo', 'redo',
+                'select all', 'bold', 'italic', 'underline', 'find', 'replace')
+KNOWN_WEBSITES = ('youtube', 'google', 'facebook', 'instagram', 'twitter', 'reddit',
+                  'github', 'amazon', 'netflix', 'spotify', 'linkedin', 'wikipedia',
+                  'flipkart', 'gmail', 'yahoo', 'bing', 'chatgpt', 'whatsapp')
+WEBSITE_APPS = ('steam', 'chrome', 'firefox', 'calculator', 'discord', 'vscode', 'code')
+RESEARCH_FILLER = ('download', 'fetch', 'get', 'me', 'all', 'research', 'of', 'on', 'about', 'for')
+
+# Preprocessing
+RESEARCH_BROWSER = re.compile(r'\b(open|use|go to)\s+(my\s+)?(default\s+)?browser\s+(and|to)\s+', re.IGNORECASE)
+BROWSER_SEARCH = re.compile(r'\b(open|use|go to)\s+(my\s+)?(default\s+)?browser\s+(and|to)\s+(go to|search|find|lookup)?\s*(.+)', re.IGNORECASE)
+COMMA = re.compile(r',\s+')
+FILE_POLITENESS = re.compile(r'^(i\s+want\s+you\s+to|i\s+want|please|can\s+you|could\s+you|would\s+you)\s+', re.IGNORECASE)
+GREETING_PREFIX = re.compile(r'^(hello|hi|hey|good morning|good afternoon|good evening|namaste)\s+', re.IGNORECASE)
+ADDRESS = re.compile(r'\b(bot|chatbot|assistant|either)\b', re.IGNORECASE)
+REQUEST_PHRASE = re.compile(r'\b(what i want you to do is|i want you to|i need you to)\b', re.IGNORECASE)
+WOULD_SAY = re.compile(r'\bi would say\b', re.IGNORECASE)
+SPACES = re.compile(r'\s+')
+LEADING_COMMAS = re.compile(r'^[,\s]+')
+
+# Grammar
+PLATFORM_ON = re.compile(r'(?:search|find|lookup)\s+(?:for\s+)?(?P<query>.+?)\s+(?:on|in)\s+(?P<platform>\w+)')
+GO_AND_SEARCH = re.compile(r'(?:go to|open|use)\s+(?P<platform>\w+)\s+(?:and|to)\s+(?:search|find|lookup|write)\s+(?:for\s+)?(?P<query>.+)')
+OPEN_OR_USE_APP = re.compile(r'(?:open|use)\s+(\w+)')
+HINGLISH_SEARCH = re.compile(r'(?P<platform>\w+)\s+(?:pe|mein|me)\s+(?:search|find|dhoondo)\s+(?P<query>.+)')
+LAUNCH_BROWSER_SEARCH = {
+    browser: re.compile(r'(?:open|launch|start)\s+(' + browser + r')\s+and\s+(?:search|searc|serch|find|lookup)\s+(?:for\s+)?(.+)')
+    for browser in BROWSER_WORDS
+}
+LAUNCH_AND_CREATE_FILE = (
+    re.compile(r'(?:open|launch|start)\s+(.+?)\s+(?:and|,)\s+(?:create|make)\s+(?:and\s+)?(?:open\s+)?(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)'),
+    re.compile(r'(?:open|launch|start)\s+(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)'),
+    re.compile(r'(?:open|launch|start)\s+(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)'),
+)
+APP_AND_CREATE_FILE = (
+    re.compile(r'^(.+?)\s+and\s+(?:create|make)\s+(?:and\s+)?(?:open\s+)?(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)'),
+    re.compile(r'^(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)'),
+    re.compile(r'^(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)'),
+)
+APP_AND_SEARCH = re.compile(r'^(.+?)\s+and\s+(?:search|searc|serch|find|lookup)\s+(?:for\s+)?(.+)')
+CREATE_FILE = (
+    re.compile(r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)\s+([^\s]+(?:\.[^\s]+)?(?:\s|$))'),
+    re.compile(r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)'),
+    re.compile(r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\s+[^\s]+)*?)(?:\s+and|\s+in|\s+to|$)'),
+)
+CREATE_FILE_TO_OPEN = (
+    re.compile(r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)'),
+    re.compile(r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)'),
+)
+DOWNLOAD_SOURCES = (
+    (re.compile(r'(?:from|via|through|using)\s+(?:the\s+)?(web|internet|online|website)'), 'web'),
+    (re.compile(r'(?:from|via|through|using)\s+(?:the\s+)?(terminal|package\s+manager|apt|dnf|brew|choco)'), 'terminal'),
+    (re.compile(r'(?:from|via|through|using)\s+(?:the\s+)?(snap(?:\s+store)?)'), 'snap'),
+    (re.compile(r'(?:from|via|through|using)\s+(?:the\s+)?(flatpak)'), 'flatpak'),
+    (re.compile(r'(?:from|via|through|using)\s+(?:the\s+)?(app\s+store|microsoft\s+store|mac\s+app\s+store|gnome\s+software)'), 'appstore'),
+)
+NEW_TAB = re.compile(r'(create|open|new)\s+(?:a\s+)?(?:new\s+)?tab')
+NEW_TAB_URL = re.compile(r'(?:and\s+)?(?:open|go to)\s+(\w+(?:\.\w+)?)')
+FIRST_TAB = re.compile(r'(switch to|go to|move to)\s+first\s+tab')
+LAST_TAB = re.compile(r'(switch to|go to|move to)\s+last\s+tab')
+NEXT_TAB = re.compile(r'(switch to|go to|move to)\s+next\s+tab|next tab')
+PREVIOUS_TAB = re.compile(r'(switch to|go to|move to)\s+prev(?:ious)?\s+tab|previous tab')
+TAB_NUMBER = re.compile(r'(switch to|go to|move to)\s+tab\s+(\d+)')
+TAB_ORDINAL = re.compile(r'(switch to|go to|move to)\s+(\d+)(?:st|nd|rd|th)\s+tab')
+CLOSE_TAB = re.compile(r'close\s+(?:this\s+|current\s+)?tab')
+CLOSE_OTHER_TABS = re.compile(r'close\s+(?:all\s+)?other\s+tabs')
+LIST_TABS = re.compile(r'(list|show)\s+(?:all\s+)?tabs')
+NEW_WINDOW = re.compile(r'(create|open|new)\s+(?:a\s+)?(?:new\s+)?window')
+INCOGNITO_WINDOW = re.compile(r'(create|open|new)\s+(?:an?\s+)?(?:incognito|private)\s+window')
+GO_BACK = re.compile(r'\bgo\s+back\b|\bback\b')
+GO_FORWARD = re.compile(r'\bgo\s+forward\b|\bforward\b')
+CURRENT_URL = re.compile(r'(what\s+is|show|get|tell)\s+(the\s+)?current\s+url')
+PAGE_TITLE = re.compile(r'(what\s+is|show|get|tell)\s+(the\s+)?page\s+title')
+NUMBER = re.compile(r'(\d+)(st|nd|rd|th)?')
+CLICK_TARGET = (
+    re.compile(r'click\s+on\s+(?:the\s+)?(.+)'),
+    re.compile(r'press\s+on\s+(?:the\s+)?(.+)'),
+    re.compile(r'select\s+(?:the\s+)?(.+)'),
+    re.compile(r'click\s+(.+)'),
+)
+CALLED = re.compile(r'(?:called|titled|named)\s+([^\s]+(?:\s+[^\s]+)*?)(?:\s+file|\s+page|\s+link|\s+in|\s+on|\s+can|$)')
+VAGUE_CLICK_TARGETS = ('cross', 'cross button', 'popup', 'first', 'first link', 'that', 'this', 'it')
+GREETING_ONLY = re.compile(r'^(hello|hi|hey|thank you|thanks|how are you|namaste|kaise ho)[\s\.,!?]*$')
+
+# Filler removal for conversational commands
+FILLER_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\b(hello|hi|hey|good morning|good afternoon|good evening|namaste|namaskar)\b',
+    r'\b(bot|assistant|either|either assistant|alexa|siri)\b',
+    r'\b(how are you|what\'s up|kaise ho|kya hal hai)\??',
+    r'\b(what i want you to do is|i want you to do is|i want you to|i need you to|i would like you to)\b',
+    r'\b(what i want is|i want to|i need to|i would like to)\b',
+    r'\b(go to a web and|go to the web and|go to web and|on the web|on web)\b',
+    r'\b(go to a|go to the|go to)\b',
+    r'\b(please|kindly|can you|could you|would you|will you|would you please|for me|thank you|thanks|dhanyavaad|shukriya|karo|kijiye)\b',
+    r'^\s*(can|could|would|will|do|does|what|so)\s+',
+    r'\b(just|really|actually|basically|literally|so|what)\b',
+))
+PUNCTUATION = re.compile(r'[,?!]+')
+LEADING_CONNECTIVE = re.compile(r'^(to|and)\s+')
+LAUNCH_VERB = re.compile(r'^(open|close|start|launch)')
+ARTICLES = re.compile(r'\b(the|a|an)\b')
+TRAILING_FOR = re.compile(r'\sfor\s+(?=\w+\s*$)')
+LEADING_PREPOSITION = re.compile(r'^(to|for|at|in|on)\s+')
+
+def preprocess_text(text):
+    cleaned = text
+    lower = cleaned.lower()
+    if 'research' in lower and ('download' in lower or 'fetch' in lower):
+        if RESEARCH_BROWSER.search(cleaned):
+            return RESEARCH_BROWSER.sub('', cleaned).strip()
+    browser_search = BROWSER_SEARCH.search(cleaned)
+    if browser_search:
+        return f"search {browser_search.group(6).strip()}"
+    cleaned = COMMA.sub(' and ', cleaned)
+    lower = cleaned.lower()
+    if ('create' in lower or 'make' in lower) and 'file' in lower:
+        cleaned = FILE_POLITENESS.sub('', cleaned)
+    cleaned = GREETING_PREFIX.sub('', cleaned)
+    cleaned = ADDRESS.sub('', cleaned)
+    cleaned = REQUEST_PHRASE.sub('', cleaned)
+    cleaned = WOULD_SAY.sub('', cleaned)
+    cleaned = SPACES.sub(' ', cleaned).strip()
+    cleaned = LEADING_COMMAS.sub('', cleaned)
+    cleaned = cleaned.strip()
+    return cleaned if len(cleaned) > 2 else text
+
+def strip_filler(text):
+    """Drop greetings, politeness and filler words; returns ``text`` unchanged if too little is left."""
+    lowered = text.lower()
+    cleaned = lowered
+    for _ in range(2):
+        before = cleaned
+        for pattern in FILLER_PATTERNS:
+            cleaned = pattern.sub('', cleaned)
+        if cleaned == before:
+            break
+    cleaned = PUNCTUATION.sub(' ', cleaned)
+    cleaned = SPACES.sub(' ', cleaned).strip()
+    cleaned = LEADING_CONNECTIVE.sub('', cleaned)
+    if not LAUNCH_VERB.search(cleaned):
+        cleaned = ARTICLES.sub('', cleaned)
+    cleaned = TRAILING_FOR.sub(' ', cleaned)
+    cleaned = SPACES.sub(' ', cleaned).strip()
+    cleaned = LEADING_PREPOSITION.sub('', cleaned)
+    if len(cleaned) >= 3 and cleaned != lowered:
+        return cleaned
+    return text
+
+class _Command:
+    __slots__ = ('text', 'cleaned', 'lower')
+    def __init__(self, text):
+        self.text = text
+        self.cleaned = preprocess_text(text)
+        self.lower = self.cleaned.lower().strip()
+
+def _is_platform(name):
+    return len(name) > 3 or any(indicator in name for indicator in get_platform_registry().web_indicators)
+
+def _normalize_editor(app_name):
+    app_name = app_name.replace('vs code', 'vscode').replace('visual studio code', 'vscode').replace(' vs ', ' vscode ')
+    return 'vscode' if app_name.strip() == 'vs' else app_name
+
+def _rest(lower):
+    words = lower.split(None, 1)
+    return words[1] if len(words) > 1 else lower
+
+def _open_and_search(app_name, query):
+    return {"action": "complex_command", "steps": [
+        {"action": "open_app", "app_name": app_name},
+        {"action": "web_search", "query": query}
+    ]}
+
+def _open_and_create(app_name, file_name):
+    return {"action": "complex_command", "steps": [
+        {"action": "open_app", "app_name": app_name},
+        {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": app_name}
+    ]}
+
+def _create_file(lower, open_in_app):
+    for pattern in CREATE_FILE:
+        match = pattern.search(lower)
+        if match:
+            file_name = match.group(1).strip().rstrip('.,!?;:')
+            if file_name and file_name not in FILE_NAME_STOPWORDS:
+                if 'vscode' in lower or 'visual studio' in lower or 'code' in lower:
+                    open_in_app = 'vscode'
+                return {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": open_in_app}
+    return None
+
+def _mentioned_file_app(lower):
+    for app, keywords in FILE_APP_KEYWORDS:
+        if any(keyword in lower for keyword in keywords):
+            return app
+    return None
+
+def _create_and_open(lower, app_mentioned):
+    if 'open it' in lower or 'open in' in lower or app_mentioned:
+        for pattern in CREATE_FILE_TO_OPEN:
+            match = pattern.search(lower)
+            if match:
+                file_name = match.group(1).strip().rstrip('.,!?;:')
+                if file_name and file_name not in OPENED_FILE_STOPWORDS:
+                    return {"action": "complex_command", "steps": [
+                        {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": app_mentioned or 'vscode'}
+                    ]}
+    return None
+
+# Guards take the cleaned, lower-cased command; whatever they return is passed on as ``hit``.
+
+def _has(*words):
+    return lambda lower: any(word in lower for word in words)
+
+def _starts(*prefixes):
+    return lambda lower: lower.startswith(prefixes)
+
+def _all(*guards):
+    return lambda lower: all(guard(lower) for guard in guards)
+
+_has_launch = _has(*LAUNCH_WORDS)
+_has_create = _has(*CREATE_WORDS)
+_has_file = _has('file')
+
+# Handlers take (command, hit) and return the action dict, or None to keep looking.
+
+def _result(action, **fields):
+    fixed = {"action": action, **fields}
+    return lambda command, hit: dict(fixed)
+
+def _browser(name):
+    return _result("browser_control", command=name)
+
+def _key(name):
+    return _result("app_command", command=name)
+
+def _platform_search(command, match):
+    platform = match.group('platform').strip()
+    if _is_platform(platform):
+        return {"action": "platform_search", "platform": platform, "query": match.group('query').strip()}
+    return None
+
+def _platform_or_browser_search(command, match):
+    target = match.group('platform').strip().lower()
+    query = match.group('query').strip()
+    if any(browser in target for browser in BROWSERS):
+        app_match = OPEN_OR_USE_APP.search(command.lower)
+        if app_match:
+            return _open_and_search(app_match.group(1).strip(), query)
+    if _is_platform(target):
+        return {"action": "platform_search", "platform": target, "query": query}
+    return None
+
+def _launch_browser_and_search(command, hit):
+    for browser in BROWSER_WORDS:
+        if browser in command.lower:
+            match = LAUNCH_BROWSER_SEARCH[browser].search(command.lower)
+            if match:
+                return _open_and_search(match.group(1).strip(), match.group(2).strip())
+    return None
+
+def _launch_and_create_file(command, hit):
+    for pattern in LAUNCH_AND_CREATE_FILE:
+        match = pattern.search(command.lower)
+        if match:
+            file_name = match.group(2).strip().rstrip('.,!?;:')
+            if file_name and file_name not in OPENED_FILE_STOPWORDS:
+                return _open_and_create(_normalize_editor(match.group(1).strip().rstrip(',')), file_name)
+    return None
+
+def _web_search(command, hit):
+    return {"action": "web_search", "query": _rest(command.lower)}
+
+def _switch_app(command, hit):
+    lower = command.lower
+    if 'switch back' in lower or 'previous app' in lower:
+        return {"action": "switch_app", "app_name": "previous"}
+    app_name = lower
+    for prefix in ('switch to ', 'go to ', 'focus on '):
+        if lower.startswith(prefix):
+            app_name = lower[len(prefix):].strip()
+            break
+    if any(keyword in app_name for keyword in SWITCH_APP_KEYWORDS):
+        return {"action": "switch_app", "app_name": app_name}
+    return None
+
+def _open_app(command, hit):
+    app_name = _rest(command.lower)
+    has_separator = 'and' in app_name or ',' in app_name
+    if has_separator and ('create' in app_name or 'make' in app_name) and 'file' in app_name:
+        normalized = app_name.replace(',', ' and ')
+        for pattern in APP_AND_CREATE_FILE:
+            match = pattern.search(normalized)
+            if match:
+                file_name = match.group(2).strip().rstrip('.,!?;:')
+                if file_name and file_name not in OPENED_FILE_STOPWORDS:
+                    return _open_and_create(_normalize_editor(match.group(1).strip().rstrip(',')), file_name)
+    if has_separator and any(verb in app_name for verb in SEARCH_VERBS):
+        normalized = app_name.replace(',', ' and ')
+        if any(browser in normalized for browser in BROWSER_WORDS):
+            match = APP_AND_SEARCH.search(normalized)
+            if match:
+                browser_name = match.group(1).strip()
+                if any(browser in browser_name for browser in BROWSER_WORDS):
+                    return _open_and_search(browser_name, match.group(2).strip())
+        parts = app_name.split('and')
+        if len(parts) >= 2:
+            query_parts = []
+            for part in parts[1:]:
+                part = part.replace('search', '').replace('searc', '').replace('serch', '').replace('find', '').replace('lookup', '').strip()
+                if part:
+                    query_parts.append(part)
+            query = ' '.join(query_parts).strip()
+            target = parts[0].strip()
+            if any(browser in target for browser in BROWSER_WORDS):
+                return _open_and_search(target, query)
+            return {"action": "platform_search", "platform": target, "query": query}
+    if app_name in EDITOR_ALIASES:
+        app_name = 'vscode'
+    return {"action": "open_app", "app_name": app_name}
+
+def _create_named_file(command, hit):
+    return _create_file(command.lower, None)
+
+def _create_file_in_app(command, hit):
+    lower = command.lower
+    app_mentioned = _mentioned_file_app(lower)
+    return _create_and_open(lower, app_mentioned) or _create_file(lower, app_mentioned)
+
+def _type_text(command, hit):
+    # Sliced from the raw text to keep the original casing.
+    for prefix in ('type ', 'write ', 'enter '):
+        if command.lower.startswith(prefix):
+            return {"action": "app_command", "command": "type", "params": {"text": command.text[len(prefix):].strip()}}
+
+def _app_command(command, hit):
+    for name in APP_COMMANDS:
+        if name in command.lower:
+            return {"action": "app_command", "command": name}
+
+def _play_media(command, hit):
+    query = command.lower.replace('play ', '').replace('the ', '').replace('first ', '').strip()
+    return {"action": "play_media", "query": query, "platform": "youtube"}
+
+def _download_research(command, hit):
+    topic = command.lower
+    for filler in RESEARCH_FILLER:
+        topic = topic.replace(filler, '')
+    return {"action": "download_research", "topic": topic.strip(), "max_papers": 5}
+
+def _download_app(command, hit):
+    app_name = _rest(command.lower).replace('for me', '').strip()
+    if 'research' in app_name or 'papers' in app_name:
+        topic = app_name.replace('research', '').replace('papers', '').replace('on', '').replace('about', '').strip()
+        return {"action": "download_research", "topic": topic, "max_papers": 5}
+    source = "web"
+    for pattern, name in DOWNLOAD_SOURCES:
+        if pattern.search(app_name):
+            source = name
+            app_name = pattern.sub('', app_name).strip()
+            break
+    return {"action": "download_app", "app_name": app_name, "source": source}
+
+def _open_website(command, hit):
+    target = command.lower.replace('go to ', '').replace('goto ', '').replace('open ', '').replace('visit ', '').strip()
+    if 'and search' in target or 'and find' in target or 'and write' in target:
+        parts = target.split('and')
+        query = ' '.join(parts[1:]).replace('search', '').replace('find', '').replace('write', '').strip()
+        return {"action": "platform_search", "platform": parts[0].strip(), "query": query}
+    if any(site in target for site in KNOWN_WEBSITES):
+        return {"action": "open_website", "url": f"{target}.com"}
+    if any(app in target for app in WEBSITE_APPS):
+        return {"action": "open_app", "app_name": target}
+    if '.com' in target or '.org' in target or '.net' in target or '.io' in target:
+        return {"action": "open_website", "url": target}
+    return {"action": "open_website", "url": f"{target}.com"}
+
+def _new_tab(command, hit):
+    url_match = NEW_TAB_URL.search(command.lower)
+    if url_match:
+        return {"action": "browser_control", "command": "new_tab", "url": url_match.group(1)}
+    return {"action": "browser_control", "command": "new_tab"}
+
+def _switch_to_tab(command, match):
+    return {"action": "browser_control", "command": "switch_to_tab", "tab_index": int(match.group(2))}
+
+def _click(command, hit):
+    lower = command.lower
+    number_match = NUMBER.search(lower)
+    if number_match:
+        element_type = 'link'
+        for candidate in ('video', 'link', 'button', 'result'):
+            if candidate in lower:
+                element_type = candidate
+                break
+        return {"action": "browser_control", "command": "click_nth", "position": int(number_match.group(1)), "element_type": element_type}
+    for pattern in CLICK_TARGET:
+        match = pattern.search(lower)
+        if match:
+            text_to_click = match.group(1).strip()
+            if 'called' in lower or 'titled' in lower or 'named' in lower:
+                called_match = CALLED.search(lower)
+                if called_match:
+                    text_to_click = called_match.group(1).strip()
+            if text_to_click not in VAGUE_CLICK_TARGETS and len(text_to_click) > 2:
+                return {"action": "browser_control", "command": "click_by_text", "text": text_to_click}
+    return {"action": "browser_control", "command": "click_first_link"}
+
+def _create_and_open_file(command, hit):
+    return _create_and_open(command.lower, _mentioned_file_app(command.lower))
+
+def _conversation(command, hit):
+    return {"action": "conversation", "text": command.text}
+
+def _single_word_app(command, hit):
+    return {"action": "open_app", "app_name": command.lower}
+
+# (name, guard, handler, group). Rules are tried in order and the first non-None
+# result wins. Within a group only the first rule whose guard matches gets to run:
+# if its handler comes back empty the rest of that group is skipped.
+RULES = (
+    ('platform_on', PLATFORM_ON.search, _platform_search, None),
+    ('go_and_search', GO_AND_SEARCH.search, _platform_or_browser_search, None),
+    ('hinglish_search', HINGLISH_SEARCH.search, _platform_search, None),
+    ('launch_browser_and_search', _all(_has_launch, _has(*SEARCH_VERBS), _has(*BROWSER_WORDS)), _launch_browser_and_search, None),
+    ('launch_and_create_file', _all(_has_launch, _has_create, _has_file), _launch_and_create_file, None),
+
+    ('web_search', _starts('search ', 'google ', 'find ', 'lookup '), _web_search, 'command'),
+    ('switch_app', _starts('switch to ', 'switch back', 'go to ', 'focus on '), _switch_app, 'command'),
+    ('open_app', _starts('open ', 'launch ', 'start ', 'run '), _open_app, 'command'),
+    ('create_named_file', _has('create file', 'make file'), _create_named_file, 'command'),
+    ('create_file_in_app', _all(_has_create, _has_file), _create_file_in_app, 'command'),
+    ('type', _starts('type ', 'write ', 'enter '), _type_text, 'command'),
+    ('app_command', _has(*APP_COMMANDS), _app_command, 'command'),
+    ('play_media', _starts('play ', 'play the ', 'play first '), _play_media, 'command'),
+    ('download_research', _all(_has('research'), _has('download', 'fetch', 'get')), _download_research, 'command'),
+    ('download_app', _starts('download ', 'install ', 'get '), _download_app, 'command'),
+    ('open_website', _starts('go to ', 'goto ', 'open ', 'visit '), _open_website, 'command'),
+    ('list_apps', _has('list app', 'show app'), _result("list_apps"), 'command'),
+    ('show_page', _has("what's on", 'show page', 'read page', 'page content'), _browser("show_page"), 'command'),
+    ('scroll_down', _has('scroll down'), _browser("scroll_down"), 'command'),
+    ('scroll_up', _has('scroll up'), _browser("scroll_up"), 'command'),
+    ('close_popup', _has('close popup', 'close pop up', 'press cross', 'click cross'), _browser("close_popup"), 'command'),
+    ('volume_up', _has('volume up', 'increase volume'), _browser("volume_up"), 'command'),
+    ('volume_down', _has('volume down', 'decrease volume'), _browser("volume_down"), 'command'),
+    ('new_tab', NEW_TAB.search, _new_tab, 'command'),
+    ('first_tab', FIRST_TAB.search, _browser("first_tab"), 'command'),
+    ('last_tab', LAST_TAB.search, _browser("last_tab"), 'command'),
+    ('next_tab', NEXT_TAB.search, _browser("next_tab"), 'command'),
+    ('previous_tab', PREVIOUS_TAB.search, _browser("previous_tab"), 'command'),
+    ('tab_number', TAB_NUMBER.search, _switch_to_tab, 'command'),
+    ('tab_ordinal', TAB_ORDINAL.search, _switch_to_tab, 'command'),
+    ('close_tab', CLOSE_TAB.search, _browser("close_tab"), 'command'),
+    ('close_other_tabs', CLOSE_OTHER_TABS.search, _browser("close_other_tabs"), 'command'),
+    ('list_tabs', LIST_TABS.search, _browser("list_tabs"), 'command'),
+    ('new_window', NEW_WINDOW.search, _browser("new_window"), 'command'),
+    ('incognito_window', INCOGNITO_WINDOW.search, _browser("incognito_window"), 'command'),
+    ('maximize', _all(_has('maximize'), _has('window')), _browser("maximize"), 'command'),
+    ('minimize', _all(_has('minimize'), _has('window')), _browser("minimize"), 'command'),
+    ('fullscreen', _has('fullscreen', 'full screen'), _browser("fullscreen"), 'command'),
+    ('go_back', GO_BACK.search, _browser("go_back"), 'command'),
+    ('go_forward', GO_FORWARD.search, _browser("go_forward"), 'command'),
+    ('refresh', _has('refresh', 'reload'), _browser("refresh"), 'command'),
+    ('get_url', CURRENT_URL.search, _browser("get_url"), 'command'),
+    ('get_title', PAGE_TITLE.search, _browser("get_title"), 'command'),
+    ('click_first_link', _all(_has('click'), _has('first')), _browser("click_first_link"), 'command'),
+    ('enter', _has('press enter', 'hit enter', 'press return'), _key("enter"), 'command'),
+    ('escape', _has('press escape', 'hit escape', 'press esc'), _key("escape"), 'command'),
+    ('tab', _has('press tab', 'hit tab'), _key("tab"), 'command'),
+    ('delete', _has('delete', 'backspace'), _key("delete"), 'command'),
+    ('click', _has('click', 'press', 'select'), _click, 'command'),
+
+    ('create_and_open_file', _all(_has_create, _has_file), _create_and_open_file, None),
+    ('greeting', GREETING_ONLY.match, _conversation, None),
+    ('single_word_app', lambda lower: len(lower.split()) == 1 and len(lower) > 2, _single_word_app, None),
+)
+
+def match_rule(text):
+    """(rule name, action dict) for ``text``; the name is None for the web search default."""
+    command = _Command(text)
+    lower = command.lower
+    skipped = None
+    for name, guard, handler, group in RULES:
+        if skipped is not None and group == skipped:
+            continue
+        hit = guard(lower)
+        if hit:
+            result = handler(command, hit)
+            if result is not None:
+                return name, result
+            skipped = group
+    return None, {"action": "web_search", "query": command.cleaned}
+
+def parse(text):
+    """Offline command grammar used when Gemini is unavailable."""
+    return match_rule(text)[1]
@@ -2,6 +2,12 @@
 import requests
 import json
 from config import GEMINI_API_KEY
+from Metrics import GEMINI_REQUESTS, GEMINI_SECONDS
+from GeminiGateway import GeminiRateLimited, get_gemini_gateway
+import FallbackParser
+from LocalIntentModel import get_local_intent_model, log_example
+from ParseRace import PARSE_RACE_ENABLED, ParseRace, local_parse
+import time
 
 class GeminiAssistant:
     def __init__(self):
@@ -13,6 +19,10 @@ class GeminiAssistant:
         import platform
         self.os_name = platform.system()
         self.default_browser = self._detect_default_browser()
+        self.gateway = get_gemini_gateway()
+        # Off for callers whose replies are not real Gemini labels (stubs, benchmarks).
+        self.log_intents = True
+        self._race = ParseRace(self._gemini_parse)
     def _detect_default_browser(self):
         import platform
         os_name = platform.system()
@@ -23,47 +33,36 @@ class GeminiAssistant:
         elif os_name == "Windows":
             return "Edge/Chrome"
         return "Chrome"
+    def _generate(self, payload, timeout, purpose):
+        return self.gateway.call(purpose, payload, lambda: self._post(payload, timeout, purpose))
+    def _post(self, payload, timeout, purpose):
+        start = time.perf_counter()
+        try:
+            response = requests.post(self.api_url, headers=self.headers, data=json.dumps(payload), timeout=timeout)
+        except requests.exceptions.Timeout:
+            GEMINI_REQUESTS.inc(purpose, 'timeout')
+            raise
+        except Exception:
+            GEMINI_REQUESTS.inc(purpose, 'error')
+            raise
+        finally:
+            GEMINI_SECONDS.observe(time.perf_counter() - start, purpose)
+        GEMINI_REQUESTS.inc(purpose, str(response.status_code))
+        return response
     def _preprocess_text(self, text):
-        import re
-        cleaned = text
-        original = text
-        if 'research' in cleaned.lower() and ('download' in cleaned.lower() or 'fetch' in cleaned.lower()):
-            browser_pattern = re.search(r'\b(open|use|go to)\s+(my\s+)?(default\s+)?browser\s+(and|to)\s+', 
-                                       cleaned, flags=re.IGNORECASE)
-            if browser_pattern:
-                cleaned = re.sub(r'\b(open|use|go to)\s+(my\s+)?(default\s+)?browser\s+(and|to)\s+', '', 
-                               cleaned, flags=re.IGNORECASE)
-                return cleaned.strip()
-        browser_search = re.search(r'\b(open|use|go to)\s+(my\s+)?(default\s+)?browser\s+(and|to)\s+(go to|search|find|lookup)?\s*(.+)', 
-                                   cleaned, flags=re.IGNORECASE)
-        if browser_search:
-            target = browser_search.group(6).strip()
-            return f"search {target}"
-        
-        cleaned = re.sub(r',\s+', ' and ', cleaned, flags=re.IGNORECASE)
-        
-        if ('create' in cleaned.lower() or 'make' in cleaned.lower()) and 'file' in cleaned.lower():
-            cleaned = re.sub(r'^(i\s+want\s+you\s+to|i\s+want|please|can\s+you|could\s+you|would\s+you)\s+', '', cleaned, flags=re.IGNORECASE)
-        
-        cleaned = re.sub(r'^(hello|hi|hey|good morning|good afternoon|good evening|namaste)\s+', '', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'\b(bot|chatbot|assistant|either)\b', '', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'\b(what i want you to do is|i want you to|i need you to)\b', '', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'\bi would say\b', '', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        cleaned = re.sub(r'^[,\s]+', '', cleaned)
-        cleaned = cleaned.strip()
-        return cleaned if len(cleaned) > 2 else text
+        return FallbackParser.preprocess_text(text)
     def parse_command_to_json(self, text):
-        try:
-            cleaned_text = self._preprocess_text(text)
-            if cleaned_text != text:
-                print(f"📝 Cleaned: '{text}' → '{cleaned_text}'")
-            os_friendly = {
-                'Windows': 'Windows',
-                'Linux': 'Linux',
-                'Darwin': 'macOS'
-            }.get(self.os_name, self.os_name)
-            prompt = f"""You are a Command Understanding AI for a cross-platform voice assistant.
+        if PARSE_RACE_ENABLED:
+            return self._race.parse(text)
+        result = self._gemini_parse(text)
+        return result if result is not None else self._offline_parse(text)
+    def _parse_instructions(self):
+        os_friendly = {
+            'Windows': 'Windows',
+            'Linux': 'Linux',
+            'Darwin': 'macOS'
+        }.get(self.os_name, self.os_name)
+        return f"""You are a Command Understanding AI for a cross-platform voice assistant.
 You must ONLY understand English, Hindi and Hinglish.
 
 Device Information:
@@ -330,7 +329,14 @@ Rules:
 ✨ "search X on [WEBSITE]" = platform_search
 ✨ Prefer action over conversation when unsure
 ✨ 🔥 ALWAYS extract download source if mentioned: "from web", "from snap", "via terminal", etc.
-✨ 🔥 App control keywords: save, copy, paste, cut, undo, redo, find, close, bold, italic, etc.
+✨ 🔥 App control keywords: save, copy, paste, cut, undo, redo, find, close, bold, italic, etc."""
+    def _gemini_parse(self, text):
+        """Gemini's action JSON for ``text``, or None when it can't be had."""
+        try:
+            cleaned_text = self._preprocess_text(text)
+            if cleaned_text != text:
+                print(f"📝 Cleaned: '{text}' → '{cleaned_text}'")
+            prompt = f"""{self._parse_instructions()}
 
 User Input: {cleaned_text}
 JSON Output:"""
@@ -346,7 +352,7 @@ JSON Output:"""
                     "topP": 0.1,
                 }
             }
-            response = requests.post(self.api_url, headers=self.headers, data=json.dumps(payload), timeout=10)
+            response = self._generate(payload, 10, 'parse')
             if response.status_code == 200:
                 result = response.json()
                 if 'candidates' in result and len(result['candidates']) > 0:
@@ -358,502 +364,87 @@ JSON Output:"""
                             json_text = json_text.replace('```json', '').replace('```', '').strip()
                             try:
                                 parsed_json = json.loads(json_text)
+                                if self.log_intents:
+                                    log_example(cleaned_text, parsed_json)
                                 return parsed_json
                             except json.JSONDecodeError:
-                                return self._fallback_parse(text)
-            return self._fallback_parse(text)
+                                return None
+            return None
+        except GeminiRateLimited as e:
+            print(f"⏳ {e}; parsing locally")
+            return None
         except Exception as e:
-            return self._fallback_parse(text)
-    def _fallback_parse(self, text):
-        import re
-        cleaned = self._preprocess_text(text)
-        text_lower = cleaned.lower().strip()
-        match1 = re.search(r'(?:search|find|lookup)\s+(?:for\s+)?(.+?)\s+(?:on|in)\s+(\w+)', text_lower)
-        if match1:
-            query, platform = match1.groups()
-            query = query.strip()
-            platform = platform.strip()
-            web_indicators = ['youtube', 'google', 'instagram', 'facebook', 'twitter', 'amazon', 
-                             'reddit', 'wikipedia', 'spotify', 'linkedin', 'github', 'chatgpt',
-                             'netflix', 'pinterest', 'tiktok', 'snapchat', 'whatsapp', 'telegram',
-                             'stackoverflow', 'medium', 'quora', 'ebay', 'imdb', 'yelp', 'twitch']
-            if any(indicator in platform for indicator in web_indicators) or len(platform) > 3:
-                return {"action": "platform_search", "platform": platform, "query": query}
-        match2 = re.search(r'(?:go to|open|use)\s+(\w+)\s+(?:and|to)\s+(?:search|find|lookup|write)\s+(?:for\s+)?(.+)', text_lower)
-        if match2:
-            platform_or_browser, query = match2.groups()
-            query = query.strip()
-            platform_or_browser = platform_or_browser.strip().lower()
-            
-            browsers = ['chrome', 'firefox', 'edge', 'safari', 'brave', 'opera']
-            if any(browser in platform_or_browser for browser in browsers):
-                import re
-                app_match = re.search(r'(?:open|use)\s+(\w+)', text_lower)
-                if app_match:
-                    browser_name = app_match.group(1).strip()
-                    return {"action": "complex_command", "steps": [
-                        {"action": "open_app", "app_name": browser_name},
-                        {"action": "web_search", "query": query}
-                    ]}
-            
-            web_indicators = ['youtube', 'google', 'instagram', 'facebook', 'twitter', 'amazon', 
-                             'reddit', 'wikipedia', 'spotify', 'linkedin', 'github', 'chatgpt',
-                             'netflix', 'pinterest', 'tiktok', 'snapchat', 'whatsapp', 'telegram',
-                             'stackoverflow', 'medium', 'quora', 'ebay', 'imdb', 'yelp', 'twitch']
-            if any(indicator in platform_or_browser for indicator in web_indicators) or len(platform_or_browser) > 3:
-                return {"action": "platform_search", "platform": platform_or_browser, "query": query}
-        match3 = re.search(r'(\w+)\s+(?:pe|mein|me)\s+(?:search|find|dhoondo)\s+(.+)', text_lower)
-        if match3:
-            platform, query = match3.groups()
-            query = query.strip()
-            platform = platform.strip()
-            web_indicators = ['youtube', 'google', 'instagram', 'facebook', 'twitter', 'amazon', 
-                             'reddit', 'wikipedia', 'spotify', 'linkedin', 'github', 'chatgpt',
-                             'netflix', 'pinterest', 'tiktok', 'snapchat', 'whatsapp', 'telegram',
-                             'stackoverflow', 'medium', 'quora', 'ebay', 'imdb', 'yelp', 'twitch']
-            if any(indicator in platform for indicator in web_indicators) or len(platform) > 3:
-                return {"action": "platform_search", "platform": platform, "query": query}
-        if ('open' in text_lower or 'launch' in text_lower or 'start' in text_lower) and any(word in text_lower for word in ['search', 'searc', 'serch', 'find', 'lookup']) and any(browser in text_lower for browser in ['chrome', 'firefox', 'edge', 'safari', 'brave', 'opera', 'browser']):
-            import re
-            browsers = ['chrome', 'firefox', 'edge', 'safari', 'brave', 'opera', 'browser']
-            for browser in browsers:
-                if browser in text_lower:
-                    pattern = r'(?:open|launch|start)\s+(' + browser + r')\s+and\s+(?:search|searc|serch|find|lookup)\s+(?:for\s+)?(.+)'
-                    match = re.search(pattern, text_lower)
-                    if match:
-                        browser_name = match.group(1).strip()
-                        query = match.group(2).strip()
-                        return {"action": "complex_command", "steps": [
-                            {"action": "open_app", "app_name": browser_name},
-                            {"action": "web_search", "query": query}
-                        ]}
-        
-        if ('open' in text_lower or 'launch' in text_lower or 'start' in text_lower) and ('create' in text_lower or 'make' in text_lower) and 'file' in text_lower:
-            import re
-            patterns = [
-                r'(?:open|launch|start)\s+(.+?)\s+(?:and|,)\s+(?:create|make)\s+(?:and\s+)?(?:open\s+)?(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)',
-                r'(?:open|launch|start)\s+(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)',
-                r'(?:open|launch|start)\s+(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)',
-            ]
-            for pattern in patterns:
-                match = re.search(pattern, text_lower)
-                if match:
-                    app_name = match.group(1).strip().rstrip(',')
-                    file_name = match.group(2).strip().rstrip('.,!?;:')
-                    
-                    app_name = app_name.replace('vs code', 'vscode').replace('visual studio code', 'vscode').replace(' vs ', ' vscode ')
-                    if app_name.lower() == 'vs' or app_name.lower().strip() == 'vs':
-                        app_name = 'vscode'
-                    
-                    if file_name and file_name not in ['called', 'named', 'titled', 'a', 'the', 'it']:
-                        return {"action": "complex_command", "steps": [
-                            {"action": "open_app", "app_name": app_name},
-                            {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": app_name}
-                        ]}
-        
-        if text_lower.startswith(('search ', 'google ', 'find ', 'lookup ')):
-            query = text_lower.split(None, 1)[1] if len(text_lower.split()) > 1 else text_lower
-            return {"action": "web_search", "query": query}
-        elif text_lower.startswith(('switch to ', 'switch back', 'go to ', 'focus on ')):
-            if 'switch back' in text_lower or 'previous app' in text_lower:
-                return {"action": "switch_app", "app_name": "previous"}
-            
-            app_name = text_lower
-            for prefix in ['switch to ', 'go to ', 'focus on ']:
-                if text_lower.startswith(prefix):
-                    app_name = text_lower[len(prefix):].strip()
-                    break
-            
-            app_keywords = ['chrome', 'firefox', 'vscode', 'code', 'terminal', 'calculator', 
-                           'notepad', 'word', 'excel', 'browser', 'spotify', 'discord', 
-                           'steam', 'vlc', 'gimp', 'photoshop']
-            
-            if any(keyword in app_name for keyword in app_keywords):
-                return {"action": "switch_app", "app_name": app_name}
-        
-        elif text_lower.startswith(('open ', 'launch ', 'start ', 'run ')):
-            app_name = text_lower.split(None, 1)[1] if len(text_lower.split()) > 1 else text_lower
-            
-            if ('and' in app_name.lower() or ',' in app_name.lower()) and ('create' in app_name.lower() or 'make' in app_name.lower()) and 'file' in app_name.lower():
-                import re
-                app_name_normalized = app_name.lower().replace(',', ' and ')
-                patterns = [
-                    r'^(.+?)\s+and\s+(?:create|make)\s+(?:and\s+)?(?:open\s+)?(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)',
-                    r'^(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)',
-                    r'^(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)',
-                ]
-                for pattern in patterns:
-                    match = re.search(pattern, app_name_normalized)
-                    if match:
-                        actual_app = match.group(1).strip().rstrip(',')
-                        file_name = match.group(2).strip().rstrip('.,!?;:')
-                        
-                        actual_app = actual_app.replace('vs code', 'vscode').replace('visual studio code', 'vscode').replace(' vs ', ' vscode ')
-                        if actual_app.lower() == 'vs' or actual_app.lower().strip() == 'vs':
-                            actual_app = 'vscode'
-                        
-                        if file_name and file_name not in ['called', 'named', 'titled', 'a', 'the', 'it']:
-                            return {"action": "complex_command", "steps": [
-                                {"action": "open_app", "app_name": actual_app},
-                                {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": actual_app}
-                            ]}
-            
-            search_variations = ['search', 'searc', 'serch', 'find', 'lookup']
-            has_search = any(var in app_name.lower() for var in search_variations)
-            
-            if ('and' in app_name.lower() or ',' in app_name.lower()) and has_search:
-                import re
-                app_name_normalized = app_name.lower().replace(',', ' and ')
-                browsers = ['chrome', 'firefox', 'edge', 'safari', 'brave', 'opera', 'browser']
-                
-                for browser in browsers:
-                    if browser in app_name_normalized:
-                        pattern = r'^(.+?)\s+and\s+(?:search|searc|serch|find|lookup)\s+(?:for\s+)?(.+)'
-                        match = re.search(pattern, app_name_normalized)
-                        if match:
-                            browser_name = match.group(1).strip()
-                            query = match.group(2).strip()
-                            if any(b in browser_name for b in browsers):
-                                return {"action": "complex_command", "steps": [
-                                    {"action": "open_app", "app_name": browser_name},
-                                    {"action": "web_search", "query": query}
-                                ]}
-                
-                parts = app_name.split('and')
-                if len(parts) >= 2:
-                    browser_or_app = parts[0].strip().lower()
-                    query_parts = []
-                    for part in parts[1:]:
-                        cleaned = part.replace('search', '').replace('searc', '').replace('serch', '').replace('find', '').replace('lookup', '').strip()
-                        if cleaned:
-                            query_parts.append(cleaned)
-                    query = ' '.join(query_parts).strip()
-                    
-                    if any(browser in browser_or_app for browser in browsers):
-                        return {"action": "complex_command", "steps": [
-                            {"action": "open_app", "app_name": parts[0].strip()},
-                            {"action": "web_search", "query": query}
-                        ]}
-                    
-                    return {"action": "platform_search", "platform": parts[0].strip(), "query": query}
-            
-            if app_name.lower() in ['vs', 'vscode', 'visual studio', 'visual studio code', 'code']:
-                app_name = 'vscode'
-            
-            return {"action": "open_app", "app_name": app_name}
-        
-        elif 'create file' in text_lower or 'make file' in text_lower:
-            import re
-            patterns = [
-                r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)\s+([^\s]+(?:\.[^\s]+)?(?:\s|$))',
-                r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)',
-                r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\s+[^\s]+)*?)(?:\s+and|\s+in|\s+to|$)',
-            ]
-            for pattern in patterns:
-                file_match = re.search(pattern, text_lower)
-                if file_match:
-                    file_name = file_match.group(1).strip()
-                    file_name = file_name.rstrip('.,!?;:')
-                    if file_name and file_name not in ['called', 'named', 'titled', 'a', 'the']:
-                        open_in_app = None
-                        if 'vscode' in text_lower or 'visual studio' in text_lower or 'code' in text_lower:
-                            open_in_app = 'vscode'
-                        return {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": open_in_app}
-        
-        elif ('create' in text_lower or 'make' in text_lower) and 'file' in text_lower:
-            import re
-            app_mentioned = None
-            app_keywords = {
-                'vscode': ['vscode', 'vs code', 'visual studio code', 'code editor'],
-                'chrome': ['chrome', 'browser', 'google chrome'],
-                'firefox': ['firefox'],
-                'notepad': ['notepad'],
-            }
-            
-            for app_key, keywords in app_keywords.items():
-                for keyword in keywords:
-                    if keyword in text_lower:
-                        app_mentioned = app_key
-                        break
-                if app_mentioned:
-                    break
-            
-            if 'open it' in text_lower or 'open in' in text_lower or app_mentioned:
-                file_patterns = [
-                    r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)',
-                    r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)',
-                ]
-                for pattern in file_patterns:
-                    file_match = re.search(pattern, text_lower)
-                    if file_match:
-                        file_name = file_match.group(1).strip()
-                        file_name = file_name.rstrip('.,!?;:')
-                        if file_name and file_name not in ['called', 'named', 'titled', 'a', 'the', 'it']:
-                            target_app = app_mentioned if app_mentioned else 'vscode'
-                            return {"action": "complex_command", "steps": [
-                                {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": target_app}
-                            ]}
-            
-            file_patterns = [
-                r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)\s+([^\s]+(?:\.[^\s]+)?(?:\s|$))',
-                r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)',
-                r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\s+[^\s]+)*?)(?:\s+and|\s+in|\s+to|$)',
-            ]
-            for pattern in file_patterns:
-                file_match = re.search(pattern, text_lower)
-                if file_match:
-                    file_name = file_match.group(1).strip()
-                    file_name = file_name.rstrip('.,!?;:')
-                    if file_name and file_name not in ['called', 'named', 'titled', 'a', 'the']:
-                        open_in_app = app_mentioned
-                        if 'vscode' in text_lower or 'visual studio' in text_lower or 'code' in text_lower:
-                            open_in_app = 'vscode'
-                        return {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": open_in_app}
-        
-        elif 'open' in text_lower and ('create' in text_lower or 'make' in text_lower) and 'file' in text_lower:
-            import re
-            patterns = [
-                r'open\s+([^\s]+(?:\s+[^\s]+)*?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)\s+([^\s]+(?:\.[^\s]+)?(?:\s|$))',
-                r'open\s+([^\s]+(?:\s+[^\s]+)*?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)',
-            ]
-            for pattern in patterns:
-                app_match = re.search(pattern, text_lower)
-                if app_match:
-                    app_name = app_match.group(1).strip()
-                    file_name = app_match.group(2).strip()
-                    file_name = file_name.rstrip('.,!?;:')
-                    if file_name and file_name not in ['called', 'named', 'titled', 'a', 'the']:
-                        app_name = app_name.replace('vs code', 'vscode').replace('visual studio code', 'vscode')
-                        return {"action": "complex_command", "steps": [
-                            {"action": "open_app", "app_name": app_name},
-                            {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": app_name}
-                        ]}
-        
-        elif text_lower.startswith(('type ', 'write ', 'enter ')):
-            text_to_type = text_lower
-            for prefix in ['type ', 'write ', 'enter ']:
-                if text_lower.startswith(prefix):
-                    text_to_type = text[len(prefix):].strip()
-                    break
-            return {"action": "app_command", "command": "type", "params": {"text": text_to_type}}
-        
-        elif any(cmd in text_lower for cmd in ['save', 'copy', 'paste', 'cut', 'undo', 'redo', 
-                                                 'select all', 'bold', 'italic', 'underline',
-                                                 'find', 'replace']):
-            for cmd in ['save file', 'save', 'copy', 'paste', 'cut', 'undo', 'redo', 
-                       'select all', 'bold', 'italic', 'underline', 'find', 'replace']:
-                if cmd in text_lower:
-                    return {"action": "app_command", "command": cmd}
-        elif text_lower.startswith(('play ', 'play the ', 'play first ')):
-            query = text_lower.replace('play ', '').replace('the ', '').replace('first ', '').strip()
-            return {"action": "play_media", "query": query, "platform": "youtube"}
-        elif 'research' in text_lower and ('download' in text_lower or 'fetch' in text_lower or 'get' in text_lower):
-            topic = text_lower
-            for remove in ['download', 'fetch', 'get', 'me', 'all', 'research', 'of', 'on', 'about', 'for']:
-                topic = topic.replace(remove, '')
-            topic = topic.strip()
-            return {"action": "download_research", "topic": topic, "max_papers": 5}
-        elif text_lower.startswith(('download ', 'install ', 'get ')):
-            app_name = text_lower.split(None, 1)[1] if len(text_lower.split()) > 1 else text_lower
-            app_name = app_name.replace('for me', '').strip()
-            
-            # Check for research download
-            if 'research' in app_name or 'papers' in app_name:
-                topic = app_name.replace('research', '').replace('papers', '').replace('on', '').replace('about', '').strip()
-                return {"action": "download_research", "topic": topic, "max_papers": 5}
-            
-            # Detect download source
-            source = "web"  # default
-            source_patterns = [
-                (r'(?:from|via|through|using)\s+(?:the\s+)?(web|internet|online|website)', 'web'),
-                (r'(?:from|via|through|using)\s+(?:the\s+)?(terminal|package\s+manager|apt|dnf|brew|choco)', 'terminal'),
-                (r'(?:from|via|through|using)\s+(?:the\s+)?(snap(?:\s+store)?)', 'snap'),
-                (r'(?:from|via|through|using)\s+(?:the\s+)?(flatpak)', 'flatpak'),
-                (r'(?:from|via|through|using)\s+(?:the\s+)?(app\s+store|microsoft\s+store|mac\s+app\s+store|gnome\s+software)', 'appstore'),
-            ]
-            
-            for pattern, src in source_patterns:
-                match = re.search(pattern, app_name)
-                if match:
-                    source = src
-                    # Remove the source specification from app_name
-                    app_name = re.sub(pattern, '', app_name).strip()
-                    break
-            
-            return {"action": "download_app", "app_name": app_name, "source": source}
-        elif text_lower.startswith(('go to ', 'goto ', 'open ', 'visit ')):
-            target = text_lower.replace('go to ', '').replace('goto ', '').replace('open ', '').replace('visit ', '').strip()
-            if 'and search' in target or 'and find' in target or 'and write' in target:
-                parts = target.split('and')
-                if len(parts) >= 2:
-                    platform = parts[0].strip()
-                    query = ' '.join(parts[1:]).replace('search', '').replace('find', '').replace('write', '').strip()
-                    return {"action": "platform_search", "platform": platform, "query": query}
-            known_websites = ['youtube', 'google', 'facebook', 'instagram', 'twitter', 'reddit', 
-                             'github', 'amazon', 'netflix', 'spotify', 'linkedin', 'wikipedia',
-                             'flipkart', 'gmail', 'yahoo', 'bing', 'chatgpt', 'whatsapp']
-            if any(site in target for site in known_websites):
-                return {"action": "open_website", "url": f"{target}.com"}
-            if any(app in target for app in ['steam', 'chrome', 'firefox', 'calculator', 'discord', 'vscode', 'code']):
-                return {"action": "open_app", "app_name": target}
-            if '.com' in target or '.org' in target or '.net' in target or '.io' in target:
-                return {"action": "open_website", "url": target}
-            return {"action": "open_website", "url": f"{target}.com"}
-        elif 'list app' in text_lower or 'show app' in text_lower:
-            return {"action": "list_apps"}
-        elif "what's on" in text_lower or 'show page' in text_lower or 'read page' in text_lower or 'page content' in text_lower:
-            return {"action": "browser_control", "command": "show_page"}
-        elif 'scroll down' in text_lower:
-            return {"action": "browser_control", "command": "scroll_down"}
-        elif 'scroll up' in text_lower:
-            return {"action": "browser_control", "command": "scroll_up"}
-        elif 'close popup' in text_lower or 'close pop up' in text_lower or 'press cross' in text_lower or 'click cross' in text_lower:
-            return {"action": "browser_control", "command": "close_popup"}
-        elif 'volume up' in text_lower or 'increase volume' in text_lower:
-            return {"action": "browser_control", "command": "volume_up"}
-        elif 'volume down' in text_lower or 'decrease volume' in text_lower:
-            return {"action": "browser_control", "command": "volume_down"}
-        
-        # Tab management
-        elif re.search(r'(create|open|new)\s+(?:a\s+)?(?:new\s+)?tab', text_lower):
-            url_match = re.search(r'(?:and\s+)?(?:open|go to)\s+(\w+(?:\.\w+)?)', text_lower)
-            if url_match:
-                url = url_match.group(1)
-                return {"action": "browser_control", "command": "new_tab", "url": url}
-            return {"action": "browser_control", "command": "new_tab"}
-        elif re.search(r'(switch to|go to|move to)\s+first\s+tab', text_lower):
-            return {"action": "browser_control", "command": "first_tab"}
-        elif re.search(r'(switch to|go to|move to)\s+last\s+tab', text_lower):
-            return {"action": "browser_control", "command": "last_tab"}
-        elif re.search(r'(switch to|go to|move to)\s+next\s+tab', text_lower) or 'next tab' in text_lower:
-            return {"action": "browser_control", "command": "next_tab"}
-        elif re.search(r'(switch to|go to|move to)\s+prev(?:ious)?\s+tab', text_lower) or 'previous tab' in text_lower:
-            return {"action": "browser_control", "command": "previous_tab"}
-        elif re.search(r'(switch to|go to|move to)\s+tab\s+(\d+)', text_lower):
-            match = re.search(r'(switch to|go to|move to)\s+tab\s+(\d+)', text_lower)
-            tab_index = int(match.group(2))
-            return {"action": "browser_control", "command": "switch_to_tab", "tab_index": tab_index}
-        elif re.search(r'(switch to|go to|move to)\s+(\d+)(?:st|nd|rd|th)\s+tab', text_lower):
-            match = re.search(r'(switch to|go to|move to)\s+(\d+)(?:st|nd|rd|th)\s+tab', text_lower)
-            tab_index = int(match.group(2))
-            return {"action": "browser_control", "command": "switch_to_tab", "tab_index": tab_index}
-        elif re.search(r'close\s+(?:this\s+|current\s+)?tab', text_lower):
-            return {"action": "browser_control", "command": "close_tab"}
-        elif re.search(r'close\s+(?:all\s+)?other\s+tabs', text_lower):
-            return {"action": "browser_control", "command": "close_other_tabs"}
-        elif re.search(r'(list|show)\s+(?:all\s+)?tabs', text_lower):
-            return {"action": "browser_control", "command": "list_tabs"}
-        
-        # Window management
-        elif re.search(r'(create|open|new)\s+(?:a\s+)?(?:new\s+)?window', text_lower):
-            return {"action": "browser_control", "command": "new_window"}
-        elif re.search(r'(create|open|new)\s+(?:an?\s+)?(?:incognito|private)\s+window', text_lower):
-            return {"action": "browser_control", "command": "incognito_window"}
-        elif 'maximize' in text_lower and 'window' in text_lower:
-            return {"action": "browser_control", "command": "maximize"}
-        elif 'minimize' in text_lower and 'window' in text_lower:
-            return {"action": "browser_control", "command": "minimize"}
-        elif 'fullscreen' in text_lower or 'full screen' in text_lower:
-            return {"action": "browser_control", "command": "fullscreen"}
-        
-        # Navigation
-        elif re.search(r'\bgo\s+back\b|\bback\b', text_lower) and 'go back' not in ['go to back', 'search go back']:
-            return {"action": "browser_control", "command": "go_back"}
-        elif re.search(r'\bgo\s+forward\b|\bforward\b', text_lower):
-            return {"action": "browser_control", "command": "go_forward"}
-        elif 'refresh' in text_lower or 'reload' in text_lower:
-            return {"action": "browser_control", "command": "refresh"}
-        elif re.search(r'(what\s+is|show|get|tell)\s+(the\s+)?current\s+url', text_lower):
-            return {"action": "browser_control", "command": "get_url"}
-        elif re.search(r'(what\s+is|show|get|tell)\s+(the\s+)?page\s+title', text_lower):
-            return {"action": "browser_control", "command": "get_title"}
-        elif 'click' in text_lower and 'first' in text_lower:
-            return {"action": "browser_control", "command": "click_first_link"}
-        elif any(word in text_lower for word in ['press enter', 'hit enter', 'press return']):
-            return {"action": "app_command", "command": "enter"}
-        
-        elif any(word in text_lower for word in ['press escape', 'hit escape', 'press esc']):
-            return {"action": "app_command", "command": "escape"}
-        
-        elif any(word in text_lower for word in ['press tab', 'hit tab']):
-            return {"action": "app_command", "command": "tab"}
-        
-        elif 'delete' in text_lower or 'backspace' in text_lower:
-            return {"action": "app_command", "command": "delete"}
-        
-        elif 'click' in text_lower or 'press' in text_lower or 'select' in text_lower:
-            import re
-            number_match = re.search(r'(\d+)(st|nd|rd|th)?', text_lower)
-            if number_match:
-                n = int(number_match.group(1))
-                element_type = 'link'
-                if 'video' in text_lower:
-                    element_type = 'video'
-                elif 'link' in text_lower:
-                    element_type = 'link'
-                elif 'button' in text_lower:
-                    element_type = 'button'
-                elif 'result' in text_lower:
-                    element_type = 'result'
-                return {"action": "browser_control", "command": "click_nth", "position": n, "element_type": element_type}
+            return None
+    def parse_commands_batch(self, texts):
+        """Parse several commands with one Gemini request; returns [(action JSON, source)] in input order.
+
+        Items Gemini drops or garbles, or the whole batch when Gemini is
+        unreachable or rate limited, are parsed locally one by one.
+        """
+        cleaned = [self._preprocess_text(text) for text in texts]
+        parsed = self._gemini_parse_batch(cleaned) if texts else []
+        results = []
+        for text, cleaned_text, result in zip(texts, cleaned, parsed):
+            if isinstance(result, dict) and result.get('action'):
+                if self.log_intents:
+                    log_example(cleaned_text, result)
+                results.append((result, 'gemini'))
             else:
-                patterns = [
-                    r'click\s+on\s+(?:the\s+)?(.+)',
-                    r'press\s+on\s+(?:the\s+)?(.+)',
-                    r'select\s+(?:the\s+)?(.+)',
-                    r'click\s+(.+)',
-                ]
-                for pattern in patterns:
-                    match = re.search(pattern, text_lower)
-                    if match:
-                        text_to_click = match.group(1).strip()
-                        if 'called' in text_lower or 'titled' in text_lower or 'named' in text_lower:
-                            called_match = re.search(r'(?:called|titled|named)\s+([^\s]+(?:\s+[^\s]+)*?)(?:\s+file|\s+page|\s+link|\s+in|\s+on|\s+can|$)', text_lower)
-                            if called_match:
-                                text_to_click = called_match.group(1).strip()
-                        if text_to_click not in ['cross', 'cross button', 'popup', 'first', 'first link', 'that', 'this', 'it'] and len(text_to_click) > 2:
-                            return {"action": "browser_control", "command": "click_by_text", "text": text_to_click}
-                return {"action": "browser_control", "command": "click_first_link"}
-        if ('create' in text_lower or 'make' in text_lower) and 'file' in text_lower:
-            import re
-            app_mentioned = None
-            app_keywords = {
-                'vscode': ['vscode', 'vs code', 'visual studio code', 'code editor'],
-                'chrome': ['chrome', 'browser', 'google chrome'],
-                'firefox': ['firefox'],
-                'notepad': ['notepad'],
+                result, _, source = local_parse(text)
+                results.append((result, source))
+        return results
+    def _gemini_parse_batch(self, cleaned):
+        count = len(cleaned)
+        numbered = "\n".join(f"{i}. {text}" for i, text in enumerate(cleaned, 1))
+        prompt = f"""{self._parse_instructions()}
+
+The user gave {count} separate commands. Understand each one on its own and
+return a JSON array with exactly {count} outputs, one per input, in the same order.
+
+User Inputs:
+{numbered}
+JSON Array Output:"""
+
+        payload = {
+            "contents": [{
+                "parts": [{"text": prompt}]
+            }],
+            "generationConfig": {
+                "temperature": 0.1,
+                "maxOutputTokens": 100 * count,
+                "topK": 1,
+                "topP": 0.1,
             }
-            
-            for app_key, keywords in app_keywords.items():
-                for keyword in keywords:
-                    if keyword in text_lower:
-                        app_mentioned = app_key
-                        break
-                if app_mentioned:
-                    break
-            
-            if 'open it' in text_lower or 'open in' in text_lower or app_mentioned:
-                file_patterns = [
-                    r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)',
-                    r'(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)',
-                ]
-                for pattern in file_patterns:
-                    file_match = re.search(pattern, text_lower)
-                    if file_match:
-                        file_name = file_match.group(1).strip()
-                        file_name = file_name.rstrip('.,!?;:')
-                        if file_name and file_name not in ['called', 'named', 'titled', 'a', 'the', 'it']:
-                            target_app = app_mentioned if app_mentioned else 'vscode'
-                            return {"action": "complex_command", "steps": [
-                                {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": target_app}
-                            ]}
-        
-        greeting_only = re.match(r'^(hello|hi|hey|thank you|thanks|how are you|namaste|kaise ho)[\s\.,!?]*$', text_lower)
-        if greeting_only:
-            return {"action": "conversation", "text": text}
-        if len(text_lower.split()) == 1 and len(text_lower) > 2:
-            return {"action": "open_app", "app_name": text_lower}
-        return {"action": "web_search", "query": cleaned}
+        }
+        try:
+            response = self._generate(payload, 10 + count, 'batch_parse')
+            if response.status_code != 200:
+                print(f"⚠️ Batch parse failed ({response.status_code}); parsing locally")
+                return [None] * count
+            json_text = response.json()['candidates'][0]['content']['parts'][0]['text'].strip()
+            json_text = json_text.replace('```json', '').replace('```', '').strip()
+            items = json.loads(json_text)
+        except GeminiRateLimited as e:
+            print(f"⏳ {e}; parsing batch locally")
+            return [None] * count
+        except Exception as e:
+            print(f"⚠️ Batch parse failed: {e}; parsing locally")
+            return [None] * count
+        if not isinstance(items, list) or len(items) != count:
+            # Merged or split commands can't be lined up with the inputs again.
+            print(f"⚠️ Batch parse returned {len(items) if isinstance(items, list) else 'no'} items for {count}; parsing locally")
+            return [None] * count
+        return items
+    def _offline_parse(self, text):
+        model = get_local_intent_model()
+        if model is not None:
+            result = model.parse(text)
+            if result is not None:
+                print(f"🧠 Local intent model: {result.get('action')}")
+                return result
+        return self._fallback_parse(text)
+    def _fallback_parse(self, text):
+        return FallbackParser.parse(text)
     def query(self, prompt):
         try:
             payload = {
@@ -869,12 +460,7 @@ JSON Output:"""
                     "maxOutputTokens": 1024,
                 }
             }
-            response = requests.post(
-                self.api_url,
-                headers=self.headers,
-                data=json.dumps(payload),
-                timeout=30
-            )
+            response = self._generate(payload, 30, 'query')
             if response.status_code == 200:
                 data = response.json()
                 if "candidates" in data and len(data["candidates"]) > 0:
@@ -898,34 +484,7 @@ JSON Output:"""
         except Exception as e:
             return False, f"Error: {str(e)}"
     def _regex_parse_command(self, text):
-        import re
-        removal_patterns = [
-            r'\b(hello|hi|hey|good morning|good afternoon|good evening|namaste|namaskar)\b',
-            r'\b(bot|assistant|either|either assistant|alexa|siri)\b',
-            r'\b(how are you|what\'s up|kaise ho|kya hal hai)\??',
-            r'\b(what i want you to do is|i want you to do is|i want you to|i need you to|i would like you to)\b',
-            r'\b(what i want is|i want to|i need to|i would like to)\b',
-            r'\b(go to a web and|go to the web and|go to web and|on the web|on web)\b',
-            r'\b(go to a|go to the|go to)\b',
-            r'\b(please|kindly|can you|could you|would you|will you|would you please|for me|thank you|thanks|dhanyavaad|shukriya|karo|kijiye)\b',
-            r'^\s*(can|could|would|will|do|does|what|so)\s+',
-            r'\b(just|really|actually|basically|literally|so|what)\b',
-        ]
-        cleaned = text.lower()
-        for _ in range(2):
-            for pattern in removal_patterns:
-                cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'[,?!]+', ' ', cleaned)
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        cleaned = re.sub(r'^(to|and)\s+', '', cleaned)
-        if not re.search(r'^(open|close|start|launch)', cleaned):
-            cleaned = re.sub(r'\b(the|a|an)\b', '', cleaned)
-        cleaned = re.sub(r'\sfor\s+(?=\w+\s*$)', ' ', cleaned)
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        cleaned = re.sub(r'^(to|for|at|in|on)\s+', '', cleaned)
-        if len(cleaned) >= 3 and cleaned != text.lower():
-            return cleaned
-        return text
+        return FallbackParser.strip_filler(text)
     def parse_conversational_command(self, text):
         try:
             prompt = f"""You are a command parser for a voice assistant. Extract ONLY the core action from conversational text.
@@ -976,7 +535,7 @@ Output:"""
                     "topP": 0.1,
                 }
             }
-            response = requests.post(self.api_url, headers=self.headers, data=json.dumps(payload), timeout=10)
+            response = self._generate(payload, 10, 'extract')
             if response.status_code == 200:
                 result = response.json()
                 if 'candidates' in result and len(result['candidates']) > 0:
@@ -0,0 +1,149 @@
+import json
+import threading
+import time
+from concurrent.futures import Future
+
+from Metrics import GEMINI_RATE_TOKENS, GEMINI_REQUESTS
+
+try:
+    from config import GEMINI_RATE_PER_MINUTE
+except ImportError:
+    GEMINI_RATE_PER_MINUTE = 15
+try:
+    from config import GEMINI_BURST
+except ImportError:
+    GEMINI_BURST = 5
+try:
+    from config import GEMINI_INTERACTIVE_RESERVE
+except ImportError:
+    GEMINI_INTERACTIVE_RESERVE = 2
+try:
+    from config import GEMINI_MAX_BACKOFF
+except ImportError:
+    GEMINI_MAX_BACKOFF = 60.0
+
+# Someone is waiting on these (a spoken command, an API call); 'query' answers can wait.
+INTERACTIVE_PURPOSES = ('parse', 'batch_parse', 'extract')
+
+class GeminiRateLimited(Exception):
+    """Raised instead of blocking when the request budget is used up or Gemini asked us to back off."""
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    def take(self, keep=0):
+        """Take one token if more than ``keep`` would remain afterwards; never waits."""
+        self._refill(time.monotonic())
+        if self.tokens - 1 >= keep:
+            self.tokens -= 1
+            return True
+        return False
+    def available(self):
+        self._refill(time.monotonic())
+        return self.tokens
+    def wait_time(self, keep=0):
+        return max(0.0, (keep + 1 - self.available()) / self.rate) if self.rate else float('inf')
+
+class GeminiGateway:
+    """Process-wide front door for Gemini calls.
+
+    - Single flight: an identical request (same purpose and payload) already in
+      flight is joined instead of sent again, so the UI, /command callers and
+      the voice loop asking the same thing cost one call.
+    - Token bucket: ``rate_per_minute`` with ``burst`` headroom. Background
+      purposes may not use the last ``reserve`` tokens, which keeps room for
+      interactive parses.
+    - 429s: the Retry-After header (or exponential backoff) closes the gate
+      for everyone until it passes.
+    When a call can't go out it raises GeminiRateLimited right away; callers
+    already fall back to the local parser / offline answers on errors.
+    """
+    def __init__(self, rate_per_minute=GEMINI_RATE_PER_MINUTE, burst=GEMINI_BURST,
+                 reserve=GEMINI_INTERACTIVE_RESERVE, max_backoff=GEMINI_MAX_BACKOFF):
+        self.bucket = TokenBucket(rate_per_minute / 60.0, burst)
+        self.reserve = min(reserve, max(burst - 1, 0))
+        self.max_backoff = max_backoff
+        self.blocked_until = 0.0
+        self._failures = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+    def _admit(self, purpose):
+        now = time.monotonic()
+        if now < self.blocked_until:
+            raise GeminiRateLimited(f"Gemini asked us to back off ({self.blocked_until - now:.0f}s left)")
+        keep = 0 if purpose in INTERACTIVE_PURPOSES else self.reserve
+        if not self.bucket.take(keep):
+            raise GeminiRateLimited(f"Gemini request budget used up (next in {self.bucket.wait_time(keep):.1f}s)")
+    def call(self, purpose, payload, send):
+        """Run ``send()`` (which performs the HTTP request) under the gateway rules; returns its response."""
+        key = (purpose, json.dumps(payload, sort_keys=True))
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                try:
+                    self._admit(purpose)
+                except GeminiRateLimited:
+                    GEMINI_REQUESTS.inc(purpose, 'rate_limited')
+                    raise
+                flight = self._inflight[key] = Future()
+        if not leader:
+            GEMINI_REQUESTS.inc(purpose, 'coalesced')
+            return flight.result()
+        try:
+            response = send()
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            self._observe(response)
+            flight.set_result(response)
+            return response
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+    def _observe(self, response):
+        with self._lock:
+            if getattr(response, 'status_code', None) != 429:
+                self._failures = 0
+                return
+            self._failures += 1
+            delay = None
+            headers = getattr(response, 'headers', None) or {}
+            try:
+                delay = float(headers.get('Retry-After'))
+            except (TypeError, ValueError):
+                pass
+            if delay is None:
+                delay = 2 ** self._failures
+            delay = min(delay, self.max_backoff)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            self.bucket.tokens = 0.0
+        print(f"⏳ Gemini rate limited (429), backing off {delay:.0f}s")
+    def status(self):
+        with self._lock:
+            return {
+                'tokens': round(self.bucket.available(), 2),
+                'capacity': self.bucket.capacity,
+                'rate_per_minute': self.bucket.rate * 60,
+                'in_flight': len(self._inflight),
+                'backoff_seconds': round(max(0.0, self.blocked_until - time.monotonic()), 1),
+            }
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+def get_gemini_gateway():
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = GeminiGateway()
+        return _gateway
+
+GEMINI_RATE_TOKENS.set_source(lambda: get_gemini_gateway().status()['tokens'])
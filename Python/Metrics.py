@@ -0,0 +1,215 @@
+import functools
+import threading
+import time
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RTF_BUCKETS = (0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 4.0)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _label_text(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+class _ShardedMetric:
+    """Per-thread cells, summed at scrape time.
+
+    Each thread writes only to its own dict, so the hot path is a thread-local
+    lookup and a dict update with no lock. Cells of finished threads are folded
+    into ``_retired`` on the next scrape so short-lived workers don't pile up.
+    """
+    kind = None
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._cells = []
+        self._retired = {}
+        self._lock = threading.Lock()
+    def _cell(self):
+        cell = getattr(self._local, 'cell', None)
+        if cell is None:
+            cell = self._local.cell = {}
+            with self._lock:
+                self._cells.append((threading.current_thread(), cell))
+        return cell
+    def _merge(self, total, values):
+        raise NotImplementedError
+    def _collect(self):
+        with self._lock:
+            live = []
+            for thread, cell in self._cells:
+                if thread.is_alive():
+                    live.append((thread, cell))
+                else:
+                    self._merge(self._retired, cell)
+            self._cells = live
+            total = {}
+            self._merge(total, self._retired)
+            for _, cell in live:
+                self._merge(total, dict(cell))
+        return total
+
+class Counter(_ShardedMetric):
+    kind = 'counter'
+    def inc(self, *labels, amount=1):
+        cell = self._cell()
+        cell[labels] = cell.get(labels, 0) + amount
+    def _merge(self, total, values):
+        for labels, value in list(values.items()):
+            total[labels] = total.get(labels, 0) + value
+    def value(self, *labels):
+        return self._collect().get(labels, 0)
+    def render(self):
+        return [f"{self.name}{_label_text(self.labelnames, labels)} {_number(value)}"
+                for labels, value in sorted(self._collect().items())]
+
+class Histogram(_ShardedMetric):
+    kind = 'histogram'
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    def observe(self, value, *labels):
+        cell = self._cell()
+        state = cell.get(labels)
+        if state is None:
+            state = cell[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+    def time(self, *labels):
+        return _Timer(self, labels)
+    def _merge(self, total, values):
+        for labels, (counts, total_sum, count) in list(values.items()):
+            merged = total.get(labels)
+            if merged is None:
+                merged = total[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            merged[0] = [a + b for a, b in zip(merged[0], counts)]
+            merged[1] += total_sum
+            merged[2] += count
+    def render(self):
+        lines = []
+        for labels, (counts, total_sum, count) in sorted(self._collect().items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_label_text(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.labelnames, labels)} {_number(total_sum)}")
+            lines.append(f"{self.name}_count{_label_text(self.labelnames, labels)} {count}")
+        return lines
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+        return False
+
+class Gauge:
+    """Value read at scrape time from ``source`` (a number, or {label tuple: number})."""
+    kind = 'gauge'
+    def __init__(self, name, help, labelnames=(), source=None):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.source = source
+    def set_source(self, source):
+        self.source = source
+    def render(self):
+        if self.source is None:
+            return []
+        try:
+            value = self.source()
+        except Exception:
+            return []
+        if not isinstance(value, dict):
+            value = {(): value}
+        return [f"{self.name}{_label_text(self.labelnames, labels)} {_number(v)}"
+                for labels, v in sorted(value.items())]
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+        self._lock = threading.Lock()
+    def _add(self, metric):
+        with self._lock:
+            self.metrics.append(metric)
+        return metric
+    def counter(self, name, help, labelnames=()):
+        return self._add(Counter(name, help, labelnames))
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(name, help, labelnames, buckets))
+    def gauge(self, name, help, labelnames=(), source=None):
+        return self._add(Gauge(name, help, labelnames, source))
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in list(self.metrics):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+_registry = MetricsRegistry()
+
+def get_metrics_registry():
+    return _registry
+
+COMMANDS = _registry.counter('either_commands_total', 'Commands dispatched, by action', ('action',))
+COMMAND_SECONDS = _registry.histogram('either_command_duration_seconds', 'Command dispatch time, by action', ('action',))
+GEMINI_REQUESTS = _registry.counter('either_gemini_requests_total', 'Gemini API calls, by purpose and outcome', ('purpose', 'outcome'))
+GEMINI_SECONDS = _registry.histogram('either_gemini_request_duration_seconds', 'Gemini API call latency', ('purpose',))
+PARSE_DECISIONS = _registry.counter('either_parse_decisions_total', 'Local vs Gemini parse race outcomes', ('decision',))
+GEMINI_RATE_TOKENS = _registry.gauge('either_gemini_rate_tokens', 'Gemini requests the rate limiter would allow right now')
+CACHE_LOOKUPS = _registry.counter('either_cache_lookups_total', 'Cache lookups, by cache and hit/miss', ('cache', 'result'))
+CACHE_SECONDS = _registry.histogram('either_cache_lookup_duration_seconds', 'Cache lookup latency', ('cache',),
+                                    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0))
+STT_REQUESTS = _registry.counter('either_stt_requests_total', 'Transcriptions, by engine', ('engine',))
+STT_SECONDS = _registry.histogram('either_stt_duration_seconds', 'Transcription time, by engine', ('engine',))
+STT_REAL_TIME_FACTOR = _registry.histogram('either_stt_real_time_factor', 'Transcription time / audio duration', ('engine',),
+                                           buckets=RTF_BUCKETS)
+BROWSER_RESTARTS = _registry.counter('either_browser_driver_restarts_total', 'Browser driver (re)starts after a closed or missing window')
+WEBSOCKET_CLIENTS = _registry.gauge('either_websocket_clients', 'Connected WebSocket clients')
+WEBSOCKET_QUEUE = _registry.gauge('either_websocket_send_queue_messages', 'Messages waiting in WebSocket send queues')
+WEBSOCKET_DROPPED = _registry.counter('either_websocket_dropped_messages_total', 'Messages dropped because a client send queue was full')
+AUDIO_BACKLOG = _registry.gauge('either_audio_queue_blocks', 'Microphone blocks waiting to be processed')
+
+def record_cache(cache, hit, seconds=None):
+    CACHE_LOOKUPS.inc(cache, 'hit' if hit else 'miss')
+    if seconds is not None:
+        CACHE_SECONDS.observe(seconds, cache)
+
+def track_stt(engine, sample_rate=16000):
+    """Decorator for STT functions taking a sample array: counts, latency and real-time factor."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(audio_np, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(audio_np, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                STT_REQUESTS.inc(engine)
+                STT_SECONDS.observe(elapsed, engine)
+                audio_seconds = len(audio_np) / sample_rate if sample_rate else 0
+                if audio_seconds > 0:
+                    STT_REAL_TIME_FACTOR.observe(elapsed / audio_seconds, engine)
+        return wrapper
+    return decorator
@@ -0,0 +1,186 @@
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import FallbackParser
+from LocalIntentModel import get_local_intent_model
+from Metrics import PARSE_DECISIONS
+from Tracing import JsonLinesSink, default_trace_path
+
+try:
+    from config import PARSE_RACE_ENABLED
+except ImportError:
+    PARSE_RACE_ENABLED = True
+try:
+    from config import PARSE_RACE_DEADLINE
+except ImportError:
+    PARSE_RACE_DEADLINE = 2.5
+try:
+    from config import PARSE_RACE_MIN_CONFIDENCE
+except ImportError:
+    PARSE_RACE_MIN_CONFIDENCE = 0.85
+try:
+    from config import PARSE_RACE_AUDIT_RATE
+except ImportError:
+    PARSE_RACE_AUDIT_RATE = 0.1
+try:
+    from config import PARSE_RACE_LOG_PATH
+except ImportError:
+    PARSE_RACE_LOG_PATH = None
+
+# Safe to run on a guess: nothing is typed, opened, closed or downloaded.
+SIDE_EFFECT_FREE = {
+    'browser_control': {
+        'scroll_down', 'scroll_up', 'volume_up', 'volume_down',
+        'next_tab', 'previous_tab', 'first_tab', 'last_tab', 'switch_to_tab', 'list_tabs',
+        'go_back', 'go_forward', 'refresh', 'get_url', 'get_title', 'show_page',
+        'maximize', 'minimize', 'fullscreen',
+    },
+}
+def _phrase(*alternatives):
+    return re.compile(r'(?:please\s+)?(?:' + '|'.join(alternatives) + r')(?:\s+please)?')
+
+# The whole (cleaned) command must be one of these fixed phrases for a grammar hit
+# to be trusted; "what does refresh rate mean" hits the refresh rule but is a question.
+KEYWORD_PHRASES = {
+    'scroll_down': _phrase(r'scroll\s+(?:the\s+page\s+)?down'),
+    'scroll_up': _phrase(r'scroll\s+(?:the\s+page\s+)?up'),
+    'volume_up': _phrase(r'(?:turn\s+(?:the\s+)?)?volume\s+up', r'increase\s+(?:the\s+)?volume'),
+    'volume_down': _phrase(r'(?:turn\s+(?:the\s+)?)?volume\s+down', r'decrease\s+(?:the\s+)?volume'),
+    'first_tab': _phrase(r'(?:switch|go|move)\s+to\s+(?:the\s+)?first\s+tab'),
+    'last_tab': _phrase(r'(?:switch|go|move)\s+to\s+(?:the\s+)?last\s+tab'),
+    'next_tab': _phrase(r'(?:(?:switch|go|move)\s+to\s+(?:the\s+)?)?next\s+tab'),
+    'previous_tab': _phrase(r'(?:(?:switch|go|move)\s+to\s+(?:the\s+)?)?prev(?:ious)?\s+tab'),
+    'tab_number': _phrase(r'(?:switch|go|move)\s+to\s+tab\s+\d+'),
+    'tab_ordinal': _phrase(r'(?:switch|go|move)\s+to\s+(?:the\s+)?\d+(?:st|nd|rd|th)\s+tab'),
+    'list_tabs': _phrase(r'(?:list|show)\s+(?:me\s+)?(?:all\s+)?(?:the\s+)?(?:open\s+)?tabs'),
+    'go_back': _phrase(r'(?:go\s+)?back'),
+    'go_forward': _phrase(r'(?:go\s+)?forward'),
+    'refresh': _phrase(r'(?:refresh|reload)(?:\s+(?:the|this))?(?:\s+page)?'),
+    'get_url': _phrase(r'(?:what\s+is|show|get|tell)\s+(?:me\s+)?(?:the\s+)?current\s+url'),
+    'get_title': _phrase(r'(?:what\s+is|show|get|tell)\s+(?:me\s+)?(?:the\s+)?page\s+title'),
+    'show_page': _phrase(r"what'?s\s+on\s+(?:the\s+|this\s+)?page", r'(?:show|read)\s+(?:the\s+|this\s+)?page',
+                         r'(?:show\s+)?(?:the\s+)?page\s+content'),
+    'maximize': _phrase(r'maximi[sz]e\s+(?:the\s+|this\s+)?window'),
+    'minimize': _phrase(r'minimi[sz]e\s+(?:the\s+|this\s+)?window'),
+    'fullscreen': _phrase(r'(?:go\s+|make\s+it\s+)?(?:fullscreen|full\s+screen)'),
+}
+# Questions about a command word ("how to go back in time") are Gemini's to answer.
+QUESTION = re.compile(r"^(?:what|who|whom|whose|why|how|when|where|which|tell\s+me|explain|define)\b|\b(?:mean|meaning|matlab)\b")
+TRAILING_PUNCTUATION = re.compile(r'[\s.,!?;:]+$')
+
+_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="GeminiParse")
+_sink = None
+_sink_lock = threading.Lock()
+
+def _decision_sink():
+    global _sink
+    with _sink_lock:
+        if _sink is None and PARSE_RACE_LOG_PATH is not False:
+            _sink = JsonLinesSink(PARSE_RACE_LOG_PATH or default_trace_path().with_name('parse_decisions.jsonl'))
+        return _sink
+
+def _phrase_text(text):
+    cleaned = FallbackParser.preprocess_text(text).lower().strip()
+    return FallbackParser.LEADING_CONNECTIVE.sub('', TRAILING_PUNCTUATION.sub('', cleaned))
+
+def local_parse(text):
+    """(action JSON, confidence, source) from the on-device model or, failing that, the regex grammar."""
+    phrase_text = _phrase_text(text)
+    model = get_local_intent_model()
+    if model is not None:
+        result, confidence = model.predict(text)
+        if result is not None:
+            if QUESTION.search(phrase_text):
+                confidence = min(confidence, 0.5)
+            return result, confidence, 'model'
+    rule, result = FallbackParser.match_rule(text)
+    phrase = KEYWORD_PHRASES.get(rule)
+    if phrase is not None and phrase.fullmatch(phrase_text):
+        return result, 1.0, f"rule:{rule}"
+    return result, 0.5 if rule else 0.0, f"rule:{rule}"
+
+def side_effect_free(result):
+    commands = SIDE_EFFECT_FREE.get(result.get('action'))
+    return bool(commands) and result.get('command') in commands
+
+def _same(a, b):
+    return isinstance(a, dict) and isinstance(b, dict) and a.get('action') == b.get('action') and a.get('command') == b.get('command')
+
+class ParseRace:
+    """Local parse and Gemini parse for one command, with a bounded wait.
+
+    The local parse (model or regex grammar) costs well under a millisecond,
+    so it runs on the caller's thread right before Gemini goes out on the pool:
+
+    - local result is confident and side-effect-free (scroll, tabs, volume,
+      navigation) -> return it at once. Gemini is only asked for a sample
+      (``audit_rate``) of these so the log shows how often the shortcut agrees;
+    - otherwise wait up to ``deadline`` seconds for Gemini, then use the local
+      result. A late Gemini answer is still logged.
+
+    Every decision goes to parse_decisions.jsonl next to the trace log and to
+    either_parse_decisions_total.
+    """
+    def __init__(self, gemini_parse, deadline=PARSE_RACE_DEADLINE, min_confidence=PARSE_RACE_MIN_CONFIDENCE,
+                 audit_rate=PARSE_RACE_AUDIT_RATE):
+        self.gemini_parse = gemini_parse
+        self.deadline = deadline
+        self.min_confidence = min_confidence
+        self.audit_rate = audit_rate
+    def parse(self, text):
+        start = time.perf_counter()
+        local, confidence, source = local_parse(text)
+        record = {
+            'ts': time.time(), 'text': text, 'local_source': source, 'confidence': round(confidence, 3),
+            'local': local, 'safe': side_effect_free(local),
+        }
+        if record['safe'] and confidence >= self.min_confidence:
+            result = self._finish(record, 'local_fast', local, start)
+            if random.random() < self.audit_rate:
+                _pool.submit(self._timed_gemini, text).add_done_callback(lambda f: self._log_late(record, f))
+            else:
+                self._log(record)
+            return result
+        future = _pool.submit(self._timed_gemini, text)
+        try:
+            gemini, gemini_ms = future.result(timeout=self.deadline)
+        except FutureTimeout:
+            result = self._finish(record, 'deadline', local, start)
+            future.add_done_callback(lambda f: self._log_late(record, f))
+            return result
+        record.update(gemini=gemini, gemini_ms=gemini_ms, agree=_same(local, gemini))
+        if gemini is None:
+            result = self._finish(record, 'gemini_failed', local, start)
+        else:
+            result = self._finish(record, 'gemini', gemini, start)
+        self._log(record)
+        return result
+    def _timed_gemini(self, text):
+        start = time.perf_counter()
+        try:
+            result = self.gemini_parse(text)
+        except Exception as e:
+            print(f"⚠️ Gemini parse failed: {e}")
+            result = None
+        return result, round((time.perf_counter() - start) * 1000, 1)
+    def _finish(self, record, decision, result, start):
+        record['decision'] = decision
+        record['total_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        PARSE_DECISIONS.inc(decision)
+        if decision == 'local_fast':
+            print(f"⚡ Using local parse ({record['local_source']}, {record['confidence']:.2f})")
+        elif decision == 'deadline':
+            print(f"⏱️ Gemini slower than {self.deadline:g}s, using local parse")
+        return result
+    def _log_late(self, record, future):
+        """Gemini answered after we moved on; keep what it said for tuning the thresholds."""
+        gemini, gemini_ms = future.result()
+        record.update(gemini=gemini, gemini_ms=gemini_ms, agree=_same(record['local'], gemini), late=True)
+        self._log(record)
+    def _log(self, record):
+        sink = _decision_sink()
+        if sink is not None:
+            sink.emit(record)
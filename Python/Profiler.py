@@ -0,0 +1,154 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+try:
+    from config import PROFILE_INTERVAL
+except ImportError:
+    PROFILE_INTERVAL = 0.005
+try:
+    from config import PROFILE_MAX_SECONDS
+except ImportError:
+    PROFILE_MAX_SECONDS = 60.0
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+def _frame_key(frame):
+    code = frame.f_code
+    return (code.co_name, code.co_filename, code.co_firstlineno)
+
+def _frame_label(key):
+    name, filename, line = key
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+class ProfileResult:
+    def __init__(self, samples, interval, started, stopped, reason):
+        self.samples = samples
+        self.interval = interval
+        self.started = started
+        self.stopped = stopped
+        self.reason = reason
+    @property
+    def duration(self):
+        return self.stopped - self.started
+    @property
+    def total_samples(self):
+        return sum(self.samples.values())
+    def collapsed(self):
+        """Brendan Gregg's folded format: 'thread;outer;...;inner count' per line."""
+        lines = []
+        for (thread, stack), count in sorted(self.samples.items(), key=lambda item: -item[1]):
+            lines.append(';'.join([thread] + [_frame_label(key) for key in stack]) + f" {count}")
+        return '\n'.join(lines) + '\n'
+    def speedscope(self, name="api_server"):
+        """speedscope.app 'sampled' profiles, one per thread."""
+        frames, index = [], {}
+        profiles = {}
+        for (thread, stack), count in self.samples.items():
+            ids = []
+            for key in stack:
+                if key not in index:
+                    index[key] = len(frames)
+                    frames.append({'name': key[0], 'file': key[1], 'line': key[2]})
+                ids.append(index[key])
+            profile = profiles.setdefault(thread, {
+                'type': 'sampled', 'name': thread, 'unit': 'seconds',
+                'startValue': 0, 'endValue': 0, 'samples': [], 'weights': [],
+            })
+            profile['samples'].append(ids)
+            profile['weights'].append(count * self.interval)
+            profile['endValue'] += count * self.interval
+        return {
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'name': name,
+            'exporter': 'either_assistant',
+            'activeProfileIndex': 0,
+            'shared': {'frames': frames},
+            'profiles': list(profiles.values()),
+        }
+    def summary(self):
+        return {
+            'duration': round(self.duration, 3),
+            'samples': self.total_samples,
+            'interval': self.interval,
+            'stopped_by': self.reason,
+        }
+
+class SamplingProfiler:
+    """Samples every thread's stack with sys._current_frames() from a daemon thread.
+
+    Covers the voice thread, executor workers and the asyncio loop alike
+    (a signal-based sampler would only see the main thread), and costs one
+    frame walk per thread per interval. A session always ends by itself
+    after ``max_seconds`` so a forgotten start can't keep sampling forever.
+    """
+    def __init__(self):
+        self.interval = PROFILE_INTERVAL
+        self.max_seconds = PROFILE_MAX_SECONDS
+        self.last_result = None
+        self._samples = Counter()
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._started = None
+        self._reason = None
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+    def start(self, interval=None, max_seconds=None):
+        with self._lock:
+            if self.running:
+                return False
+            self.interval = max(0.001, interval or PROFILE_INTERVAL)
+            self.max_seconds = min(max_seconds or PROFILE_MAX_SECONDS, PROFILE_MAX_SECONDS)
+            self._samples = Counter()
+            self._stop.clear()
+            self._reason = None
+            self._started = time.time()
+            self._thread = threading.Thread(target=self._run, daemon=True, name="SamplingProfiler")
+            self._thread.start()
+            print(f"🔬 Profiler started ({self.interval * 1000:.0f} ms interval, auto-stop after {self.max_seconds:g}s)")
+            return True
+    def _run(self):
+        own = threading.get_ident()
+        deadline = time.monotonic() + self.max_seconds
+        while not self._stop.wait(self.interval):
+            if time.monotonic() >= deadline:
+                self._reason = 'timeout'
+                break
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_key(frame))
+                    frame = frame.f_back
+                stack.reverse()
+                self._samples[(names.get(ident, str(ident)), tuple(stack))] += 1
+        self.last_result = ProfileResult(self._samples, self.interval, self._started, time.time(), self._reason or 'request')
+        if self._reason == 'timeout':
+            print(f"🔬 Profiler stopped after {self.max_seconds:g}s limit")
+    def stop(self):
+        """Stop sampling and return the result (the last one if it already timed out)."""
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return self.last_result
+            self._stop.set()
+            thread.join()
+            self._thread = None
+            print(f"🔬 Profiler stopped: {self.last_result.total_samples} samples")
+            return self.last_result
+
+_profiler = None
+_profiler_lock = threading.Lock()
+
+def get_profiler():
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = SamplingProfiler()
+        return _profiler
@@ -5,6 +5,8 @@ import webrtcvad
 import noisereduce as nr
 from scipy import signal
 from collections import deque
+import time
+from Tracing import get_tracer
 
 fs = 16000
 blocksize = 1024
@@ -140,6 +142,8 @@ def stream_microPhone(stt_function, buffer_seconds=2, noise_profile_duration=3):
     speech_buffer = []
     max_buffer_len = int(buffer_seconds * fs / blocksize)
     detector = SpeechDetector()
+    tracer = get_tracer()
+    silence_started = None
     noise_profile = []
     print("\n" + "="*60)
     print("NOISE CALIBRATION")
@@ -188,6 +192,8 @@ def stream_microPhone(stt_function, buffer_seconds=2, noise_profile_duration=3):
                 else:
                     if detector.is_speaking:
                         silence_blocks += 1
+                        if silence_blocks == 1:
+                            silence_started = time.perf_counter()
                         speech_buffer.append(audio_block)
                         if silence_blocks >= max_silence_blocks:
                             print(" Processing...")
@@ -195,8 +201,11 @@ def stream_microPhone(stt_function, buffer_seconds=2, noise_profile_duration=3):
                             silence_blocks = 0
                             audio_np = np.concatenate(speech_buffer, axis=0).flatten()
                             if detector.calculate_energy(audio_np) > ENERGY_THRESHOLD:
-                                audio_proc = preprocess_audio(audio_np, noise_sample)
-                                text = stt_function(audio_proc)
+                                with tracer.span('voice_command'):
+                                    tracer.record('vad_endpoint', silence_started)
+                                    with tracer.span('preprocess_audio'):
+                                        audio_proc = preprocess_audio(audio_np, noise_sample)
+                                    text = stt_function(audio_proc) or ""
                                 if text.strip() != "" and len(text.strip()) > 2:
                                     print(f"Transcription: {text}\n")
                                 else:
@@ -2,6 +2,8 @@ import os
 import json
 import numpy as np
 from vosk import Model, KaldiRecognizer
+from Tracing import traced
+from Metrics import track_stt
 
 vosk_model_path = os.path.join(os.path.dirname(__file__), "vosk-model-en-us-0.22")
 if not os.path.exists(vosk_model_path):
@@ -10,6 +12,8 @@ if not os.path.exists(vosk_model_path):
 model = Model(vosk_model_path)
 recognizer = KaldiRecognizer(model, 16000)
 
+@traced('stt')
+@track_stt('vosk')
 def stt_vosk(audio_np):
     data_bytes = (audio_np * 32767).astype(np.int16).tobytes()
     if recognizer.AcceptWaveform(data_bytes):
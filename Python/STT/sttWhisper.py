@@ -12,6 +12,9 @@ try:
 except ImportError:
     PRIMARY_LANGUAGE = "english"
 
+from Tracing import traced
+from Metrics import track_stt
+
 if torch.cuda.is_available():
     device = "cuda"
 elif torch.backends.mps.is_available():
@@ -27,6 +30,8 @@ model.config.forced_decoder_ids = None
 
 print(f"✓ Whisper initialized with PRIMARY_LANGUAGE: {PRIMARY_LANGUAGE}")
 
+@traced('stt')
+@track_stt('whisper')
 def stt_whisper(audio_np):
     audio_np = audio_np / np.max(np.abs(audio_np))
     input_features = processor(audio_np, sampling_rate=16000, return_tensors="pt").input_features.to(device)
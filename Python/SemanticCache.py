@@ -0,0 +1,288 @@
+import math
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from Metrics import record_cache
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SentenceTransformer = None
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+try:
+    from config import SEMANTIC_CACHE_ENABLED
+except ImportError:
+    SEMANTIC_CACHE_ENABLED = True
+try:
+    from config import SEMANTIC_CACHE_MODEL
+except ImportError:
+    SEMANTIC_CACHE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+try:
+    from config import SEMANTIC_CACHE_THRESHOLD
+except ImportError:
+    SEMANTIC_CACHE_THRESHOLD = None
+try:
+    from config import SEMANTIC_CACHE_TTL
+except ImportError:
+    SEMANTIC_CACHE_TTL = 24 * 3600
+try:
+    from config import SEMANTIC_CACHE_SIZE
+except ImportError:
+    SEMANTIC_CACHE_SIZE = 512
+
+CONTRACTIONS = (("what's", "what is"), ("who's", "who is"), ("where's", "where is"), ("how's", "how is"),
+                ("it's", "it is"), ("that's", "that is"), ("whats", "what is"))
+STOPWORDS = frozenset("a an the is are was were be of to in on for and or me my i you your it this that "
+                      "what who how why when where which do does did can could would please tell about".split())
+# Answers to these go stale long before the TTL does.
+VOLATILE_WORDS = frozenset("today tonight now current currently latest live weather news time date score "
+                           "price stock yesterday tomorrow".split())
+WORD = re.compile(r"[a-z0-9']+")
+
+def normalize(text):
+    text = text.lower().strip()
+    for short, long in CONTRACTIONS:
+        text = text.replace(short, long)
+    return ' '.join(WORD.findall(text))
+
+def content_words(text):
+    return frozenset(word for word in normalize(text).split() if word not in STOPWORDS)
+
+def numbers(words):
+    return frozenset(word for word in words if any(char.isdigit() for char in word))
+
+class HashingEmbedder:
+    """Dependency-free fallback: hashed word and character-trigram features.
+
+    Catches rephrasings that share vocabulary ("what is AI" / "AI what is it?"),
+    not true synonyms; the sentence-transformers model handles those. Hashed
+    vectors can't tell "10 km" from "100 km", so a hit also needs the same
+    content words (``exact_terms``).
+    """
+    name = 'hashing'
+    threshold = 0.8
+    exact_terms = True
+    def __init__(self, dim=256):
+        self.dim = dim
+    def _add(self, vector, feature, weight):
+        bucket = zlib.crc32(feature.encode('utf-8'))
+        vector[bucket % self.dim] += weight if bucket & 0x80000000 else -weight
+    def embed(self, text):
+        vector = [0.0] * self.dim
+        words = [word for word in normalize(text).split() if word not in STOPWORDS] or normalize(text).split()
+        for word in words:
+            self._add(vector, 'w:' + word, 1.0)
+            padded = f"<{word}>"
+            for i in range(len(padded) - 2):
+                self._add(vector, 't:' + padded[i:i + 3], 0.4)
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+class SentenceEmbedder:
+    """Small CPU sentence-embedding model, loaded on first use."""
+    name = 'sentence-transformers'
+    threshold = 0.88
+    exact_terms = False
+    def __init__(self, model_name=SEMANTIC_CACHE_MODEL):
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+    def _load(self):
+        with self._lock:
+            if self._model is None:
+                start = time.perf_counter()
+                self._model = SentenceTransformer(self.model_name, device='cpu')
+                print(f"🧠 Answer cache embedder loaded: {self.model_name} ({time.perf_counter() - start:.1f}s)")
+        return self._model
+    def embed(self, text):
+        return self._load().encode(normalize(text) or text, normalize_embeddings=True)
+
+def default_embedder():
+    if SENTENCE_TRANSFORMERS_AVAILABLE:
+        return SentenceEmbedder()
+    return HashingEmbedder()
+
+class _VectorIndex:
+    """Fixed-capacity matrix of unit vectors; cosine top-1 is one matrix-vector product."""
+    def __init__(self, capacity, dim):
+        self.capacity = capacity
+        self.dim = dim
+        if NUMPY_AVAILABLE:
+            self.matrix = np.zeros((capacity, dim), dtype=np.float32)
+        else:
+            self.matrix = [None] * capacity
+    def set(self, slot, vector):
+        if NUMPY_AVAILABLE:
+            self.matrix[slot] = np.asarray(vector, dtype=np.float32)
+        else:
+            self.matrix[slot] = list(vector)
+    def clear(self, slot):
+        if NUMPY_AVAILABLE:
+            self.matrix[slot] = 0.0
+        else:
+            self.matrix[slot] = None
+    def top1(self, vector, allowed):
+        """(slot, similarity) of the closest row among the ``allowed`` slots."""
+        if not allowed:
+            return None, 0.0
+        if NUMPY_AVAILABLE:
+            slots = np.fromiter(allowed, dtype=np.int64)
+            sims = self.matrix[slots] @ np.asarray(vector, dtype=np.float32)
+            best = int(np.argmax(sims))
+            return int(slots[best]), float(sims[best])
+        best, best_sim = None, -1.0
+        for slot in allowed:
+            row = self.matrix[slot]
+            sim = sum(a * b for a, b in zip(row, vector))
+            if sim > best_sim:
+                best, best_sim = slot, sim
+        return best, best_sim
+
+class SemanticCache:
+    """Answers keyed by question meaning, with a similarity threshold, TTL and LRU eviction.
+
+    Each namespace ("conversation", "web") is searched separately because the
+    same question is answered with different prompts. Exact repeats are found
+    by normalized text before anything is embedded. A similar question only
+    counts if it has the same numbers ("convert 10 km" is not "convert 100 km").
+    If the embedder fails (the model can't be downloaded) lookups miss and
+    stores are skipped; before anything is indexed it falls back to hashing.
+    """
+    def __init__(self, embedder=None, threshold=SEMANTIC_CACHE_THRESHOLD, ttl=SEMANTIC_CACHE_TTL,
+                 max_entries=SEMANTIC_CACHE_SIZE, enabled=SEMANTIC_CACHE_ENABLED):
+        self.enabled = enabled
+        self.embedder = embedder or default_embedder()
+        self._threshold = threshold
+        self.threshold = threshold if threshold is not None else self.embedder.threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._index = None
+        self._entries = OrderedDict()  # (namespace, normalized) -> entry, least recently used first
+        self._slots = {}  # slot -> key
+        self._free = list(range(max_entries - 1, -1, -1))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    def cacheable(self, text):
+        words = normalize(text).split()
+        return bool(words) and not any(word in VOLATILE_WORDS for word in words)
+    def _namespace_slots(self, namespace):
+        return [entry['slot'] for (ns, _), entry in self._entries.items() if ns == namespace]
+    def _expired(self, entry, now):
+        return self.ttl and now - entry['stored'] > self.ttl
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._slots.pop(entry['slot'], None)
+        self._index.clear(entry['slot'])
+        self._free.append(entry['slot'])
+    def _embed(self, text):
+        embedder = self.embedder
+        try:
+            return embedder.embed(text)
+        except Exception as e:
+            print(f"⚠️ Answer cache embedder failed: {str(e)[:100]}")
+        with self._lock:
+            if self._index is None and self.embedder is embedder and not isinstance(embedder, HashingEmbedder):
+                self.embedder = HashingEmbedder()
+                self.threshold = self._threshold if self._threshold is not None else self.embedder.threshold
+        return None
+    def _matches(self, text, key):
+        words, cached = content_words(text), content_words(key[1])
+        if getattr(self.embedder, 'exact_terms', False):
+            return words == cached
+        return numbers(words) == numbers(cached)
+    def get(self, namespace, text):
+        """Cached answer for ``text`` (or a close paraphrase), else None."""
+        if not self.enabled or not self.cacheable(text):
+            return None
+        start = time.perf_counter()
+        key = (namespace, normalize(text))
+        answer, similarity = self._lookup(key, text)
+        if answer is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            print(f"⚡ Answer cache hit ({similarity:.2f})")
+        record_cache('answers', answer is not None, time.perf_counter() - start)
+        return answer
+    def _lookup(self, key, text):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._expired(entry, now):
+                    self._remove(key)
+                else:
+                    self._entries.move_to_end(key)
+                    return entry['answer'], 1.0
+            if self._index is None or not self._entries:
+                return None, 0.0
+        vector = self._embed(text)
+        if vector is None:
+            return None, 0.0
+        with self._lock:
+            slot, similarity = self._index.top1(vector, self._namespace_slots(key[0]))
+            if slot is None or similarity < self.threshold:
+                return None, similarity
+            match = self._slots[slot]
+            if not self._matches(text, match):
+                return None, similarity
+            entry = self._entries[match]
+            if self._expired(entry, now):
+                self._remove(match)
+                return None, similarity
+            self._entries.move_to_end(match)
+            return entry['answer'], similarity
+    def put(self, namespace, text, answer):
+        if not self.enabled or not answer or not self.cacheable(text):
+            return
+        key = (namespace, normalize(text))
+        vector = self._embed(text)
+        if vector is None:
+            return
+        with self._lock:
+            if self._index is None:
+                self._index = _VectorIndex(self.max_entries, len(vector))
+            if key in self._entries:
+                self._remove(key)
+            if not self._free:
+                self._remove(next(iter(self._entries)))
+            slot = self._free.pop()
+            self._index.set(slot, vector)
+            self._slots[slot] = key
+            self._entries[key] = {'slot': slot, 'answer': answer, 'stored': time.time()}
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'capacity': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'embedder': self.embedder.name,
+            'threshold': self.threshold,
+        }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_semantic_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SemanticCache()
+        return _cache
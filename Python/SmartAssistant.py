@@ -5,10 +5,19 @@ from GeminiAPI import GeminiAssistant
 from ConfirmationManager import ConfirmationManager
 from Application.ApplicationController import ApplicationController
 from Application.ContextManager import ContextManager
+from Application.InputBackend import get_input_backend
+from Application.MacroManager import get_macro_manager
+from Browser.WebFetcher import get_web_fetcher
+from SemanticCache import get_semantic_cache
+from System.LaunchTracker import wait_for_focus, wait_for_window_change
+from System.WindowList import active_window
+from Tracing import span, traced, trace_methods
+from Metrics import COMMANDS, COMMAND_SECONDS
 import platform
-import time
+import re
 from pathlib import Path
 
+@trace_methods('_execute_')
 class SmartAssistant:
     def __init__(self, driver=None, system_controller=None):
         self.classifier = CommandClassifier()
@@ -26,9 +35,12 @@ class SmartAssistant:
             print(f"⚠ Gemini AI not available: {e}")
         self.confirmation_manager = ConfirmationManager()
         self.app_controller = ApplicationController()
-        self.context_manager = ContextManager()
+        self.context_manager = ContextManager.shared()
+        self.macros = get_macro_manager()
+        self.answer_cache = get_semantic_cache()
         print("✓ Application Controller initialized for app control")
-    def process_command(self, transcription):
+    @traced('process_command')
+    def process_command(self, transcription, command_json=None):
         if not transcription or transcription.strip() == "":
             return False, "Empty transcription"
         transcription = transcription.strip().rstrip('.,!?;:')
@@ -40,136 +52,19 @@ class SmartAssistant:
         
         if self.confirmation_manager.has_pending():
             return self._handle_confirmation(transcription)
-        if self.gemini_available:
+        opened = self._open_fetched_result(transcription)
+        if opened:
+            return opened
+        macro_command = self.macros.parse_control(transcription)
+        if macro_command and (macro_command[0] not in ('stop', 'cancel') or self.macros.is_recording):
+            return self._handle_macro_command(*macro_command)
+        if self.gemini_available or command_json is not None:
             try:
-                command_json = self.gemini.parse_command_to_json(transcription)
+                if command_json is None:
+                    with span('parse_command_to_json'):
+                        command_json = self.gemini.parse_command_to_json(transcription)
                 print(f"🤖 Action: {command_json.get('action', 'unknown')}")
-                action = command_json.get('action', 'unknown')
-                
-                if action == 'web_search':
-                    query = command_json.get('query', '')
-                    if any(keyword in query.lower() for keyword in ['create', 'make', 'file']) and 'file' in transcription.lower():
-                        print("🔍 Detected file command misclassified as web_search, attempting to parse...")
-                        result = self._handle_fallback_file_commands(transcription)
-                        if result[0]:
-                            return result
-                
-                if action == 'open_app':
-                    app_name = command_json.get('app_name', '')
-                    app_name_normalized = app_name.lower().replace(',', ' and ')
-                    
-                    search_variations = ['search', 'searc', 'serch', 'find', 'lookup']
-                    has_search = any(var in app_name_normalized for var in search_variations)
-                    browsers = ['chrome', 'firefox', 'edge', 'safari', 'brave', 'opera', 'browser']
-                    
-                    if ('and' in app_name_normalized or ',' in app_name.lower()) and has_search:
-                        import re
-                        for browser in browsers:
-                            if browser in app_name_normalized:
-                                pattern = r'^(.+?)\s+and\s+(?:search|searc|serch|find|lookup)\s+(?:for\s+)?(.+)'
-                                match = re.search(pattern, app_name_normalized)
-                                if match:
-                                    browser_name = match.group(1).strip()
-                                    query = match.group(2).strip()
-                                    if any(b in browser_name for b in browsers):
-                                        return self._execute_complex_command([
-                                            {"action": "open_app", "app_name": browser_name},
-                                            {"action": "web_search", "query": query}
-                                        ])
-                    
-                    if ('and' in app_name_normalized or ',' in app_name.lower()) and ('create' in app_name_normalized or 'make' in app_name_normalized) and 'file' in app_name_normalized:
-                        import re
-                        patterns = [
-                            r'^(.+?)\s+and\s+(?:create|make)\s+(?:and\s+)?(?:open\s+)?(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)',
-                            r'^(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)',
-                            r'^(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)',
-                        ]
-                        for pattern in patterns:
-                            match = re.search(pattern, app_name_normalized)
-                            if match:
-                                actual_app = match.group(1).strip().rstrip(',')
-                                file_name = match.group(2).strip().rstrip('.,!?;:')
-                                
-                                actual_app = actual_app.replace('vs code', 'vscode').replace('visual studio code', 'vscode').replace(' vs ', ' vscode ')
-                                if actual_app.lower() == 'vs' or actual_app.lower().strip() == 'vs':
-                                    actual_app = 'vscode'
-                                
-                                if file_name and file_name not in ['called', 'named', 'titled', 'a', 'the', 'it']:
-                                    return self._execute_complex_command([
-                                        {"action": "open_app", "app_name": actual_app},
-                                        {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": actual_app}
-                                    ])
-                    return self._execute_open_app(app_name)
-                elif action == 'switch_app':
-                    app_name = command_json.get('app_name', '')
-                    return self._execute_switch_app(app_name)
-                elif action == 'app_command':
-                    command = command_json.get('command', '')
-                    params = command_json.get('params', {})
-                    return self._execute_app_command(command, params)
-                elif action == 'clear_context':
-                    return self._execute_clear_context()
-                elif action == 'web_search':
-                    query = command_json.get('query', '')
-                    if any(keyword in transcription.lower() for keyword in ['create', 'make']) and 'file' in transcription.lower():
-                        print("🔍 Detected file command in web_search, attempting fallback...")
-                        result = self._handle_fallback_file_commands(transcription)
-                        if result[0]:
-                            return result
-                    return self._execute_web_search(query)
-                elif action == 'platform_search':
-                    platform = command_json.get('platform', 'google')
-                    query = command_json.get('query', '')
-                    return self._execute_platform_search(platform, query)
-                elif action == 'list_apps':
-                    return self._execute_list_apps()
-                elif action == 'play_media':
-                    query = command_json.get('query', '')
-                    platform = command_json.get('platform', 'youtube')
-                    return self._execute_play_media(query, platform)
-                elif action == 'download_app':
-                    app_name = command_json.get('app_name', '')
-                    source = command_json.get('source', 'web')  # default to web
-                    return self._execute_download_app(app_name, source)
-                elif action == 'download_research':
-                    topic = command_json.get('topic', '')
-                    max_papers = command_json.get('max_papers', 5)
-                    return self._execute_download_research(topic, max_papers)
-                elif action == 'open_website':
-                    url = command_json.get('url', '')
-                    return self._execute_open_website(url)
-                elif action == 'browser_control':
-                    command = command_json.get('command', '')
-                    return self._execute_browser_control(command_json)
-                elif action == 'conversation':
-                    text = command_json.get('text', transcription)
-                    return self._handle_conversation(text)
-                elif action == 'complex_command':
-                    steps = command_json.get('steps', [])
-                    return self._execute_complex_command(steps)
-                elif action == 'create_file':
-                    file_path = command_json.get('file_path', '')
-                    create_folder_if_missing = command_json.get('create_folder_if_missing', True)
-                    open_in_app = command_json.get('open_in_app', None)
-                    return self._execute_create_file(file_path, create_folder_if_missing, open_in_app)
-                elif action == 'create_folder':
-                    folder_path = command_json.get('folder_path', '')
-                    return self._execute_create_folder(folder_path)
-                elif action == 'move_file':
-                    source = command_json.get('source', '')
-                    destination = command_json.get('destination', '')
-                    return self._execute_move_file(source, destination)
-                elif action == 'copy_file':
-                    source = command_json.get('source', '')
-                    destination = command_json.get('destination', '')
-                    return self._execute_copy_file(source, destination)
-                else:
-                    if self.context_manager.is_in_app_context():
-                        return self._try_generic_app_command(transcription)
-                    if any(keyword in transcription.lower() for keyword in ['create', 'make', 'file', 'folder', 'move', 'copy', 'open app', 'switch']):
-                        print(f"⚠ Command not fully recognized, attempting fallback parsing...")
-                        return self._handle_conversation(transcription)
-                    return self._execute_web_search(transcription)
+                return self._run_command_json(command_json, transcription)
             except Exception as e:
                 print(f"⚠ Gemini parsing failed: {e}")
                 if self.context_manager.is_in_app_context():
@@ -184,6 +79,186 @@ class SmartAssistant:
             return self._handle_web_query(transcription)
         else:
             return self._handle_conversation(transcription)
+    def _handle_macro_command(self, operation, name=None):
+        if operation == 'start':
+            if self.macros.start_recording(name or ''):
+                return True, f"Recording macro '{name}'. Say 'stop recording' when done"
+            return False, "Macro needs a name"
+        if operation == 'stop':
+            saved = self.macros.stop_recording()
+            if saved:
+                return True, f"Saved macro '{saved}' ({len(self.macros.get(saved))} steps)"
+            return False, "Nothing was recorded"
+        if operation == 'cancel':
+            self.macros.cancel_recording()
+            return True, "Macro recording cancelled"
+        if operation == 'delete':
+            if self.macros.delete(name or ''):
+                return True, f"Deleted macro '{name}'"
+            return False, f"No macro named '{name}'"
+        if operation == 'list':
+            names = self.macros.list_macros()
+            if names:
+                return True, "Macros: " + ", ".join(names)
+            return True, "No macros recorded yet"
+        return self._execute_macro(name or '')
+    def _execute_macro(self, name):
+        steps = self.macros.get(name)
+        if not steps:
+            return False, f"No macro named '{name}'"
+        print(f"▶️ Running macro '{name}' ({len(steps)} steps)")
+        keys = self.app_controller.input
+        for i, step in enumerate(steps, 1):
+            action = step.get('action', '')
+            if step.get('keys'):
+                self.context_manager.set_context(step['app'])
+                keys.sequence([tuple(key_action) for key_action in step['keys']])
+                success, message = True, f"Executed: {step.get('command', action)}"
+            else:
+                success, message = self._dispatch_command_json(step)
+            if not success:
+                print(f"⚠ Macro step {i} failed: {message}")
+                return False, f"Macro '{name}' failed at step {i}: {message}"
+            if action == 'open_app' and i < len(steps):
+                self._wait_for_app(step.get('app_name', ''))
+        return True, f"Ran macro '{name}' ({len(steps)} steps)"
+    def _run_command_json(self, command_json, transcription=''):
+        app_before = self.context_manager.get_current_context()
+        action = command_json.get('action', 'unknown')
+        COMMANDS.inc(action)
+        with self.app_controller.input.capture() as keys, span('dispatch', action=action), COMMAND_SECONDS.time(action):
+            result = self._dispatch_command_json(command_json, transcription)
+        if self.macros.is_recording and result[0]:
+            app = app_before if command_json.get('action') == 'app_command' else None
+            self.macros.record_step(command_json, app=app, keys=keys if app else None)
+        return result
+    def _dispatch_command_json(self, command_json, transcription=''):
+        action = command_json.get('action', 'unknown')
+        
+        if action == 'web_search':
+            query = command_json.get('query', '')
+            if any(keyword in query.lower() for keyword in ['create', 'make', 'file']) and 'file' in transcription.lower():
+                print("🔍 Detected file command misclassified as web_search, attempting to parse...")
+                result = self._handle_fallback_file_commands(transcription)
+                if result[0]:
+                    return result
+        
+        if action == 'open_app':
+            app_name = command_json.get('app_name', '')
+            app_name_normalized = app_name.lower().replace(',', ' and ')
+            
+            search_variations = ['search', 'searc', 'serch', 'find', 'lookup']
+            has_search = any(var in app_name_normalized for var in search_variations)
+            browsers = ['chrome', 'firefox', 'edge', 'safari', 'brave', 'opera', 'browser']
+            
+            if ('and' in app_name_normalized or ',' in app_name.lower()) and has_search:
+                import re
+                for browser in browsers:
+                    if browser in app_name_normalized:
+                        pattern = r'^(.+?)\s+and\s+(?:search|searc|serch|find|lookup)\s+(?:for\s+)?(.+)'
+                        match = re.search(pattern, app_name_normalized)
+                        if match:
+                            browser_name = match.group(1).strip()
+                            query = match.group(2).strip()
+                            if any(b in browser_name for b in browsers):
+                                return self._execute_complex_command([
+                                    {"action": "open_app", "app_name": browser_name},
+                                    {"action": "web_search", "query": query}
+                                ])
+            
+            if ('and' in app_name_normalized or ',' in app_name.lower()) and ('create' in app_name_normalized or 'make' in app_name_normalized) and 'file' in app_name_normalized:
+                import re
+                patterns = [
+                    r'^(.+?)\s+and\s+(?:create|make)\s+(?:and\s+)?(?:open\s+)?(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)',
+                    r'^(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+(?:called|named|titled)?\s*([^\s]+(?:\.[^\s]+)?)',
+                    r'^(.+?)\s+and\s+(?:create|make)\s+(?:a\s+|the\s+)?file\s+([^\s]+(?:\.[^\s]+)?)',
+                ]
+                for pattern in patterns:
+                    match = re.search(pattern, app_name_normalized)
+                    if match:
+                        actual_app = match.group(1).strip().rstrip(',')
+                        file_name = match.group(2).strip().rstrip('.,!?;:')
+                        
+                        actual_app = actual_app.replace('vs code', 'vscode').replace('visual studio code', 'vscode').replace(' vs ', ' vscode ')
+                        if actual_app.lower() == 'vs' or actual_app.lower().strip() == 'vs':
+                            actual_app = 'vscode'
+                        
+                        if file_name and file_name not in ['called', 'named', 'titled', 'a', 'the', 'it']:
+                            return self._execute_complex_command([
+                                {"action": "open_app", "app_name": actual_app},
+                                {"action": "create_file", "file_path": file_name, "create_folder_if_missing": True, "open_in_app": actual_app}
+                            ])
+            return self._execute_open_app(app_name)
+        elif action == 'switch_app':
+            app_name = command_json.get('app_name', '')
+            return self._execute_switch_app(app_name)
+        elif action == 'app_command':
+            command = command_json.get('command', '')
+            params = command_json.get('params', {})
+            return self._execute_app_command(command, params)
+        elif action == 'clear_context':
+            return self._execute_clear_context()
+        elif action == 'web_search':
+            query = command_json.get('query', '')
+            if any(keyword in transcription.lower() for keyword in ['create', 'make']) and 'file' in transcription.lower():
+                print("🔍 Detected file command in web_search, attempting fallback...")
+                result = self._handle_fallback_file_commands(transcription)
+                if result[0]:
+                    return result
+            return self._execute_web_search(query)
+        elif action == 'platform_search':
+            platform = command_json.get('platform', 'google')
+            query = command_json.get('query', '')
+            return self._execute_platform_search(platform, query)
+        elif action == 'list_apps':
+            return self._execute_list_apps()
+        elif action == 'play_media':
+            query = command_json.get('query', '')
+            platform = command_json.get('platform', 'youtube')
+            return self._execute_play_media(query, platform)
+        elif action == 'download_app':
+            app_name = command_json.get('app_name', '')
+            source = command_json.get('source', 'web')  # default to web
+            return self._execute_download_app(app_name, source)
+        elif action == 'download_research':
+            topic = command_json.get('topic', '')
+            max_papers = command_json.get('max_papers', 5)
+            return self._execute_download_research(topic, max_papers)
+        elif action == 'open_website':
+            url = command_json.get('url', '')
+            return self._execute_open_website(url)
+        elif action == 'browser_control':
+            command = command_json.get('command', '')
+            return self._execute_browser_control(command_json)
+        elif action == 'conversation':
+            text = command_json.get('text', transcription)
+            return self._handle_conversation(text)
+        elif action == 'complex_command':
+            steps = command_json.get('steps', [])
+            return self._execute_complex_command(steps)
+        elif action == 'create_file':
+            file_path = command_json.get('file_path', '')
+            create_folder_if_missing = command_json.get('create_folder_if_missing', True)
+            open_in_app = command_json.get('open_in_app', None)
+            return self._execute_create_file(file_path, create_folder_if_missing, open_in_app)
+        elif action == 'create_folder':
+            folder_path = command_json.get('folder_path', '')
+            return self._execute_create_folder(folder_path)
+        elif action == 'move_file':
+            source = command_json.get('source', '')
+            destination = command_json.get('destination', '')
+            return self._execute_move_file(source, destination)
+        elif action == 'copy_file':
+            source = command_json.get('source', '')
+            destination = command_json.get('destination', '')
+            return self._execute_copy_file(source, destination)
+        else:
+            if self.context_manager.is_in_app_context():
+                return self._try_generic_app_command(transcription)
+            if any(keyword in transcription.lower() for keyword in ['create', 'make', 'file', 'folder', 'move', 'copy', 'open app', 'switch']):
+                print(f"⚠ Command not fully recognized, attempting fallback parsing...")
+                return self._handle_conversation(transcription)
+            return self._execute_web_search(transcription)
     def _execute_open_app(self, app_name):
         if self.system_controller:
             success = self.system_controller.open_app(app_name)
@@ -211,6 +286,11 @@ class SmartAssistant:
             return True, f"Context set to {app_name}"
         return False, "Failed to switch application"
     
+    def _wait_for_app(self, app_name, timeout=10.0):
+        if self.system_controller and self.system_controller.get_launch(app_name):
+            return self.system_controller.wait_until_ready(app_name, timeout)
+        return wait_for_focus(app_name, 1.5)
+    
     def _execute_app_command(self, command, params):
         current_app = self.context_manager.get_current_context()
         if not current_app:
@@ -234,6 +314,8 @@ class SmartAssistant:
             
             if step_action == 'open_app':
                 success, message = self._execute_open_app(step.get('app_name', ''))
+                if success and i < len(steps):
+                    self._wait_for_app(step.get('app_name', ''))
             elif step_action == 'create_file':
                 success, message = self._execute_create_file(
                     step.get('file_path', ''),
@@ -295,7 +377,7 @@ class SmartAssistant:
                 if open_in_app:
                     print(f"Opening {file_path_obj.name} in {open_in_app}")
                     self._execute_switch_app(open_in_app)
-                    time.sleep(1.5)
+                    self._wait_for_app(open_in_app)
                     
                     if open_in_app.lower() in ['vscode', 'code', 'visual studio code', 'vs']:
                         import subprocess
@@ -308,27 +390,25 @@ class SmartAssistant:
                                 message += f" | Opened in {open_in_app}"
                             except FileNotFoundError:
                                 ctrl_or_cmd = 'command' if platform.system() == 'Darwin' else 'ctrl'
-                                import pyautogui
-                                pyautogui.hotkey(ctrl_or_cmd, 'p')
-                                time.sleep(0.8)
-                                pyautogui.write(str(file_path))
-                                time.sleep(0.3)
-                                pyautogui.press('enter')
+                                keys = get_input_backend()
+                                before = active_window()
+                                keys.hotkey(ctrl_or_cmd, 'p')
+                                wait_for_window_change(before, 0.8)
+                                keys.sequence([('write', str(file_path)), ('sleep', 0.3), ('press', 'enter')])
                                 message += f" | Opened in {open_in_app}"
                     else:
                         ctrl_or_cmd = 'command' if platform.system() == 'Darwin' else 'ctrl'
-                        import pyautogui
-                        pyautogui.hotkey(ctrl_or_cmd, 'o')
-                        time.sleep(0.8)
-                        pyautogui.write(str(file_path))
-                        time.sleep(0.3)
-                        pyautogui.press('enter')
+                        keys = get_input_backend()
+                        before = active_window()
+                        keys.hotkey(ctrl_or_cmd, 'o')
+                        wait_for_window_change(before, 0.8)
+                        keys.sequence([('write', str(file_path)), ('sleep', 0.3), ('press', 'enter')])
                         message += f" | Opened in {open_in_app}"
                 elif self.context_manager.get_current_context():
                     current_app = self.context_manager.get_current_context()
                     print(f"File created, current context: {current_app}")
                     if current_app.lower() in ['vscode', 'code', 'visual studio code']:
-                        time.sleep(1.5)
+                        self._wait_for_app(current_app)
                         import subprocess
                         try:
                             subprocess.Popen(['code', str(file_path)], stderr=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
@@ -339,12 +419,11 @@ class SmartAssistant:
                                 message += f" | Opened in {current_app}"
                             except FileNotFoundError:
                                 ctrl_or_cmd = 'command' if platform.system() == 'Darwin' else 'ctrl'
-                                import pyautogui
-                                pyautogui.hotkey(ctrl_or_cmd, 'p')
-                                time.sleep(0.8)
-                                pyautogui.write(str(file_path))
-                                time.sleep(0.3)
-                                pyautogui.press('enter')
+                                keys = get_input_backend()
+                                before = active_window()
+                                keys.hotkey(ctrl_or_cmd, 'p')
+                                wait_for_window_change(before, 0.8)
+                                keys.sequence([('write', str(file_path)), ('sleep', 0.3), ('press', 'enter')])
                                 message += f" | Opened in {current_app}"
                 
                 return True, message
@@ -793,14 +872,25 @@ class SmartAssistant:
         else:
             return False, "System controller not available"
     def _handle_web_query(self, text):
+        if not self._is_url(text):
+            cached = self.answer_cache.get('web', self._clean_search_query(text))
+            if cached:
+                print(f"🤖 {cached}\n")
+                return True, cached
         if self.gemini_available and not self._is_url(text):
             try:
                 query = self._clean_search_query(text)
                 response = self.gemini.search_and_respond(query)
                 print(f"🤖 {response}\n")
+                if not response.startswith("Sorry, I couldn't get information"):
+                    self.answer_cache.put('web', query, response)
                 return True, response
             except Exception as e:
                 pass
+        if not self._is_url(text):
+            fetched = self._fetch_web_results(self._clean_search_query(text))
+            if fetched:
+                return fetched
         if self.browser:
             try:
                 if self._is_url(text):
@@ -814,12 +904,51 @@ class SmartAssistant:
                 return False, f"Error: {e}"
         else:
             return False, "Neither Gemini nor browser available for web queries"
+    def _fetch_web_results(self, query):
+        fetcher = get_web_fetcher()
+        if fetcher is None:
+            return None
+        results = fetcher.search(query)
+        if not results:
+            return None
+        for i, result in enumerate(results[:5], 1):
+            print(f"  {i}. {result['title']} - {result['url']}")
+        top = "; ".join(f"{i}. {result['title']}" for i, result in enumerate(results[:3], 1))
+        return True, f"Top results for {query}: {top}. Say 'open result' and a number to open one"
+    def _open_fetched_result(self, text):
+        fetcher = get_web_fetcher()
+        if fetcher is None or not fetcher.has_recent_results():
+            return None
+        match = re.search(r'^open\s+(?:the\s+)?result\s+(?:number\s+)?(\d+)$', text.lower())
+        if match:
+            position = int(match.group(1))
+        else:
+            match = re.search(r'^open\s+(?:the\s+)?(first|second|third|fourth|fifth)\s+result$', text.lower())
+            if match:
+                position = ['first', 'second', 'third', 'fourth', 'fifth'].index(match.group(1)) + 1
+        if not match:
+            # Any other command moves on from the results list.
+            fetcher.expire_results()
+            return None
+        url = fetcher.result_url(position)
+        if not url:
+            return False, f"There is no result {position}"
+        if not self.browser:
+            return False, f"Browser not available to open {url}"
+        fetcher.expire_results()
+        self.browser.open_website(url)
+        return True, f"Opened result {position}"
     def _handle_conversation(self, text):
+        cached = self.answer_cache.get('conversation', text)
+        if cached:
+            print(f"🤖 {cached}")
+            return True, cached
         if self.gemini_available:
             try:
                 success, response = self.gemini.query(f"Answer this question concisely and clearly: {text}")
                 if success:
                     print(f"🤖 {response}")
+                    self.answer_cache.put('conversation', text, response)
                     return True, response
             except Exception as e:
                 print(f"⚠ Gemini query failed: {e}")
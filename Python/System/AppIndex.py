@@ -0,0 +1,369 @@
+import ctypes
+import ctypes.util
+import json
+import os
+import platform
+import select
+import struct
+import threading
+import time
+from pathlib import Path
+
+INDEX_VERSION = 1
+
+def _clean_name(name):
+    return ''.join(c.lower() for c in name if c.isalnum() or c.isspace())
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def default_index_path():
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA')
+    base = Path(cache_home) if cache_home else Path.home() / '.cache'
+    return base / 'either_assistant' / 'app_index.json'
+
+class AppIndex:
+    """On-disk index of installed applications.
+
+    Every source (a .desktop directory, a Start Menu tree, a registry key,
+    ...) is stored as the ordered list of ``(name, command, weak)`` entries
+    it produced plus a stamp of the directory mtimes / registry timestamps
+    it was read from. On load only sources whose stamp changed are scanned
+    again, and the entries are replayed in source order so the result is
+    identical to a full scan (``weak`` entries such as abbreviations are
+    only added when the name is still free).
+    """
+    def __init__(self, system=None, home_dir=None, index_path=None, on_change=None):
+        self.system = system or platform.system()
+        self.home_dir = Path(home_dir) if home_dir else Path.home()
+        self.index_path = Path(index_path) if index_path else default_index_path()
+        self.on_change = on_change
+        self.sources = self._sources()
+        self.entries = {}
+        self.apps = {}
+        self._lock = threading.Lock()
+        self._watcher = None
+    def _sources(self):
+        if self.system == "Linux":
+            desktop_paths = [
+                '/usr/share/applications',
+                '/usr/local/share/applications',
+                str(self.home_dir / '.local/share/applications'),
+                '/var/lib/snapd/desktop/applications',
+                '/var/lib/flatpak/exports/share/applications',
+            ]
+            return [('desktop', path) for path in desktop_paths]
+        if self.system == "Windows":
+            sources = [
+                ('start_menu', os.path.join(os.environ.get('ProgramData', 'C:\\ProgramData'), 'Microsoft\\Windows\\Start Menu\\Programs')),
+                ('start_menu', os.path.join(os.environ.get('APPDATA', ''), 'Microsoft\\Windows\\Start Menu\\Programs')),
+                ('program_files', os.environ.get('ProgramFiles', 'C:\\Program Files')),
+                ('program_files', os.environ.get('ProgramFiles(x86)', 'C:\\Program Files (x86)')),
+                ('program_files', os.path.join(os.environ.get('LOCALAPPDATA', ''), 'Programs')),
+                ('registry', r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+                ('registry', r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
+            ]
+            return sources
+        if self.system == "Darwin":
+            app_paths = [
+                '/Applications',
+                '/System/Applications',
+                '/System/Library/CoreServices/Applications',
+                str(self.home_dir / 'Applications'),
+                '/Applications/Utilities',
+            ]
+            return [('macos_apps', path) for path in app_paths]
+        return []
+    def _source_id(self, source):
+        return f"{source[0]}:{source[1]}"
+    def load(self):
+        """Load the index from disk, rescanning only stale sources."""
+        stored = {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION and data.get('system') == self.system:
+                stored = data.get('sources', {})
+        except (OSError, ValueError):
+            pass
+        changed = False
+        entries = {}
+        for source in self.sources:
+            source_id = self._source_id(source)
+            entry = stored.get(source_id)
+            if entry is None or self._is_stale(entry.get('stamp', {})):
+                entry = self._scan(source)
+                changed = True
+            entries[source_id] = entry
+        with self._lock:
+            self.entries = entries
+            self.apps = self._build()
+        if changed or set(stored) != set(entries):
+            self.save()
+        return self.apps
+    def refresh(self, source_ids=None):
+        """Rescan the given sources (all of them if None) and rebuild."""
+        with self._lock:
+            entries = dict(self.entries)
+        for source in self.sources:
+            source_id = self._source_id(source)
+            if source_ids is None or source_id in source_ids:
+                entries[source_id] = self._scan(source)
+        with self._lock:
+            self.entries = entries
+            self.apps = self._build()
+            apps = self.apps
+        self.save()
+        if self.on_change:
+            try:
+                self.on_change(apps)
+            except Exception:
+                pass
+        return apps
+    def save(self):
+        with self._lock:
+            data = {'version': INDEX_VERSION, 'system': self.system, 'sources': self.entries}
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            pass
+    def _build(self):
+        apps = {}
+        for source in self.sources:
+            entry = self.entries.get(self._source_id(source))
+            if not entry:
+                continue
+            for name, command, weak in entry['ops']:
+                if weak and name in apps:
+                    continue
+                apps[name] = command
+        return apps
+    def _is_stale(self, stamp):
+        if not stamp:
+            return True
+        for key, value in stamp.items():
+            if key.startswith('winreg:'):
+                current = self._registry_stamp(key[len('winreg:'):])
+            else:
+                current = _mtime(key)
+            if current != value:
+                return True
+        return False
+    def _scan(self, source):
+        kind, path = source
+        ops = []
+        stamp = {}
+        try:
+            if kind == 'desktop':
+                self._scan_desktop_dir(path, ops, stamp)
+            elif kind == 'start_menu':
+                self._scan_start_menu(path, ops, stamp)
+            elif kind == 'program_files':
+                self._scan_program_files(path, ops, stamp)
+            elif kind == 'registry':
+                self._scan_registry(path, ops, stamp)
+            elif kind == 'macos_apps':
+                self._scan_macos_dir(path, ops, stamp)
+        except Exception:
+            pass
+        return {'stamp': stamp, 'ops': ops}
+    def _scan_desktop_dir(self, desktop_path, ops, stamp):
+        stamp[desktop_path] = _mtime(desktop_path)
+        if stamp[desktop_path] is None:
+            return
+        for file in os.listdir(desktop_path):
+            if file.endswith('.desktop'):
+                self._parse_desktop_file(os.path.join(desktop_path, file), ops)
+    def _parse_desktop_file(self, filepath, ops):
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                name = None
+                exec_cmd = None
+                no_display = False
+                for line in f:
+                    line = line.strip()
+                    if line.startswith('Name=') and not line.startswith('Name['):
+                        name = line.split('=', 1)[1].strip()
+                    elif line.startswith('Exec='):
+                        exec_cmd = line.split('=', 1)[1].strip()
+                        exec_cmd = exec_cmd.split()[0] if exec_cmd else None
+                    elif line.startswith('NoDisplay=true'):
+                        no_display = True
+                if name and exec_cmd and not no_display:
+                    ops.append((name.lower(), exec_cmd, False))
+                    clean_name = _clean_name(name)
+                    if clean_name != name.lower():
+                        ops.append((clean_name, exec_cmd, False))
+                    words = name.lower().split()
+                    if len(words) > 1:
+                        abbrev = ''.join(w[0] for w in words if w)
+                        if len(abbrev) > 1:
+                            ops.append((abbrev, exec_cmd, True))
+        except Exception:
+            pass
+    def _scan_start_menu(self, start_menu, ops, stamp):
+        stamp[start_menu] = _mtime(start_menu)
+        if stamp[start_menu] is None:
+            return
+        for root, dirs, files in os.walk(start_menu):
+            stamp[root] = _mtime(root)
+            for file in files:
+                if file.endswith('.lnk'):
+                    app_name = file[:-4].lower()
+                    ops.append((app_name, file[:-4], False))
+                    clean_name = _clean_name(app_name)
+                    if clean_name != app_name:
+                        ops.append((clean_name, file[:-4], False))
+    def _scan_program_files(self, base_path, ops, stamp):
+        stamp[base_path] = _mtime(base_path)
+        if stamp[base_path] is None:
+            return
+        for item in os.listdir(base_path):
+            item_path = os.path.join(base_path, item)
+            if os.path.isdir(item_path):
+                ops.append((item.lower(), item, False))
+                stamp[item_path] = _mtime(item_path)
+                try:
+                    for file in os.listdir(item_path):
+                        if file.endswith('.exe'):
+                            ops.append((file[:-4].lower(), file[:-4], False))
+                except OSError:
+                    pass
+    def _registry_stamp(self, reg_path):
+        try:
+            import winreg
+            key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, reg_path)
+            try:
+                return winreg.QueryInfoKey(key)[2]
+            finally:
+                winreg.CloseKey(key)
+        except (ImportError, OSError):
+            return None
+    def _scan_registry(self, reg_path, ops, stamp):
+        stamp['winreg:' + reg_path] = self._registry_stamp(reg_path)
+        try:
+            import winreg
+            key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, reg_path)
+        except (ImportError, OSError):
+            return
+        for i in range(winreg.QueryInfoKey(key)[0]):
+            try:
+                subkey_name = winreg.EnumKey(key, i)
+                subkey = winreg.OpenKey(key, subkey_name)
+                try:
+                    app_name = winreg.QueryValueEx(subkey, "DisplayName")[0]
+                    if app_name:
+                        ops.append((app_name.lower(), app_name, False))
+                        clean_name = _clean_name(app_name)
+                        if clean_name != app_name.lower():
+                            ops.append((clean_name, app_name, False))
+                except OSError:
+                    pass
+                winreg.CloseKey(subkey)
+            except OSError:
+                pass
+        winreg.CloseKey(key)
+    def _scan_macos_dir(self, app_path, ops, stamp):
+        stamp[app_path] = _mtime(app_path)
+        if stamp[app_path] is None:
+            return
+        for item in os.listdir(app_path):
+            if item.endswith('.app'):
+                full_name = item[:-4]
+                app_name = full_name.lower()
+                ops.append((app_name, full_name, False))
+                clean_name = _clean_name(full_name)
+                if clean_name != app_name:
+                    ops.append((clean_name, full_name, False))
+                words = app_name.split()
+                if len(words) > 1:
+                    abbrev = ''.join(w[0] for w in words if w)
+                    if len(abbrev) > 1:
+                        ops.append((abbrev, full_name, False))
+    def start_watcher(self):
+        """Keep the index current via inotify (Linux only)."""
+        if self.system != "Linux" or self._watcher is not None:
+            return False
+        watcher = _InotifyWatcher(self)
+        if not watcher.setup():
+            return False
+        self._watcher = watcher
+        watcher.start()
+        return True
+    def stop_watcher(self):
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
+
+class _InotifyWatcher(threading.Thread):
+    IN_ATTRIB = 0x004
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_CLOEXEC = 0o2000000
+    IN_NONBLOCK = 0o4000
+    EVENT_HEADER = struct.Struct('iIII')
+    DEBOUNCE = 0.5
+    def __init__(self, index):
+        super().__init__(daemon=True, name="AppIndexWatcher")
+        self.index = index
+        self.fd = None
+        self.watches = {}
+        self._stop_event = threading.Event()
+    def setup(self):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = libc.inotify_init1(self.IN_CLOEXEC | self.IN_NONBLOCK)
+            if fd < 0:
+                return False
+            mask = (self.IN_ATTRIB | self.IN_CLOSE_WRITE | self.IN_MOVED_FROM |
+                    self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE)
+            for source in self.index.sources:
+                path = source[1]
+                if not os.path.isdir(path):
+                    continue
+                wd = libc.inotify_add_watch(fd, os.fsencode(path), mask)
+                if wd >= 0:
+                    self.watches[wd] = self.index._source_id(source)
+            if not self.watches:
+                os.close(fd)
+                return False
+            self.fd = fd
+            return True
+        except (OSError, AttributeError):
+            return False
+    def stop(self):
+        self._stop_event.set()
+    def run(self):
+        dirty = set()
+        last_event = 0.0
+        try:
+            while not self._stop_event.is_set():
+                ready, _, _ = select.select([self.fd], [], [], self.DEBOUNCE)
+                if ready:
+                    try:
+                        data = os.read(self.fd, 64 * 1024)
+                    except BlockingIOError:
+                        data = b''
+                    offset = 0
+                    while offset + self.EVENT_HEADER.size <= len(data):
+                        wd, mask, cookie, length = self.EVENT_HEADER.unpack_from(data, offset)
+                        offset += self.EVENT_HEADER.size + length
+                        name = data[offset - length:offset].rstrip(b'\0')
+                        if wd in self.watches and name.endswith(b'.desktop'):
+                            dirty.add(self.watches[wd])
+                    last_event = time.monotonic()
+                elif dirty and time.monotonic() - last_event >= self.DEBOUNCE:
+                    sources, dirty = dirty, set()
+                    self.index.refresh(sources)
+        finally:
+            os.close(self.fd)
@@ -0,0 +1,196 @@
+APPS = [
+    {'id': 'chrome', 'aliases': ['chrome', 'google chrome'], 'family': 'browser', 'keywords': ['chrome'],
+     'launch': {'Windows': 'chrome', 'Linux': 'google-chrome', 'Darwin': 'Google Chrome'}},
+    {'id': 'firefox', 'aliases': ['firefox'], 'family': 'browser', 'keywords': ['firefox'],
+     'launch': {'Windows': 'firefox', 'Linux': 'firefox', 'Darwin': 'Firefox'}},
+    {'id': 'brave', 'aliases': ['brave'], 'family': 'browser', 'keywords': ['brave'],
+     'launch': {'Windows': 'brave', 'Linux': 'brave-browser', 'Darwin': 'Brave Browser'}},
+    {'id': 'edge', 'aliases': ['edge', 'microsoft edge'], 'family': 'browser', 'keywords': ['edge'],
+     'launch': {'Windows': 'msedge', 'Linux': 'microsoft-edge', 'Darwin': 'Microsoft Edge'}},
+    {'id': 'safari', 'aliases': ['safari'], 'family': 'browser', 'keywords': ['safari'],
+     'launch': {'Windows': 'safari', 'Linux': 'safari', 'Darwin': 'Safari'}},
+    {'id': 'opera', 'aliases': ['opera'], 'family': 'browser',
+     'launch': {'Windows': 'opera', 'Linux': 'opera', 'Darwin': 'Opera'}},
+    {'id': 'vscode', 'aliases': ['code', 'vscode', 'vs code', 'visual studio code', 'visual studio', 'vs', 'cs code', 'vc code'],
+     'family': 'vscode', 'keywords': ['code', 'vscode', 'visual', 'studio'],
+     'launch': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'}},
+    {'id': 'pycharm', 'aliases': ['pycharm'],
+     'launch': {'Windows': 'pycharm', 'Linux': 'pycharm', 'Darwin': 'PyCharm'}},
+    {'id': 'intellij', 'aliases': ['intellij'],
+     'launch': {'Windows': 'idea', 'Linux': 'idea', 'Darwin': 'IntelliJ IDEA'}},
+    {'id': 'android_studio', 'aliases': ['android studio'],
+     'launch': {'Windows': 'studio', 'Linux': 'studio', 'Darwin': 'Android Studio'}},
+    {'id': 'sublime', 'aliases': ['sublime', 'sublime text'], 'family': 'editor',
+     'launch': {'Windows': 'sublime_text', 'Linux': 'subl', 'Darwin': 'Sublime Text'}},
+    {'id': 'atom', 'aliases': ['atom'], 'family': 'editor',
+     'launch': {'Windows': 'atom', 'Linux': 'atom', 'Darwin': 'Atom'}},
+    {'id': 'notepad_plus_plus', 'aliases': ['notepad++'], 'family': 'editor',
+     'launch': {'Windows': 'notepad++', 'Linux': 'notepad++', 'Darwin': 'notepad++'}},
+    {'id': 'vim', 'aliases': ['vim'],
+     'launch': {'Windows': 'vim', 'Linux': 'vim', 'Darwin': 'MacVim'}},
+    {'id': 'emacs', 'aliases': ['emacs'],
+     'launch': {'Windows': 'emacs', 'Linux': 'emacs', 'Darwin': 'Emacs'}},
+    {'id': 'slack', 'aliases': ['slack'],
+     'launch': {'Windows': 'slack', 'Linux': 'slack', 'Darwin': 'Slack'}},
+    {'id': 'discord', 'aliases': ['discord'], 'keywords': ['discord'],
+     'launch': {'Windows': 'discord', 'Linux': 'discord', 'Darwin': 'Discord'}},
+    {'id': 'zoom', 'aliases': ['zoom'],
+     'launch': {'Windows': 'zoom', 'Linux': 'zoom', 'Darwin': 'zoom.us'}},
+    {'id': 'teams', 'aliases': ['teams', 'microsoft teams'],
+     'launch': {'Windows': 'teams', 'Linux': 'teams', 'Darwin': 'Microsoft Teams'}},
+    {'id': 'skype', 'aliases': ['skype'],
+     'launch': {'Windows': 'skype', 'Linux': 'skype', 'Darwin': 'Skype'}},
+    {'id': 'telegram', 'aliases': ['telegram'],
+     'launch': {'Windows': 'telegram', 'Linux': 'telegram', 'Darwin': 'Telegram'}},
+    {'id': 'whatsapp', 'aliases': ['whatsapp'],
+     'launch': {'Windows': 'whatsapp', 'Linux': 'whatsapp', 'Darwin': 'WhatsApp'}},
+    {'id': 'vlc', 'aliases': ['vlc'], 'family': 'media', 'keywords': ['vlc'],
+     'launch': {'Windows': 'vlc', 'Linux': 'vlc', 'Darwin': 'VLC'}},
+    {'id': 'spotify', 'aliases': ['spotify'], 'family': 'media', 'keywords': ['spotify'],
+     'launch': {'Windows': 'spotify', 'Linux': 'spotify', 'Darwin': 'Spotify'}},
+    {'id': 'itunes', 'aliases': ['itunes'], 'family': 'media',
+     'launch': {'Windows': 'itunes', 'Linux': 'rhythmbox', 'Darwin': 'Music'}},
+    {'id': 'music', 'aliases': ['music'], 'family': 'media',
+     'launch': {'Windows': 'wmplayer', 'Linux': 'rhythmbox', 'Darwin': 'Music'}},
+    {'id': 'media_player', 'aliases': ['media player'], 'family': 'media',
+     'launch': {'Windows': 'wmplayer', 'Linux': 'vlc', 'Darwin': 'QuickTime Player'}},
+    {'id': 'word', 'aliases': ['word', 'microsoft word'], 'family': 'word',
+     'launch': {'Windows': 'winword', 'Linux': 'libreoffice', 'Darwin': 'Microsoft Word'}},
+    {'id': 'excel', 'aliases': ['excel', 'microsoft excel'], 'family': 'excel',
+     'launch': {'Windows': 'excel', 'Linux': 'libreoffice', 'Darwin': 'Microsoft Excel'}},
+    {'id': 'powerpoint', 'aliases': ['powerpoint', 'microsoft powerpoint'], 'family': 'powerpoint',
+     'launch': {'Windows': 'powerpnt', 'Linux': 'libreoffice', 'Darwin': 'Microsoft PowerPoint'}},
+    {'id': 'outlook', 'aliases': ['outlook', 'microsoft outlook'],
+     'launch': {'Windows': 'outlook', 'Linux': 'thunderbird', 'Darwin': 'Microsoft Outlook'}},
+    {'id': 'onenote', 'aliases': ['onenote'],
+     'launch': {'Windows': 'onenote', 'Linux': 'xournalpp', 'Darwin': 'Microsoft OneNote'}},
+    {'id': 'libreoffice', 'aliases': ['libreoffice'], 'family': 'libreoffice',
+     'launch': {'Windows': 'libreoffice', 'Linux': 'libreoffice', 'Darwin': 'LibreOffice'}},
+    {'id': 'libreoffice_writer', 'aliases': ['libreoffice writer', 'writer'], 'family': 'libreoffice',
+     'launch': {'Windows': 'libreoffice --writer', 'Linux': 'libreoffice --writer', 'Darwin': 'LibreOffice'}},
+    {'id': 'libreoffice_calc', 'aliases': ['libreoffice calc'], 'family': 'libreoffice',
+     'launch': {'Windows': 'libreoffice --calc', 'Linux': 'libreoffice --calc', 'Darwin': 'LibreOffice'}},
+    {'id': 'libreoffice_impress', 'aliases': ['libreoffice impress', 'impress'], 'family': 'libreoffice',
+     'launch': {'Windows': 'libreoffice --impress', 'Linux': 'libreoffice --impress', 'Darwin': 'LibreOffice'}},
+    {'id': 'libreoffice_math', 'aliases': ['libreoffice math'], 'family': 'libreoffice',
+     'launch': {'Windows': 'libreoffice --math', 'Linux': 'libreoffice --math', 'Darwin': 'LibreOffice'}},
+    {'id': 'libreoffice_draw', 'aliases': ['libreoffice draw', 'draw'], 'family': 'libreoffice',
+     'launch': {'Windows': 'libreoffice --draw', 'Linux': 'libreoffice --draw', 'Darwin': 'LibreOffice'}},
+    {'id': 'calculator', 'aliases': ['calculator'], 'keywords': ['calculator'],
+     'launch': {'Windows': 'calc', 'Linux': 'gnome-calculator', 'Darwin': 'Calculator'}},
+    {'id': 'notepad', 'aliases': ['notepad'], 'family': 'editor', 'keywords': ['notepad'],
+     'launch': {'Windows': 'notepad', 'Linux': 'gedit', 'Darwin': 'TextEdit'}},
+    {'id': 'paint', 'aliases': ['paint'],
+     'launch': {'Windows': 'mspaint', 'Linux': 'gimp', 'Darwin': 'Preview'}},
+    {'id': 'gimp', 'aliases': ['gimp'],
+     'launch': {'Windows': 'gimp', 'Linux': 'gimp', 'Darwin': 'GIMP'}},
+    {'id': 'photoshop', 'aliases': ['photoshop'],
+     'launch': {'Windows': 'photoshop', 'Linux': 'gimp', 'Darwin': 'Adobe Photoshop'}},
+    {'id': 'terminal', 'aliases': ['terminal', 'command prompt', 'cmd'], 'family': 'terminal', 'keywords': ['terminal', 'cmd'],
+     'launch': {'Windows': 'cmd', 'Linux': 'gnome-terminal', 'Darwin': 'Terminal'}},
+    {'id': 'powershell', 'aliases': ['powershell'], 'family': 'terminal',
+     'launch': {'Windows': 'powershell', 'Linux': 'pwsh', 'Darwin': 'Terminal'}},
+    {'id': 'task_manager', 'aliases': ['task manager', 'activity monitor'],
+     'launch': {'Windows': 'taskmgr', 'Linux': 'gnome-system-monitor', 'Darwin': 'Activity Monitor'}},
+    {'id': 'file_explorer', 'aliases': ['file explorer', 'explorer', 'files', 'finder'], 'keywords': ['explorer', 'finder'],
+     'launch': {'Windows': 'explorer', 'Linux': 'nautilus', 'Darwin': 'Finder'}},
+    {'id': 'git', 'aliases': ['git'],
+     'launch': {'Windows': 'git', 'Linux': 'git-gui', 'Darwin': 'Git'}},
+    {'id': 'github_desktop', 'aliases': ['github desktop'],
+     'launch': {'Windows': 'githubdesktop', 'Linux': 'github-desktop', 'Darwin': 'GitHub Desktop'}},
+    {'id': 'docker', 'aliases': ['docker'],
+     'launch': {'Windows': 'docker', 'Linux': 'docker', 'Darwin': 'Docker'}},
+    {'id': 'postman', 'aliases': ['postman'],
+     'launch': {'Windows': 'postman', 'Linux': 'postman', 'Darwin': 'Postman'}},
+    {'id': 'steam', 'aliases': ['steam'], 'keywords': ['steam'],
+     'launch': {'Windows': 'steam', 'Linux': 'steam', 'Darwin': 'Steam'}},
+    {'id': 'obs', 'aliases': ['obs', 'obs studio'],
+     'launch': {'Windows': 'obs', 'Linux': 'obs', 'Darwin': 'OBS'}},
+    {'id': 'blender', 'aliases': ['blender'],
+     'launch': {'Windows': 'blender', 'Linux': 'blender', 'Darwin': 'Blender'}},
+    {'id': 'audacity', 'aliases': ['audacity'],
+     'launch': {'Windows': 'audacity', 'Linux': 'audacity', 'Darwin': 'Audacity'}},
+    {'id': 'handbrake', 'aliases': ['handbrake'],
+     'launch': {'Windows': 'handbrake', 'Linux': 'handbrake', 'Darwin': 'HandBrake'}},
+    {'id': 'virtualbox', 'aliases': ['virtualbox'],
+     'launch': {'Windows': 'virtualbox', 'Linux': 'virtualbox', 'Darwin': 'VirtualBox'}},
+    {'id': 'vmware', 'aliases': ['vmware'],
+     'launch': {'Windows': 'vmware', 'Linux': 'vmware', 'Darwin': 'VMware Fusion'}},
+    {'id': 'pulseaudio', 'aliases': ['pulseaudio', 'pulse audio'],
+     'launch': {'Windows': '', 'Linux': 'pavucontrol', 'Darwin': ''}},
+    {'id': 'volume_control', 'aliases': ['volume control'],
+     'launch': {'Windows': 'sndvol', 'Linux': 'pavucontrol', 'Darwin': 'open /System/Library/PreferencePanes/Sound.prefPane'}},
+]
+
+# Substring fallback for in-app commands, checked in order when the app
+# name is not an exact alias (e.g. "chrome - new tab" or a window title).
+FAMILY_KEYWORDS = [
+    ('vscode', 'vscode'),
+    ('visual studio code', 'vscode'),
+    ('code', 'vscode'),
+    ('chrome', 'browser'),
+    ('firefox', 'browser'),
+    ('brave', 'browser'),
+    ('edge', 'browser'),
+    ('browser', 'browser'),
+    ('spotify', 'media'),
+    ('vlc', 'media'),
+    ('terminal', 'terminal'),
+    ('cmd', 'terminal'),
+    ('command prompt', 'terminal'),
+    ('powershell', 'terminal'),
+    ('notepad', 'editor'),
+    ('gedit', 'editor'),
+    ('textedit', 'editor'),
+    ('word', 'word'),
+    ('excel', 'excel'),
+    ('powerpoint', 'powerpoint'),
+    ('libreoffice', 'libreoffice'),
+]
+
+GENERIC_APP_KEYWORDS = ['settings', 'tool', 'app', 'application']
+
+class AppRegistry:
+    """Single alias table shared by launching, classification and in-app commands."""
+    def __init__(self, apps=None):
+        self.apps = {}
+        self.aliases = {}
+        for app in apps or APPS:
+            self.apps[app['id']] = app
+            for alias in app['aliases']:
+                self.aliases.setdefault(alias, app)
+        keywords = []
+        for app in self.apps.values():
+            for keyword in app.get('keywords', []):
+                if keyword not in keywords:
+                    keywords.append(keyword)
+        self.classifier_keywords = tuple(keywords + GENERIC_APP_KEYWORDS)
+        self.family_keywords = tuple(FAMILY_KEYWORDS)
+    def resolve(self, name):
+        if not name:
+            return None
+        return self.aliases.get(name.lower().strip())
+    def launch_command(self, name, system, default=None):
+        app = self.resolve(name)
+        if app is None:
+            return default
+        return app['launch'].get(system, default)
+    def family_for(self, name):
+        name_lower = (name or '').lower().strip()
+        app = self.aliases.get(name_lower)
+        if app is not None and app.get('family'):
+            return app['family']
+        for keyword, family in self.family_keywords:
+            if keyword in name_lower:
+                return family
+        return None
+    def alias_names(self):
+        return list(self.aliases.keys())
+
+_registry = None
+
+def get_app_registry():
+    global _registry
+    if _registry is None:
+        _registry = AppRegistry()
+    return _registry
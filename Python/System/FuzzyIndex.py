@@ -0,0 +1,245 @@
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+MIN_SCORE = 0.5
+WORD_SIMILARITY = 0.7
+
+def score_app_name(query_lower, app_lower):
+    """Score used by SystemController for fuzzy app lookup (0 when skipped)."""
+    query_words = query_lower.split()
+    query_length = len(query_lower)
+    app_length = len(app_lower)
+    app_words = app_lower.split()
+    if app_length < 3 and query_lower != app_lower:
+        return 0.0
+    if not query_length or not app_length:
+        return 0.0
+    length_ratio = min(query_length, app_length) / max(query_length, app_length)
+    if length_ratio < 0.3:
+        return 0.0
+    if query_lower in app_lower or app_lower in query_lower:
+        return 0.9 * length_ratio
+    char_score = SequenceMatcher(None, query_lower, app_lower).ratio()
+    word_matches = 0
+    for qw in query_words:
+        if len(qw) < 3:
+            continue
+        for aw in app_words:
+            if len(aw) < 3:
+                continue
+            if qw in aw or aw in qw:
+                word_matches += 1
+                break
+            elif len(qw) > 3 and len(aw) > 3:
+                word_sim = SequenceMatcher(None, qw, aw).ratio()
+                if word_sim >= WORD_SIMILARITY:
+                    word_matches += 0.7
+                    break
+    word_score = word_matches / max(len(query_words), len(app_words)) if query_words else 0
+    return (char_score * 0.3) + (word_score * 0.7)
+
+def fuzzy_match_linear(query, names, threshold=MIN_SCORE):
+    """Reference implementation: score every name, keep the first best."""
+    best_match = None
+    best_score = 0.0
+    query_lower = query.lower()
+    for name in names:
+        score = score_app_name(query_lower, name.lower())
+        if score > best_score and score >= threshold:
+            best_score = score
+            best_match = name
+    return best_match
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def _deletes(word, max_distance):
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for item in frontier:
+            if len(item) <= 1:
+                continue
+            for i in range(len(item)):
+                next_frontier.add(item[:i] + item[i + 1:])
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+class FuzzyIndex:
+    """Candidate index over app names for ``score_app_name``.
+
+    A name can only reach the threshold if it is a substring of the query,
+    contains the query, or shares a matching word with it, so candidates are
+    gathered from a trigram index over names and words, a substring lookup
+    and a SymSpell-style deletion dictionary for misspelt words. Candidates
+    are then scored best-bound-first and scoring stops once no remaining
+    bound can beat the current results.
+    """
+    MAX_EDIT_DISTANCE = 2
+    def __init__(self, names):
+        self.names = list(names)
+        self.lowered = [name.lower() for name in self.names]
+        self.name_ids = {}
+        self.by_length = defaultdict(list)
+        self.word_counts = [len(lowered.split()) for lowered in self.lowered]
+        self.name_trigrams = defaultdict(set)
+        self.words = []
+        self.word_ids = {}
+        self.word_names = defaultdict(set)
+        self.word_trigrams = defaultdict(set)
+        self.word_deletes = defaultdict(set)
+        for name_id, lowered in enumerate(self.lowered):
+            self.name_ids.setdefault(lowered, name_id)
+            self.by_length[len(lowered)].append(name_id)
+            for gram in _trigrams(lowered):
+                self.name_trigrams[gram].add(name_id)
+            for word in lowered.split():
+                if len(word) < 3:
+                    continue
+                word_id = self.word_ids.get(word)
+                if word_id is None:
+                    word_id = len(self.words)
+                    self.words.append(word)
+                    self.word_ids[word] = word_id
+                    for gram in _trigrams(word):
+                        self.word_trigrams[gram].add(word_id)
+                    if len(word) > 3:
+                        for variant in _deletes(word, self.MAX_EDIT_DISTANCE):
+                            self.word_deletes[variant].add(word_id)
+                self.word_names[word_id].add(name_id)
+    def __len__(self):
+        return len(self.names)
+    def _containing(self, postings, text):
+        grams = _trigrams(text)
+        if not grams:
+            return set()
+        sets = sorted((postings.get(gram, set()) for gram in grams), key=len)
+        result = set(sets[0])
+        for other in sets[1:]:
+            result &= other
+            if not result:
+                break
+        return result
+    def _substrings(self, text, lookup):
+        found = set()
+        for start in range(len(text)):
+            for end in range(start + 3, len(text) + 1):
+                item_id = lookup.get(text[start:end])
+                if item_id is not None:
+                    found.add(item_id)
+        return found
+    def _similar_words(self, word):
+        found = set()
+        for word_id in self._containing(self.word_trigrams, word):
+            if word in self.words[word_id]:
+                found.add(word_id)
+        found |= self._substrings(word, self.word_ids)
+        if len(word) > 3:
+            shared = defaultdict(int)
+            for gram in _trigrams(word):
+                for word_id in self.word_trigrams.get(gram, ()):
+                    shared[word_id] += 1
+            nearby = {word_id for word_id, count in shared.items() if count >= 2}
+            for variant in _deletes(word, self.MAX_EDIT_DISTANCE):
+                nearby |= self.word_deletes.get(variant, set())
+            matcher = SequenceMatcher(None)
+            matcher.set_seq2(word)
+            for word_id in nearby - found:
+                other = self.words[word_id]
+                if len(other) <= 3:
+                    continue
+                if 2.0 * min(len(word), len(other)) / (len(word) + len(other)) < WORD_SIMILARITY:
+                    continue
+                matcher.set_seq1(other)
+                if matcher.quick_ratio() >= WORD_SIMILARITY and matcher.ratio() >= WORD_SIMILARITY:
+                    found.add(word_id)
+        return found
+    def candidates(self, query_lower):
+        """Map candidate name ids to the number of query words they match."""
+        candidates = {}
+        exact = self.name_ids.get(query_lower)
+        if exact is not None:
+            candidates[exact] = 0
+        if len(query_lower) >= 3:
+            for name_id in self._containing(self.name_trigrams, query_lower):
+                if query_lower in self.lowered[name_id]:
+                    candidates[name_id] = 0
+        else:
+            max_length = int(len(query_lower) / (MIN_SCORE / 0.9))
+            for length in range(len(query_lower), max_length + 1):
+                for name_id in self.by_length.get(length, ()):
+                    if query_lower in self.lowered[name_id]:
+                        candidates[name_id] = 0
+        for name_id in self._substrings(query_lower, self.name_ids):
+            candidates[name_id] = 0
+        similar = {}
+        for word in query_lower.split():
+            if len(word) < 3:
+                continue
+            if word not in similar:
+                matched = set()
+                for word_id in self._similar_words(word):
+                    matched |= self.word_names[word_id]
+                similar[word] = matched
+            for name_id in similar[word]:
+                candidates[name_id] = candidates.get(name_id, 0) + 1
+        return candidates
+    def _upper_bound(self, query_lower, query_info, name_id, word_hits, char_bound=None):
+        query_length, query_word_count, usable = query_info
+        app_lower = self.lowered[name_id]
+        app_length = len(app_lower)
+        if app_length < 3 and query_lower != app_lower:
+            return 0.0
+        if not app_length:
+            return 0.0
+        if query_length < app_length:
+            length_ratio = query_length / app_length
+        else:
+            length_ratio = app_length / query_length
+        if length_ratio < 0.3:
+            return 0.0
+        if query_lower in app_lower or app_lower in query_lower:
+            return 0.9 * length_ratio
+        if char_bound is None:
+            char_bound = 2.0 * length_ratio / (1.0 + length_ratio)
+        if not query_word_count:
+            return char_bound * 0.3
+        word_bound = min(usable, word_hits) / max(query_word_count, self.word_counts[name_id])
+        return (char_bound * 0.3) + (word_bound * 0.7)
+    def search(self, query, limit=5):
+        """Return up to ``limit`` ``(name, score)`` pairs, best first."""
+        query_lower = query.lower()
+        if not query_lower.strip():
+            return []
+        query_words = query_lower.split()
+        query_info = (len(query_lower), len(query_words), sum(1 for qw in query_words if len(qw) >= 3))
+        bounded = []
+        upper_bound = self._upper_bound
+        for name_id, word_hits in self.candidates(query_lower).items():
+            bound = upper_bound(query_lower, query_info, name_id, word_hits)
+            if bound >= MIN_SCORE:
+                bounded.append((-bound, name_id, word_hits))
+        bounded.sort()
+        matcher = SequenceMatcher(None)
+        matcher.set_seq2(query_lower)
+        scored = []
+        for bound, name_id, word_hits in bounded:
+            cutoff = -scored[limit - 1][0] if len(scored) >= limit else MIN_SCORE
+            if -bound < cutoff:
+                break
+            app_lower = self.lowered[name_id]
+            if not (query_lower in app_lower or app_lower in query_lower):
+                matcher.set_seq1(app_lower)
+                tighter = self._upper_bound(query_lower, query_info, name_id, word_hits, matcher.quick_ratio())
+                if tighter < cutoff:
+                    continue
+            score = score_app_name(query_lower, app_lower)
+            if score >= MIN_SCORE:
+                scored.append((-score, name_id))
+                scored.sort()
+        return [(self.names[name_id], -score) for score, name_id in scored[:limit]]
+    def best(self, query):
+        results = self.search(query, limit=1)
+        return results[0][0] if results else None
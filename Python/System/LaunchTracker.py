@@ -0,0 +1,155 @@
+import asyncio
+import os
+import platform
+import threading
+import time
+from System.WindowList import list_windows, active_window, window_matches
+from System.WindowRegistry import get_window_registry
+
+def _process_tree(root_pid):
+    """PIDs of ``root_pid`` and all its descendants (Linux /proc)."""
+    if not os.path.isdir('/proc'):
+        return {root_pid}
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'rb') as f:
+                stat = f.read()
+            ppid = int(stat[stat.rindex(b')') + 2:].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    tree = {root_pid}
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        for child in children.get(pid, ()):
+            if child not in tree:
+                tree.add(child)
+                pending.append(child)
+    return tree
+
+class LaunchTracker:
+    """Watches a launched process until one of its windows shows up.
+
+    A window counts as ready when it belongs to the spawned process tree or,
+    for launchers that hand off to another process (xdg-open, single
+    instance apps), when a new window's class/title matches the app name.
+    Where no window list is available the tracker falls back to the old
+    fixed settle delay.
+    """
+    POLL_INTERVAL = 0.1
+    FALLBACK_DELAY = 1.5
+    DEFAULT_TIMEOUT = 10.0
+    def __init__(self, process, app_name, command=None, timeout=None):
+        self.process = process
+        self.pid = process.pid if process is not None else None
+        self.app_name = app_name
+        self.timeout = timeout or self.DEFAULT_TIMEOUT
+        self.hints = self._hints(app_name, command)
+        self.started = time.time()
+        self.ready_time = None
+        self.window = None
+        self.status = 'starting'
+        self.ready = threading.Event()
+        self._baseline = self._window_ids(list_windows())
+        self._thread = threading.Thread(target=self._watch, daemon=True, name=f"LaunchTracker-{app_name}")
+        self._thread.start()
+    def _hints(self, app_name, command):
+        hints = set()
+        for value in (app_name, command):
+            if not value:
+                continue
+            value = value.lower().strip()
+            hints.add(value)
+            hints.add(os.path.basename(value.split()[0]) if value.split() else value)
+        return {hint for hint in hints if len(hint) >= 3}
+    def _window_ids(self, windows):
+        if windows is None:
+            return None
+        return {window['id'] for window in windows}
+    def _find_window(self, windows):
+        pids = _process_tree(self.pid) if self.pid and platform.system() == "Linux" else {self.pid}
+        for window in windows:
+            if window.get('pid') in pids:
+                return window
+        for window in windows:
+            is_new = self._baseline is None or window['id'] not in self._baseline
+            if is_new and window_matches(window, self.hints):
+                return window
+        launcher_done = self.process is not None and self.process.poll() is not None
+        if launcher_done and time.time() - self.started > 1.0:
+            for window in windows:
+                if window_matches(window, self.hints):
+                    return window
+        return None
+    def _mark(self, status, window=None):
+        self.status = status
+        self.window = window
+        self.ready_time = time.time()
+        if window is not None:
+            get_window_registry().register(self.app_name, window)
+        self.ready.set()
+    def _watch(self):
+        deadline = self.started + self.timeout
+        while time.time() < deadline:
+            windows = list_windows()
+            if windows is None:
+                remaining = self.FALLBACK_DELAY - (time.time() - self.started)
+                if remaining > 0:
+                    time.sleep(remaining)
+                failed = self.process is not None and self.process.poll() not in (None, 0)
+                self._mark('exited' if failed else 'assumed_ready')
+                return
+            window = self._find_window(windows)
+            if window:
+                self._mark('ready', window)
+                return
+            if self.process is not None and self.process.poll() not in (None, 0):
+                self._mark('exited')
+                return
+            time.sleep(self.POLL_INTERVAL)
+        self._mark('timeout')
+    @property
+    def is_ready(self):
+        return self.ready.is_set() and self.status in ('ready', 'assumed_ready')
+    @property
+    def elapsed(self):
+        end = self.ready_time or time.time()
+        return end - self.started
+    def wait(self, timeout=None):
+        """Block until the app is ready; True if a window (or fallback) is up."""
+        self.ready.wait(self.timeout if timeout is None else timeout)
+        return self.is_ready
+    async def wait_async(self, timeout=None):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.wait, timeout)
+
+def wait_for_focus(app_name, timeout=1.5):
+    """Wait until the active window looks like ``app_name`` (fixed delay if unknown)."""
+    hints = {app_name.lower().strip()} if app_name else set()
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        window = active_window()
+        if window is None:
+            time.sleep(max(0.0, deadline - time.time()))
+            return False
+        if window_matches(window, hints):
+            return True
+        time.sleep(LaunchTracker.POLL_INTERVAL)
+    return False
+
+def wait_for_window_change(previous, timeout=0.8):
+    """Wait until the active window differs from ``previous`` (e.g. a dialog opened)."""
+    if previous is None:
+        time.sleep(timeout)
+        return False
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        window = active_window()
+        if window is not None and (window.get('id'), window.get('title')) != (previous.get('id'), previous.get('title')):
+            return True
+        time.sleep(0.05)
+    return False
@@ -3,13 +3,22 @@ import platform
 import subprocess
 import shutil
 from pathlib import Path
-from difflib import SequenceMatcher
+from System.AppIndex import AppIndex
+from System.FuzzyIndex import FuzzyIndex
+from System.AppRegistry import get_app_registry
+from System.LaunchTracker import LaunchTracker
 
 class SystemController:
     def __init__(self):
         self.system = platform.system()
         self.home_dir = Path.home()
         self.installed_apps = {}
+        self._fuzzy_index = None
+        self._fuzzy_index_source = None
+        self.registry = get_app_registry()
+        self.launches = {}
+        self.last_launch = None
+        self.app_index = AppIndex(self.system, self.home_dir, on_change=self._on_apps_changed)
         self._discover_installed_apps()
     def create_folder(self, folder_path):
         try:
@@ -82,208 +91,36 @@ class SystemController:
             return False
     def _discover_installed_apps(self):
         try:
-            if self.system == "Linux":
-                self._discover_linux_apps()
-            elif self.system == "Windows":
-                self._discover_windows_apps()
-            elif self.system == "Darwin":
-                self._discover_macos_apps()
+            self.installed_apps = self.app_index.load()
+            self.app_index.start_watcher()
         except Exception as e:
             self.installed_apps = {}
-    def _discover_linux_apps(self):
-        desktop_paths = [
-            '/usr/share/applications',
-            '/usr/local/share/applications',
-            str(self.home_dir / '.local/share/applications'),
-            '/var/lib/snapd/desktop/applications',
-            '/var/lib/flatpak/exports/share/applications',
-        ]
-        for desktop_path in desktop_paths:
-            if not os.path.exists(desktop_path):
-                continue
-            try:
-                for file in os.listdir(desktop_path):
-                    if file.endswith('.desktop'):
-                        desktop_file = os.path.join(desktop_path, file)
-                        self._parse_desktop_file(desktop_file)
-            except Exception as e:
-                continue
-    def _parse_desktop_file(self, filepath):
+    def _on_apps_changed(self, apps):
+        self.installed_apps = apps
+    def refresh_installed_apps(self):
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                name = None
-                exec_cmd = None
-                no_display = False
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('Name=') and not line.startswith('Name['):
-                        name = line.split('=', 1)[1].strip()
-                    elif line.startswith('Exec='):
-                        exec_cmd = line.split('=', 1)[1].strip()
-                        exec_cmd = exec_cmd.split()[0] if exec_cmd else None
-                    elif line.startswith('NoDisplay=true'):
-                        no_display = True
-                if name and exec_cmd and not no_display:
-                    self.installed_apps[name.lower()] = exec_cmd
-                    clean_name = ''.join(c.lower() for c in name if c.isalnum() or c.isspace())
-                    if clean_name != name.lower():
-                        self.installed_apps[clean_name] = exec_cmd
-                    words = name.lower().split()
-                    if len(words) > 1:
-                        abbrev = ''.join(w[0] for w in words if w)
-                        if len(abbrev) > 1 and abbrev not in self.installed_apps:
-                            self.installed_apps[abbrev] = exec_cmd
+            self.installed_apps = self.app_index.refresh()
         except Exception as e:
-            pass
-    def _discover_windows_apps(self):
-        start_menu_paths = [
-            os.path.join(os.environ.get('ProgramData', 'C:\\ProgramData'), 'Microsoft\\Windows\\Start Menu\\Programs'),
-            os.path.join(os.environ.get('APPDATA', ''), 'Microsoft\\Windows\\Start Menu\\Programs'),
-        ]
-        for start_menu in start_menu_paths:
-            if os.path.exists(start_menu):
-                try:
-                    for root, dirs, files in os.walk(start_menu):
-                        for file in files:
-                            if file.endswith('.lnk'):
-                                app_name = file[:-4].lower()
-                                self.installed_apps[app_name] = file[:-4]
-                                clean_name = ''.join(c.lower() for c in app_name if c.isalnum() or c.isspace())
-                                if clean_name != app_name:
-                                    self.installed_apps[clean_name] = file[:-4]
-                except:
-                    pass
-        program_files = [
-            os.environ.get('ProgramFiles', 'C:\\Program Files'),
-            os.environ.get('ProgramFiles(x86)', 'C:\\Program Files (x86)'),
-            os.path.join(os.environ.get('LOCALAPPDATA', ''), 'Programs'),
-        ]
-        for base_path in program_files:
-            if not os.path.exists(base_path):
-                continue
-            try:
-                for item in os.listdir(base_path):
-                    item_path = os.path.join(base_path, item)
-                    if os.path.isdir(item_path):
-                        self.installed_apps[item.lower()] = item
-                        try:
-                            for file in os.listdir(item_path):
-                                if file.endswith('.exe'):
-                                    app_name = file[:-4].lower()
-                                    self.installed_apps[app_name] = file[:-4]
-                        except:
-                            pass
-            except:
-                continue
-        try:
-            import winreg
-            registry_paths = [
-                r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall",
-                r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"
-            ]
-            for reg_path in registry_paths:
-                try:
-                    key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, reg_path)
-                    for i in range(winreg.QueryInfoKey(key)[0]):
-                        try:
-                            subkey_name = winreg.EnumKey(key, i)
-                            subkey = winreg.OpenKey(key, subkey_name)
-                            try:
-                                app_name = winreg.QueryValueEx(subkey, "DisplayName")[0]
-                                if app_name:
-                                    self.installed_apps[app_name.lower()] = app_name
-                                    clean_name = ''.join(c.lower() for c in app_name if c.isalnum() or c.isspace())
-                                    if clean_name != app_name.lower():
-                                        self.installed_apps[clean_name] = app_name
-                            except:
-                                pass
-                            winreg.CloseKey(subkey)
-                        except:
-                            pass
-                    winreg.CloseKey(key)
-                except:
-                    pass
-        except ImportError:
-            pass
-    def _discover_macos_apps(self):
-        app_paths = [
-            '/Applications',
-            '/System/Applications',
-            '/System/Library/CoreServices/Applications',
-            str(self.home_dir / 'Applications'),
-            '/Applications/Utilities',
-        ]
-        for app_path in app_paths:
-            if not os.path.exists(app_path):
-                continue
-            try:
-                for item in os.listdir(app_path):
-                    if item.endswith('.app'):
-                        full_name = item[:-4]
-                        app_name = full_name.lower()
-                        self.installed_apps[app_name] = full_name
-                        clean_name = ''.join(c.lower() for c in full_name if c.isalnum() or c.isspace())
-                        if clean_name != app_name:
-                            self.installed_apps[clean_name] = full_name
-                        if ' ' in app_name:
-                            words = app_name.split()
-                            if len(words) > 1:
-                                abbrev = ''.join(w[0] for w in words if w)
-                                if len(abbrev) > 1:
-                                    self.installed_apps[abbrev] = full_name
-            except:
-                continue
+            print(f"❌ Error refreshing app index: {e}")
+        return self.installed_apps
+    def _get_fuzzy_index(self):
+        if self._fuzzy_index is None or self._fuzzy_index_source is not self.installed_apps:
+            names = list(self.installed_apps.keys())
+            names += [alias for alias in self.registry.alias_names() if alias not in self.installed_apps]
+            self._fuzzy_index = FuzzyIndex(names)
+            self._fuzzy_index_source = self.installed_apps
+        return self._fuzzy_index
     def _fuzzy_match_app(self, query):
-        if not self.installed_apps:
-            return None
-        best_match = None
-        best_score = 0.0
-        min_threshold = 0.5
-        query_lower = query.lower()
-        query_words = query_lower.split()
-        query_length = len(query_lower)
-        all_apps = list(self.installed_apps.keys())
-        for app_name in all_apps:
-            app_lower = app_name.lower()
-            app_length = len(app_lower)
-            app_words = app_lower.split()
-            if app_length < 3 and query_lower != app_lower:
-                continue
-            length_ratio = min(query_length, app_length) / max(query_length, app_length)
-            if length_ratio < 0.3:
-                continue
-            if query_lower in app_lower or app_lower in query_lower:
-                score = 0.9 * length_ratio
-            else:
-                char_score = SequenceMatcher(None, query_lower, app_lower).ratio()
-                word_matches = 0
-                for qw in query_words:
-                    if len(qw) < 3:
-                        continue
-                    for aw in app_words:
-                        if len(aw) < 3:
-                            continue
-                        if qw in aw or aw in qw:
-                            word_matches += 1
-                            break
-                        elif len(qw) > 3 and len(aw) > 3:
-                            word_sim = SequenceMatcher(None, qw, aw).ratio()
-                            if word_sim >= 0.7:
-                                word_matches += 0.7
-                                break
-                word_score = word_matches / max(len(query_words), len(app_words)) if query_words else 0
-                score = (char_score * 0.3) + (word_score * 0.7)
-            if score > best_score and score >= min_threshold:
-                best_score = score
-                best_match = app_name
-        return best_match
+        return self._get_fuzzy_index().best(query)
     def list_installed_apps(self):
         if not self.installed_apps:
             print("No apps discovered yet.")
             return
         unique_apps = {}
+        seen_commands = set()
         for app_name, exec_cmd in self.installed_apps.items():
-            if exec_cmd not in unique_apps.values():
+            if exec_cmd not in seen_commands:
+                seen_commands.add(exec_cmd)
                 unique_apps[app_name] = exec_cmd
         sorted_apps = sorted(unique_apps.items())
         print(f"\n📱 Discovered Applications ({len(sorted_apps)} apps):")
@@ -313,136 +150,79 @@ class SystemController:
     def open_app(self, app_name):
         app_name = app_name.strip().rstrip('.,!?;:')
         app_lower = app_name.lower()
+        requested_name = app_name
         print(f"🔍 Looking for: {app_name}")
-        app_mappings = {
-            'chrome': {'Windows': 'chrome', 'Linux': 'google-chrome', 'Darwin': 'Google Chrome'},
-            'google chrome': {'Windows': 'chrome', 'Linux': 'google-chrome', 'Darwin': 'Google Chrome'},
-            'firefox': {'Windows': 'firefox', 'Linux': 'firefox', 'Darwin': 'Firefox'},
-            'brave': {'Windows': 'brave', 'Linux': 'brave-browser', 'Darwin': 'Brave Browser'},
-            'edge': {'Windows': 'msedge', 'Linux': 'microsoft-edge', 'Darwin': 'Microsoft Edge'},
-            'microsoft edge': {'Windows': 'msedge', 'Linux': 'microsoft-edge', 'Darwin': 'Microsoft Edge'},
-            'safari': {'Windows': 'safari', 'Linux': 'safari', 'Darwin': 'Safari'},
-            'opera': {'Windows': 'opera', 'Linux': 'opera', 'Darwin': 'Opera'},
-            'code': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
-            'vscode': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
-            'vs code': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
-            'visual studio code': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
-            'visual studio': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
-            'vs': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
-            'cs code': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
-            'vc code': {'Windows': 'code', 'Linux': 'code', 'Darwin': 'Visual Studio Code'},
-            'pycharm': {'Windows': 'pycharm', 'Linux': 'pycharm', 'Darwin': 'PyCharm'},
-            'intellij': {'Windows': 'idea', 'Linux': 'idea', 'Darwin': 'IntelliJ IDEA'},
-            'android studio': {'Windows': 'studio', 'Linux': 'studio', 'Darwin': 'Android Studio'},
-            'sublime': {'Windows': 'sublime_text', 'Linux': 'subl', 'Darwin': 'Sublime Text'},
-            'sublime text': {'Windows': 'sublime_text', 'Linux': 'subl', 'Darwin': 'Sublime Text'},
-            'atom': {'Windows': 'atom', 'Linux': 'atom', 'Darwin': 'Atom'},
-            'notepad++': {'Windows': 'notepad++', 'Linux': 'notepad++', 'Darwin': 'notepad++'},
-            'vim': {'Windows': 'vim', 'Linux': 'vim', 'Darwin': 'MacVim'},
-            'emacs': {'Windows': 'emacs', 'Linux': 'emacs', 'Darwin': 'Emacs'},
-            'slack': {'Windows': 'slack', 'Linux': 'slack', 'Darwin': 'Slack'},
-            'discord': {'Windows': 'discord', 'Linux': 'discord', 'Darwin': 'Discord'},
-            'zoom': {'Windows': 'zoom', 'Linux': 'zoom', 'Darwin': 'zoom.us'},
-            'teams': {'Windows': 'teams', 'Linux': 'teams', 'Darwin': 'Microsoft Teams'},
-            'microsoft teams': {'Windows': 'teams', 'Linux': 'teams', 'Darwin': 'Microsoft Teams'},
-            'skype': {'Windows': 'skype', 'Linux': 'skype', 'Darwin': 'Skype'},
-            'telegram': {'Windows': 'telegram', 'Linux': 'telegram', 'Darwin': 'Telegram'},
-            'whatsapp': {'Windows': 'whatsapp', 'Linux': 'whatsapp', 'Darwin': 'WhatsApp'},
-            'vlc': {'Windows': 'vlc', 'Linux': 'vlc', 'Darwin': 'VLC'},
-            'spotify': {'Windows': 'spotify', 'Linux': 'spotify', 'Darwin': 'Spotify'},
-            'itunes': {'Windows': 'itunes', 'Linux': 'rhythmbox', 'Darwin': 'Music'},
-            'music': {'Windows': 'wmplayer', 'Linux': 'rhythmbox', 'Darwin': 'Music'},
-            'media player': {'Windows': 'wmplayer', 'Linux': 'vlc', 'Darwin': 'QuickTime Player'},
-            'word': {'Windows': 'winword', 'Linux': 'libreoffice', 'Darwin': 'Microsoft Word'},
-            'microsoft word': {'Windows': 'winword', 'Linux': 'libreoffice', 'Darwin': 'Microsoft Word'},
-            'excel': {'Windows': 'excel', 'Linux': 'libreoffice', 'Darwin': 'Microsoft Excel'},
-            'microsoft excel': {'Windows': 'excel', 'Linux': 'libreoffice', 'Darwin': 'Microsoft Excel'},
-            'powerpoint': {'Windows': 'powerpnt', 'Linux': 'libreoffice', 'Darwin': 'Microsoft PowerPoint'},
-            'microsoft powerpoint': {'Windows': 'powerpnt', 'Linux': 'libreoffice', 'Darwin': 'Microsoft PowerPoint'},
-            'outlook': {'Windows': 'outlook', 'Linux': 'thunderbird', 'Darwin': 'Microsoft Outlook'},
-            'microsoft outlook': {'Windows': 'outlook', 'Linux': 'thunderbird', 'Darwin': 'Microsoft Outlook'},
-            'onenote': {'Windows': 'onenote', 'Linux': 'xournalpp', 'Darwin': 'Microsoft OneNote'},
-            'libreoffice': {'Windows': 'libreoffice', 'Linux': 'libreoffice', 'Darwin': 'LibreOffice'},
-            'libreoffice writer': {'Windows': 'libreoffice --writer', 'Linux': 'libreoffice --writer', 'Darwin': 'LibreOffice'},
-            'libreoffice calc': {'Windows': 'libreoffice --calc', 'Linux': 'libreoffice --calc', 'Darwin': 'LibreOffice'},
-            'libreoffice impress': {'Windows': 'libreoffice --impress', 'Linux': 'libreoffice --impress', 'Darwin': 'LibreOffice'},
-            'libreoffice math': {'Windows': 'libreoffice --math', 'Linux': 'libreoffice --math', 'Darwin': 'LibreOffice'},
-            'libreoffice draw': {'Windows': 'libreoffice --draw', 'Linux': 'libreoffice --draw', 'Darwin': 'LibreOffice'},
-            'writer': {'Windows': 'libreoffice --writer', 'Linux': 'libreoffice --writer', 'Darwin': 'LibreOffice'},
-            'impress': {'Windows': 'libreoffice --impress', 'Linux': 'libreoffice --impress', 'Darwin': 'LibreOffice'},
-            'draw': {'Windows': 'libreoffice --draw', 'Linux': 'libreoffice --draw', 'Darwin': 'LibreOffice'},
-            'calculator': {'Windows': 'calc', 'Linux': 'gnome-calculator', 'Darwin': 'Calculator'},
-            'notepad': {'Windows': 'notepad', 'Linux': 'gedit', 'Darwin': 'TextEdit'},
-            'paint': {'Windows': 'mspaint', 'Linux': 'gimp', 'Darwin': 'Preview'},
-            'gimp': {'Windows': 'gimp', 'Linux': 'gimp', 'Darwin': 'GIMP'},
-            'photoshop': {'Windows': 'photoshop', 'Linux': 'gimp', 'Darwin': 'Adobe Photoshop'},
-            'terminal': {'Windows': 'cmd', 'Linux': 'gnome-terminal', 'Darwin': 'Terminal'},
-            'command prompt': {'Windows': 'cmd', 'Linux': 'gnome-terminal', 'Darwin': 'Terminal'},
-            'cmd': {'Windows': 'cmd', 'Linux': 'gnome-terminal', 'Darwin': 'Terminal'},
-            'powershell': {'Windows': 'powershell', 'Linux': 'pwsh', 'Darwin': 'Terminal'},
-            'task manager': {'Windows': 'taskmgr', 'Linux': 'gnome-system-monitor', 'Darwin': 'Activity Monitor'},
-            'activity monitor': {'Windows': 'taskmgr', 'Linux': 'gnome-system-monitor', 'Darwin': 'Activity Monitor'},
-            'file explorer': {'Windows': 'explorer', 'Linux': 'nautilus', 'Darwin': 'Finder'},
-            'explorer': {'Windows': 'explorer', 'Linux': 'nautilus', 'Darwin': 'Finder'},
-            'files': {'Windows': 'explorer', 'Linux': 'nautilus', 'Darwin': 'Finder'},
-            'finder': {'Windows': 'explorer', 'Linux': 'nautilus', 'Darwin': 'Finder'},
-            'git': {'Windows': 'git', 'Linux': 'git-gui', 'Darwin': 'Git'},
-            'github desktop': {'Windows': 'githubdesktop', 'Linux': 'github-desktop', 'Darwin': 'GitHub Desktop'},
-            'docker': {'Windows': 'docker', 'Linux': 'docker', 'Darwin': 'Docker'},
-            'postman': {'Windows': 'postman', 'Linux': 'postman', 'Darwin': 'Postman'},
-            'steam': {'Windows': 'steam', 'Linux': 'steam', 'Darwin': 'Steam'},
-            'obs': {'Windows': 'obs', 'Linux': 'obs', 'Darwin': 'OBS'},
-            'obs studio': {'Windows': 'obs', 'Linux': 'obs', 'Darwin': 'OBS'},
-            'blender': {'Windows': 'blender', 'Linux': 'blender', 'Darwin': 'Blender'},
-            'audacity': {'Windows': 'audacity', 'Linux': 'audacity', 'Darwin': 'Audacity'},
-            'handbrake': {'Windows': 'handbrake', 'Linux': 'handbrake', 'Darwin': 'HandBrake'},
-            'virtualbox': {'Windows': 'virtualbox', 'Linux': 'virtualbox', 'Darwin': 'VirtualBox'},
-            'vmware': {'Windows': 'vmware', 'Linux': 'vmware', 'Darwin': 'VMware Fusion'},
-            'pulseaudio': {'Windows': '', 'Linux': 'pavucontrol', 'Darwin': ''},
-            'pulse audio': {'Windows': '', 'Linux': 'pavucontrol', 'Darwin': ''},
-            'volume control': {'Windows': 'sndvol', 'Linux': 'pavucontrol', 'Darwin': 'open /System/Library/PreferencePanes/Sound.prefPane'},
-        }
-        if app_lower in app_mappings:
-            app_name = app_mappings[app_lower].get(self.system, app_name)
+        registry_app = self.registry.resolve(app_lower)
+        if registry_app:
+            app_name = registry_app['launch'].get(self.system, app_name)
             print(f"✓ Mapped to: {app_name}")
         elif app_lower in self.installed_apps:
             app_name = self.installed_apps[app_lower]
             print(f"✓ Found installed: {app_name}")
         else:
             matched_app = self._fuzzy_match_app(app_lower)
-            if matched_app:
+            if matched_app in self.installed_apps:
                 app_name = self.installed_apps[matched_app]
                 print(f"✓ Similar app found: {matched_app} → {app_name}")
+            elif matched_app:
+                app_name = self.registry.launch_command(matched_app, self.system, app_name)
+                print(f"✓ Similar app found: {matched_app} → {app_name}")
         try:
             if ' ' in app_name and ('--' in app_name or '/' in app_name):
                 parts = app_name.split()
                 if self.system == "Windows":
-                    subprocess.Popen(parts, shell=True)
+                    process = subprocess.Popen(parts, shell=True)
                 elif self.system == "Darwin":
-                    subprocess.Popen(parts)
+                    process = subprocess.Popen(parts)
                 else:
-                    subprocess.Popen(parts)
+                    process = subprocess.Popen(parts)
                 print(f"✓ Opened: {app_name}")
+                self._track_launch(process, requested_name, app_name)
                 return True
             else:
                 if self.system == "Windows":
-                    subprocess.Popen(['start', '', app_name], shell=True)
+                    process = subprocess.Popen(['start', '', app_name], shell=True)
                 elif self.system == "Darwin":
-                    subprocess.Popen(['open', '-a', app_name])
+                    process = subprocess.Popen(['open', '-a', app_name])
                 else:
-                    subprocess.Popen([app_name])
+                    process = subprocess.Popen([app_name])
                 print(f"✓ Opened: {app_name}")
+                self._track_launch(process, requested_name, app_name)
                 return True
         except Exception as e:
             print(f"✗ Not found locally: {app_name}")
             try:
                 if self.system == "Linux":
-                    subprocess.Popen(['xdg-open', app_name])
+                    process = subprocess.Popen(['xdg-open', app_name])
                     print(f"✓ Opened via xdg-open")
+                    self._track_launch(process, requested_name, app_name)
                     return True
             except:
                 pass
             return False
+    def _track_launch(self, process, requested_name, command):
+        try:
+            tracker = LaunchTracker(process, requested_name, command)
+        except Exception as e:
+            return None
+        self.launches[requested_name.lower()] = tracker
+        self.last_launch = tracker
+        return tracker
+    def get_launch(self, app_name=None):
+        if app_name is None:
+            return self.last_launch
+        return self.launches.get(app_name.lower().strip())
+    def wait_until_ready(self, app_name=None, timeout=None):
+        """Wait for the window of a recently opened app; True once it is up."""
+        tracker = self.get_launch(app_name)
+        if tracker is None:
+            return False
+        ready = tracker.wait(timeout)
+        if ready:
+            print(f"✓ {tracker.app_name} ready after {tracker.elapsed:.1f}s")
+        else:
+            print(f"⚠ {tracker.app_name} not ready ({tracker.status})")
+        return ready
     def download_and_install_app(self, app_name):
         print(f"📥 Attempting to install: {app_name}")
         app_name_clean = app_name.lower().strip()
@@ -0,0 +1,218 @@
+import os
+import platform
+import subprocess
+import threading
+
+try:
+    # Must be imported before any Display is opened: it gives each connection a
+    # real lock, and the shared one below is used by LaunchTracker threads,
+    # WindowRegistry callers and the main thread at once.
+    import Xlib.threaded
+    from Xlib import display as xdisplay, X, protocol
+    XLIB_AVAILABLE = True
+except ImportError:
+    XLIB_AVAILABLE = False
+
+_display = None
+_display_lock = threading.Lock()
+
+def _get_display():
+    global _display
+    with _display_lock:
+        if _display is None and XLIB_AVAILABLE and os.environ.get('DISPLAY'):
+            try:
+                _display = xdisplay.Display()
+            except Exception:
+                _display = None
+        return _display
+
+def _xlib_property(display, window, name):
+    try:
+        prop = window.get_full_property(display.intern_atom(name), X.AnyPropertyType)
+        return prop.value if prop else None
+    except Exception:
+        return None
+
+def _xlib_window_info(display, window_id):
+    window = display.create_resource_object('window', window_id)
+    pid = _xlib_property(display, window, '_NET_WM_PID')
+    title = _xlib_property(display, window, '_NET_WM_NAME') or _xlib_property(display, window, 'WM_NAME')
+    if isinstance(title, bytes):
+        title = title.decode('utf-8', 'replace')
+    try:
+        wm_class = window.get_wm_class() or ()
+    except Exception:
+        wm_class = ()
+    return {
+        'id': window_id,
+        'pid': int(pid[0]) if pid is not None and len(pid) else None,
+        'wm_class': '.'.join(wm_class).lower(),
+        'title': title or '',
+    }
+
+def _list_xlib():
+    display = _get_display()
+    if display is None:
+        return None
+    try:
+        root = display.screen().root
+        client_list = _xlib_property(display, root, '_NET_CLIENT_LIST')
+        if client_list is None:
+            return None
+        return [_xlib_window_info(display, window_id) for window_id in client_list]
+    except Exception:
+        return None
+
+def _list_wmctrl():
+    try:
+        result = subprocess.run(['wmctrl', '-lpx'], capture_output=True, text=True, timeout=2)
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return None
+    if result.returncode != 0:
+        return None
+    windows = []
+    for line in result.stdout.splitlines():
+        parts = line.split(None, 4)
+        if len(parts) < 4:
+            continue
+        try:
+            pid = int(parts[2])
+        except ValueError:
+            pid = None
+        windows.append({
+            'id': int(parts[0], 16),
+            'pid': pid if pid else None,
+            'wm_class': parts[3].lower(),
+            'title': parts[4].split(None, 1)[1] if len(parts) > 4 and ' ' in parts[4] else '',
+        })
+    return windows
+
+def _list_win32():
+    try:
+        import win32gui
+        import win32process
+    except ImportError:
+        return None
+    windows = []
+    def callback(hwnd, _):
+        try:
+            if win32gui.IsWindowVisible(hwnd) and win32gui.GetWindowText(hwnd):
+                _, pid = win32process.GetWindowThreadProcessId(hwnd)
+                windows.append({
+                    'id': hwnd,
+                    'pid': pid,
+                    'wm_class': win32gui.GetClassName(hwnd).lower(),
+                    'title': win32gui.GetWindowText(hwnd),
+                })
+        except Exception:
+            pass
+        return True
+    try:
+        win32gui.EnumWindows(callback, None)
+    except Exception:
+        return None
+    return windows
+
+def list_windows():
+    """Top-level windows as dicts (id, pid, wm_class, title), or None if unknown.
+
+    Pure Wayland sessions do not expose a window list to clients, so only
+    XWayland windows are visible there.
+    """
+    system = platform.system()
+    if system == "Linux":
+        windows = _list_xlib()
+        if windows is None:
+            windows = _list_wmctrl()
+        return windows
+    if system == "Windows":
+        return _list_win32()
+    return None
+
+def active_window():
+    system = platform.system()
+    if system == "Linux":
+        display = _get_display()
+        if display is not None:
+            try:
+                root = display.screen().root
+                active = _xlib_property(display, root, '_NET_ACTIVE_WINDOW')
+                if active is not None and len(active) and active[0]:
+                    return _xlib_window_info(display, int(active[0]))
+            except Exception:
+                pass
+        try:
+            result = subprocess.run(['xdotool', 'getactivewindow', 'getwindowpid', 'getwindowname'],
+                                    capture_output=True, text=True, timeout=2)
+            if result.returncode == 0:
+                lines = result.stdout.splitlines()
+                return {
+                    'id': None,
+                    'pid': int(lines[0]) if lines and lines[0].isdigit() else None,
+                    'wm_class': '',
+                    'title': lines[1] if len(lines) > 1 else '',
+                }
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            pass
+        return None
+    if system == "Windows":
+        try:
+            import win32gui
+            import win32process
+            hwnd = win32gui.GetForegroundWindow()
+            _, pid = win32process.GetWindowThreadProcessId(hwnd)
+            return {'id': hwnd, 'pid': pid, 'wm_class': win32gui.GetClassName(hwnd).lower(),
+                    'title': win32gui.GetWindowText(hwnd)}
+        except Exception:
+            return None
+    return None
+
+def window_matches(window, hints):
+    text = f"{window.get('wm_class', '')} {window.get('title', '')}".lower()
+    return any(hint and hint in text for hint in hints)
+
+def window_exists(window_id):
+    """Cheap liveness check for a cached window id (None if it can't be told)."""
+    system = platform.system()
+    if system == "Windows":
+        try:
+            import win32gui
+            return bool(win32gui.IsWindow(window_id))
+        except ImportError:
+            return None
+    return None
+
+def activate_window(window):
+    """Raise and focus ``window`` in-process; False if that isn't possible here."""
+    if window is None or window.get('id') is None:
+        return False
+    system = platform.system()
+    if system == "Linux":
+        display = _get_display()
+        if display is None:
+            return False
+        try:
+            root = display.screen().root
+            target = display.create_resource_object('window', window['id'])
+            event = protocol.event.ClientMessage(
+                window=target,
+                client_type=display.intern_atom('_NET_ACTIVE_WINDOW'),
+                data=(32, [2, X.CurrentTime, 0, 0, 0]),
+            )
+            root.send_event(event, event_mask=X.SubstructureRedirectMask | X.SubstructureNotifyMask)
+            display.flush()
+            return True
+        except Exception:
+            return False
+    if system == "Windows":
+        try:
+            import win32con
+            import win32gui
+            hwnd = window['id']
+            if win32gui.IsIconic(hwnd):
+                win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+            win32gui.SetForegroundWindow(hwnd)
+            return True
+        except Exception:
+            return False
+    return False
@@ -0,0 +1,138 @@
+import os
+import platform
+import threading
+import time
+from System.AppRegistry import get_app_registry
+from System.WindowList import XLIB_AVAILABLE, list_windows, window_matches, window_exists, activate_window
+from Metrics import record_cache
+
+if XLIB_AVAILABLE:
+    from Xlib import display as xdisplay, X
+
+class _ClientListWatcher(threading.Thread):
+    """Flags the registry stale whenever the window manager's client list changes."""
+    def __init__(self, on_change):
+        super().__init__(daemon=True, name="WindowRegistryWatcher")
+        self.on_change = on_change
+        self.display = xdisplay.Display()
+        self.client_list = self.display.intern_atom('_NET_CLIENT_LIST')
+        self.display.screen().root.change_attributes(event_mask=X.PropertyChangeMask)
+        self.display.flush()
+        self.alive = True
+    def run(self):
+        while True:
+            try:
+                event = self.display.next_event()
+            except Exception:
+                self.alive = False
+                self.on_change()
+                return
+            if event.type == X.PropertyNotify and event.atom == self.client_list:
+                self.on_change()
+
+class WindowRegistry:
+    """Window id per app, so focusing a known app is one in-process call.
+
+    The window list is cached and only re-read after the X server reports a
+    change to ``_NET_CLIENT_LIST`` (or, without an event source, at most
+    every ``POLL_INTERVAL`` seconds). Windows found by LaunchTracker are
+    registered directly.
+    """
+    POLL_INTERVAL = 2.0
+    def __init__(self):
+        self.windows = None
+        self.listed_at = 0.0
+        self.dirty = True
+        self.by_app = {}
+        self._lock = threading.Lock()
+        self._watcher = None
+        if platform.system() == "Linux" and XLIB_AVAILABLE and os.environ.get('DISPLAY'):
+            try:
+                self._watcher = _ClientListWatcher(self._invalidate)
+                self._watcher.start()
+            except Exception:
+                self._watcher = None
+    def _invalidate(self):
+        self.dirty = True
+    def _is_fresh(self):
+        if self.windows is None:
+            return False
+        if self._watcher is not None and self._watcher.alive:
+            return not self.dirty
+        return time.time() - self.listed_at < self.POLL_INTERVAL
+    def _snapshot(self, force=False):
+        if force or not self._is_fresh():
+            self.dirty = False
+            windows = list_windows()
+            with self._lock:
+                self.windows = windows
+                self.listed_at = time.time()
+                if windows is not None:
+                    ids = {window['id'] for window in windows}
+                    self.by_app = {app: window for app, window in self.by_app.items() if window['id'] in ids}
+        return self.windows
+    def _key(self, app_name):
+        return (app_name or '').lower().strip()
+    def _hints(self, app_name):
+        key = self._key(app_name)
+        hints = {key}
+        command = get_app_registry().launch_command(key, platform.system())
+        if command:
+            hints.add(os.path.basename(command.split()[0]).lower())
+        return {hint for hint in hints if len(hint) >= 3}
+    def _match(self, windows, hints):
+        for window in windows:
+            if any(hint in window.get('wm_class', '') for hint in hints):
+                return window
+        for window in windows:
+            if window_matches(window, hints):
+                return window
+        return None
+    def register(self, app_name, window):
+        if window and window.get('id') is not None:
+            with self._lock:
+                self.by_app[self._key(app_name)] = window
+    def forget(self, app_name):
+        with self._lock:
+            self.by_app.pop(self._key(app_name), None)
+    def lookup(self, app_name):
+        key = self._key(app_name)
+        if not key:
+            return None
+        was_fresh = self._is_fresh()
+        windows = self._snapshot()
+        cached = self.by_app.get(key)
+        if cached is not None and window_exists(cached['id']) is not False:
+            if windows is None or any(window['id'] == cached['id'] for window in windows):
+                record_cache('window', True)
+                return cached
+        record_cache('window', False)
+        if windows is None:
+            return None
+        hints = self._hints(key)
+        window = self._match(windows, hints)
+        if window is None and was_fresh:
+            # Titles aren't tracked between client-list changes, so re-read once on a miss
+            windows = self._snapshot(force=True) or []
+            window = self._match(windows, hints)
+        if window is not None:
+            self.register(key, window)
+        return window
+    def focus(self, app_name):
+        window = self.lookup(app_name)
+        if window is None:
+            return False
+        if activate_window(window):
+            return True
+        self.forget(app_name)
+        return False
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_window_registry():
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = WindowRegistry()
+        return _registry
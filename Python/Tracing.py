@@ -0,0 +1,238 @@
+import atexit
+import contextvars
+import functools
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    from config import TRACE_ENABLED
+except ImportError:
+    TRACE_ENABLED = True
+try:
+    from config import TRACE_LOG_PATH
+except ImportError:
+    TRACE_LOG_PATH = None
+try:
+    from config import TRACE_OTLP_ENDPOINT
+except ImportError:
+    TRACE_OTLP_ENDPOINT = None
+try:
+    from config import TRACE_WINDOW
+except ImportError:
+    TRACE_WINDOW = 1000
+try:
+    from config import TRACE_LOG_MAX_BYTES
+except ImportError:
+    TRACE_LOG_MAX_BYTES = 10 * 1024 * 1024
+try:
+    from config import TRACE_LOG_BACKUPS
+except ImportError:
+    TRACE_LOG_BACKUPS = 2
+
+try:
+    from opentelemetry import trace as otel_trace
+    OTEL_AVAILABLE = True
+except ImportError:
+    otel_trace = None
+    OTEL_AVAILABLE = False
+
+_current = contextvars.ContextVar('either_trace_span', default=None)
+
+def default_trace_path():
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA')
+    base = Path(cache_home) if cache_home else Path.home() / '.cache'
+    return base / 'either_assistant' / 'traces.jsonl'
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return round(ordered[index], 3)
+
+class JsonLinesSink:
+    """Appends records to a JSON-lines file from a background thread.
+
+    Once the file reaches ``max_bytes`` it is rotated to ``<name>.1`` (older
+    copies shift up, ``backups`` are kept), so the log never grows unbounded.
+    """
+    def __init__(self, path, max_bytes=TRACE_LOG_MAX_BYTES, backups=TRACE_LOG_BACKUPS):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True, name="TraceSink")
+        self.thread.start()
+        atexit.register(self.flush)
+    def emit(self, record):
+        self.queue.put(record)
+    def _run(self):
+        while True:
+            records = [self.queue.get()]
+            while True:
+                try:
+                    records.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(records)
+            for _ in records:
+                self.queue.task_done()
+    def _backup(self, n):
+        return self.path.with_name(f"{self.path.name}.{n}")
+    def _rotate(self):
+        if not self.max_bytes or not self.path.exists() or self.path.stat().st_size < self.max_bytes:
+            return
+        if self.backups <= 0:
+            self.path.unlink()
+            return
+        for n in range(self.backups - 1, 0, -1):
+            if self._backup(n).exists():
+                os.replace(self._backup(n), self._backup(n + 1))
+        os.replace(self.path, self._backup(1))
+    def _write(self, records):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._rotate()
+            with open(self.path, 'a', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record, default=str) + '\n')
+        except OSError as e:
+            print(f"⚠️ Could not write traces: {e}")
+    def flush(self):
+        self.queue.join()
+
+class Tracer:
+    """Span timing for the voice command pipeline.
+
+    The active span lives in a ContextVar, so nested stages (STT inside the
+    microphone loop, handlers inside dispatch) are parented without passing
+    anything around. A span opened with no active span starts a new trace.
+    Finished spans feed per-stage latency windows (``latency``), a local
+    JSON-lines log and, when opentelemetry is installed, an OTel tracer.
+    """
+    def __init__(self, enabled=TRACE_ENABLED, log_path=TRACE_LOG_PATH, otlp_endpoint=TRACE_OTLP_ENDPOINT, window=TRACE_WINDOW):
+        self.enabled = enabled
+        self.window = window
+        self.samples = {}
+        self._lock = threading.Lock()
+        self.sink = JsonLinesSink(log_path or default_trace_path()) if enabled and log_path is not False else None
+        self.otel = self._setup_otel(otlp_endpoint) if enabled and OTEL_AVAILABLE else None
+    def _setup_otel(self, endpoint):
+        if endpoint:
+            try:
+                from opentelemetry.sdk.trace import TracerProvider
+                from opentelemetry.sdk.trace.export import BatchSpanProcessor
+                from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+                provider = TracerProvider()
+                provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint)))
+                otel_trace.set_tracer_provider(provider)
+            except ImportError as e:
+                print(f"⚠️ OTLP exporter not available: {e}")
+        return otel_trace.get_tracer("either_assistant")
+    @contextmanager
+    def span(self, name, **attrs):
+        if not self.enabled:
+            yield None
+            return
+        parent = _current.get()
+        record = {
+            'trace_id': parent['trace_id'] if parent else uuid.uuid4().hex,
+            'span_id': uuid.uuid4().hex[:16],
+            'parent_id': parent['span_id'] if parent else None,
+            'name': name,
+            'attrs': attrs,
+            'start': time.time(),
+        }
+        token = _current.set(record)
+        start = time.perf_counter()
+        otel_context = self.otel.start_as_current_span(name, attributes=attrs) if self.otel else None
+        try:
+            if otel_context is not None:
+                with otel_context:
+                    yield record
+            else:
+                yield record
+        except Exception as e:
+            record['error'] = str(e)[:200]
+            raise
+        finally:
+            _current.reset(token)
+            self._finish(record, (time.perf_counter() - start) * 1000)
+    def record(self, name, start, end=None, **attrs):
+        """Log a stage measured elsewhere (perf_counter start/end) under the current trace."""
+        if not self.enabled:
+            return
+        end = time.perf_counter() if end is None else end
+        parent = _current.get()
+        record = {
+            'trace_id': parent['trace_id'] if parent else uuid.uuid4().hex,
+            'span_id': uuid.uuid4().hex[:16],
+            'parent_id': parent['span_id'] if parent else None,
+            'name': name,
+            'attrs': attrs,
+            'start': time.time() - (time.perf_counter() - start),
+        }
+        self._finish(record, (end - start) * 1000)
+    def _finish(self, record, duration_ms):
+        record['duration_ms'] = round(duration_ms, 3)
+        with self._lock:
+            window = self.samples.get(record['name'])
+            if window is None:
+                window = self.samples[record['name']] = deque(maxlen=self.window)
+            window.append(duration_ms)
+        if self.sink is not None:
+            self.sink.emit(record)
+    def latency(self):
+        """Per-stage count and p50/p95/p99 (ms) over the recent window."""
+        with self._lock:
+            snapshot = {name: sorted(window) for name, window in self.samples.items()}
+        return {
+            name: {
+                'count': len(values),
+                'p50': _percentile(values, 0.50),
+                'p95': _percentile(values, 0.95),
+                'p99': _percentile(values, 0.99),
+            }
+            for name, values in snapshot.items()
+        }
+    def current_trace_id(self):
+        record = _current.get()
+        return record['trace_id'] if record else None
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+def get_tracer():
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer()
+        return _tracer
+
+def span(name, **attrs):
+    return get_tracer().span(name, **attrs)
+
+def traced(name=None):
+    """Decorator: run the function inside a span (default name: the function's)."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_tracer().span(name or func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def trace_methods(prefix):
+    """Class decorator: wrap every method whose name starts with ``prefix`` in a span."""
+    def decorator(cls):
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith(prefix) and callable(value):
+                setattr(cls, attr, traced(f"{cls.__name__}.{attr}")(value))
+        return cls
+    return decorator
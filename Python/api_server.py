@@ -7,7 +7,7 @@ import threading
 import queue
 import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -22,6 +22,11 @@ from Browser.DriverManager import setup_driver
 from Browser.IntelligentBrowser import process_voice_command, EnhancedIntelligentBrowser
 from System.SystemController import SystemController
 from SmartAssistant import SmartAssistant, process_voice_command_smart
+from Browser.WebFetcher import get_web_fetcher
+from Tracing import get_tracer
+from Profiler import get_profiler
+from Metrics import get_metrics_registry, BROWSER_RESTARTS, WEBSOCKET_CLIENTS, WEBSOCKET_QUEUE, WEBSOCKET_DROPPED, AUDIO_BACKLOG
+import STT.RTMicroPhone as microphone
 
 try:
     from STT.sttWhisper import stt_whisper
@@ -32,29 +37,45 @@ except ImportError:
     stt_whisper = None
 
 try:
-    from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+    from fastapi import Depends, FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
     from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse, PlainTextResponse
     from pydantic import BaseModel
     from contextlib import asynccontextmanager
 except ImportError:
     print("Installing required packages...")
     import subprocess
     subprocess.run([sys.executable, "-m", "pip", "install", "fastapi", "uvicorn", "websockets"], check=True)
-    from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+    from fastapi import Depends, FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
     from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse, PlainTextResponse
     from pydantic import BaseModel
     from contextlib import asynccontextmanager
 
+try:
+    from config import WS_SEND_QUEUE_SIZE
+except ImportError:
+    WS_SEND_QUEUE_SIZE = 256
+try:
+    from config import BATCH_MAX_COMMANDS
+except ImportError:
+    BATCH_MAX_COMMANDS = 20
+
 browser_driver = None
 system_controller = None
 voice_queue = queue.Queue()
 websocket_connections = set()
 is_listening = False
 speech_detector = None
+main_loop = None
 
 class VoiceCommand(BaseModel):
     command: str
 
+class BatchCommand(BaseModel):
+    commands: List[str]
+    stop_on_error: bool = False
+
 class SystemStatus(BaseModel):
     status: str
     message: str
@@ -66,27 +87,63 @@ class CommandResponse(BaseModel):
     result: Optional[Dict[str, Any]] = None
 
 class ConnectionManager:
-    def __init__(self):
+    """Each client gets a bounded send queue drained by its own task, so one
+    slow socket never holds up a broadcast; when a queue is full the oldest
+    message is dropped."""
+    def __init__(self, queue_size: int = WS_SEND_QUEUE_SIZE):
         self.active_connections: list[WebSocket] = []
+        self.queues: Dict[WebSocket, asyncio.Queue] = {}
+        self.senders: Dict[WebSocket, asyncio.Task] = {}
+        self.queue_size = queue_size
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
         self.active_connections.append(websocket)
+        self.queues[websocket] = asyncio.Queue(maxsize=self.queue_size)
+        self.senders[websocket] = asyncio.create_task(self._drain(websocket))
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        if websocket in self.active_connections:
+            self.active_connections.remove(websocket)
+        self.queues.pop(websocket, None)
+        sender = self.senders.pop(websocket, None)
+        if sender is not None and sender is not asyncio.current_task():
+            sender.cancel()
+
+    async def _drain(self, websocket: WebSocket):
+        queue = self.queues[websocket]
+        try:
+            while True:
+                message = await queue.get()
+                await websocket.send_text(message)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            self.disconnect(websocket)
+
+    def _enqueue(self, message: str, websocket: WebSocket):
+        queue = self.queues.get(websocket)
+        if queue is None:
+            return
+        if queue.full():
+            queue.get_nowait()
+            WEBSOCKET_DROPPED.inc()
+        queue.put_nowait(message)
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
+        self._enqueue(message, websocket)
 
     async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except:
-                self.active_connections.remove(connection)
+        for connection in list(self.active_connections):
+            self._enqueue(message, connection)
+
+    def queued_messages(self) -> int:
+        return sum(queue.qsize() for queue in list(self.queues.values()))
 
 manager = ConnectionManager()
+WEBSOCKET_CLIENTS.set_source(lambda: len(manager.active_connections))
+WEBSOCKET_QUEUE.set_source(manager.queued_messages)
+AUDIO_BACKLOG.set_source(microphone.q.qsize)
 
 def _clean_response_message(message):
     if not message:
@@ -151,6 +208,7 @@ def ensure_browser_driver():
             return True
         except:
             logger.info("Browser window closed, reopening...")
+            BROWSER_RESTARTS.inc()
             try:
                 browser_driver.quit()
             except:
@@ -166,6 +224,27 @@ def ensure_browser_driver():
         browser_driver = None
         return False
 
+def _broadcast_web_results(query, results):
+    if main_loop is None:
+        return
+    message = json.dumps({
+        "type": "web_results",
+        "query": query,
+        "results": results,
+        "timestamp": time.time()
+    })
+    asyncio.run_coroutine_threadsafe(manager.broadcast(message), main_loop)
+
+def _open_web_result(position):
+    fetcher = get_web_fetcher()
+    url = fetcher.result_url(position) if fetcher else None
+    if not url:
+        return False, f"There is no result {position}"
+    if not ensure_browser_driver():
+        return False, "Failed to initialize browser"
+    browser_driver.get(url)
+    return True, f"Opened {url}"
+
 def initialize_system():
     global system_controller, browser_driver, speech_detector
     logger.info("Initializing system components...")
@@ -184,6 +263,9 @@ def initialize_system():
     else:
         logger.info("Whisper not available - Using Vosk STT only")
     system_controller.get_system_info()
+    fetcher = get_web_fetcher()
+    if fetcher:
+        fetcher.add_listener(_broadcast_web_results)
     logger.info("System initialization complete")
 
 def process_voice_input(audio_np):
@@ -303,6 +385,8 @@ def start_voice_listening():
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global main_loop
+    main_loop = asyncio.get_running_loop()
     initialize_system()
     yield
     if browser_driver:
@@ -340,6 +424,63 @@ async def get_status():
         "timestamp": time.time()
     }
 
+@app.get("/metrics")
+async def get_metrics():
+    return PlainTextResponse(
+        get_metrics_registry().render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+@app.get("/metrics/latency")
+async def get_latency_metrics():
+    return {
+        "stages": get_tracer().latency(),
+        "timestamp": time.time()
+    }
+
+LOCAL_CLIENTS = {"127.0.0.1", "::1", "localhost"}
+
+def require_local(request: Request):
+    if request.client is None or request.client.host not in LOCAL_CLIENTS:
+        raise HTTPException(status_code=403, detail="Debug endpoints are only available from localhost")
+
+@app.post("/debug/profile/start", dependencies=[Depends(require_local)])
+async def start_profile(interval_ms: float = 5.0, max_seconds: float = 60.0):
+    profiler = get_profiler()
+    if not profiler.start(interval=interval_ms / 1000, max_seconds=max_seconds):
+        raise HTTPException(status_code=409, detail="Profiler already running")
+    return {
+        "success": True,
+        "interval_ms": profiler.interval * 1000,
+        "max_seconds": profiler.max_seconds,
+        "timestamp": time.time()
+    }
+
+@app.post("/debug/profile/stop", dependencies=[Depends(require_local)])
+async def stop_profile(format: str = "speedscope"):
+    result = await asyncio.to_thread(get_profiler().stop)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Profiler was not started")
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(result.started))
+    if format == "collapsed":
+        return PlainTextResponse(result.collapsed(), headers={
+            "Content-Disposition": f'attachment; filename="profile-{stamp}.folded"',
+            "X-Profile-Samples": str(result.total_samples),
+        })
+    return JSONResponse(result.speedscope(), headers={
+        "Content-Disposition": f'attachment; filename="profile-{stamp}.speedscope.json"',
+        "X-Profile-Samples": str(result.total_samples),
+    })
+
+@app.get("/debug/profile", dependencies=[Depends(require_local)])
+async def profile_status():
+    profiler = get_profiler()
+    last = profiler.last_result
+    return {
+        "running": profiler.running,
+        "last": last.summary() if last else None
+    }
+
 @app.post("/voice/start")
 async def start_voice():
     global is_listening
@@ -417,6 +558,80 @@ async def process_command(command: VoiceCommand):
             message=f"Error: {str(e)}"
         )
 
+def _run_command_batch(commands, stop_on_error):
+    """Parse every command with one Gemini request, then run them in order on one assistant."""
+    needs_browser = any(keyword in command.lower() for command in commands for keyword in
+                        ['search', 'browser', 'web', 'google', 'youtube', 'website', 'download', 'open website'])
+    if needs_browser and not ensure_browser_driver():
+        return CommandResponse(
+            success=False,
+            message="Failed to initialize browser. Please check browser installation."
+        )
+    driver = browser_driver or type('DummyDriver', (), {'get': lambda self, url: None, 'quit': lambda self: None})()
+    assistant = SmartAssistant(driver, system_controller)
+    if assistant.gemini_available:
+        parsed = assistant.gemini.parse_commands_batch(commands)
+    else:
+        parsed = [(None, None)] * len(commands)
+    items = []
+    failed = False
+    halted = None
+    for text, (command_json, source) in zip(commands, parsed):
+        item = {"command": text, "action": (command_json or {}).get('action'), "source": source}
+        if halted:
+            items.append({**item, "success": False, "message": halted})
+            continue
+        if failed and stop_on_error:
+            items.append({**item, "success": False, "message": "Skipped after an earlier failure"})
+            continue
+        try:
+            success, message = assistant.process_command(text, command_json=command_json)
+            message = _clean_response_message(message) if success else f"Error: {message}"
+        except Exception as e:
+            logger.error(f"Error processing batch command '{text}': {e}")
+            success, message = False, f"Error: {str(e)}"
+        if assistant.confirmation_manager.has_pending():
+            # Nobody can answer yes/no inside a batch, and the next item would be read as the answer.
+            pending = assistant.confirmation_manager.get_pending()
+            if assistant.browser:
+                try:
+                    assistant.browser.browser_controller.remove_highlight()
+                except Exception:
+                    pass
+            assistant.confirmation_manager.reject()
+            success = False
+            message = f"Needs confirmation: closest match was '{pending.get('text', '')}', not clicked"
+            item["needs_confirmation"] = True
+            halted = "Skipped: an earlier command needed confirmation"
+        failed = failed or not success
+        items.append({**item, "success": success, "message": message})
+    succeeded = sum(1 for item in items if item["success"])
+    return CommandResponse(
+        success=succeeded == len(items),
+        message=f"Ran {succeeded}/{len(items)} commands",
+        result={"items": items}
+    )
+
+@app.post("/commands/batch")
+async def process_command_batch(batch: BatchCommand):
+    if not batch.commands:
+        raise HTTPException(status_code=400, detail="No commands given")
+    if len(batch.commands) > BATCH_MAX_COMMANDS:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_COMMANDS} commands per batch")
+    if not system_controller:
+        return CommandResponse(
+            success=False,
+            message="System controller not initialized"
+        )
+    try:
+        return await asyncio.to_thread(_run_command_batch, batch.commands, batch.stop_on_error)
+    except Exception as e:
+        logger.error(f"Error processing command batch: {e}")
+        return CommandResponse(
+            success=False,
+            message=f"Error: {str(e)}"
+        )
+
 @app.post("/browser/enable")
 async def enable_browser():
     global browser_driver
@@ -465,7 +680,15 @@ async def websocket_endpoint(websocket: WebSocket):
             data = await websocket.receive_text()
             message = json.loads(data)
             if message.get("type") == "ping":
-                await websocket.send_text(json.dumps({"type": "pong"}))
+                await manager.send_personal_message(json.dumps({"type": "pong"}), websocket)
+            elif message.get("type") == "open_result":
+                success, result = await asyncio.to_thread(_open_web_result, int(message.get("position", 1)))
+                await manager.send_personal_message(json.dumps({
+                    "type": "command_result" if success else "error",
+                    "result": result,
+                    "message": result,
+                    "timestamp": time.time()
+                }), websocket)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     except Exception as e:
@@ -0,0 +1,29 @@
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.common import load_commands, throughput
+
+def bench(min_seconds=0.5):
+    try:
+        from CommandClassifier import CommandClassifier
+    except ImportError as e:
+        print(f"⚠️ Skipping classifier benchmark: {e}")
+        return None
+    commands = load_commands()
+    classifier = CommandClassifier()
+    kinds = Counter(classifier.classify(command)[0].value for command in commands)
+    per_sec, us_per = throughput(classifier.classify, commands, min_seconds)
+    print(f"📊 CommandClassifier: {len(commands)} commands")
+    print(f"   Throughput:    {per_sec:10.0f} commands/sec ({us_per:.1f} µs each)")
+    print(f"   Split:         {dict(kinds)}")
+    return {
+        'commands': len(commands),
+        'commands_per_sec': per_sec,
+        'us_per_command': us_per,
+    }
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,29 @@
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.common import load_commands, throughput
+
+def bench(min_seconds=0.5):
+    try:
+        from GeminiAPI import GeminiAssistant
+    except ImportError as e:
+        print(f"⚠️ Skipping fallback parse benchmark: {e}")
+        return None
+    commands = load_commands()
+    assistant = GeminiAssistant()
+    actions = Counter(assistant._fallback_parse(command).get('action') for command in commands)
+    per_sec, us_per = throughput(assistant._fallback_parse, commands, min_seconds)
+    print(f"📊 Offline parser (_fallback_parse): {len(commands)} commands")
+    print(f"   Throughput:    {per_sec:10.0f} commands/sec ({us_per:.1f} µs each)")
+    print(f"   Actions:       {len(actions)} distinct, top {actions.most_common(3)}")
+    return {
+        'commands': len(commands),
+        'commands_per_sec': per_sec,
+        'us_per_command': us_per,
+    }
+
+if __name__ == "__main__":
+    bench()
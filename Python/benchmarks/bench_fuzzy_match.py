@@ -0,0 +1,83 @@
+
+import sys
+import random
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from System.FuzzyIndex import FuzzyIndex, fuzzy_match_linear
+
+CONSONANTS = 'bcdfghjklmnpqrstvwxz'
+VOWELS = 'aeiouy'
+SUFFIXES = ['', '', ' studio', ' player', ' editor', ' manager', ' viewer', ' browser', ' tools', ' pro']
+REAL_APPS = ['visual studio code', 'google chrome', 'firefox', 'brave browser', 'vlc media player',
+             'libreoffice writer', 'gnome terminal', 'spotify', 'discord', 'steam', 'gimp',
+             'obs studio', 'telegram desktop', 'android studio', 'file manager', 'system monitor']
+
+def make_names(count, seed=7):
+    rng = random.Random(seed)
+    names = {}
+    for app in REAL_APPS:
+        names[app] = app
+    while len(names) < count:
+        word = ''.join(rng.choice(CONSONANTS) + rng.choice(VOWELS) for _ in range(rng.randint(2, 4)))
+        name = word + rng.choice(SUFFIXES)
+        names.setdefault(name, name)
+        words = name.split()
+        if len(words) > 1:
+            names.setdefault(''.join(w[0] for w in words), name)
+    return list(names)
+
+def make_queries(names, count, seed=11):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        name = rng.choice(names)
+        kind = rng.random()
+        if kind < 0.3 and len(name) > 4:
+            i = rng.randrange(len(name))
+            name = name[:i] + name[i + 1:]
+        elif kind < 0.5 and len(name) > 4:
+            i = rng.randrange(len(name) - 1)
+            name = name[:i] + name[i + 1] + name[i] + name[i + 2:]
+        elif kind < 0.7:
+            name = name.split()[0]
+        elif kind < 0.8:
+            name = 'open ' + name
+        queries.append(name)
+    queries += ['chrome', 'vs code', 'code', 'fire fox', 'terminal', 'xyzzy', 'music player']
+    return queries
+
+def bench(app_count=5000, query_count=100):
+    names = make_names(app_count)
+    queries = make_queries(names, query_count)
+    start = time.perf_counter()
+    index = FuzzyIndex(names)
+    build_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    linear = [fuzzy_match_linear(q, names) for q in queries]
+    linear_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    start = time.perf_counter()
+    indexed = [index.best(q) for q in queries]
+    indexed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    mismatches = [(q, a, b) for q, a, b in zip(queries, linear, indexed) if a != b]
+    print(f"📊 Fuzzy app match: {len(names)} names, {len(queries)} queries")
+    print(f"   Index build:   {build_ms:8.1f} ms")
+    print(f"   Linear scan:   {linear_ms:8.3f} ms/query")
+    print(f"   Indexed:       {indexed_ms:8.3f} ms/query ({linear_ms / max(indexed_ms, 1e-9):.0f}x)")
+    print(f"   Agreement:     {len(queries) - len(mismatches)}/{len(queries)}")
+    for q, a, b in mismatches[:5]:
+        print(f"      '{q}': linear={a!r} indexed={b!r}")
+    return {
+        'names': len(names),
+        'queries': len(queries),
+        'build_ms': build_ms,
+        'linear_ms_per_query': linear_ms,
+        'indexed_ms_per_query': indexed_ms,
+        'mismatches': len(mismatches),
+    }
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    bench(count)
@@ -0,0 +1,87 @@
+import contextlib
+import io
+import json
+import re
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.common import load_commands
+
+INPUT_PATTERN = re.compile(r'User Input:\s*(.*?)\s*JSON Output:', re.S)
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers generateContent like Gemini would, after an optional fixed delay."""
+    protocol_version = 'HTTP/1.1'
+    delay = 0.0
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        prompt = payload['contents'][0]['parts'][0]['text']
+        match = INPUT_PATTERN.search(prompt)
+        text = match.group(1) if match else prompt[-80:]
+        if self.delay:
+            time.sleep(self.delay)
+        answer = '```json\n' + json.dumps({'action': 'web_search', 'query': text}) + '\n```'
+        body = json.dumps({'candidates': [{'content': {'parts': [{'text': answer}]}}]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    def log_message(self, format, *args):
+        pass
+
+def bench(rounds=3, delay_ms=0.0):
+    try:
+        from GeminiAPI import GeminiAssistant
+        from GeminiGateway import GeminiGateway
+    except ImportError as e:
+        print(f"⚠️ Skipping Gemini stub benchmark: {e}")
+        return None
+    StubHandler.delay = delay_ms / 1000
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        assistant = GeminiAssistant()
+        assistant.api_url = f"http://127.0.0.1:{server.server_address[1]}/v1beta/models/stub:generateContent"
+        # Measure the Gemini request path itself: no rate limit, and no local-parse race shortcut.
+        assistant.gateway = GeminiGateway(rate_per_minute=60 * 10 ** 6, burst=10 ** 6, reserve=0)
+        # Stub replies are not real labels; keep them out of the intent training log.
+        assistant.log_intents = False
+        commands = load_commands()
+        timings = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            parsed = [assistant._gemini_parse(command) for command in commands]
+            for _ in range(rounds):
+                for command in commands:
+                    start = time.perf_counter()
+                    result = assistant._gemini_parse(command)
+                    timings.append((time.perf_counter() - start) * 1000)
+                    parsed.append(result)
+        stubbed = sum(1 for result in parsed[:len(commands)] if result and result.get('action') == 'web_search')
+        missed = sum(1 for result in parsed if not result or result.get('action') != 'web_search')
+    finally:
+        server.shutdown()
+    if missed:
+        raise RuntimeError(f"{missed} of {len(parsed)} parses were not answered by the stub")
+    timings.sort()
+    p50 = timings[len(timings) // 2]
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    overhead = p50 - delay_ms
+    print(f"📊 Gemini parse against a local stub ({delay_ms:.0f} ms server delay)")
+    print(f"   Answered by stub: {stubbed}/{len(commands)}")
+    print(f"   p50 {p50:7.2f} ms   p95 {p95:7.2f} ms   client overhead ~{overhead:.2f} ms")
+    return {
+        'commands': len(commands),
+        'stub_answers': stubbed,
+        'p50_ms': p50,
+        'p95_ms': p95,
+    }
+
+if __name__ == "__main__":
+    bench(delay_ms=float(sys.argv[1]) if len(sys.argv) > 1 else 0.0)
@@ -0,0 +1,62 @@
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.common import FIXTURES, throughput
+
+def bench(min_seconds=0.5, holdout_every=5):
+    """Train on the golden parser corpus, then time and score the held-out commands.
+
+    The corpus labels are regex outputs rather than Gemini's, so the accuracy
+    numbers only show that training and slot tagging work; latency is the point.
+    """
+    from LocalIntentModel import LocalIntentModel, intent_label
+    with open(FIXTURES / 'fallback_parse_golden.json', encoding='utf-8') as f:
+        cases = [(case['input'], case['expected']) for case in json.load(f)]
+    train = [case for i, case in enumerate(cases) if i % holdout_every]
+    test = [case for i, case in enumerate(cases) if not i % holdout_every]
+
+    start = time.perf_counter()
+    model = LocalIntentModel.train(train)
+    train_ms = (time.perf_counter() - start) * 1000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = model.save(Path(tmp) / 'intent_model.json')
+        size_kb = path.stat().st_size / 1024
+        start = time.perf_counter()
+        model = LocalIntentModel.load(path)
+        load_ms = (time.perf_counter() - start) * 1000
+
+    exact = abstained = intents = 0
+    for text, expected in test:
+        result = model.parse(text)
+        if result is None:
+            abstained += 1
+            continue
+        exact += result == expected
+        intents += intent_label(result) == intent_label(expected)
+    answered = len(test) - abstained
+    per_sec, us_per = throughput(model.parse, [text for text, _ in test], min_seconds)
+
+    print(f"📊 Local intent model: trained on {len(train)} commands, {len(model.schemas)} intents")
+    print(f"   Train / load:  {train_ms:8.0f} ms / {load_ms:.0f} ms ({size_kb:.0f} KB)")
+    print(f"   Throughput:    {per_sec:8.0f} commands/sec ({us_per:.1f} µs each)")
+    print(f"   Held out:      {len(test)} commands, answered {answered}, "
+          f"intent {intents / max(answered, 1):.0%}, exact JSON {exact / max(answered, 1):.0%}")
+    return {
+        'train_commands': len(train),
+        'test_commands': len(test),
+        'train_ms': train_ms,
+        'load_ms': load_ms,
+        'commands_per_sec': per_sec,
+        'us_per_command': us_per,
+        'answered': answered,
+        'intent_accuracy': intents / max(answered, 1),
+        'exact_match': exact / max(answered, 1),
+    }
+
+if __name__ == "__main__":
+    bench()
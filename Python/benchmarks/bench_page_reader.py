@@ -0,0 +1,76 @@
+import contextlib
+import io
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.bench_platform_search import _make_driver
+
+def make_page(links=400, buttons=60, sections=40):
+    """A long article-style page: headings, paragraphs, nav links and buttons."""
+    parts = ['<!DOCTYPE html><html><head><title>Reader fixture</title></head><body><nav>']
+    parts += [f'<a href="/nav/{i}">Navigation item {i}</a> ' for i in range(40)]
+    parts.append('</nav><main>')
+    per_section = max(1, links // sections)
+    for s in range(sections):
+        parts.append(f'<h{1 + s % 3}>Section {s}: notes on topic {s * 7 % 13}</h{1 + s % 3}><p>')
+        parts += [f'<a href="/article/{s}/{i}">Read article {s}-{i} about widgets</a>, ' for i in range(per_section)]
+        parts.append('</p>')
+        if s % max(1, sections // buttons) == 0:
+            parts += [f'<button>Action {s}-{b}</button>' for b in range(max(1, buttons // sections))]
+    parts.append('<button>Sign in</button><button>Subscribe</button></main></body></html>')
+    return ''.join(parts).encode()
+
+class PageHandler(BaseHTTPRequestHandler):
+    body = b''
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+    def log_message(self, format, *args):
+        pass
+
+def _timed(func, rounds):
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+        start = time.perf_counter()
+        for _ in range(rounds):
+            result = func()
+    return (time.perf_counter() - start) * 1000 / rounds, result
+
+def bench(rounds=10):
+    driver = _make_driver()
+    if driver is None:
+        print("⚠️ Skipping PageReader benchmark: needs selenium and Chrome")
+        return None
+    from Browser.PageReader import PageReader
+    PageHandler.body = make_page()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        driver.get(f"http://127.0.0.1:{server.server_address[1]}/")
+        reader = PageReader(driver)
+        summary_ms, summary = _timed(reader.get_page_summary, rounds)
+        match_ms, match = _timed(lambda: reader.find_closest_match("read article 12-3 about widgets"), rounds)
+        find_ms, _ = _timed(lambda: reader.find_element_by_partial_text("subscribe"), rounds)
+    finally:
+        server.shutdown()
+        driver.quit()
+    print(f"📊 PageReader on a local page ({len(PageHandler.body) // 1024} KB)")
+    print(f"   Page summary:       {summary_ms:8.1f} ms ({len(summary['links'])} links, {len(summary['headings'])} headings)")
+    print(f"   Closest match:      {match_ms:8.1f} ms -> {match['text'] if match else None!r}")
+    print(f"   Find by text:       {find_ms:8.1f} ms")
+    return {
+        'summary_ms': summary_ms,
+        'closest_match_ms': match_ms,
+        'find_text_ms': find_ms,
+    }
+
+if __name__ == "__main__":
+    bench()
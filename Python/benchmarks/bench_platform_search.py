@@ -0,0 +1,126 @@
+
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from Browser.PlatformRegistry import get_platform_registry
+from Browser.Prefetcher import COLLECT_JS
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+# Local stand-ins for each platform: home page with a search box, and its results page
+ROUTES = {
+    '/google/': 'google_home.html',
+    '/google/search': 'google_results.html',
+    '/youtube/': 'youtube_home.html',
+    '/youtube/results': 'youtube_results.html',
+}
+
+# How the old code searched: open the homepage, type into the box, submit
+LEGACY_FLOWS = {
+    'google': {'home': '/google/', 'box': 'textarea[name="q"]', 'results': '/google/search'},
+    'youtube': {'home': '/youtube/', 'box': 'input#search', 'results': '/youtube/results'},
+}
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        name = ROUTES.get(urlsplit(self.path).path)
+        if name is None:
+            self.send_error(404)
+            return
+        body = (FIXTURES / name).read_bytes()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    def log_message(self, format, *args):
+        pass
+
+def _start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def _make_driver():
+    try:
+        from selenium import webdriver
+    except ImportError:
+        return None
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-gpu')
+    try:
+        driver = webdriver.Chrome(options=options)
+    except Exception as e:
+        print(f"⚠️ Could not start headless Chrome: {e}")
+        return None
+    driver.set_page_load_timeout(30)
+    return driver
+
+def _local_url(base, platform, url):
+    parts = urlsplit(url)
+    return f"{base}/{platform}{parts.path}?{parts.query}"
+
+def _wait_for_results(driver, profile, timeout=5.0):
+    driver.set_script_timeout(timeout + 2)
+    data = driver.execute_async_script(COLLECT_JS, profile['selector'], 10, int(timeout * 1000), False)
+    return data.get('results') or []
+
+def _legacy_search(driver, base, platform, query, profile):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    flow = LEGACY_FLOWS[platform]
+    driver.get(base + flow['home'])
+    box = driver.find_element(By.CSS_SELECTOR, flow['box'])
+    box.clear()
+    box.send_keys(query)
+    box.send_keys(Keys.RETURN)
+    WebDriverWait(driver, 5).until(EC.url_contains(flow['results']))
+    return _wait_for_results(driver, profile)
+
+def _direct_search(driver, base, platform, query, profile):
+    registry = get_platform_registry()
+    driver.get(_local_url(base, platform, registry.search_url(platform, query)))
+    return _wait_for_results(driver, profile)
+
+def bench(rounds=10, query="lofi hip hop radio"):
+    driver = _make_driver()
+    if driver is None:
+        print("⚠️ Skipping platform search benchmark: needs selenium and Chrome")
+        return None
+    server, base = _start_server()
+    registry = get_platform_registry()
+    report = {}
+    try:
+        for platform in LEGACY_FLOWS:
+            profile = registry.by_id[platform]['results']
+            timings = {}
+            for name, search in (('legacy', _legacy_search), ('direct', _direct_search)):
+                results = search(driver, base, platform, query, profile)
+                assert results, f"{name} {platform} search found no results"
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    search(driver, base, platform, query, profile)
+                timings[name] = (time.perf_counter() - start) * 1000 / rounds
+            report[platform] = timings
+            print(f"📊 {platform}: {len(results)} results via profile '{profile['selector']}'")
+            print(f"   Homepage + typing: {timings['legacy']:8.1f} ms/search")
+            print(f"   Direct URL:        {timings['direct']:8.1f} ms/search "
+                  f"({timings['legacy'] / max(timings['direct'], 1e-9):.1f}x)")
+        print("   (the old search_google also slept a fixed 3 s per search, not counted above)")
+    finally:
+        server.shutdown()
+        driver.quit()
+    return report
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
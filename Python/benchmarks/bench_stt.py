@@ -0,0 +1,97 @@
+import math
+import sys
+import time
+import wave
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.common import FIXTURES
+
+SAMPLE_RATE = 16000
+AUDIO_DIR = FIXTURES / 'audio'
+STT_DIR = Path(__file__).parent.parent / 'STT'
+WHISPER_MODEL = 'openai/whisper-tiny'
+
+def load_wav(path):
+    import numpy as np
+    with wave.open(str(path), 'rb') as f:
+        if f.getframerate() != SAMPLE_RATE or f.getsampwidth() != 2:
+            raise ValueError(f"{path.name}: expected 16 kHz 16-bit PCM")
+        frames = f.readframes(f.getnframes())
+        audio = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768
+        if f.getnchannels() > 1:
+            audio = audio.reshape(-1, f.getnchannels()).mean(axis=1)
+    return audio
+
+def synthetic_clip(seconds=3.0):
+    """Voiced-sounding stand-in (harmonics with a syllable envelope) when no WAVs are bundled."""
+    import numpy as np
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 140 + 20 * np.sin(2 * math.pi * 0.5 * t)
+    phase = 2 * math.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = np.clip(np.sin(2 * math.pi * 3 * t), 0, None)
+    return (0.3 * voice * envelope).astype(np.float32)
+
+def load_clips():
+    clips = [(path.name, load_wav(path)) for path in sorted(AUDIO_DIR.glob('*.wav'))]
+    return clips or [('synthetic', synthetic_clip())]
+
+def whisper_engine():
+    import torch
+    from transformers import WhisperProcessor, WhisperForConditionalGeneration
+    processor = WhisperProcessor.from_pretrained(WHISPER_MODEL, local_files_only=True)
+    model = WhisperForConditionalGeneration.from_pretrained(WHISPER_MODEL, local_files_only=True)
+    def transcribe(audio):
+        features = processor(audio, sampling_rate=SAMPLE_RATE, return_tensors='pt').input_features
+        with torch.no_grad():
+            ids = model.generate(features, language='english', task='transcribe', max_length=448)
+        return processor.batch_decode(ids, skip_special_tokens=True)[0]
+    return transcribe
+
+def vosk_engine():
+    import json
+    import numpy as np
+    from vosk import Model, KaldiRecognizer
+    models = sorted(STT_DIR.glob('vosk-model-small*')) or sorted(STT_DIR.glob('vosk-model*'))
+    if not models:
+        raise FileNotFoundError("no vosk model under STT/")
+    model = Model(str(models[0]))
+    def transcribe(audio):
+        recognizer = KaldiRecognizer(model, SAMPLE_RATE)
+        recognizer.AcceptWaveform((audio * 32767).astype(np.int16).tobytes())
+        return json.loads(recognizer.FinalResult()).get('text', '')
+    return transcribe
+
+ENGINES = {'whisper-tiny': whisper_engine, 'vosk': vosk_engine}
+
+def bench(rounds=2):
+    try:
+        clips = load_clips()
+    except ImportError as e:
+        print(f"⚠️ Skipping STT benchmark: {e}")
+        return None
+    report = {}
+    for name, factory in ENGINES.items():
+        try:
+            transcribe = factory()
+        except Exception as e:
+            print(f"⚠️ Skipping {name}: {str(e)[:100]}")
+            continue
+        transcribe(clips[0][1])
+        audio_seconds = 0.0
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for _, audio in clips:
+                transcribe(audio)
+                audio_seconds += len(audio) / SAMPLE_RATE
+        rtf = (time.perf_counter() - start) / audio_seconds
+        report[name] = {'clips': len(clips), 'rtf': rtf}
+        print(f"📊 STT {name}: {len(clips)} clip(s), real-time factor {rtf:.3f}")
+    if not report:
+        return None
+    return report
+
+if __name__ == "__main__":
+    bench()
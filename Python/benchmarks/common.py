@@ -0,0 +1,24 @@
+import contextlib
+import io
+import time
+from pathlib import Path
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+def load_commands(path=FIXTURES / 'commands.txt'):
+    lines = Path(path).read_text(encoding='utf-8').splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.startswith('#')]
+
+def throughput(func, items, min_seconds=0.5):
+    """Run ``func`` over ``items`` repeatedly for at least ``min_seconds``; items/sec and µs/item."""
+    calls = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        while True:
+            for item in items:
+                func(item)
+            calls += len(items)
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_seconds:
+                break
+    return calls / elapsed, elapsed * 1e6 / calls
@@ -0,0 +1,128 @@
+import argparse
+import importlib
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+BENCH_DIR = Path(__file__).parent
+DEFAULT_BASELINE = BENCH_DIR / 'baseline.json'
+
+# name -> (module, kwargs); every module exposes bench(**kwargs) returning a dict, or None when skipped.
+# A bench() that raises is a failure, not a skip.
+BENCHMARKS = {
+    'classifier': ('benchmarks.bench_classifier', {}),
+    'fallback_parse': ('benchmarks.bench_fallback_parse', {}),
+    'local_intent': ('benchmarks.bench_local_intent', {}),
+    'fuzzy_match': ('benchmarks.bench_fuzzy_match', {'app_count': 5000, 'query_count': 30}),
+    'gemini_stub': ('benchmarks.bench_gemini_stub', {}),
+    'stt': ('benchmarks.bench_stt', {}),
+    'page_reader': ('benchmarks.bench_page_reader', {}),
+    'platform_search': ('benchmarks.bench_platform_search', {'rounds': 5}),
+}
+
+def flatten(result, prefix=''):
+    flat = {}
+    for key, value in (result or {}).items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+def direction(metric):
+    """-1 if lower is better, 1 if higher is better, 0 if informational."""
+    leaf = metric.rsplit('.', 1)[-1]
+    if leaf.endswith('_per_sec'):
+        return 1
+    if leaf.endswith('_ms') or '_ms_' in leaf or leaf.startswith('us_') or leaf == 'rtf' or leaf in ('legacy', 'direct'):
+        return -1
+    if leaf == 'mismatches':
+        return -1
+    return 0
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, metrics in results.items():
+        reference = flatten(baseline.get('results', {}).get(name))
+        for metric, value in flatten(metrics).items():
+            sign = direction(metric)
+            old = reference.get(metric)
+            if not sign or old is None:
+                continue
+            if old == 0:
+                # Nothing to scale against (e.g. zero mismatches): any move the wrong way regresses.
+                if -sign * value > 0:
+                    regressions.append({'benchmark': name, 'metric': metric, 'baseline': old,
+                                        'current': value, 'change': None})
+                continue
+            change = (value - old) / old
+            if -sign * change > tolerance:
+                regressions.append({'benchmark': name, 'metric': metric, 'baseline': old,
+                                    'current': value, 'change': round(change, 3)})
+    return regressions
+
+def run(names):
+    """(results, failures): results[name] is None when the benchmark skipped itself; failures[name] is the error."""
+    results = {}
+    failures = {}
+    for name in names:
+        module_name, kwargs = BENCHMARKS[name]
+        print(f"\n▶️ {name}")
+        try:
+            module = importlib.import_module(module_name)
+            results[name] = module.bench(**kwargs)
+        except Exception as e:
+            print(f"❌ {name} failed: {e}")
+            failures[name] = f"{type(e).__name__}: {e}"
+    return results, failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help="benchmarks to run (default: all)")
+    parser.add_argument('--output', type=Path, help="write the JSON report here (default: stdout summary only)")
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown before a metric counts as a regression")
+    parser.add_argument('--update-baseline', action='store_true', help="store these results as the new baseline")
+    parser.add_argument('--check', action='store_true', help="exit non-zero when a metric regressed")
+    args = parser.parse_args(argv)
+
+    results, failures = run(args.only or list(BENCHMARKS))
+    report = {
+        'timestamp': time.time(),
+        'machine': {'python': platform.python_version(), 'platform': platform.platform(), 'processor': platform.machine()},
+        'results': results,
+        'failures': failures,
+    }
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    report['regressions'] = compare(results, baseline, args.tolerance) if baseline else []
+
+    skipped = [name for name, result in results.items() if result is None]
+    total = len(results) + len(failures)
+    print(f"\n📊 Ran {len(results) - len(skipped)}/{total} benchmarks" + (f" (skipped: {', '.join(skipped)})" if skipped else ""))
+    for name, error in failures.items():
+        print(f"   ❌ {name} failed: {error}")
+    for regression in report['regressions']:
+        change = f"{regression['change']:+.0%}" if regression['change'] is not None else "was 0"
+        print(f"   ⚠️ {regression['benchmark']}.{regression['metric']}: {regression['baseline']:.4g} → "
+              f"{regression['current']:.4g} ({change})")
+    if baseline and not report['regressions']:
+        print(f"   ✓ No regressions beyond {args.tolerance:.0%} against {args.baseline.name}")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"   Report written to {args.output}")
+    if args.update_baseline:
+        merged = dict(baseline.get('results', {}))
+        merged.update({name: result for name, result in results.items() if result is not None})
+        args.baseline.write_text(json.dumps({'machine': report['machine'], 'results': merged}, indent=2) + '\n')
+        print(f"   Baseline updated: {args.baseline}")
+    return 1 if args.check and (report['regressions'] or failures) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,4 +5,51 @@ PRIMARY_LANGUAGE = "english"
 
 USE_DEFAULT_PROFILE = True
 
-ENABLE_VOICE_FEEDBACK = True
\ No newline at end of file
+ENABLE_VOICE_FEEDBACK = True
+
+INPUT_BACKEND = "auto"
+INPUT_ACTION_DELAY = 0.05
+INPUT_TYPING_INTERVAL = 0.0
+CLIPBOARD_PASTE_THRESHOLD = 64
+
+CONTEXT_MAX_AGE = 30 * 60
+
+FETCH_RESULTS_WINDOW = 120.0
+
+TRACE_ENABLED = True
+TRACE_LOG_PATH = None
+TRACE_OTLP_ENDPOINT = None
+TRACE_WINDOW = 1000
+TRACE_LOG_MAX_BYTES = 10 * 1024 * 1024
+TRACE_LOG_BACKUPS = 2
+
+WS_SEND_QUEUE_SIZE = 256
+
+PROFILE_INTERVAL = 0.005
+PROFILE_MAX_SECONDS = 60.0
+
+LOCAL_INTENT_ENABLED = True
+LOCAL_INTENT_MODEL_PATH = None
+LOCAL_INTENT_MIN_CONFIDENCE = 0.6
+INTENT_LOG_PATH = None
+INTENT_LOG_MAX_BYTES = 5 * 1024 * 1024
+INTENT_LOG_BACKUPS = 2
+
+SEMANTIC_CACHE_ENABLED = True
+SEMANTIC_CACHE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+SEMANTIC_CACHE_THRESHOLD = None
+SEMANTIC_CACHE_TTL = 24 * 3600
+SEMANTIC_CACHE_SIZE = 512
+
+GEMINI_RATE_PER_MINUTE = 15
+GEMINI_BURST = 5
+GEMINI_INTERACTIVE_RESERVE = 2
+GEMINI_MAX_BACKOFF = 60.0
+
+PARSE_RACE_ENABLED = True
+PARSE_RACE_DEADLINE = 2.5
+PARSE_RACE_MIN_CONFIDENCE = 0.85
+PARSE_RACE_AUDIT_RATE = 0.1
+PARSE_RACE_LOG_PATH = None
+
+BATCH_MAX_COMMANDS = 20
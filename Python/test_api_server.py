@@ -0,0 +1,125 @@
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent))
+
+pytest.importorskip("fastapi")
+api_server = pytest.importorskip("api_server")
+from fastapi.testclient import TestClient
+from ConfirmationManager import ConfirmationManager
+
+@contextmanager
+def local_client():
+    """TestClient whose requests pass the localhost guard on the debug endpoints."""
+    api_server.app.dependency_overrides[api_server.require_local] = lambda: None
+    try:
+        yield TestClient(api_server.app)
+    finally:
+        api_server.app.dependency_overrides.pop(api_server.require_local, None)
+
+def test_debug_endpoints_reject_remote_clients():
+    client = TestClient(api_server.app)
+    assert client.get("/debug/profile").status_code == 403
+    assert client.post("/debug/profile/start").status_code == 403
+
+def test_profile_start_status_stop():
+    with local_client() as client:
+        started = client.post("/debug/profile/start", params={"interval_ms": 2, "max_seconds": 5})
+        assert started.status_code == 200 and started.json()["interval_ms"] == 2
+        assert client.post("/debug/profile/start").status_code == 409
+        assert client.get("/debug/profile").json()["running"] is True
+        time.sleep(0.05)
+        folded = client.post("/debug/profile/stop", params={"format": "collapsed"})
+        assert folded.status_code == 200
+        assert folded.headers["content-disposition"].endswith('.folded"')
+        assert int(folded.headers["x-profile-samples"]) > 0
+        assert all(line.rsplit(' ', 1)[1].isdigit() for line in folded.text.strip().splitlines())
+        status = client.get("/debug/profile").json()
+        assert status["running"] is False and status["last"]["stopped_by"] == "request"
+
+def test_profile_stop_returns_speedscope():
+    with local_client() as client:
+        client.post("/debug/profile/start", params={"interval_ms": 2, "max_seconds": 5})
+        time.sleep(0.05)
+        doc = client.post("/debug/profile/stop").json()
+        assert doc["$schema"].startswith("https://www.speedscope.app/")
+        assert doc["profiles"] and all(profile["type"] == "sampled" for profile in doc["profiles"])
+        assert "frames" in doc["shared"]
+
+class StubGemini:
+    def parse_commands_batch(self, texts):
+        return [({"action": "app_command", "command": text}, 'gemini') for text in texts]
+
+class StubAssistant:
+    runs = []
+    def __init__(self, driver, system_controller):
+        self.gemini_available = True
+        self.gemini = StubGemini()
+        self.browser = None
+        self.confirmation_manager = ConfirmationManager()
+    def process_command(self, transcription, command_json=None):
+        if self.confirmation_manager.has_pending():
+            return False, "Please confirm with yes or no"
+        self.runs.append((transcription, command_json["action"]))
+        if transcription == "undo":
+            return False, "nothing to undo"
+        if transcription.startswith("click on"):
+            self.confirmation_manager.set_pending(object(), "Sign up", transcription)
+            return True, "Did you mean 'Sign up'?"
+        return True, f"Done {transcription}"
+
+@contextmanager
+def stub_assistant(monkeypatch):
+    StubAssistant.runs = []
+    monkeypatch.setattr(api_server, 'SmartAssistant', StubAssistant)
+    monkeypatch.setattr(api_server, 'system_controller', object())
+    monkeypatch.setattr(api_server, 'browser_driver', None)
+    yield TestClient(api_server.app)
+
+def test_batch_runs_commands_in_order(monkeypatch):
+    with stub_assistant(monkeypatch) as client:
+        body = client.post("/commands/batch", json={"commands": ["save", "undo", "copy"]}).json()
+    assert StubAssistant.runs == [("save", "app_command"), ("undo", "app_command"), ("copy", "app_command")]
+    items = body["result"]["items"]
+    assert [item["command"] for item in items] == ["save", "undo", "copy"]
+    assert [item["success"] for item in items] == [True, False, True]
+    assert items[1]["message"] == "Error: nothing to undo" and items[0]["source"] == "gemini"
+    assert body["success"] is False and body["message"] == "Ran 2/3 commands"
+
+def test_batch_stop_on_error_skips_the_rest(monkeypatch):
+    with stub_assistant(monkeypatch) as client:
+        body = client.post("/commands/batch", json={"commands": ["save", "undo", "copy"], "stop_on_error": True}).json()
+    assert [text for text, _ in StubAssistant.runs] == ["save", "undo"]
+    assert body["result"]["items"][2] == {"command": "copy", "action": "app_command", "source": "gemini",
+                                          "success": False, "message": "Skipped after an earlier failure"}
+
+def test_batch_stops_at_a_command_that_needs_confirmation(monkeypatch):
+    with stub_assistant(monkeypatch) as client:
+        body = client.post("/commands/batch", json={"commands": ["save", "click on sign in", "share this page"]}).json()
+    assert [text for text, _ in StubAssistant.runs] == ["save", "click on sign in"]
+    save, click, share = body["result"]["items"]
+    assert save["success"] is True
+    assert click["success"] is False and click["needs_confirmation"] is True and "Sign up" in click["message"]
+    assert share["success"] is False and share["message"] == "Skipped: an earlier command needed confirmation"
+    assert body["message"] == "Ran 1/3 commands"
+
+def test_batch_size_is_capped(monkeypatch):
+    with stub_assistant(monkeypatch) as client:
+        too_many = client.post("/commands/batch", json={"commands": ["save"] * (api_server.BATCH_MAX_COMMANDS + 1)})
+        empty = client.post("/commands/batch", json={"commands": []})
+    assert too_many.status_code == 413 and empty.status_code == 400
+    assert StubAssistant.runs == []
+
+if __name__ == "__main__":
+    test_debug_endpoints_reject_remote_clients()
+    test_profile_start_status_stop()
+    test_profile_stop_returns_speedscope()
+    for test in (test_batch_runs_commands_in_order, test_batch_stop_on_error_skips_the_rest,
+                 test_batch_stops_at_a_command_that_needs_confirmation, test_batch_size_is_capped):
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            test(monkeypatch)
+    print("✅ API server tests passed")
@@ -0,0 +1,67 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent))
+
+import GeminiAPI
+from GeminiAPI import GeminiAssistant
+from GeminiGateway import GeminiRateLimited
+
+class Response:
+    def __init__(self, items, status_code=200):
+        self.status_code = status_code
+        self.items = items
+    def json(self):
+        text = "```json\n" + json.dumps(self.items) + "\n```"
+        return {'candidates': [{'content': {'parts': [{'text': text}]}}]}
+
+class ScriptedAssistant(GeminiAssistant):
+    def __init__(self, reply):
+        super().__init__()
+        self.reply = reply
+        self.calls = []
+    def _generate(self, payload, timeout, purpose):
+        self.calls.append(purpose)
+        if isinstance(self.reply, Exception):
+            raise self.reply
+        return self.reply
+
+def test_one_request_for_the_whole_batch(monkeypatch):
+    logged = []
+    monkeypatch.setattr(GeminiAPI, 'log_example', lambda text, result: logged.append(text))
+    spotify = {"action": "open_app", "app_name": "Spotify"}
+    cats = {"action": "platform_search", "platform": "youtube", "query": "cats"}
+    assistant = ScriptedAssistant(Response([spotify, cats]))
+    results = assistant.parse_commands_batch(["open spotify", "search cats on youtube"])
+    assert results == [(spotify, 'gemini'), (cats, 'gemini')]
+    assert assistant.calls == ['batch_parse']
+    assert logged == ["open spotify", "search cats on youtube"]
+
+def test_bad_items_fall_back_to_local_parse(monkeypatch):
+    monkeypatch.setattr(GeminiAPI, 'log_example', lambda text, result: None)
+    spotify = {"action": "open_app", "app_name": "Spotify"}
+    assistant = ScriptedAssistant(Response([spotify, "??"]))
+    results = assistant.parse_commands_batch(["open spotify", "scroll down"])
+    assert results[0] == (spotify, 'gemini')
+    assert results[1][0] == {"action": "browser_control", "command": "scroll_down"}
+    assert results[1][1] != 'gemini'
+
+def test_misaligned_or_failed_batch_parses_locally():
+    for reply in (Response([{"action": "open_app", "app_name": "Spotify"}]), Response([], 500),
+                  GeminiRateLimited("budget used up")):
+        results = ScriptedAssistant(reply).parse_commands_batch(["scroll down", "scroll up"])
+        assert [result for result, _ in results] == [
+            {"action": "browser_control", "command": "scroll_down"},
+            {"action": "browser_control", "command": "scroll_up"},
+        ]
+        assert all(source != 'gemini' for _, source in results)
+
+if __name__ == "__main__":
+    for test in (test_one_request_for_the_whole_batch, test_bad_items_fall_back_to_local_parse):
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            test(monkeypatch)
+    test_misaligned_or_failed_batch_parses_locally()
+    print("✅ Batch parse tests passed")
@@ -0,0 +1,44 @@
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent))
+
+from Application import ContextManager as context_module
+from Application.ContextManager import ContextManager
+
+def restore(started, has_window):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'context.json'
+        path.write_text(json.dumps({
+            'current_app': 'gedit', 'previous_app': 'chrome', 'context_start_time': started,
+            'app_history': [{'app': 'chrome', 'timestamp': started - 5}, {'app': 'gedit', 'timestamp': started}],
+            'app_states': [['gedit', {'file': 'notes.txt'}]],
+        }))
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setattr(context_module, '_app_has_window', lambda app: has_window)
+            context = ContextManager(path)
+        context.state_path = None  # keep the atexit flush out of the deleted temp dir
+        return context
+
+def test_recent_context_with_a_window_is_restored():
+    for has_window in (True, None):
+        context = restore(time.time() - 60, has_window)
+        assert context.get_current_context() == 'gedit' and context.context_start_time is not None
+
+def test_stale_or_closed_context_is_dropped_but_history_kept():
+    for started, has_window in ((time.time() - context_module.CONTEXT_MAX_AGE - 60, True), (time.time() - 60, False)):
+        context = restore(started, has_window)
+        assert context.get_current_context() is None and context.context_start_time is None
+        assert context.get_previous_context() == 'chrome'
+        assert context.get_recent_apps() == ['gedit', 'chrome']
+        assert context.app_states['gedit'] == {'file': 'notes.txt'}
+
+if __name__ == "__main__":
+    test_recent_context_with_a_window_is_restored()
+    test_stale_or_closed_context_is_dropped_but_history_kept()
+    print("✅ ContextManager tests passed")
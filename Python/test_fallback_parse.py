@@ -0,0 +1,41 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+import FallbackParser
+
+GOLDEN = Path(__file__).parent / 'benchmarks' / 'fixtures' / 'fallback_parse_golden.json'
+
+def load_golden():
+    with open(GOLDEN, encoding='utf-8') as f:
+        return json.load(f)
+
+def test_golden_corpus():
+    """Outputs recorded from the pre-rule-table _fallback_parse / _regex_parse_command."""
+    for case in load_golden():
+        assert FallbackParser.parse(case['input']) == case['expected'], case['input']
+        assert FallbackParser.strip_filler(case['input']) == case['filler_stripped'], case['input']
+
+def test_first_hit_in_group_is_final():
+    # "go to" enters the switch rule; with no app keyword the rest of the
+    # command rules are skipped and the text ends up as a web search.
+    name, result = FallbackParser.match_rule('go to the moon')
+    assert name is None
+    assert result == {"action": "web_search", "query": "go to the moon"}
+
+def test_parse_is_fast():
+    inputs = [case['input'] for case in load_golden()]
+    start = time.perf_counter()
+    for text in inputs:
+        FallbackParser.parse(text)
+    per_command = (time.perf_counter() - start) / len(inputs)
+    assert per_command < 0.001, f"{per_command * 1000:.3f} ms per command"
+
+if __name__ == "__main__":
+    test_golden_corpus()
+    test_first_hit_in_group_is_final()
+    test_parse_is_fast()
+    print("✅ FallbackParser tests passed")
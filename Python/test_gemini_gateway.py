@@ -0,0 +1,65 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from GeminiGateway import GeminiGateway, GeminiRateLimited
+
+class FakeResponse:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+def test_identical_requests_share_one_call():
+    gateway = GeminiGateway(rate_per_minute=60, burst=5, reserve=0)
+    calls = []
+    release = threading.Event()
+    def send():
+        calls.append(1)
+        release.wait(2)
+        return FakeResponse()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(gateway.call('parse', {'q': 'open chrome'}, send)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len(results) == 4 and all(result is results[0] for result in results)
+
+def test_background_calls_leave_room_for_interactive_ones():
+    gateway = GeminiGateway(rate_per_minute=0.001, burst=3, reserve=2)
+    gateway.call('query', {'q': 1}, FakeResponse)
+    try:
+        gateway.call('query', {'q': 2}, FakeResponse)
+        assert False, "background call should be refused"
+    except GeminiRateLimited:
+        pass
+    gateway.call('parse', {'q': 3}, FakeResponse)
+    gateway.call('parse', {'q': 4}, FakeResponse)
+    try:
+        gateway.call('parse', {'q': 5}, FakeResponse)
+        assert False, "budget should be exhausted"
+    except GeminiRateLimited:
+        pass
+
+def test_429_closes_the_gate():
+    gateway = GeminiGateway(rate_per_minute=600, burst=5, reserve=0)
+    gateway.call('parse', {'q': 1}, lambda: FakeResponse(429, {'Retry-After': '30'}))
+    try:
+        gateway.call('parse', {'q': 2}, FakeResponse)
+        assert False, "should back off after a 429"
+    except GeminiRateLimited:
+        pass
+    assert gateway.status()['backoff_seconds'] > 25
+
+if __name__ == "__main__":
+    test_identical_requests_share_one_call()
+    test_background_calls_leave_room_for_interactive_ones()
+    test_429_closes_the_gate()
+    print("✅ GeminiGateway tests passed")
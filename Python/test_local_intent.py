@@ -0,0 +1,64 @@
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from LocalIntentModel import LocalIntentModel, flush_log, load_examples, log_example
+
+EXAMPLES = [
+    ("chrome kholo", {"action": "open_app", "app_name": "chrome"}),
+    ("spotify kholo", {"action": "open_app", "app_name": "spotify"}),
+    ("open steam", {"action": "open_app", "app_name": "steam"}),
+    ("launch calculator", {"action": "open_app", "app_name": "calculator"}),
+    ("youtube pe arijit singh search karo", {"action": "platform_search", "platform": "youtube", "query": "arijit singh"}),
+    ("amazon pe headphones search karo", {"action": "platform_search", "platform": "amazon", "query": "headphones"}),
+    ("instagram pe virat kohli search karo", {"action": "platform_search", "platform": "instagram", "query": "virat kohli"}),
+    ("reddit pe memes search karo", {"action": "platform_search", "platform": "reddit", "query": "memes"}),
+    ("search cats on youtube", {"action": "platform_search", "platform": "youtube", "query": "cats"}),
+    ("volume badha do", {"action": "browser_control", "command": "volume_up"}),
+    ("volume kam karo", {"action": "browser_control", "command": "volume_down"}),
+    ("teesra tab kholo", {"action": "browser_control", "command": "switch_to_tab", "tab_index": 3}),
+    ("switch to tab 2", {"action": "browser_control", "command": "switch_to_tab", "tab_index": 2}),
+    ("go to tab 4", {"action": "browser_control", "command": "switch_to_tab", "tab_index": 4}),
+    ("go to youtube", {"action": "open_website", "url": "youtube.com"}),
+    ("visit reddit", {"action": "open_website", "url": "reddit.com"}),
+    ("open chrome and search python", {"action": "complex_command", "steps": [
+        {"action": "open_app", "app_name": "chrome"}, {"action": "web_search", "query": "python"}]}),
+]
+
+def train(examples=EXAMPLES * 3):
+    return LocalIntentModel.train(examples, epochs=8)
+
+def test_emits_gemini_shaped_json():
+    model = train()
+    assert model.parse("discord kholo", min_confidence=0) == {"action": "open_app", "app_name": "discord"}
+    assert model.parse("flipkart pe shoes search karo", min_confidence=0) == \
+        {"action": "platform_search", "platform": "flipkart", "query": "shoes"}
+    assert model.parse("volume badha do", min_confidence=0) == {"action": "browser_control", "command": "volume_up"}
+    assert model.parse("switch to tab 7", min_confidence=0) == \
+        {"action": "browser_control", "command": "switch_to_tab", "tab_index": 7}
+    assert model.parse("visit github", min_confidence=0) == {"action": "open_website", "url": "github.com"}
+
+def test_abstains_on_multi_step_commands():
+    model = train()
+    assert model.parse("open chrome and search python", min_confidence=0) is None
+
+def test_log_and_reload_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        log = Path(tmp) / 'intent_log.jsonl'
+        for text, result in EXAMPLES * 3:
+            log_example(text, result, path=log)
+        flush_log()
+        examples = load_examples([log])
+        assert len(examples) == len(EXAMPLES) * 3
+        model = LocalIntentModel.train(examples, epochs=8)
+        loaded = LocalIntentModel.load(model.save(Path(tmp) / 'model.json'))
+        for text, _ in EXAMPLES:
+            assert loaded.parse(text, min_confidence=0) == model.parse(text, min_confidence=0), text
+
+if __name__ == "__main__":
+    test_emits_gemini_shaped_json()
+    test_abstains_on_multi_step_commands()
+    test_log_and_reload_round_trip()
+    print("✅ LocalIntentModel tests passed")
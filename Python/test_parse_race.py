@@ -0,0 +1,59 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from ParseRace import ParseRace, local_parse
+
+class RecordingRace(ParseRace):
+    def __init__(self, gemini_parse, **kwargs):
+        super().__init__(gemini_parse, **kwargs)
+        self.records = []
+    def _log(self, record):
+        self.records.append(record)
+
+def test_safe_local_result_skips_gemini():
+    calls = []
+    race = RecordingRace(lambda text: calls.append(text), audit_rate=0)
+    assert race.parse("scroll down") == {"action": "browser_control", "command": "scroll_down"}
+    assert calls == []
+    assert race.records[-1]['decision'] == 'local_fast'
+
+def test_questions_about_command_words_go_to_gemini():
+    for text in ("tell me a refreshing drink recipe", "what does refresh rate mean", "who sang go back",
+                 "how to go back in time", "what is the current url standard", "scroll down meaning in hindi"):
+        assert local_parse(text)[1] < 1.0, text
+        answer = {"action": "conversation", "text": text}
+        race = RecordingRace(lambda text: answer, deadline=1.0, audit_rate=0)
+        assert race.parse(text) == answer, text
+        assert race.records[-1]['decision'] == 'gemini', text
+
+def test_whole_command_phrases_are_trusted():
+    for text in ("scroll down", "Please scroll down.", "go back", "refresh the page", "what is the current url"):
+        assert local_parse(text)[1] == 1.0, text
+
+def test_gemini_wins_when_it_answers_in_time():
+    gemini = {"action": "open_app", "app_name": "Spotify"}
+    race = RecordingRace(lambda text: gemini, deadline=1.0)
+    assert race.parse("open spotify") == gemini
+    assert race.records[-1]['decision'] == 'gemini'
+
+def test_deadline_bounds_latency():
+    def slow(text):
+        time.sleep(0.5)
+        return {"action": "open_app", "app_name": "Chrome"}
+    race = RecordingRace(slow, deadline=0.1)
+    start = time.perf_counter()
+    assert race.parse("open chrome") == {"action": "open_app", "app_name": "chrome"}
+    assert time.perf_counter() - start < 0.3
+    time.sleep(0.6)
+    assert race.records[-1]['decision'] == 'deadline' and race.records[-1]['late']
+
+if __name__ == "__main__":
+    test_safe_local_result_skips_gemini()
+    test_questions_about_command_words_go_to_gemini()
+    test_whole_command_phrases_are_trusted()
+    test_gemini_wins_when_it_answers_in_time()
+    test_deadline_bounds_latency()
+    print("✅ ParseRace tests passed")
@@ -0,0 +1,59 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from Profiler import SPEEDSCOPE_SCHEMA, ProfileResult, SamplingProfiler
+
+def _busy(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+def test_start_stop_collects_samples():
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy, args=(stop,), name="BusyWorker", daemon=True)
+    worker.start()
+    profiler = SamplingProfiler()
+    try:
+        assert profiler.start(interval=0.002, max_seconds=5)
+        assert not profiler.start()
+        assert profiler.running
+        time.sleep(0.2)
+        result = profiler.stop()
+    finally:
+        stop.set()
+    assert not profiler.running
+    assert result.reason == 'request' and result.total_samples > 0
+    assert any(thread == "BusyWorker" and stack[-1][0] == '_busy' for thread, stack in result.samples)
+    assert profiler.stop() is result
+
+def test_session_stops_itself_after_max_seconds():
+    profiler = SamplingProfiler()
+    assert profiler.start(interval=0.002, max_seconds=0.1)
+    time.sleep(0.3)
+    assert not profiler.running
+    assert profiler.last_result.reason == 'timeout'
+    assert profiler.last_result.duration < 0.3
+    assert profiler.stop() is profiler.last_result
+
+def test_collapsed_and_speedscope_output():
+    outer, inner = ('outer', '/app/a.py', 1), ('inner', '/app/b.py', 10)
+    result = ProfileResult({('MainThread', (outer, inner)): 3, ('Worker', (outer,)): 1}, 0.005, 100.0, 101.0, 'request')
+    assert result.collapsed() == "MainThread;outer (a.py:1);inner (b.py:10) 3\nWorker;outer (a.py:1) 1\n"
+    doc = result.speedscope()
+    assert doc['$schema'] == SPEEDSCOPE_SCHEMA
+    assert doc['shared']['frames'] == [{'name': 'outer', 'file': '/app/a.py', 'line': 1},
+                                       {'name': 'inner', 'file': '/app/b.py', 'line': 10}]
+    main, worker = doc['profiles']
+    assert main['type'] == 'sampled' and main['name'] == 'MainThread' and main['unit'] == 'seconds'
+    assert main['samples'] == [[0, 1]] and abs(main['weights'][0] - 0.015) < 1e-9
+    assert abs(main['endValue'] - 0.015) < 1e-9
+    assert worker['samples'] == [[0]]
+
+if __name__ == "__main__":
+    test_start_stop_collects_samples()
+    test_session_stops_itself_after_max_seconds()
+    test_collapsed_and_speedscope_output()
+    print("✅ Profiler tests passed")
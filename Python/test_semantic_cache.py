@@ -0,0 +1,65 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from SemanticCache import HashingEmbedder, SemanticCache
+
+def make_cache(**kwargs):
+    return SemanticCache(embedder=HashingEmbedder(), enabled=True, **kwargs)
+
+def test_paraphrase_hit_per_namespace():
+    cache = make_cache()
+    cache.put('conversation', "what is AI", "AI is the simulation of intelligence by machines.")
+    assert cache.get('conversation', "What's AI?") == "AI is the simulation of intelligence by machines."
+    assert cache.get('conversation', "tell me what AI is") is not None
+    assert cache.get('conversation', "what is python") is None
+    assert cache.get('web', "what is AI") is None
+
+def test_volatile_questions_are_not_cached():
+    cache = make_cache()
+    cache.put('web', "weather today in delhi", "Sunny")
+    assert cache.get('web', "weather today in delhi") is None
+
+def test_lru_and_ttl_eviction():
+    cache = make_cache(max_entries=2, ttl=0.2)
+    cache.put('conversation', "capital of france", "Paris")
+    cache.put('conversation', "capital of japan", "Tokyo")
+    assert cache.get('conversation', "capital of france") == "Paris"
+    cache.put('conversation', "capital of italy", "Rome")
+    assert cache.get('conversation', "capital of japan") is None
+    assert cache.get('conversation', "capital of france") == "Paris"
+    time.sleep(0.25)
+    assert cache.get('conversation', "capital of italy") is None
+    assert cache.stats()['entries'] <= 1
+
+def test_numbers_and_terms_must_match():
+    cache = make_cache()
+    cache.put('conversation', "convert 10 km to miles", "10 km is 6.21 miles")
+    cache.put('conversation', "who wrote harry potter", "J. K. Rowling")
+    assert cache.get('conversation', "convert 100 km to miles") is None
+    assert cache.get('conversation', "who wrote harry potter 2") is None
+    assert cache.get('conversation', "Who wrote Harry Potter?") == "J. K. Rowling"
+
+class BrokenEmbedder:
+    name = 'broken'
+    threshold = 0.9
+    def embed(self, text):
+        raise OSError("model download failed")
+
+def test_embedder_failure_is_a_miss():
+    cache = SemanticCache(embedder=BrokenEmbedder(), enabled=True)
+    cache.put('conversation', "what is AI", "AI is the simulation of intelligence by machines.")
+    assert cache.stats()['entries'] == 0
+    assert cache.stats()['embedder'] == 'hashing'
+    cache.put('conversation', "what is AI", "AI is the simulation of intelligence by machines.")
+    assert cache.get('conversation', "AI what is it?") is not None
+
+if __name__ == "__main__":
+    test_paraphrase_hit_per_namespace()
+    test_volatile_questions_are_not_cached()
+    test_lru_and_ttl_eviction()
+    test_numbers_and_terms_must_match()
+    test_embedder_failure_is_a_miss()
+    print("✅ SemanticCache tests passed")
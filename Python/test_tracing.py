@@ -0,0 +1,24 @@
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from Tracing import JsonLinesSink
+
+def test_sink_rotates_and_keeps_backups():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'traces.jsonl'
+        sink = JsonLinesSink(path, max_bytes=200, backups=2)
+        for i in range(40):
+            sink.emit({'i': i, 'pad': 'x' * 20})
+            sink.flush()
+        assert sorted(p.name for p in Path(tmp).iterdir()) == ['traces.jsonl', 'traces.jsonl.1', 'traces.jsonl.2']
+        assert all(p.stat().st_size < 200 + 50 for p in Path(tmp).iterdir())
+        last = [json.loads(line) for line in path.read_text().splitlines()]
+        assert last[-1]['i'] == 39
+
+if __name__ == "__main__":
+    test_sink_rotates_and_keeps_backups()
+    print("✅ Tracing tests passed")